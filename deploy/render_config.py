@@ -110,6 +110,8 @@ def render_config_toml(s: dict) -> str:
                 lines.append(f'{key} = {val}')
             else:
                 lines.append(f'{key} = "{val}"')
+        if get(s, "email.idle", False):
+            lines.append('idle = true')
         if not use_env_file:
             lines.append(f'imap_password = "{get(s, "email.imap_password", "")}"')
 
@@ -145,8 +147,10 @@ def render_config_toml(s: dict) -> str:
     sched_fields = [
         ("poll_interval", 5), ("talk_poll_interval", 10), ("talk_poll_timeout", 30),
         ("talk_poll_wait", 2.0), ("email_poll_interval", 60), ("briefing_check_interval", 60),
+        ("briefing_max_workers", 4),
         ("tasks_file_poll_interval", 30), ("shared_file_check_interval", 120),
-        ("heartbeat_check_interval", 60), ("progress_updates", True),
+        ("heartbeat_check_interval", 60), ("heartbeat_max_workers", 4),
+        ("heartbeat_check_timeout", 300), ("progress_updates", True),
         ("progress_min_interval", 8), ("progress_max_messages", 5),
         ("progress_show_tool_use", True), ("progress_show_text", False),
         ("progress_text_max_chars", 200), ("progress_style", "replace"),
@@ -230,6 +234,7 @@ def render_config_toml(s: dict) -> str:
         lines.append(f'cron = "{get(s, "sleep_cycle.cron", "0 2 * * *")}"')
         lines.append(f'lookback_hours = {get(s, "sleep_cycle.lookback_hours", 24)}')
         lines.append(f'memory_retention_days = {get(s, "sleep_cycle.memory_retention_days", 0)}')
+        lines.append(f'max_concurrent = {get(s, "sleep_cycle.max_concurrent", 2)}')
 
     # [channel_sleep_cycle]
     if get(s, "channel_sleep_cycle.enabled", False):
@@ -190,10 +190,23 @@ CREATE TABLE IF NOT EXISTS scheduled_jobs (
     last_success_at TEXT,
     once INTEGER DEFAULT 0,                 -- One-time job: auto-removed after successful execution
     skip_log_channel INTEGER DEFAULT 0,     -- Suppress log channel output for tasks from this job
+    next_run_at TEXT,                       -- Next fire time (UTC); NULL = recompute on next check
+    next_run_tz TEXT,                       -- Timezone next_run_at was computed in
     UNIQUE(user_id, name)
 );
 
 CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_user ON scheduled_jobs(user_id);
+CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_next_run ON scheduled_jobs(next_run_at);
+
+-- Clear the stored fire time whenever an input to it changes, whoever makes the change
+CREATE TRIGGER IF NOT EXISTS scheduled_jobs_next_run_reset
+AFTER UPDATE OF cron_expression, last_run_at, created_at ON scheduled_jobs
+WHEN OLD.cron_expression IS NOT NEW.cron_expression
+  OR OLD.last_run_at IS NOT NEW.last_run_at
+  OR OLD.created_at IS NOT NEW.created_at
+BEGIN
+    UPDATE scheduled_jobs SET next_run_at = NULL WHERE id = NEW.id;
+END;
 
 -- Sleep cycle state (tracks last run for nightly memory extraction)
 CREATE TABLE IF NOT EXISTS sleep_cycle_state (
@@ -242,6 +255,7 @@ CREATE TABLE IF NOT EXISTS monarch_synced_transactions (
 CREATE INDEX IF NOT EXISTS idx_monarch_synced_user ON monarch_synced_transactions(user_id);
 CREATE INDEX IF NOT EXISTS idx_monarch_synced_active ON monarch_synced_transactions(user_id)
     WHERE recategorized_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_monarch_synced_hash ON monarch_synced_transactions(user_id, content_hash);
 
 -- CSV imported transactions (deduplication via content hash)
 CREATE TABLE IF NOT EXISTS csv_imported_transactions (
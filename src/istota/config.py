@@ -50,6 +50,7 @@ class EmailConfig:
     # Polling settings
     poll_folder: str = "INBOX"
     bot_email: str = ""  # bot's email address (to skip own messages)
+    idle: bool = False  # hold an IMAP IDLE session so new mail is polled right away
 
     @property
     def effective_smtp_user(self) -> str:
@@ -101,9 +102,12 @@ class SchedulerConfig:
     poll_interval: int = 2  # seconds between task queue checks
     email_poll_interval: int = 60  # seconds between email polls
     briefing_check_interval: int = 60  # seconds between briefing checks
+    briefing_max_workers: int = 4  # briefings are prepared concurrently off the main loop
     tasks_file_poll_interval: int = 30  # seconds between TASKS.md file polls
     shared_file_check_interval: int = 120  # seconds between shared file organization checks
     heartbeat_check_interval: int = 60  # seconds between heartbeat checks
+    heartbeat_max_workers: int = 4  # heartbeat checks run concurrently off the main loop
+    heartbeat_check_timeout: int = 300  # seconds before a running check is reported as timed out
     talk_poll_interval: int = 10  # seconds between Talk polls
     talk_poll_timeout: int = 30  # long-poll timeout for Talk API
     talk_poll_wait: float = 2.0  # max seconds to wait for all rooms before processing available results
@@ -145,6 +149,7 @@ class SleepCycleConfig:
     lookback_hours: int = 24
     auto_load_dated_days: int = 3  # auto-load N days of dated memories into prompts (0 = disabled)
     curate_user_memory: bool = False  # nightly USER.md curation from dated memories
+    max_concurrent: int = 2  # user + channel cycles run in the background, at most this many at once
 
 
 @dataclass
@@ -280,6 +285,7 @@ class SecurityConfig:
     sandbox_admin_db_write: bool = False  # allow admin DB writes in sandbox
     skill_proxy_enabled: bool = True  # proxy skill CLI calls via Unix socket
     skill_proxy_timeout: int = 300  # timeout for proxied skill commands (seconds)
+    skill_proxy_warm: bool = True  # fork skill CLIs from a preloaded forkserver
     passthrough_env_vars: list[str] = field(default_factory=lambda: [
         "LANG", "LC_ALL", "LC_CTYPE", "TZ",
     ])
@@ -620,6 +626,7 @@ def load_config(config_path: Path | None = None) -> Config:
             smtp_password=email.get("smtp_password", ""),
             poll_folder=email.get("poll_folder", "INBOX"),
             bot_email=email.get("bot_email", ""),
+            idle=email.get("idle", False),
         )
 
     if "conversation" in data:
@@ -645,9 +652,12 @@ def load_config(config_path: Path | None = None) -> Config:
             poll_interval=sched.get("poll_interval", 5),
             email_poll_interval=sched.get("email_poll_interval", 60),
             briefing_check_interval=sched.get("briefing_check_interval", 60),
+            briefing_max_workers=sched.get("briefing_max_workers", 4),
             tasks_file_poll_interval=sched.get("tasks_file_poll_interval", sched.get("istota_file_poll_interval", 30)),
             shared_file_check_interval=sched.get("shared_file_check_interval", 120),
             heartbeat_check_interval=sched.get("heartbeat_check_interval", 60),
+            heartbeat_max_workers=sched.get("heartbeat_max_workers", 4),
+            heartbeat_check_timeout=sched.get("heartbeat_check_timeout", 300),
             talk_poll_interval=sched.get("talk_poll_interval", 10),
             talk_poll_timeout=sched.get("talk_poll_timeout", 30),
             talk_poll_wait=sched.get("talk_poll_wait", 2.0),
@@ -733,6 +743,7 @@ def load_config(config_path: Path | None = None) -> Config:
             lookback_hours=sc.get("lookback_hours", 24),
             auto_load_dated_days=sc.get("auto_load_dated_days", 3),
             curate_user_memory=sc.get("curate_user_memory", False),
+            max_concurrent=sc.get("max_concurrent", 2),
         )
 
     if "channel_sleep_cycle" in data:
@@ -795,6 +806,7 @@ def load_config(config_path: Path | None = None) -> Config:
             sandbox_admin_db_write=sec.get("sandbox_admin_db_write", False),
             skill_proxy_enabled=sec.get("skill_proxy_enabled", True),
             skill_proxy_timeout=sec.get("skill_proxy_timeout", 300),
+            skill_proxy_warm=sec.get("skill_proxy_warm", True),
             network=network_config,
             **({
                 "passthrough_env_vars": sec["passthrough_env_vars"]
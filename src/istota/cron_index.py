@@ -0,0 +1,152 @@
+"""Next-fire-time computation and index for cron-driven work.
+
+Cron expressions are evaluated on naive wall-clock time in the owner's
+timezone (croniter miscomputes next fire times when a tz-aware datetime
+crosses a DST boundary, causing double-fires) and the result is converted
+to UTC, so stored fire times compare directly against the current time.
+
+Scheduled jobs keep their next fire time in the scheduled_jobs table.
+Briefings and sleep cycles are defined in config, so FireTimeIndex keeps
+theirs in an in-memory min-heap.
+"""
+
+import heapq
+import itertools
+from collections.abc import Callable, Hashable
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+
+def zone(name: str | None) -> ZoneInfo:
+    """ZoneInfo for name, falling back to UTC for unknown or empty names."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except Exception:
+        return ZoneInfo("UTC")
+
+
+def parse_utc(timestamp: str) -> datetime:
+    """Parse a stored timestamp; naive values are UTC (SQLite datetime('now'))."""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_utc(moment: datetime) -> str:
+    """Format an aware datetime as a UTC timestamp in SQLite's datetime() form."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _wall_to_utc(wall: datetime, tz: ZoneInfo) -> datetime:
+    """The first instant at which wall-clock time in tz reaches wall."""
+    utc = wall.replace(tzinfo=tz).astimezone(timezone.utc)
+    if utc.astimezone(tz).replace(tzinfo=None) == wall:
+        return utc
+    # wall falls in a spring-forward gap and never shows on the clock: fire
+    # when the gap ends. The other fold reads the wall time with the offset
+    # from after the change, which lands before the gap.
+    lo = int(wall.replace(tzinfo=tz, fold=1).astimezone(timezone.utc).timestamp())
+    hi = int(utc.timestamp())
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if datetime.fromtimestamp(mid, tz).replace(tzinfo=None) >= wall:
+            hi = mid
+        else:
+            lo = mid
+    return datetime.fromtimestamp(hi, timezone.utc)
+
+
+def next_fire_time(cron_expr: str, tz: ZoneInfo, after: datetime) -> datetime:
+    """First time cron_expr fires in tz strictly after `after`, in UTC."""
+    base = after.astimezone(tz).replace(tzinfo=None)
+    return _wall_to_utc(croniter(cron_expr, base).get_next(datetime), tz)
+
+
+def fire_time_since(
+    cron_expr: str, tz: ZoneInfo, last_run_at: str | None, now: datetime,
+) -> datetime:
+    """Next fire time after last_run_at, or after today's midnight if never run.
+
+    Anchoring never-run crons at midnight means a cron whose time has
+    already passed today fires on the first check.
+    """
+    if last_run_at:
+        after = parse_utc(last_run_at)
+    else:
+        after = now.astimezone(tz).replace(hour=0, minute=0, second=0, microsecond=0)
+    return next_fire_time(cron_expr, tz, after)
+
+
+class FireTimeIndex:
+    """
+    Min-heap of next fire times for cron definitions held in memory.
+
+    Each key's fire time is computed from its definition and last run when
+    the key first appears or its definition changes, and again when it
+    comes due. A check otherwise costs one comparison per definition and
+    pops only the entries whose time has come.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, Hashable]] = []
+        # key -> (sequence of its live heap item, definition)
+        self._entries: dict[Hashable, tuple[int, tuple[str, str]]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _push(self, key: Hashable, definition: tuple[str, str], fire_at: datetime) -> None:
+        seq = next(self._seq)
+        self._entries[key] = (seq, definition)
+        heapq.heappush(self._heap, (fire_at, seq, key))
+
+    def due(
+        self,
+        definitions: dict[Hashable, tuple[str, str]],
+        last_run: Callable[[Hashable], str | None],
+        now: datetime,
+    ) -> list[Hashable]:
+        """
+        Keys whose cron has fired since their last run, in fire-time order.
+
+        definitions maps each key to (cron expression, timezone name).
+        last_run returns a key's stored last run, or None if it never ran;
+        it is called only for keys being computed or coming due, so a run
+        recorded elsewhere is noticed before the key is reported due.
+
+        Reported keys leave the index and are recomputed from last_run on
+        the next check: after the caller records the run, or due again if
+        it didn't run.
+        """
+        for key in self._entries.keys() - definitions.keys():
+            del self._entries[key]
+        for key, definition in definitions.items():
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != definition:
+                cron_expr, tz_name = definition
+                self._push(key, definition, fire_time_since(cron_expr, zone(tz_name), last_run(key), now))
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != seq:
+                continue  # Superseded by a newer definition or dropped
+            definition = entry[1]
+            cron_expr, tz_name = definition
+            fire_at = fire_time_since(cron_expr, zone(tz_name), last_run(key), now)
+            if fire_at > now:
+                self._push(key, definition, fire_at)
+                continue
+            del self._entries[key]
+            due.append(key)
+
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            live = {seq for seq, _ in self._entries.values()}
+            self._heap = [item for item in self._heap if item[1] in live]
+            heapq.heapify(self._heap)
+        return due
@@ -4,7 +4,7 @@ import json
 import logging
 import sqlite3
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator
@@ -125,6 +125,8 @@ class ScheduledJob:
     last_error: str | None = None
     last_success_at: str | None = None
     once: bool = False
+    next_run_at: str | None = None
+    next_run_tz: str | None = None
 
 
 def _run_migrations(conn: sqlite3.Connection) -> None:
@@ -159,6 +161,8 @@ def _run_migrations(conn: sqlite3.Connection) -> None:
         ("last_success_at", "TEXT"),
         ("once", "INTEGER DEFAULT 0"),
         ("skip_log_channel", "INTEGER DEFAULT 0"),
+        ("next_run_at", "TEXT"),
+        ("next_run_tz", "TEXT"),
     ]:
         try:
             conn.execute(f"ALTER TABLE scheduled_jobs ADD COLUMN {col} {col_type}")
@@ -935,6 +939,115 @@ def is_email_processed(conn: sqlite3.Connection, email_id: str) -> bool:
     return cursor.fetchone() is not None
 
 
+# Values per IN (...) list, well below SQLite's bound-variable limit
+_IN_CHUNK = 500
+
+
+def get_processed_email_ids(conn: sqlite3.Connection, email_ids: list[str]) -> set[str]:
+    """The subset of email_ids already processed, in one query per 500 ids."""
+    processed: set[str] = set()
+    unique = list(dict.fromkeys(email_ids))
+    for start in range(0, len(unique), _IN_CHUNK):
+        chunk = unique[start:start + _IN_CHUNK]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(
+            f"SELECT email_id FROM processed_emails WHERE email_id IN ({placeholders})",
+            chunk,
+        )
+        processed.update(row[0] for row in cursor)
+    return processed
+
+
+@dataclass
+class ProcessedEmailRecord:
+    """A processed-email marker to write with mark_emails_processed."""
+    email_id: str
+    sender_email: str
+    subject: str | None = None
+    thread_id: str | None = None
+    message_id: str | None = None
+    references: str | None = None
+    user_id: str | None = None
+    task_id: int | None = None
+
+
+def mark_emails_processed(
+    conn: sqlite3.Connection,
+    records: list[ProcessedEmailRecord],
+) -> None:
+    """Record a batch of processed emails in one statement; ids already recorded are kept."""
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO processed_emails
+            (email_id, sender_email, subject, thread_id, message_id, "references", user_id, task_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (r.email_id, r.sender_email, r.subject, r.thread_id, r.message_id,
+             r.references, r.user_id, r.task_id)
+            for r in records
+        ],
+    )
+
+
+def get_email_poll_watermark(
+    conn: sqlite3.Connection, account: str, folder: str,
+) -> tuple[int, int] | None:
+    """(UIDVALIDITY, next UID to examine) recorded for a mailbox folder, or None."""
+    row = kv_get(conn, account, "email_poller", folder)
+    if row is None:
+        return None
+    try:
+        watermark = json.loads(row["value"])
+        return int(watermark["uidvalidity"]), int(watermark["uid_next"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def set_email_poll_watermark(
+    conn: sqlite3.Connection, account: str, folder: str, uidvalidity: int, uid_next: int,
+) -> None:
+    """Record that messages in folder below uid_next have been examined."""
+    kv_set(
+        conn, account, "email_poller", folder,
+        json.dumps({"uidvalidity": uidvalidity, "uid_next": uid_next}),
+    )
+
+
+def get_email_poll_failures(
+    conn: sqlite3.Connection, account: str, folder: str, uidvalidity: int,
+) -> dict[str, int]:
+    """Failed processing attempts per message UID in a mailbox folder.
+
+    Counts recorded under a different UIDVALIDITY no longer name the same
+    messages and are ignored.
+    """
+    row = kv_get(conn, account, "email_poller_failures", folder)
+    if row is None:
+        return {}
+    try:
+        failures = json.loads(row["value"])
+        if int(failures["uidvalidity"]) != uidvalidity:
+            return {}
+        return {str(uid): int(count) for uid, count in failures["counts"].items()}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def set_email_poll_failures(
+    conn: sqlite3.Connection, account: str, folder: str, uidvalidity: int,
+    counts: dict[str, int],
+) -> None:
+    """Record failed processing attempts per message UID; empty counts clear them."""
+    if not counts:
+        kv_delete(conn, account, "email_poller_failures", folder)
+        return
+    kv_set(
+        conn, account, "email_poller_failures", folder,
+        json.dumps({"uidvalidity": uidvalidity, "counts": counts}),
+    )
+
+
 def mark_email_processed(
     conn: sqlite3.Connection,
     email_id: str,
@@ -1090,6 +1203,48 @@ def find_sent_email_by_references(
     )
 
 
+def find_sent_emails_by_message_ids(
+    conn: sqlite3.Connection,
+    message_ids: list[str],
+) -> dict[str, SentEmail]:
+    """Sent emails for any of the given Message-IDs, keyed by Message-ID.
+
+    Resolves In-Reply-To/References ids for a whole batch of inbound
+    emails at once; where a Message-ID was recorded twice the most
+    recent send wins.
+    """
+    found: dict[str, SentEmail] = {}
+    unique = list(dict.fromkeys(message_ids))
+    for start in range(0, len(unique), _IN_CHUNK):
+        chunk = unique[start:start + _IN_CHUNK]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(
+            f"""
+            SELECT id, user_id, task_id, message_id, to_addr, subject, thread_id,
+                   in_reply_to, "references", conversation_token, sent_at
+            FROM sent_emails
+            WHERE message_id IN ({placeholders})
+            ORDER BY sent_at, id
+            """,
+            chunk,
+        )
+        for row in cursor:
+            found[row["message_id"]] = SentEmail(
+                id=row["id"],
+                user_id=row["user_id"],
+                task_id=row["task_id"],
+                message_id=row["message_id"],
+                to_addr=row["to_addr"],
+                subject=row["subject"],
+                thread_id=row["thread_id"],
+                in_reply_to=row["in_reply_to"],
+                references=row["references"],
+                conversation_token=row["conversation_token"],
+                sent_at=row["sent_at"],
+            )
+    return found
+
+
 # ============================================================================
 # Talk message tracking functions
 # ============================================================================
@@ -1390,6 +1545,23 @@ def is_istota_task_tracked(conn: sqlite3.Connection, user_id: str, content_hash:
     return cursor.fetchone() is not None
 
 
+def get_tracked_istota_task_hashes(
+    conn: sqlite3.Connection, user_id: str, content_hashes: list[str],
+) -> set[str]:
+    """The subset of content_hashes already tracked for a user, in one query per 500."""
+    tracked: set[str] = set()
+    unique = list(dict.fromkeys(content_hashes))
+    for start in range(0, len(unique), _IN_CHUNK):
+        chunk = unique[start:start + _IN_CHUNK]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor = conn.execute(
+            f"SELECT content_hash FROM istota_file_tasks WHERE user_id = ? AND content_hash IN ({placeholders})",
+            [user_id, *chunk],
+        )
+        tracked.update(row[0] for row in cursor)
+    return tracked
+
+
 def track_istota_file_task(
     conn: sqlite3.Connection,
     user_id: str,
@@ -1532,7 +1704,7 @@ def get_enabled_scheduled_jobs(conn: sqlite3.Connection) -> list[ScheduledJob]:
                conversation_token, output_target, enabled, last_run_at, created_at,
                silent_unless_action, skip_log_channel,
                consecutive_failures, last_error, last_success_at,
-               once
+               once, next_run_at, next_run_tz
         FROM scheduled_jobs
         WHERE enabled = 1
         """
@@ -1540,6 +1712,48 @@ def get_enabled_scheduled_jobs(conn: sqlite3.Connection) -> list[ScheduledJob]:
     return [_row_to_scheduled_job(row) for row in cursor.fetchall()]
 
 
+def get_due_scheduled_jobs(conn: sqlite3.Connection, now: str) -> list[ScheduledJob]:
+    """Fetch enabled jobs due by now (UTC) or with no stored next fire time.
+
+    now is a UTC timestamp in SQLite datetime() form. The lookup is a range
+    search on the next_run_at index, so jobs that aren't due are never read.
+    """
+    cursor = conn.execute(
+        """
+        SELECT id, user_id, name, cron_expression, prompt, command,
+               conversation_token, output_target, enabled, last_run_at, created_at,
+               silent_unless_action, skip_log_channel,
+               consecutive_failures, last_error, last_success_at,
+               once, next_run_at, next_run_tz
+        FROM scheduled_jobs
+        WHERE (next_run_at IS NULL OR next_run_at <= ?) AND enabled = 1
+        """,
+        (now,),
+    )
+    return [_row_to_scheduled_job(row) for row in cursor.fetchall()]
+
+
+def set_scheduled_job_next_run(
+    conn: sqlite3.Connection, job_id: int, next_run_at: str, tz: str,
+) -> None:
+    """Store a job's next fire time (UTC) and the timezone it was computed in."""
+    conn.execute(
+        "UPDATE scheduled_jobs SET next_run_at = ?, next_run_tz = ? WHERE id = ?",
+        (next_run_at, tz, job_id),
+    )
+
+
+def clear_scheduled_job_next_runs(conn: sqlite3.Connection, user_id: str, tz: str) -> None:
+    """Drop a user's stored fire times that were computed in another timezone."""
+    conn.execute(
+        """
+        UPDATE scheduled_jobs SET next_run_at = NULL
+        WHERE user_id = ? AND next_run_at IS NOT NULL AND next_run_tz IS NOT ?
+        """,
+        (user_id, tz),
+    )
+
+
 def get_user_scheduled_jobs(conn: sqlite3.Connection, user_id: str) -> list[ScheduledJob]:
     """Fetch all scheduled jobs for a user (enabled and disabled)."""
     cursor = conn.execute(
@@ -1548,7 +1762,7 @@ def get_user_scheduled_jobs(conn: sqlite3.Connection, user_id: str) -> list[Sche
                conversation_token, output_target, enabled, last_run_at, created_at,
                silent_unless_action, skip_log_channel,
                consecutive_failures, last_error, last_success_at,
-               once
+               once, next_run_at, next_run_tz
         FROM scheduled_jobs
         WHERE user_id = ?
         ORDER BY name
@@ -1578,6 +1792,8 @@ def _row_to_scheduled_job(row: sqlite3.Row) -> ScheduledJob:
         last_error=row["last_error"] if "last_error" in row.keys() else None,
         last_success_at=row["last_success_at"] if "last_success_at" in row.keys() else None,
         once=bool(row["once"]) if "once" in row.keys() else False,
+        next_run_at=row["next_run_at"] if "next_run_at" in row.keys() else None,
+        next_run_tz=row["next_run_tz"] if "next_run_tz" in row.keys() else None,
     )
 
 
@@ -1588,7 +1804,11 @@ def set_scheduled_job_last_run(conn: sqlite3.Connection, job_id: int) -> None:
     a next-fire time within the same minute, preventing double-fires.
     """
     conn.execute(
-        "UPDATE scheduled_jobs SET last_run_at = strftime('%Y-%m-%d %H:%M:00', 'now') WHERE id = ?",
+        """
+        UPDATE scheduled_jobs
+        SET last_run_at = strftime('%Y-%m-%d %H:%M:00', 'now'), next_run_at = NULL
+        WHERE id = ?
+        """,
         (job_id,),
     )
 
@@ -1642,7 +1862,7 @@ def get_scheduled_job(conn: sqlite3.Connection, job_id: int) -> ScheduledJob | N
                conversation_token, output_target, enabled, last_run_at, created_at,
                silent_unless_action, skip_log_channel,
                consecutive_failures, last_error, last_success_at,
-               once
+               once, next_run_at, next_run_tz
         FROM scheduled_jobs
         WHERE id = ?
         """,
@@ -1687,7 +1907,7 @@ def get_scheduled_job_by_name(
                conversation_token, output_target, enabled, last_run_at, created_at,
                silent_unless_action, skip_log_channel,
                consecutive_failures, last_error, last_success_at,
-               once
+               once, next_run_at, next_run_tz
         FROM scheduled_jobs
         WHERE user_id = ? AND name = ?
         """,
@@ -1835,6 +2055,28 @@ def set_sleep_cycle_last_run(
     )
 
 
+def get_sleep_cycle_run(conn: sqlite3.Connection, subject: str) -> dict | None:
+    """Get the run record for a sleep cycle job (see set_sleep_cycle_run)."""
+    row = kv_get(conn, subject, "sleep_cycle", "run")
+    if row is None:
+        return None
+    try:
+        run = json.loads(row["value"])
+    except ValueError:
+        return None
+    return run if isinstance(run, dict) else None
+
+
+def set_sleep_cycle_run(conn: sqlite3.Connection, subject: str, run: dict) -> None:
+    """Persist the run record for a sleep cycle job.
+
+    subject is the user_id, or "channel:<token>" for channel sleep cycles.
+    The record holds status ("running", "done" or "failed"), the pid of the
+    process running it and started_at/finished_at (ISO datetimes).
+    """
+    kv_set(conn, subject, "sleep_cycle", "run", json.dumps(run))
+
+
 # ============================================================================
 # Channel sleep cycle state functions
 # ============================================================================
@@ -1877,40 +2119,134 @@ def set_channel_sleep_cycle_last_run(
     )
 
 
-def get_completed_channel_tasks_since(
+@dataclass
+class CompletedTaskInfo:
+    """A completed task's metadata and text lengths, without the text itself."""
+    id: int
+    user_id: str
+    source_type: str
+    conversation_token: str | None
+    created_at: str | None
+    prompt_chars: int
+    result_chars: int
+
+
+def get_completed_task_info(
     conn: sqlite3.Connection,
-    conversation_token: str,
     since_datetime: str,
     after_task_id: int | None = None,
-) -> list[Task]:
+    *,
+    user_id: str | None = None,
+    conversation_token: str | None = None,
+) -> list[CompletedTaskInfo]:
     """
-    Fetch completed tasks for a conversation token since a given datetime.
+    Metadata for completed tasks since a given datetime, filtered by user or conversation.
 
-    Returns list of Task objects ordered by id ascending.
+    Reads lengths instead of prompt and result text, so callers can budget
+    before loading any text (see iter_task_text_slices).
+    Ordered by id ascending.
     """
     query = """
-        SELECT id, status, source_type, user_id, prompt, conversation_token,
-               parent_task_id, is_group_chat, attachments, result, error,
-               confirmation_prompt, priority, attempt_count, max_attempts,
-               created_at, scheduled_for, output_target,
-               talk_message_id, talk_response_id, reply_to_talk_id, reply_to_content,
-               heartbeat_silent
+        SELECT id, user_id, source_type, conversation_token, created_at,
+               length(prompt), length(result)
         FROM tasks
-        WHERE conversation_token = ?
-        AND status = 'completed'
+        WHERE status = 'completed'
         AND result IS NOT NULL
         AND completed_at >= ?
     """
-    params: list = [conversation_token, since_datetime]
+    params: list = [since_datetime]
 
+    if user_id is not None:
+        query += " AND user_id = ?"
+        params.append(user_id)
+    if conversation_token is not None:
+        query += " AND conversation_token = ?"
+        params.append(conversation_token)
     if after_task_id is not None:
         query += " AND id > ?"
         params.append(after_task_id)
 
     query += " ORDER BY id ASC"
 
-    cursor = conn.execute(query, params)
-    return [_row_to_task(row) for row in cursor.fetchall()]
+    return [
+        CompletedTaskInfo(
+            id=row[0], user_id=row[1], source_type=row[2], conversation_token=row[3],
+            created_at=row[4], prompt_chars=row[5] or 0, result_chars=row[6] or 0,
+        )
+        for row in conn.execute(query, params)
+    ]
+
+
+def get_latest_completed_task_id(
+    conn: sqlite3.Connection,
+    since_datetime: str,
+    after_task_id: int | None = None,
+    *,
+    user_id: str | None = None,
+    conversation_token: str | None = None,
+) -> int | None:
+    """Highest id among the tasks get_completed_task_info would return, or None."""
+    query = """
+        SELECT max(id) FROM tasks
+        WHERE status = 'completed'
+        AND result IS NOT NULL
+        AND completed_at >= ?
+    """
+    params: list = [since_datetime]
+
+    if user_id is not None:
+        query += " AND user_id = ?"
+        params.append(user_id)
+    if conversation_token is not None:
+        query += " AND conversation_token = ?"
+        params.append(conversation_token)
+    if after_task_id is not None:
+        query += " AND id > ?"
+        params.append(after_task_id)
+
+    return conn.execute(query, params).fetchone()[0]
+
+
+# Rows per query in iter_task_text_slices (5 bound parameters each)
+_TEXT_SLICE_CHUNK = 150
+
+
+def iter_task_text_slices(
+    conn: sqlite3.Connection,
+    slices: dict[int, tuple[int, int, int, int]],
+) -> Iterator[tuple[int, str, str, str, str]]:
+    """
+    Stream head and tail slices of task prompts and results.
+
+    slices maps task id to (prompt_head, prompt_tail, result_head,
+    result_tail) character counts. Yields (id, prompt_head, prompt_tail,
+    result_head, result_tail) strings in id order; a tail count of 0
+    yields an empty tail. Truncation happens in SQLite, so full texts
+    are never loaded into Python.
+    """
+    ids = sorted(slices)
+    for start in range(0, len(ids), _TEXT_SLICE_CHUNK):
+        chunk = ids[start:start + _TEXT_SLICE_CHUNK]
+        values = ", ".join("(?, ?, ?, ?, ?)" for _ in chunk)
+        params: list = []
+        for task_id in chunk:
+            params.append(task_id)
+            params.extend(slices[task_id])
+        cursor = conn.execute(
+            f"""
+            WITH s(id, ph, pt, rh, rt) AS (VALUES {values})
+            SELECT t.id,
+                   substr(coalesce(t.prompt, ''), 1, s.ph),
+                   CASE WHEN s.pt > 0 THEN substr(t.prompt, -s.pt) ELSE '' END,
+                   substr(coalesce(t.result, ''), 1, s.rh),
+                   CASE WHEN s.rt > 0 THEN substr(t.result, -s.rt) ELSE '' END
+            FROM s JOIN tasks t ON t.id = s.id
+            ORDER BY t.id
+            """,
+            params,
+        )
+        for row in cursor:
+            yield row[0], row[1] or "", row[2] or "", row[3] or "", row[4] or ""
 
 
 def get_active_channel_tokens(
@@ -1937,46 +2273,6 @@ def get_active_channel_tokens(
     return [row[0] for row in cursor.fetchall()]
 
 
-def get_completed_tasks_since(
-    conn: sqlite3.Connection,
-    user_id: str,
-    since_datetime: str,
-    after_task_id: int | None = None,
-) -> list[Task]:
-    """
-    Fetch completed tasks for a user since a given datetime.
-
-    Args:
-        since_datetime: ISO format datetime string (UTC)
-        after_task_id: Only return tasks with id > this value (to avoid reprocessing)
-
-    Returns list of Task objects ordered by id ascending.
-    """
-    query = """
-        SELECT id, status, source_type, user_id, prompt, conversation_token,
-               parent_task_id, is_group_chat, attachments, result, error,
-               confirmation_prompt, priority, attempt_count, max_attempts,
-               created_at, scheduled_for, output_target,
-               talk_message_id, talk_response_id, reply_to_talk_id, reply_to_content,
-               heartbeat_silent
-        FROM tasks
-        WHERE user_id = ?
-        AND status = 'completed'
-        AND result IS NOT NULL
-        AND completed_at >= ?
-    """
-    params: list = [user_id, since_datetime]
-
-    if after_task_id is not None:
-        query += " AND id > ?"
-        params.append(after_task_id)
-
-    query += " ORDER BY id ASC"
-
-    cursor = conn.execute(query, params)
-    return [_row_to_task(row) for row in cursor.fetchall()]
-
-
 def list_istota_file_tasks(
     conn: sqlite3.Connection,
     user_id: str | None = None,
@@ -2122,6 +2418,91 @@ def update_heartbeat_state(
         )
 
 
+def get_heartbeat_states(
+    conn: sqlite3.Connection,
+) -> dict[tuple[str, str], HeartbeatState]:
+    """Get the state of every heartbeat check in one query, keyed by (user_id, check_name)."""
+    cursor = conn.execute(
+        """
+        SELECT user_id, check_name, last_check_at, last_alert_at,
+               last_healthy_at, last_error_at, consecutive_errors
+        FROM heartbeat_state
+        """
+    )
+    return {
+        (row["user_id"], row["check_name"]): HeartbeatState(
+            user_id=row["user_id"],
+            check_name=row["check_name"],
+            last_check_at=row["last_check_at"],
+            last_alert_at=row["last_alert_at"],
+            last_healthy_at=row["last_healthy_at"],
+            last_error_at=row["last_error_at"],
+            consecutive_errors=row["consecutive_errors"],
+        )
+        for row in cursor.fetchall()
+    }
+
+
+@dataclass
+class HeartbeatUpdate:
+    """One check's state transition, with the same flags as update_heartbeat_state."""
+    user_id: str
+    check_name: str
+    last_check_at: bool = False
+    last_alert_at: bool = False
+    last_healthy_at: bool = False
+    last_error_at: bool = False
+    reset_errors: bool = False
+    increment_errors: bool = False
+    # When the check finished (UTC, datetime('now') format); the time
+    # fields are stamped with it rather than the time of the write
+    at: str | None = None
+
+
+def apply_heartbeat_updates(
+    conn: sqlite3.Connection,
+    updates: list[HeartbeatUpdate],
+) -> None:
+    """
+    Write a batch of heartbeat state transitions in one transaction.
+
+    Each update is a single upsert, so a cycle's worth of checks costs one
+    write transaction however many checks ran. Updates are applied in order.
+    Time fields are stamped with each update's `at`, or the current time
+    when it has none.
+    """
+    if not updates:
+        return
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO heartbeat_state (
+                user_id, check_name, last_check_at, last_alert_at,
+                last_healthy_at, last_error_at, consecutive_errors
+            )
+            VALUES (
+                :user_id, :check_name,
+                CASE WHEN :last_check_at THEN coalesce(:at, datetime('now')) END,
+                CASE WHEN :last_alert_at THEN coalesce(:at, datetime('now')) END,
+                CASE WHEN :last_healthy_at THEN coalesce(:at, datetime('now')) END,
+                CASE WHEN :last_error_at THEN coalesce(:at, datetime('now')) END,
+                CASE WHEN :increment_errors AND NOT :reset_errors THEN 1 ELSE 0 END
+            )
+            ON CONFLICT (user_id, check_name) DO UPDATE SET
+                last_check_at = CASE WHEN :last_check_at THEN coalesce(:at, datetime('now')) ELSE last_check_at END,
+                last_alert_at = CASE WHEN :last_alert_at THEN coalesce(:at, datetime('now')) ELSE last_alert_at END,
+                last_healthy_at = CASE WHEN :last_healthy_at THEN coalesce(:at, datetime('now')) ELSE last_healthy_at END,
+                last_error_at = CASE WHEN :last_error_at THEN coalesce(:at, datetime('now')) ELSE last_error_at END,
+                consecutive_errors = CASE
+                    WHEN :reset_errors THEN 0
+                    WHEN :increment_errors THEN consecutive_errors + 1
+                    ELSE consecutive_errors
+                END
+            """,
+            [asdict(update) for update in updates],
+        )
+
+
 # ============================================================================
 # Reminder state functions (for shuffle-queue rotation)
 # ============================================================================
@@ -2189,6 +2570,31 @@ def is_monarch_transaction_synced(
     return cursor.fetchone() is not None
 
 
+def get_synced_monarch_transaction_ids(
+    conn: sqlite3.Connection,
+    user_id: str,
+    monarch_transaction_ids: list[str],
+) -> set[str]:
+    """Return which of the given Monarch transaction IDs have already been synced.
+
+    One query for the whole list (joined through json_each), instead of
+    one is_monarch_transaction_synced() probe per transaction.
+    """
+    if not monarch_transaction_ids:
+        return set()
+    # CROSS JOIN pins json_each as the outer loop so each value is an index
+    # lookup; otherwise SQLite may rescan the list for every table row.
+    cursor = conn.execute(
+        """
+        SELECT m.monarch_transaction_id FROM json_each(?) AS ids
+        CROSS JOIN monarch_synced_transactions AS m
+            ON m.user_id = ? AND m.monarch_transaction_id = ids.value
+        """,
+        (json.dumps(list(monarch_transaction_ids)), user_id),
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
 @dataclass
 class MonarchSyncedTransaction:
     """A previously synced Monarch transaction for reconciliation."""
@@ -2248,23 +2654,24 @@ def track_monarch_transactions_batch(
     Returns:
         Count of transactions inserted/updated
     """
-    count = 0
-    for txn in transactions:
-        cursor = conn.execute(
-            """
-            INSERT INTO monarch_synced_transactions (
-                user_id, monarch_transaction_id, tags_json, amount, merchant,
-                posted_account, txn_date, content_hash
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (user_id, monarch_transaction_id) DO UPDATE SET
-                tags_json = excluded.tags_json,
-                amount = excluded.amount,
-                merchant = excluded.merchant,
-                posted_account = excluded.posted_account,
-                txn_date = excluded.txn_date,
-                content_hash = excluded.content_hash
-            """,
+    if not transactions:
+        return 0
+    cursor = conn.executemany(
+        """
+        INSERT INTO monarch_synced_transactions (
+            user_id, monarch_transaction_id, tags_json, amount, merchant,
+            posted_account, txn_date, content_hash
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, monarch_transaction_id) DO UPDATE SET
+            tags_json = excluded.tags_json,
+            amount = excluded.amount,
+            merchant = excluded.merchant,
+            posted_account = excluded.posted_account,
+            txn_date = excluded.txn_date,
+            content_hash = excluded.content_hash
+        """,
+        [
             (
                 user_id,
                 txn["id"],
@@ -2274,10 +2681,11 @@ def track_monarch_transactions_batch(
                 txn.get("posted_account"),
                 txn.get("txn_date"),
                 txn.get("content_hash"),
-            ),
-        )
-        count += cursor.rowcount
-    return count
+            )
+            for txn in transactions
+        ],
+    )
+    return cursor.rowcount
 
 
 def is_content_hash_synced(
@@ -2304,22 +2712,68 @@ def is_content_hash_synced(
     return cursor.fetchone() is not None
 
 
-def get_active_monarch_synced_transactions(
+def get_synced_content_hashes(
     conn: sqlite3.Connection,
     user_id: str,
-) -> list[MonarchSyncedTransaction]:
-    """Get all synced transactions that haven't been recategorized.
+    content_hashes: list[str],
+) -> set[str]:
+    """Return which of the given content hashes exist in any tracking table.
 
-    Used for reconciliation to check if tags have changed in Monarch.
+    Bulk form of is_content_hash_synced(): one query for the whole list.
     """
+    if not content_hashes:
+        return set()
     cursor = conn.execute(
         """
-        SELECT id, monarch_transaction_id, tags_json, amount, merchant, posted_account, txn_date
-        FROM monarch_synced_transactions
-        WHERE user_id = ? AND recategorized_at IS NULL
+        SELECT m.content_hash FROM json_each(?) AS h
+        CROSS JOIN monarch_synced_transactions AS m
+            ON m.user_id = ? AND m.content_hash = h.value
+        UNION
+        SELECT c.content_hash FROM json_each(?) AS h
+        CROSS JOIN csv_imported_transactions AS c
+            ON c.user_id = ? AND c.content_hash = h.value
         """,
-        (user_id,),
+        (json.dumps(list(content_hashes)), user_id, json.dumps(list(content_hashes)), user_id),
     )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_active_monarch_synced_transactions(
+    conn: sqlite3.Connection,
+    user_id: str,
+    monarch_transaction_ids: list[str] | None = None,
+    since: str | None = None,
+) -> list[MonarchSyncedTransaction]:
+    """Get all synced transactions that haven't been recategorized.
+
+    Used for reconciliation to check if tags have changed in Monarch.
+    With monarch_transaction_ids, only those transactions are returned
+    (e.g. the ones in the current fetch window). With since (YYYY-MM-DD),
+    only transactions dated on or after it are returned.
+    """
+    if monarch_transaction_ids is None:
+        cursor = conn.execute(
+            """
+            SELECT id, monarch_transaction_id, tags_json, amount, merchant, posted_account, txn_date
+            FROM monarch_synced_transactions
+            WHERE user_id = ? AND recategorized_at IS NULL
+                AND (? IS NULL OR txn_date >= ?)
+            """,
+            (user_id, since, since),
+        )
+    else:
+        cursor = conn.execute(
+            """
+            SELECT m.id, m.monarch_transaction_id, m.tags_json, m.amount, m.merchant,
+                   m.posted_account, m.txn_date
+            FROM json_each(?) AS ids
+            CROSS JOIN monarch_synced_transactions AS m
+                ON m.user_id = ? AND m.monarch_transaction_id = ids.value
+            WHERE m.recategorized_at IS NULL
+                AND (? IS NULL OR m.txn_date >= ?)
+            """,
+            (json.dumps(list(monarch_transaction_ids)), user_id, since, since),
+        )
     return [
         MonarchSyncedTransaction(
             id=row["id"],
@@ -2334,6 +2788,28 @@ def get_active_monarch_synced_transactions(
     ]
 
 
+def get_monarch_sync_cursor(conn: sqlite3.Connection, user_id: str) -> dict | None:
+    """Get the user's Monarch sync cursor (see set_monarch_sync_cursor)."""
+    row = kv_get(conn, user_id, "accounting", "monarch_sync_cursor")
+    if row is None:
+        return None
+    try:
+        cursor = json.loads(row["value"])
+    except ValueError:
+        return None
+    return cursor if isinstance(cursor, dict) else None
+
+
+def set_monarch_sync_cursor(conn: sqlite3.Connection, user_id: str, cursor: dict) -> None:
+    """Persist the user's Monarch sync cursor.
+
+    The cursor records the date the last sync fetched through
+    (synced_through, YYYY-MM-DD) and when synced transactions outside the
+    incremental window were last reconciled (reconciled_at, ISO datetime).
+    """
+    kv_set(conn, user_id, "accounting", "monarch_sync_cursor", json.dumps(cursor))
+
+
 def mark_monarch_transaction_recategorized(
     conn: sqlite3.Connection,
     user_id: str,
@@ -2375,6 +2851,52 @@ def update_monarch_transaction_posted_account(
     return cursor.rowcount > 0
 
 
+def mark_monarch_transactions_recategorized_batch(
+    conn: sqlite3.Connection,
+    user_id: str,
+    monarch_transaction_ids: list[str],
+) -> int:
+    """Mark multiple synced transactions as recategorized. Returns count updated."""
+    if not monarch_transaction_ids:
+        return 0
+    cursor = conn.execute(
+        """
+        UPDATE monarch_synced_transactions
+        SET recategorized_at = datetime('now')
+        WHERE user_id = ? AND recategorized_at IS NULL
+            AND monarch_transaction_id IN (SELECT value FROM json_each(?))
+        """,
+        (user_id, json.dumps(list(monarch_transaction_ids))),
+    )
+    return cursor.rowcount
+
+
+def update_monarch_transactions_posted_account_batch(
+    conn: sqlite3.Connection,
+    user_id: str,
+    updates: list[dict],
+) -> int:
+    """Update posted_account for multiple synced transactions.
+
+    Args:
+        updates: List of dicts with keys: monarch_transaction_id, posted_account
+
+    Returns:
+        Count of transactions updated
+    """
+    if not updates:
+        return 0
+    cursor = conn.executemany(
+        """
+        UPDATE monarch_synced_transactions
+        SET posted_account = ?
+        WHERE user_id = ? AND monarch_transaction_id = ? AND recategorized_at IS NULL
+        """,
+        [(u["posted_account"], user_id, u["monarch_transaction_id"]) for u in updates],
+    )
+    return cursor.rowcount
+
+
 # ============================================================================
 # CSV import transaction deduplication functions
 # ============================================================================
@@ -2445,18 +2967,17 @@ def track_csv_transactions_batch(
     source_file: str | None = None,
 ) -> int:
     """Record multiple CSV transactions as imported. Returns count inserted."""
-    count = 0
-    for content_hash in hashes:
-        cursor = conn.execute(
-            """
-            INSERT INTO csv_imported_transactions (user_id, content_hash, source_file)
-            VALUES (?, ?, ?)
-            ON CONFLICT (user_id, content_hash) DO NOTHING
-            """,
-            (user_id, content_hash, source_file),
-        )
-        count += cursor.rowcount
-    return count
+    if not hashes:
+        return 0
+    cursor = conn.executemany(
+        """
+        INSERT INTO csv_imported_transactions (user_id, content_hash, source_file)
+        VALUES (?, ?, ?)
+        ON CONFLICT (user_id, content_hash) DO NOTHING
+        """,
+        [(user_id, content_hash, source_file) for content_hash in hashes],
+    )
+    return cursor.rowcount
 
 
 # ============================================================================
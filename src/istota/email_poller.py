@@ -3,53 +3,70 @@
 import hashlib
 import logging
 import re
+import threading
+import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime
+from pathlib import Path
 
 from . import db
 from .config import Config
 from .skills.email import (
+    Email,
     EmailConfig,
+    EmailEnvelope,
     delete_email,
-    download_attachments,
+    fetch_emails,
+    folder_uid_status,
     list_emails,
-    read_email,
+    list_new_envelopes,
+    open_mailbox,
+    wait_for_mail,
 )
 from .storage import ensure_user_directories_v2, upload_file_to_inbox_v2
 
 logger = logging.getLogger("istota.email_poller")
 
 
-def _match_thread(conn, email) -> db.SentEmail | None:
-    """Check if an inbound email is a reply to one of our sent emails.
+def _thread_ids(email) -> list[str]:
+    """Message-IDs an inbound email may be replying to, most direct first.
 
-    Checks In-Reply-To first (direct reply), then References (thread chain).
-    Returns the matching SentEmail or None.
+    In-Reply-To (when the envelope carries it) is the direct parent; the
+    References chain follows, last entry first.
     """
-    # In-Reply-To is typically a single Message-ID
-    in_reply_to = None
-    if hasattr(email, "message_id"):
-        # email object from read_email — check for In-Reply-To in references
-        pass
+    ids = []
+    in_reply_to = getattr(email, "in_reply_to", None)
+    if in_reply_to:
+        ids.extend(in_reply_to.split())
+    if email.references:
+        ids.extend(reversed(email.references.split()))
+    return list(dict.fromkeys(ids))
 
-    # For imap-tools Email objects, In-Reply-To isn't directly exposed.
-    # But References header contains the full thread chain including
-    # In-Reply-To. We parse both from the email's headers.
 
-    # Check references: split by whitespace to get individual Message-IDs
-    if email.references:
-        ref_ids = email.references.split()
-        if ref_ids:
-            # Check the last reference first (most likely the direct parent)
-            match = db.find_sent_email_by_message_id(conn, ref_ids[-1])
-            if match:
-                return match
-            # Fall back to checking all references
-            match = db.find_sent_email_by_references(conn, ref_ids)
-            if match:
-                return match
+def _resolve_thread(email, sent_by_id: dict[str, db.SentEmail]) -> db.SentEmail | None:
+    """Pick the sent email an inbound email replies to from a pre-fetched lookup.
+
+    The direct parent wins; otherwise the most recent sent email anywhere
+    in the chain.
+    """
+    ids = _thread_ids(email)
+    if not ids:
+        return None
+    if ids[0] in sent_by_id:
+        return sent_by_id[ids[0]]
+    matches = [sent_by_id[i] for i in ids if i in sent_by_id]
+    if not matches:
+        return None
+    return max(matches, key=lambda m: (m.sent_at or "", m.id))
 
-    return None
+
+def _match_thread(conn, email) -> db.SentEmail | None:
+    """Check if an inbound email is a reply to one of our sent emails.
+
+    Returns the matching SentEmail or None.
+    """
+    return _resolve_thread(email, db.find_sent_emails_by_message_ids(conn, _thread_ids(email)))
 
 
 def get_email_config(config: Config) -> EmailConfig:
@@ -89,137 +106,242 @@ def compute_thread_id(subject: str, participants: list[str]) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+# Messages examined per poll; a larger backlog drains over the following polls
+_POLL_BATCH = 50
+
+# Polls that may fail on one accepted message before it is marked processed
+# without a task, so it stops holding the watermark back
+_MAX_EMAIL_ATTEMPTS = 3
+
+# Seconds to stay in one IMAP IDLE before re-issuing it (servers drop IDLE after ~30 min)
+_IDLE_TIMEOUT = 20 * 60
+
+
 def poll_emails(config: Config) -> list[int]:
     """
     Poll for new emails, create tasks for known senders.
+
+    Everything happens in one IMAP session. Only messages at or above the
+    folder's persisted UIDNEXT watermark are listed, from headers and
+    flags alone, and routing (known sender, or a reply to a thread we
+    started) is decided from those headers. Only accepted messages are
+    downloaded, once, with attachments saved from the same fetch. If the
+    folder's UIDVALIDITY changes, the newest messages are listed instead
+    and processed_emails skips the ones already seen. A message that
+    fails is retried on later polls, up to _MAX_EMAIL_ATTEMPTS.
+
     Returns list of created task_ids.
     """
     if not config.email.enabled:
         return []
 
     email_config = get_email_config(config)
-    created_tasks = []
+    created_tasks: list[int] = []
 
-    # List recent emails
     try:
-        envelopes = list_emails(
-            folder=config.email.poll_folder,
-            limit=50,
-            config=email_config,
-        )
+        with open_mailbox(config.email.poll_folder, email_config) as mailbox:
+            with db.get_db(config.db_path) as conn:
+                created_tasks = _poll_mailbox(config, conn, mailbox)
     except Exception as e:
-        logger.error("Error listing emails: %s", e)
-        return []
+        logger.error("Error polling emails: %s", e)
 
-    with db.get_db(config.db_path) as conn:
-        for envelope in envelopes:
-            # Skip already processed
-            if db.is_email_processed(conn, envelope.id):
-                continue
-
-            # Skip bot's own emails
-            if config.email.bot_email:
-                if envelope.sender.lower() == config.email.bot_email.lower():
-                    db.mark_email_processed(
-                        conn,
-                        email_id=envelope.id,
-                        sender_email=envelope.sender,
-                        subject=envelope.subject,
-                    )
-                    continue
+    return created_tasks
 
-            # Find user by sender email
-            user_id = config.find_user_by_email(envelope.sender)
 
-            # For unknown senders, check if this is a reply to a thread we initiated
-            sent_email_match = None
-            if not user_id:
-                try:
-                    email = read_email(
-                        envelope.id,
-                        folder=config.email.poll_folder,
-                        config=email_config,
-                        envelope=envelope,
-                    )
-                    sent_email_match = _match_thread(conn, email)
-                except Exception as e:
-                    logger.error("Error reading email %s for thread matching: %s", envelope.id, e)
-
-                if sent_email_match:
-                    # Route to the user who initiated the thread
-                    user_id = sent_email_match.user_id
-                    logger.info(
-                        "Thread match: email from %s is a reply to sent email %s (user %s)",
-                        envelope.sender, sent_email_match.message_id, user_id,
-                    )
-                else:
-                    # Unknown sender, not a reply to our thread — discard
-                    db.mark_email_processed(
-                        conn,
-                        email_id=envelope.id,
-                        sender_email=envelope.sender,
-                        subject=envelope.subject,
-                    )
-                    continue
+def _poll_mailbox(config: Config, conn, mailbox) -> list[int]:
+    """Process new messages in an open mailbox session (see poll_emails)."""
+    folder = config.email.poll_folder
+    account = config.email.imap_user
+
+    uidvalidity, uid_next = folder_uid_status(mailbox, folder)
+    watermark = db.get_email_poll_watermark(conn, account, folder)
+    if watermark is not None and watermark[0] == uidvalidity:
+        if watermark[1] >= uid_next:
+            return []
+        envelopes = list_new_envelopes(mailbox, min_uid=watermark[1], limit=_POLL_BATCH)
+    else:
+        envelopes = list_new_envelopes(mailbox, limit=_POLL_BATCH)
+
+    # One query each for the processed subset and for every thread id
+    # the unknown senders could be replying to
+    processed = db.get_processed_email_ids(conn, [e.id for e in envelopes])
+    envelopes_to_route = [e for e in envelopes if e.id not in processed]
+    sent_by_id = db.find_sent_emails_by_message_ids(conn, [
+        message_id
+        for envelope in envelopes_to_route
+        if not config.find_user_by_email(envelope.sender)
+        for message_id in _thread_ids(envelope)
+    ])
+
+    markers: list[db.ProcessedEmailRecord] = []
+    accepted: dict[str, tuple[EmailEnvelope, str, db.SentEmail | None]] = {}
+    for envelope in envelopes_to_route:
+        route = _route_envelope(config, envelope, sent_by_id)
+        if route is None:
+            markers.append(db.ProcessedEmailRecord(
+                email_id=envelope.id,
+                sender_email=envelope.sender,
+                subject=envelope.subject,
+            ))
+        else:
+            accepted[envelope.id] = (envelope, *route)
 
-            # Read full email content (if not already read during thread matching)
-            if sent_email_match is None:
+    attachment_ids = {uid: uuid.uuid4().hex[:8] for uid in accepted}
+    created_tasks = []
+    fetched = set()
+    failed = set()
+    if accepted:
+        try:
+            for email, local_attachment_paths in fetch_emails(
+                mailbox,
+                list(accepted),
+                attachment_dir=lambda uid: config.temp_dir / f"attachments_{attachment_ids[uid]}",
+            ):
+                envelope, user_id, sent_email_match = accepted[email.id]
+                fetched.add(email.id)
                 try:
-                    email = read_email(
-                        envelope.id,
-                        folder=config.email.poll_folder,
-                        config=email_config,
-                        envelope=envelope,
+                    task_id, marker = _create_email_task(
+                        config, conn, envelope, email, user_id, sent_email_match,
+                        local_attachment_paths, attachment_ids[email.id],
                     )
                 except Exception as e:
-                    logger.error("Error reading email %s: %s", envelope.id, e)
+                    logger.error("Error creating task for email %s: %s", email.id, e)
+                    failed.add(email.id)
                     continue
+                created_tasks.append(task_id)
+                markers.append(marker)
+        except Exception as e:
+            logger.error("Error reading emails: %s", e)
+            # Messages are read in order; blame the one being read
+            unread = [uid for uid in accepted if uid not in fetched]
+            if unread:
+                failed.add(unread[0])
+        else:
+            # The server didn't return these
+            failed.update(uid for uid in accepted if uid not in fetched)
+
+    # A message that keeps failing is given up on after a few polls, so
+    # it can't hold the watermark back for the mail behind it
+    failures = db.get_email_poll_failures(conn, account, folder, uidvalidity)
+    for uid in failed:
+        failures[uid] = failures.get(uid, 0) + 1
+        if failures[uid] >= _MAX_EMAIL_ATTEMPTS:
+            envelope = accepted[uid][0]
+            logger.warning(
+                "Giving up on email %s '%s' from %s after %d failed attempts",
+                uid, envelope.subject, envelope.sender, failures[uid],
+            )
+            markers.append(db.ProcessedEmailRecord(
+                email_id=uid,
+                sender_email=envelope.sender,
+                subject=envelope.subject,
+            ))
+
+    db.mark_emails_processed(conn, markers)
+
+    # Advance past everything handled; a message that couldn't be read
+    # isn't marked processed and is listed again next poll
+    handled = {marker.email_id for marker in markers}
+    missed = [int(uid) for uid in accepted if uid not in handled]
+    if missed:
+        next_uid = min(missed)
+    elif len(envelopes) >= _POLL_BATCH:
+        next_uid = int(envelopes[-1].id) + 1
+    else:
+        next_uid = uid_next
+    db.set_email_poll_failures(conn, account, folder, uidvalidity, {
+        uid: count for uid, count in failures.items()
+        if uid not in handled and int(uid) >= next_uid
+    })
+    db.set_email_poll_watermark(conn, account, folder, uidvalidity, next_uid)
+
+    return created_tasks
 
-            # Download attachments directly to target directory
-            attachment_id = uuid.uuid4().hex[:8]
-            attachment_dir = config.temp_dir / f"attachments_{attachment_id}"
-            local_attachment_paths = download_attachments(
-                envelope.id,
-                target_dir=attachment_dir,
-                folder=config.email.poll_folder,
-                config=email_config,
+
+def _route_envelope(
+    config: Config,
+    envelope: EmailEnvelope,
+    sent_by_id: dict[str, db.SentEmail],
+) -> tuple[str, db.SentEmail | None] | None:
+    """
+    Decide from headers alone who an unprocessed email is for.
+
+    Returns (user_id, sent email it replies to or None), or None when the
+    email should be skipped and just marked processed.
+    """
+    # Skip bot's own emails
+    if config.email.bot_email:
+        if envelope.sender.lower() == config.email.bot_email.lower():
+            return None
+
+    # Find user by sender email
+    user_id = config.find_user_by_email(envelope.sender)
+    if user_id:
+        return user_id, None
+
+    # For unknown senders, check if this is a reply to a thread we initiated
+    sent_email_match = _resolve_thread(envelope, sent_by_id)
+    if sent_email_match:
+        # Route to the user who initiated the thread
+        logger.info(
+            "Thread match: email from %s is a reply to sent email %s (user %s)",
+            envelope.sender, sent_email_match.message_id, sent_email_match.user_id,
+        )
+        return sent_email_match.user_id, sent_email_match
+
+    # Unknown sender, not a reply to our thread — discard
+    return None
+
+
+def _create_email_task(
+    config: Config,
+    conn,
+    envelope: EmailEnvelope,
+    email: Email,
+    user_id: str,
+    sent_email_match: db.SentEmail | None,
+    local_attachment_paths: list[Path],
+    attachment_id: str,
+) -> tuple[int, db.ProcessedEmailRecord]:
+    """Upload an accepted email's attachments and create its task.
+
+    Returns the task id and the processed-email marker to record for it.
+    """
+    # Upload attachments to user's Nextcloud inbox
+    attachment_paths = []
+    if local_attachment_paths:
+        # Ensure user directories exist
+        ensure_user_directories_v2(config, user_id)
+
+        for local_path in local_attachment_paths:
+            # Add unique prefix to avoid filename collisions
+            remote_filename = f"{attachment_id}_{local_path.name}"
+            remote_path = upload_file_to_inbox_v2(
+                config,
+                user_id,
+                local_path,
+                remote_filename,
             )
+            if remote_path:
+                attachment_paths.append(remote_path)
+            else:
+                # Fall back to local path if upload fails
+                attachment_paths.append(str(local_path))
+
+    # Compute thread_id for conversation context
+    participants = [envelope.sender, config.email.bot_email]
+    thread_id = compute_thread_id(envelope.subject, participants)
+
+    # Build prompt from email
+    attachments_text = ""
+    if attachment_paths:
+        attachments_text = "\nAttachments (in Nextcloud):\n" + "\n".join(
+            f"  - {p}" for p in attachment_paths
+        )
 
-            # Upload attachments to user's Nextcloud inbox
-            attachment_paths = []
-            if local_attachment_paths:
-                # Ensure user directories exist
-                ensure_user_directories_v2(config, user_id)
-
-                for local_path in local_attachment_paths:
-                    # Add unique prefix to avoid filename collisions
-                    remote_filename = f"{attachment_id}_{local_path.name}"
-                    remote_path = upload_file_to_inbox_v2(
-                        config,
-                        user_id,
-                        local_path,
-                        remote_filename,
-                    )
-                    if remote_path:
-                        attachment_paths.append(remote_path)
-                    else:
-                        # Fall back to local path if upload fails
-                        attachment_paths.append(str(local_path))
-
-            # Compute thread_id for conversation context
-            participants = [envelope.sender, config.email.bot_email]
-            thread_id = compute_thread_id(envelope.subject, participants)
-
-            # Build prompt from email
-            attachments_text = ""
-            if attachment_paths:
-                attachments_text = "\nAttachments (in Nextcloud):\n" + "\n".join(
-                    f"  - {p}" for p in attachment_paths
-                )
-
-            # For emissary thread replies, include routing context in the prompt
-            if sent_email_match:
-                prompt = f"""Emissary email reply — an external contact has replied to an email you sent on behalf of this user.
+    # For emissary thread replies, include routing context in the prompt
+    if sent_email_match:
+        prompt = f"""Emissary email reply — an external contact has replied to an email you sent on behalf of this user.
 
 From: {email.sender}
 Subject: {email.subject}
@@ -230,52 +352,69 @@ Original thread initiated by you (sent to: {sent_email_match.to_addr})
 {email.body}
 
 Notify the user about this reply and summarize its content. If the conversation requires a response, draft one for the user's approval."""
-            else:
-                prompt = f"""Email from: {email.sender}
+    else:
+        prompt = f"""Email from: {email.sender}
 Subject: {email.subject}
 Date: {email.date}
 {attachments_text}
 
 {email.body}"""
 
-            # Determine output target — emissary replies go to Talk
-            output_target = None
-            conversation_token = thread_id
-            if sent_email_match:
-                output_target = "talk"
-                # Route to the Talk conversation where the original send was requested
-                if sent_email_match.conversation_token:
-                    conversation_token = sent_email_match.conversation_token
-
-            # Create task with attachment paths (already strings from Nextcloud upload)
-            attachment_strs = attachment_paths if attachment_paths else None
-            task_id = db.create_task(
-                conn,
-                prompt=prompt,
-                user_id=user_id,
-                source_type="email",
-                conversation_token=conversation_token,
-                attachments=attachment_strs,
-                output_target=output_target,
-            )
+    # Determine output target — emissary replies go to Talk
+    output_target = None
+    conversation_token = thread_id
+    if sent_email_match:
+        output_target = "talk"
+        # Route to the Talk conversation where the original send was requested
+        if sent_email_match.conversation_token:
+            conversation_token = sent_email_match.conversation_token
+
+    # Create task with attachment paths (already strings from Nextcloud upload)
+    attachment_strs = attachment_paths if attachment_paths else None
+    task_id = db.create_task(
+        conn,
+        prompt=prompt,
+        user_id=user_id,
+        source_type="email",
+        conversation_token=conversation_token,
+        attachments=attachment_strs,
+        output_target=output_target,
+    )
 
-            # Mark email as processed with task link
-            db.mark_email_processed(
-                conn,
-                email_id=envelope.id,
-                sender_email=envelope.sender,
-                subject=envelope.subject,
-                thread_id=thread_id,
-                message_id=email.message_id,
-                references=email.references,
-                user_id=user_id,
-                task_id=task_id,
-            )
+    # Processed marker with task link, written with the rest of the cycle's
+    marker = db.ProcessedEmailRecord(
+        email_id=envelope.id,
+        sender_email=envelope.sender,
+        subject=envelope.subject,
+        thread_id=thread_id,
+        message_id=email.message_id,
+        references=email.references,
+        user_id=user_id,
+        task_id=task_id,
+    )
 
-            created_tasks.append(task_id)
-            logger.info("Created task %d from email '%s' by %s", task_id, envelope.subject, envelope.sender)
+    logger.info("Created task %d from email '%s' by %s", task_id, envelope.subject, envelope.sender)
+    return task_id, marker
 
-    return created_tasks
+
+def watch_for_mail(config: Config, wakeup: threading.Event, stopped: Callable[[], bool]) -> None:
+    """
+    Hold an IMAP IDLE session on the poll folder and set wakeup when mail arrives.
+
+    Lets the scheduler poll as soon as the server reports a change instead
+    of waiting for email_poll_interval. Reconnects after errors; returns
+    once stopped() is true.
+    """
+    email_config = get_email_config(config)
+    while not stopped():
+        try:
+            with open_mailbox(config.email.poll_folder, email_config) as mailbox:
+                while not stopped():
+                    if wait_for_mail(mailbox, _IDLE_TIMEOUT):
+                        wakeup.set()
+        except Exception as e:
+            logger.warning("Email IDLE session ended: %s", e)
+            time.sleep(config.scheduler.email_poll_interval)
 
 
 def cleanup_old_emails(config: Config, days: int) -> int:
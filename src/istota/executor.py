@@ -467,6 +467,7 @@ def build_bwrap_cmd(
     user_temp_dir: Path,
     proxy_sock: Path | None = None,
     net_proxy_sock: Path | None = None,
+    net_proxy_token: str | None = None,
 ) -> list[str]:
     """Wrap a command in bubblewrap for per-user filesystem isolation.
 
@@ -662,8 +663,11 @@ def build_bwrap_cmd(
         from .network_proxy import BRIDGE_PORT
         bridge_path = str(user_temp_dir.resolve() / ".developer" / "net-bridge")
         sock_path = str(net_proxy_sock)
+        # On a shared per-user proxy the bridge tags each connection with
+        # this task's scope token.
+        token_arg = f" {net_proxy_token}" if net_proxy_token else ""
         shell_cmd = (
-            f"python3 {bridge_path} {sock_path} {BRIDGE_PORT} & "
+            f"python3 {bridge_path} {sock_path} {BRIDGE_PORT}{token_arg} & "
             f"sleep 0.2; "
             f"exec env "
             f"HTTPS_PROXY=http://127.0.0.1:{BRIDGE_PORT} "
@@ -2006,7 +2010,10 @@ def execute_task(
                     "    sys.exit(1)\n"
                     "s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)\n"
                     "s.connect(sock_path)\n"
-                    "s.sendall(json.dumps({'type': 'credential', 'name': sys.argv[1]}).encode() + b'\\n')\n"
+                    "req = {'type': 'credential', 'name': sys.argv[1]}\n"
+                    "if os.environ.get('ISTOTA_SKILL_PROXY_TOKEN'):\n"
+                    "    req['token'] = os.environ['ISTOTA_SKILL_PROXY_TOKEN']\n"
+                    "s.sendall(json.dumps(req).encode() + b'\\n')\n"
                     "d = b''\n"
                     "while b'\\n' not in d:\n"
                     "    c = s.recv(4096)\n"
@@ -2164,16 +2171,17 @@ def execute_task(
 
         # Credential isolation via skill proxy: strip secrets from Claude's env
         # and run skill CLIs through a Unix socket proxy that injects them.
+        # Inside the daemon, the proxies are long-lived per user (proxy_hub)
+        # and this task only registers a scope on them; otherwise a per-task
+        # proxy is started and torn down around the run.
+        from .proxy_hub import get_hub
+        _hub = get_hub()
         _proxy_ctx = None
         _proxy_sock = None
         if config.security.skill_proxy_enabled:
             from .skill_proxy import SkillProxy
             credential_env, env = _split_credential_env(env)
             if credential_env:
-                # Use /tmp for socket path to stay within AF_UNIX length limit (~104 chars).
-                # build_bwrap_cmd() bind-mounts this file into the sandbox.
-                _proxy_sock = Path(tempfile.gettempdir()) / f"istota-proxy-{task.id}.sock"
-                env["ISTOTA_SKILL_PROXY_SOCK"] = str(_proxy_sock)
                 # All CLI-capable skills get their credentials — skill selection
                 # controls which docs are loaded, not credential access.  The
                 # proxy validates skill names against _ALLOWED_SKILLS, and
@@ -2181,17 +2189,32 @@ def execute_task(
                 all_skill_names = list({s for ss in _CREDENTIAL_SKILL_MAP.values() for s in ss})
                 allowed_creds = _allowed_credentials_for_skills(all_skill_names)
                 skill_cred_map = _build_skill_credential_map(all_skill_names)
-                _proxy_ctx = SkillProxy(
-                    _proxy_sock, credential_env, env,
-                    timeout=config.security.skill_proxy_timeout,
-                    allowed_credentials=allowed_creds,
-                    skill_credential_map=skill_cred_map,
-                )
+                if _hub is not None:
+                    _proxy_ctx = _hub.skill_scope(
+                        task.id, task.user_id, credential_env, env,
+                        allowed_credentials=allowed_creds,
+                        skill_credential_map=skill_cred_map,
+                    )
+                    _proxy_sock = _proxy_ctx.socket_path
+                    env["ISTOTA_SKILL_PROXY_TOKEN"] = _proxy_ctx.token
+                else:
+                    # Use /tmp for socket path to stay within AF_UNIX length limit (~104 chars).
+                    # build_bwrap_cmd() bind-mounts this file into the sandbox.
+                    _proxy_sock = Path(tempfile.gettempdir()) / f"istota-proxy-{task.id}.sock"
+                    _proxy_ctx = SkillProxy(
+                        _proxy_sock, credential_env, env,
+                        timeout=config.security.skill_proxy_timeout,
+                        allowed_credentials=allowed_creds,
+                        skill_credential_map=skill_cred_map,
+                        warm=config.security.skill_proxy_warm,
+                    )
+                env["ISTOTA_SKILL_PROXY_SOCK"] = str(_proxy_sock)
 
         # Network isolation via CONNECT proxy: outbound traffic restricted
         # to an allowlist of host:port pairs via --unshare-net + proxy.
         _net_proxy_ctx = None
         _net_proxy_sock = None
+        _net_proxy_token = None
         if config.security.network.enabled and config.security.sandbox_enabled:
             from .network_proxy import NetworkProxy, write_bridge_script
 
@@ -2202,10 +2225,15 @@ def execute_task(
             dev_dir.mkdir(parents=True, exist_ok=True)
             write_bridge_script(dev_dir / "net-bridge")
 
-            _net_proxy_sock = Path(tempfile.gettempdir()) / f"istota-net-{task.id}.sock"
-            _net_proxy_ctx = NetworkProxy(
-                _net_proxy_sock, allowed_hosts,
-            )
+            if _hub is not None:
+                _net_proxy_ctx = _hub.network_scope(task.id, task.user_id, allowed_hosts)
+                _net_proxy_sock = _net_proxy_ctx.socket_path
+                _net_proxy_token = _net_proxy_ctx.token
+            else:
+                _net_proxy_sock = Path(tempfile.gettempdir()) / f"istota-net-{task.id}.sock"
+                _net_proxy_ctx = NetworkProxy(
+                    _net_proxy_sock, allowed_hosts,
+                )
 
         def _build_and_run():
             nonlocal cmd
@@ -2215,6 +2243,7 @@ def execute_task(
                     cmd, config, task, is_admin, user_resources,
                     Path(user_temp_dir), proxy_sock=_proxy_sock,
                     net_proxy_sock=_net_proxy_sock,
+                    net_proxy_token=_net_proxy_token,
                 )
             if use_streaming:
                 return _execute_streaming(cmd, env, config, task, on_progress, result_file, prompt)
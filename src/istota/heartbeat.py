@@ -1,12 +1,17 @@
 """Heartbeat monitoring system for periodic health checks."""
 
+import heapq
 import logging
 import os
 import re
 import shutil
 import subprocess
-from dataclasses import dataclass, field
-from datetime import datetime
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
@@ -228,7 +233,9 @@ def _check_file_watch(check: HeartbeatCheck, config: "Config") -> CheckResult:
     return CheckResult(healthy=True, message=f"File OK: {file_path}")
 
 
-def _check_shell_command(check: HeartbeatCheck, config: "Config") -> CheckResult:
+def _check_shell_command(
+    check: HeartbeatCheck, config: "Config", timeout: float | None = None,
+) -> CheckResult:
     """
     Run a shell command and evaluate the condition.
 
@@ -237,11 +244,13 @@ def _check_shell_command(check: HeartbeatCheck, config: "Config") -> CheckResult
         condition: Simple comparison (< N, > N, == N, contains:X, not-contains:X)
         message: Alert message template with {value} placeholder
         timeout: Command timeout in seconds (default: 30)
+
+    timeout, if given, caps the configured one (the runner's check budget).
     """
     command = check.config.get("command", "")
     condition = check.config.get("condition", "")
     message_template = check.config.get("message", "Check failed: {value}")
-    timeout = check.config.get("timeout", 30)
+    timeout = _capped(check.config.get("timeout", 30), timeout)
 
     if not command:
         return CheckResult(healthy=False, message="No command configured")
@@ -311,7 +320,9 @@ def _check_shell_command(check: HeartbeatCheck, config: "Config") -> CheckResult
     )
 
 
-def _check_url_health(check: HeartbeatCheck, config: "Config") -> CheckResult:
+def _check_url_health(
+    check: HeartbeatCheck, config: "Config", timeout: float | None = None,
+) -> CheckResult:
     """
     HTTP health check.
 
@@ -319,10 +330,12 @@ def _check_url_health(check: HeartbeatCheck, config: "Config") -> CheckResult:
         url: URL to check
         expected_status: Expected HTTP status code (default: 200)
         timeout: Request timeout in seconds (default: 10)
+
+    timeout, if given, caps the configured one (the runner's check budget).
     """
     url = check.config.get("url", "")
     expected_status = check.config.get("expected_status", 200)
-    timeout = check.config.get("timeout", 10)
+    timeout = _capped(check.config.get("timeout", 10), timeout)
 
     if not url:
         return CheckResult(healthy=False, message="No URL configured")
@@ -355,12 +368,56 @@ def _check_url_health(check: HeartbeatCheck, config: "Config") -> CheckResult:
         )
 
 
-def _check_calendar_conflicts(check: HeartbeatCheck, config: "Config", user_id: str) -> CheckResult:
+# Shared across checks and users so frequent heartbeat intervals reuse
+# events the CalDAV server reports as unchanged
+_calendar_cache = None
+
+
+def _get_calendar_cache():
+    global _calendar_cache
+    if _calendar_cache is None:
+        from .skills.calendar import EventCache
+        _calendar_cache = EventCache()
+    return _calendar_cache
+
+
+def _find_overlaps(events: list) -> list[tuple]:
+    """
+    Find pairs of overlapping events with a sweep over start times.
+
+    Events are sorted by start once; a min-heap keyed on end time holds the
+    events still in progress, so each event is only compared with those it
+    actually overlaps. O(n log n + k) for k conflicts.
+
+    Returns (earlier, later) pairs in start order.
+    """
+    ordered = sorted(events, key=lambda e: (e.start, e.end))
+    active: list[tuple] = []  # (end, index, event)
+    overlaps = []
+    for index, event in enumerate(ordered):
+        while active and active[0][0] <= event.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            # The same occurrence listed in two calendars isn't a conflict
+            if other.uid and other.uid == event.uid and other.start == event.start:
+                continue
+            overlaps.append((other, event))
+        heapq.heappush(active, (event.end, index, event))
+    return overlaps
+
+
+def _check_calendar_conflicts(
+    check: HeartbeatCheck, config: "Config", user_id: str, timeout: float | None = None,
+) -> CheckResult:
     """
     Find overlapping calendar events.
 
+    All-day events are ignored, since they overlap everything on their day.
+
     Config fields:
         lookahead_hours: Hours to look ahead (default: 24)
+
+    timeout, if given, bounds each CalDAV request.
     """
     lookahead_hours = check.config.get("lookahead_hours", 24)
 
@@ -368,68 +425,41 @@ def _check_calendar_conflicts(check: HeartbeatCheck, config: "Config", user_id:
         return CheckResult(healthy=False, message="CalDAV not configured")
 
     try:
-        from .skills.calendar import list_calendars, list_events
+        from .skills.calendar import get_caldav_client
 
-        # Get user's calendars
-        calendars = list_calendars(
-            caldav_url=config.caldav_url,
-            username=config.caldav_username,
-            password=config.caldav_password,
-            user_id=user_id,
+        cache = _get_calendar_cache()
+        client = get_caldav_client(
+            config.caldav_url, config.caldav_username, config.caldav_password,
+            timeout=timeout,
         )
 
+        # Get user's calendars
+        calendars = cache.calendars_for_user(client, user_id)
         if not calendars:
             return CheckResult(healthy=True, message="No calendars found")
 
-        # Collect all events
         now = datetime.now()
-        end_time = datetime.now().replace(
-            hour=23, minute=59, second=59
-        )
-        # Extend to lookahead hours
-        from datetime import timedelta
         end_time = now + timedelta(hours=lookahead_hours)
 
         all_events = []
-        for cal in calendars:
+        for cal_name, cal_url, _writable in calendars:
             try:
-                events = list_events(
-                    caldav_url=config.caldav_url,
-                    username=config.caldav_username,
-                    password=config.caldav_password,
-                    calendar_path=cal["path"],
-                    start_date=now.strftime("%Y-%m-%d"),
-                    end_date=end_time.strftime("%Y-%m-%d"),
-                )
-                for event in events:
-                    if event.get("start") and event.get("end"):
-                        all_events.append(event)
+                events = cache.get_events(client, cal_url, now, end_time)
+                all_events.extend(e for e in events if not e.all_day)
             except Exception as e:
-                logger.debug("Error listing events from %s: %s", cal.get("name"), e)
+                logger.debug("Error listing events from %s: %s", cal_name, e)
 
         if not all_events:
             return CheckResult(healthy=True, message="No upcoming events")
 
-        # Check for overlaps
-        conflicts = []
-        for i, event1 in enumerate(all_events):
-            for event2 in all_events[i + 1:]:
-                # Parse times (simplified - assumes ISO format)
-                try:
-                    start1 = datetime.fromisoformat(event1["start"].replace("Z", "+00:00"))
-                    end1 = datetime.fromisoformat(event1["end"].replace("Z", "+00:00"))
-                    start2 = datetime.fromisoformat(event2["start"].replace("Z", "+00:00"))
-                    end2 = datetime.fromisoformat(event2["end"].replace("Z", "+00:00"))
-
-                    # Check overlap
-                    if start1 < end2 and start2 < end1:
-                        conflicts.append({
-                            "event1": event1.get("summary", "Untitled"),
-                            "event2": event2.get("summary", "Untitled"),
-                            "time": event1["start"],
-                        })
-                except (ValueError, TypeError):
-                    continue
+        conflicts = [
+            {
+                "event1": first.summary or "Untitled",
+                "event2": second.summary or "Untitled",
+                "time": first.start.isoformat(),
+            }
+            for first, second in _find_overlaps(all_events)
+        ]
 
         if conflicts:
             conflict_desc = ", ".join(
@@ -523,13 +553,18 @@ def _check_task_deadline(check: HeartbeatCheck, config: "Config", user_id: str)
     return CheckResult(healthy=True, message="No overdue or upcoming deadlines")
 
 
-def _check_self(check: HeartbeatCheck, config: "Config", user_id: str) -> CheckResult:
+def _check_self(
+    check: HeartbeatCheck, config: "Config", user_id: str, timeout: float | None = None,
+) -> CheckResult:
     """
     Run system health diagnostics (mirrors !check command).
 
     Config fields:
         execution_test: Whether to run Claude CLI invocation test (default: True)
+
+    timeout, if given, caps the 30s execution test.
     """
+    exec_timeout = _capped(30, timeout)
     from .executor import build_bwrap_cmd, build_clean_env
 
     failures = []
@@ -602,12 +637,12 @@ def _check_self(check: HeartbeatCheck, config: "Config", user_id: str) -> CheckR
                 cmd = build_bwrap_cmd(cmd, config, fake_task, is_admin, user_resources, user_temp)
 
             result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=30, env=env,
+                cmd, capture_output=True, text=True, timeout=exec_timeout, env=env,
             )
             if "healthcheck-ok" not in result.stdout:
                 failures.append("Claude execution test: 'healthcheck-ok' not in output")
         except subprocess.TimeoutExpired:
-            failures.append("Claude execution test timed out (30s)")
+            failures.append(f"Claude execution test timed out ({exec_timeout:g}s)")
         except Exception as e:
             failures.append(f"Claude execution test error: {e}")
 
@@ -621,6 +656,11 @@ def _check_self(check: HeartbeatCheck, config: "Config", user_id: str) -> CheckR
     return CheckResult(healthy=True, message="All self-checks passed")
 
 
+def _capped(configured: float, budget: float | None) -> float:
+    """A check's own timeout, no longer than the runner's budget if one is set."""
+    return configured if budget is None else min(configured, budget)
+
+
 # Handler dispatch table
 _CHECK_HANDLERS = {
     "file-watch": _check_file_watch,
@@ -632,12 +672,21 @@ _CHECK_HANDLERS = {
 }
 
 
+# Handlers that do network or subprocess I/O and accept a timeout budget
+_TIMEOUT_AWARE = {"shell-command", "url-health", "calendar-conflicts", "self-check"}
+
+
 def run_check(
     check: HeartbeatCheck,
     config: "Config",
     user_id: str,
+    timeout: float | None = None,
 ) -> CheckResult:
-    """Run a single heartbeat check."""
+    """Run a single heartbeat check.
+
+    timeout, if given, is passed down as the limit for the check's own
+    HTTP, subprocess and CalDAV calls.
+    """
     handler = _CHECK_HANDLERS.get(check.type)
     if not handler:
         return CheckResult(
@@ -645,12 +694,13 @@ def run_check(
             message=f"Unknown check type: {check.type}",
         )
 
+    kwargs = {"timeout": timeout} if timeout is not None and check.type in _TIMEOUT_AWARE else {}
     try:
         # Some handlers need user_id (calendar, task-deadline, self-check)
         if check.type in ("calendar-conflicts", "task-deadline", "self-check"):
-            return handler(check, config, user_id)
+            return handler(check, config, user_id, **kwargs)
         else:
-            return handler(check, config)
+            return handler(check, config, **kwargs)
     except Exception as e:
         logger.exception("Error running check %s for user %s", check.name, user_id)
         return CheckResult(
@@ -675,6 +725,21 @@ def should_alert(
     - Within cooldown period
     - Within quiet hours
     """
+    if result.healthy:
+        return False
+    state = db.get_heartbeat_state(conn, user_id, check.name)
+    return _alert_due(state, user_id, check, result, settings, user_tz)
+
+
+def _alert_due(
+    state: "db.HeartbeatState | None",
+    user_id: str,
+    check: HeartbeatCheck,
+    result: CheckResult,
+    settings: HeartbeatSettings,
+    user_tz: str,
+) -> bool:
+    """should_alert against already-loaded state."""
     if result.healthy:
         return False
 
@@ -684,7 +749,6 @@ def should_alert(
         return False
 
     # Check cooldown
-    state = db.get_heartbeat_state(conn, user_id, check.name)
     if state and state.last_alert_at:
         try:
             last_alert = datetime.fromisoformat(state.last_alert_at)
@@ -727,13 +791,61 @@ def send_heartbeat_alert(
     )
 
 
+def _is_due(state: "db.HeartbeatState | None", check: HeartbeatCheck) -> bool:
+    """Whether the check's per-check interval has elapsed since its last run."""
+    if check.interval_minutes is None:
+        return True
+    if state and state.last_check_at:
+        try:
+            last_check = datetime.fromisoformat(state.last_check_at)
+            elapsed = (datetime.now(ZoneInfo("UTC")).replace(tzinfo=None) - last_check).total_seconds()
+            if elapsed < check.interval_minutes * 60:
+                return False
+        except (ValueError, TypeError):
+            pass
+    return True
+
+
+def _transition(
+    config: "Config",
+    user_id: str,
+    check: HeartbeatCheck,
+    check_result: CheckResult,
+    settings: HeartbeatSettings,
+    user_tz: str,
+    state: "db.HeartbeatState | None",
+) -> db.HeartbeatUpdate:
+    """Alert on a check's result if needed and return its state transition."""
+    update = db.HeartbeatUpdate(
+        user_id, check.name, last_check_at=True,
+        at=datetime.now(ZoneInfo("UTC")).strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+    if check_result.healthy:
+        update.last_healthy_at = True
+        update.reset_errors = True
+    elif _alert_due(state, user_id, check, check_result, settings, user_tz):
+        if send_heartbeat_alert(config, user_id, check, check_result, settings):
+            update.last_alert_at = True
+        else:
+            update.last_error_at = True
+            update.increment_errors = True
+
+    return update
+
+
 def check_heartbeats(conn, config: "Config") -> list[str]:
     """
-    Check all heartbeats for all users.
+    Check all heartbeats for all users, one check after another.
 
+    State is read in one query up front and every check's transition is
+    written in one transaction at the end. Used by single-pass mode; the
+    daemon uses HeartbeatRunner instead.
     Returns list of user IDs that were checked.
     """
     checked_users = []
+    states = db.get_heartbeat_states(conn)
+    updates = []
 
     for user_id, user_config in config.users.items():
         result = load_heartbeat_config(config, user_id)
@@ -745,47 +857,249 @@ def check_heartbeats(conn, config: "Config") -> list[str]:
         user_tz = user_config.timezone
 
         for check in checks:
+            state = states.get((user_id, check.name))
             # Skip if per-check interval hasn't elapsed
-            if check.interval_minutes is not None:
-                state = db.get_heartbeat_state(conn, user_id, check.name)
-                if state and state.last_check_at:
-                    try:
-                        last_check = datetime.fromisoformat(state.last_check_at)
-                        elapsed = (datetime.now(ZoneInfo("UTC")).replace(tzinfo=None) - last_check).total_seconds()
-                        if elapsed < check.interval_minutes * 60:
-                            continue
-                    except (ValueError, TypeError):
-                        pass
-
-            # Run the check
-            check_result = run_check(check, config, user_id)
+            if not _is_due(state, check):
+                continue
 
-            # Update state
-            db.update_heartbeat_state(
-                conn, user_id, check.name,
-                last_check_at=True,
+            check_result = run_check(check, config, user_id)
+            updates.append(
+                _transition(config, user_id, check, check_result, settings, user_tz, state),
             )
 
-            if check_result.healthy:
-                db.update_heartbeat_state(
-                    conn, user_id, check.name,
-                    last_healthy_at=True,
-                    reset_errors=True,
+    db.apply_heartbeat_updates(conn, updates)
+    return checked_users
+
+
+def _run_check_with_timeout(
+    check: HeartbeatCheck,
+    config: "Config",
+    user_id: str,
+    timeout: float,
+    on_abandon: Callable[[], None] | None = None,
+    on_late_exit: Callable[[], None] | None = None,
+) -> CheckResult | None:
+    """Run a check on its own thread, giving up on it after timeout seconds.
+
+    The timeout is also passed to the check's own I/O calls, so a check
+    normally ends near the deadline. Returns None if it is still running
+    then; its thread is a daemon and is left to finish on its own.
+    on_abandon is called when giving up, and on_late_exit when that
+    thread finally exits, always in that order.
+    """
+    outcome: list[CheckResult] = []
+    lock = threading.Lock()
+    abandoned = False
+
+    def target() -> None:
+        try:
+            outcome.append(run_check(check, config, user_id, timeout=timeout))
+        finally:
+            with lock:
+                late = abandoned
+            if late and on_late_exit:
+                on_late_exit()
+
+    thread = threading.Thread(
+        target=target, daemon=True, name=f"heartbeat-{user_id}-{check.name}",
+    )
+    thread.start()
+    thread.join(timeout)
+    with lock:
+        if outcome:
+            return outcome[0]
+        abandoned = True
+        if on_abandon:
+            on_abandon()
+    return None
+
+
+@dataclass
+class CheckStats:
+    """Timing and backlog for one (user, check) pair in a HeartbeatRunner."""
+    runs: int = 0
+    timeouts: int = 0
+    last_duration: float | None = None  # seconds the last run took
+    max_duration: float = 0.0
+    last_wait: float | None = None  # seconds the last run waited for a worker
+    skipped: int = 0  # times the check came due while still queued or running
+    queued_at: float | None = None  # monotonic time of the pending submission
+    started_at: float | None = None  # monotonic start of the current run
+
+
+class HeartbeatRunner:
+    """
+    Runs due heartbeat checks in a bounded worker pool.
+
+    The scheduler loop calls schedule(), which submits each due check that
+    isn't already queued or running and returns without waiting. A (user,
+    check) pair runs at most once at a time, so its state updates and alerts
+    stay in order. Each run is bounded by check_timeout seconds; a check
+    still running at the deadline is reported as timed out and not started
+    again until its abandoned thread exits.
+
+    Workers don't touch the database. Their state transitions are queued
+    and written by the next schedule() (or flush()) in one transaction,
+    right before all state is read back in one query, so a cycle costs one
+    write transaction however many checks ran. A check whose transition is
+    still queued isn't resubmitted, since its state snapshot would be stale.
+    """
+
+    def __init__(
+        self,
+        config: "Config",
+        max_workers: int | None = None,
+        check_timeout: float | None = None,
+    ):
+        self.config = config
+        self.max_workers = max_workers or config.scheduler.heartbeat_max_workers
+        self.check_timeout = check_timeout or config.scheduler.heartbeat_check_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="heartbeat",
+        )
+        self._lock = threading.Lock()
+        self._in_flight: set[tuple[str, str]] = set()
+        self._unflushed: set[tuple[str, str]] = set()  # finished, update not yet written
+        self._abandoned: set[tuple[str, str]] = set()  # timed out, thread still running
+        self._stats: dict[tuple[str, str], CheckStats] = {}
+        self._pending: list[db.HeartbeatUpdate] = []
+
+    def schedule(self, conn) -> list[str]:
+        """Submit every due check that isn't already in flight.
+
+        Returns list of user IDs with heartbeat checks.
+        """
+        checked_users = []
+        still_running = []
+        self.flush(conn)
+        states = db.get_heartbeat_states(conn)
+
+        for user_id, user_config in self.config.users.items():
+            result = load_heartbeat_config(self.config, user_id)
+            if not result:
+                continue
+
+            settings, checks = result
+            checked_users.append(user_id)
+
+            for check in checks:
+                key = (user_id, check.name)
+                with self._lock:
+                    stats = self._stats.setdefault(key, CheckStats())
+                    if key in self._unflushed:
+                        # Finished since the flush; evaluate next cycle on fresh state
+                        continue
+                    if key in self._in_flight or key in self._abandoned:
+                        stats.skipped += 1
+                        still_running.append(f"{user_id}/{check.name}")
+                        continue
+                state = states.get(key)
+                if not _is_due(state, check):
+                    continue
+                with self._lock:
+                    self._in_flight.add(key)
+                    stats.queued_at = time.monotonic()
+                self._executor.submit(
+                    self._execute, key, check, settings, user_config.timezone, state,
                 )
+
+        if still_running:
+            logger.info(
+                "Heartbeat backlog: %d check(s) still queued or running (%s)",
+                len(still_running), ", ".join(still_running),
+            )
+        return checked_users
+
+    def _execute(
+        self,
+        key: tuple[str, str],
+        check: HeartbeatCheck,
+        settings: HeartbeatSettings,
+        user_tz: str,
+        state: "db.HeartbeatState | None",
+    ) -> None:
+        user_id = key[0]
+        started = time.monotonic()
+        with self._lock:
+            stats = self._stats[key]
+            stats.started_at = started
+            stats.last_wait = started - (stats.queued_at or started)
+
+        timed_out = False
+        try:
+            check_result = _run_check_with_timeout(
+                check, self.config, user_id, self.check_timeout,
+                on_abandon=lambda: self._mark_abandoned(key, True),
+                on_late_exit=lambda: self._mark_abandoned(key, False),
+            )
+            if check_result is None:
+                timed_out = True
+                logger.warning(
+                    "Heartbeat check %s for %s still running after %ds, giving up",
+                    check.name, user_id, self.check_timeout,
+                )
+                check_result = CheckResult(
+                    healthy=False,
+                    message=f"Check timed out after {self.check_timeout:.0f}s",
+                )
+            update = _transition(
+                self.config, user_id, check, check_result, settings, user_tz, state,
+            )
+            with self._lock:
+                self._pending.append(update)
+                self._unflushed.add(key)
+        except Exception:
+            logger.exception("Error recording heartbeat check %s for user %s", check.name, user_id)
+        finally:
+            duration = time.monotonic() - started
+            with self._lock:
+                stats.runs += 1
+                stats.timeouts += int(timed_out)
+                stats.last_duration = duration
+                stats.max_duration = max(stats.max_duration, duration)
+                stats.queued_at = None
+                stats.started_at = None
+                self._in_flight.discard(key)
+            logger.debug(
+                "Heartbeat check %s for %s took %.2fs (waited %.2fs)",
+                check.name, user_id, duration, stats.last_wait,
+            )
+
+    def _mark_abandoned(self, key: tuple[str, str], abandoned: bool) -> None:
+        with self._lock:
+            if abandoned:
+                self._abandoned.add(key)
             else:
-                # Check if we should alert
-                if should_alert(conn, user_id, check, check_result, settings, user_tz):
-                    sent = send_heartbeat_alert(config, user_id, check, check_result, settings)
-                    if sent:
-                        db.update_heartbeat_state(
-                            conn, user_id, check.name,
-                            last_alert_at=True,
-                        )
-                    else:
-                        db.update_heartbeat_state(
-                            conn, user_id, check.name,
-                            last_error_at=True,
-                            increment_errors=True,
-                        )
+                self._abandoned.discard(key)
 
-    return checked_users
+    def flush(self, conn) -> int:
+        """Write queued state transitions in one transaction. Returns the count."""
+        with self._lock:
+            updates, self._pending = self._pending, []
+        try:
+            db.apply_heartbeat_updates(conn, updates)
+        except Exception:
+            # Keep them, ahead of anything queued since, for the next flush
+            with self._lock:
+                self._pending[:0] = updates
+            raise
+        with self._lock:
+            self._unflushed.difference_update((u.user_id, u.check_name) for u in updates)
+        return len(updates)
+
+    def backlog(self) -> int:
+        """Number of checks queued or running (abandoned runs included)."""
+        with self._lock:
+            return len(self._in_flight | self._abandoned)
+
+    def stats(self) -> dict[tuple[str, str], CheckStats]:
+        """Snapshot of per-(user, check) timing and backlog."""
+        with self._lock:
+            return {key: replace(stats) for key, stats in self._stats.items()}
+
+    def shutdown(self) -> None:
+        """Stop accepting checks; queued ones are dropped, running ones finish.
+
+        Call flush() afterwards to persist transitions from finished checks.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
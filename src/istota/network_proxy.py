@@ -4,11 +4,26 @@ Runs in the host network namespace, listens on a Unix socket.
 Inside the bwrap sandbox (--unshare-net), a TCP-to-Unix bridge
 forwards connections from 127.0.0.1:PORT to this socket.
 Only HTTPS CONNECT requests to allowlisted host:port pairs are tunneled.
+
+A proxy shared by several tasks keeps one allowlist per task. The bridge
+then opens every Unix connection with an ``ISTOTA-SCOPE <token>`` line so
+the proxy can pick the right allowlist.
+
+All connections of a proxy are served by one selector loop thread. Tunnel
+bytes are moved with ``os.splice`` through a kernel pipe where available
+(Linux), so they never get copied into Python; otherwise through a reused
+buffer. Upstream DNS lookups run in a small resolver pool and are cached.
 """
 
+import errno
 import logging
+import os
+import selectors
 import socket
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger("istota.network_proxy")
@@ -20,36 +35,117 @@ BRIDGE_PORT = 18080
 # Bridge script written to .developer/net-bridge inside the sandbox.
 # Listens on 127.0.0.1:PORT, forwards each TCP connection to the proxy
 # Unix socket.  Runs as a background process started by the shell wrapper.
+# Single-threaded selector loop; must stay self-contained (runs under the
+# sandbox's system python3, without istota importable).
 BRIDGE_SCRIPT = """\
 #!/usr/bin/env python3
-import socket, sys, threading
+import selectors, socket, sys
 
-def bridge(tcp_conn, unix_path):
-    unix_conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-    unix_conn.connect(unix_path)
-    def forward(src, dst):
-        try:
-            while True:
-                data = src.recv(65536)
-                if not data: break
-                dst.sendall(data)
-        except OSError: pass
-        finally:
-            try: dst.shutdown(socket.SHUT_WR)
+sock_path, port = sys.argv[1], int(sys.argv[2])
+token = sys.argv[3] if len(sys.argv) > 3 else ""
+sel = selectors.DefaultSelector()
+
+
+class Pair:
+    def __init__(self, tcp_conn, unix_conn):
+        self.socks = (tcp_conn, unix_conn)
+        # [src, dst, pending bytes, eof] per direction
+        self.dirs = [[tcp_conn, unix_conn, b"", False], [unix_conn, tcp_conn, b"", False]]
+        self.events = {}
+
+    def close(self):
+        for s in self.socks:
+            if self.events.pop(s, 0):
+                sel.unregister(s)
+            s.close()
+
+    def update(self):
+        for s in self.socks:
+            ev = 0
+            for src, dst, buf, eof in self.dirs:
+                if src is s and not buf and not eof:
+                    ev |= selectors.EVENT_READ
+                if dst is s and buf:
+                    ev |= selectors.EVENT_WRITE
+            old = self.events.get(s, 0)
+            if ev and not old:
+                sel.register(s, ev, self)
+            elif ev and ev != old:
+                sel.modify(s, ev, self)
+            elif not ev and old:
+                sel.unregister(s)
+            self.events[s] = ev
+
+    def flush(self, d):
+        if d[2]:
+            n = d[1].send(d[2])
+            d[2] = d[2][n:]
+        if not d[2] and d[3]:
+            try: d[1].shutdown(socket.SHUT_WR)
             except OSError: pass
-    threading.Thread(target=forward, args=(tcp_conn, unix_conn), daemon=True).start()
-    forward(unix_conn, tcp_conn)
 
-sock_path, port = sys.argv[1], int(sys.argv[2])
+    def handle(self, s, mask):
+        try:
+            for d in self.dirs:
+                if mask & selectors.EVENT_READ and d[0] is s and not d[2] and not d[3]:
+                    try:
+                        data = s.recv(65536)
+                    except BlockingIOError:
+                        data = None
+                    if data == b"":
+                        d[3] = True
+                    elif data:
+                        d[2] = data
+                    self.flush(d)
+                if mask & selectors.EVENT_WRITE and d[1] is s:
+                    self.flush(d)
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.close()
+            return
+        if all(d[3] and not d[2] for d in self.dirs):
+            self.close()
+        else:
+            self.update()
+
+
 srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 srv.bind(("127.0.0.1", port))
 srv.listen(32)
+sel.register(srv, selectors.EVENT_READ, None)
 while True:
-    conn, _ = srv.accept()
-    threading.Thread(target=bridge, args=(conn, sock_path), daemon=True).start()
+    for key, mask in sel.select():
+        if key.data is not None:
+            key.data.handle(key.fileobj, mask)
+            continue
+        conn, _ = srv.accept()
+        unix_conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            unix_conn.connect(sock_path)
+            if token:
+                unix_conn.sendall(b"ISTOTA-SCOPE " + token.encode() + b"\\r\\n")
+        except OSError:
+            conn.close()
+            unix_conn.close()
+            continue
+        conn.setblocking(False)
+        unix_conn.setblocking(False)
+        Pair(conn, unix_conn).update()
 """
 
+# First line a bridge sends on a shared proxy, before the CONNECT request.
+_SCOPE_PREFIX = b"ISTOTA-SCOPE "
+
+_RELAY_CHUNK = 65536
+_MAX_HEADER_BYTES = 16384
+_HEADER_TIMEOUT = 30
+_CONNECT_TIMEOUT = 10
+_DNS_TTL = 300
+
+_SPLICE_FLAGS = getattr(os, "SPLICE_F_MOVE", 0) | getattr(os, "SPLICE_F_NONBLOCK", 0)
+
 
 def _enable_tcp_keepalive(sock: socket.socket) -> None:
     """Enable TCP keepalive on a socket to detect dead connections."""
@@ -65,11 +161,130 @@ def _enable_tcp_keepalive(sock: socket.socket) -> None:
 
 
 def write_bridge_script(path: Path) -> None:
-    """Write the TCP-to-Unix bridge script to the given path."""
+    """Write the TCP-to-Unix bridge script to the given path.
+
+    Skips the write when the file already has the current content, so
+    back-to-back tasks for the same user don't rewrite it.
+    """
+    try:
+        if path.read_text() == BRIDGE_SCRIPT:
+            return
+    except OSError:
+        pass
     path.write_text(BRIDGE_SCRIPT)
     path.chmod(0o700)
 
 
+class _Relay:
+    """One direction of a tunnel (src → dst) with backpressure.
+
+    At most one chunk is in flight: src is only read once everything
+    previously read has been written to dst. With ``os.splice`` the chunk
+    sits in a kernel pipe; otherwise in a preallocated buffer.
+    """
+
+    def __init__(self, src: socket.socket, dst: socket.socket, use_splice: bool):
+        self.src = src
+        self.dst = dst
+        self.pending = 0
+        self.eof = False
+        self.bytes = 0
+        self._pipe: tuple[int, int] | None = None
+        self._buf: bytearray | None = None
+        self._offset = 0
+        if use_splice:
+            try:
+                self._pipe = os.pipe()
+            except OSError:
+                self._pipe = None
+        if self._pipe is None:
+            self._buf = bytearray(_RELAY_CHUNK)
+
+    def preload(self, data: bytes) -> None:
+        """Queue bytes that arrived with the request headers."""
+        if self._pipe is not None:
+            os.write(self._pipe[1], data)
+        else:
+            self._buf[:len(data)] = data
+            self._offset = 0
+        self.pending = len(data)
+
+    def fill(self) -> None:
+        """Read the next chunk from src. Sets ``eof`` when src is done."""
+        if self._pipe is not None:
+            try:
+                n = os.splice(self.src.fileno(), self._pipe[1], _RELAY_CHUNK, flags=_SPLICE_FLAGS)
+            except OSError as e:
+                if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                    raise
+                # Socket type not spliceable here; fall back to copying.
+                self._close_pipe()
+                self._buf = bytearray(_RELAY_CHUNK)
+                return self.fill()
+        else:
+            n = self.src.recv_into(self._buf)
+            self._offset = 0
+        if n == 0:
+            self.eof = True
+        self.pending = n
+
+    def drain(self) -> None:
+        """Write as much of the pending chunk to dst as it will take."""
+        while self.pending:
+            if self._pipe is not None:
+                n = os.splice(self._pipe[0], self.dst.fileno(), self.pending, flags=_SPLICE_FLAGS)
+            else:
+                n = self.dst.send(
+                    memoryview(self._buf)[self._offset:self._offset + self.pending]
+                )
+                self._offset += n
+            self.pending -= n
+            self.bytes += n
+        if self.eof:
+            try:
+                self.dst.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    @property
+    def done(self) -> bool:
+        return self.eof and not self.pending
+
+    def _close_pipe(self) -> None:
+        if self._pipe is not None:
+            for fd in self._pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._pipe = None
+
+    def close(self) -> None:
+        self._close_pipe()
+
+
+class _Conn:
+    """A proxied client connection, from accept to tunnel teardown."""
+
+    def __init__(self, client: socket.socket, allowed_hosts: set[str]):
+        self.client = client
+        self.allowed_hosts = allowed_hosts
+        self.phase = "header"  # header → resolving → connecting → tunnel
+        self.buf = b""
+        self.scoped = False
+        self.deadline = time.monotonic() + _HEADER_TIMEOUT
+        self.target = ""
+        self.host = ""
+        self.port = 0
+        self.started = 0.0
+        self.addrs: list[tuple] = []
+        self.upstream: socket.socket | None = None
+        self.up: _Relay | None = None    # client → upstream
+        self.down: _Relay | None = None  # upstream → client
+        # socket → (registered events, phase the handler was bound for)
+        self.events: dict[socket.socket, tuple[int, str | None]] = {}
+
+
 class NetworkProxy:
     """CONNECT proxy on a Unix socket with domain allowlist.
 
@@ -81,19 +296,64 @@ class NetworkProxy:
 
     No MITM, no credential injection.  Pure connectivity gate.
     TLS is end-to-end between the client and upstream.
+
+    With ``require_token=True`` the constructor allowlist is unused and each
+    connection must name a scope registered via ``register_scope()``.
     """
 
     def __init__(
         self,
         socket_path: Path,
         allowed_hosts: set[str],  # {"api.anthropic.com:443", ...}
+        require_token: bool = False,
+        use_splice: bool | None = None,
     ):
         self.socket_path = socket_path
         self.allowed_hosts = allowed_hosts
+        self.require_token = require_token
+        self.use_splice = hasattr(os, "splice") if use_splice is None else use_splice
+        self._scopes: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "connections": 0, "active": 0, "tunnels": 0, "blocked": 0,
+            "connect_ms": 0.0, "max_connect_ms": 0.0,
+        }
+        self._host_stats: dict[str, dict] = {}
+        self._dns_cache: dict[tuple[str, int], tuple[float, list[tuple]]] = {}
+        self._conns: set[_Conn] = set()
+        self._resolved: deque = deque()
+        self._resolver: ThreadPoolExecutor | None = None
+        self._selector: selectors.BaseSelector | None = None
+        self._wakeup: tuple[socket.socket, socket.socket] | None = None
         self._server_sock: socket.socket | None = None
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
 
+    def register_scope(self, token: str, allowed_hosts: set[str]) -> None:
+        """Make a task's host allowlist reachable under ``token``."""
+        with self._lock:
+            self._scopes[token] = allowed_hosts
+
+    def revoke_scope(self, token: str) -> None:
+        with self._lock:
+            self._scopes.pop(token, None)
+
+    def stats(self) -> dict:
+        """Connection counts, upstream setup latency and per-host traffic."""
+        with self._lock:
+            result = dict(self._stats)
+            result["scopes"] = len(self._scopes)
+            hosts = {h: dict(s) for h, s in self._host_stats.items()}
+        tunnels = result["tunnels"]
+        result["avg_connect_ms"] = round(result["connect_ms"] / tunnels, 1) if tunnels else 0.0
+        result["connect_ms"] = round(result["connect_ms"], 1)
+        result["max_connect_ms"] = round(result["max_connect_ms"], 1)
+        for s in hosts.values():
+            s["avg_connect_ms"] = round(s["connect_ms"] / s["tunnels"], 1) if s["tunnels"] else 0.0
+            s["connect_ms"] = round(s["connect_ms"], 1)
+        result["hosts"] = hosts
+        return result
+
     def start(self) -> None:
         if self.socket_path.exists():
             self.socket_path.unlink()
@@ -101,10 +361,18 @@ class NetworkProxy:
         self._server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self._server_sock.bind(str(self.socket_path))
         self._server_sock.listen(32)
-        self._server_sock.settimeout(1.0)
+        self._server_sock.setblocking(False)
+
+        self._wakeup = socket.socketpair()
+        for s in self._wakeup:
+            s.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server_sock, selectors.EVENT_READ, self._on_accept)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ, self._on_wakeup)
+        self._resolver = ThreadPoolExecutor(max_workers=4, thread_name_prefix="network-proxy-dns")
 
         self._thread = threading.Thread(
-            target=self._accept_loop, daemon=True, name="network-proxy",
+            target=self._loop, daemon=True, name="network-proxy",
         )
         self._thread.start()
         logger.debug(
@@ -114,13 +382,26 @@ class NetworkProxy:
 
     def stop(self) -> None:
         self._stop_event.set()
-        if self._server_sock:
-            try:
-                self._server_sock.close()
-            except OSError:
-                pass
+        self._wake()
         if self._thread:
             self._thread.join(timeout=5)
+            self._thread = None
+        if self._resolver:
+            self._resolver.shutdown(wait=False)
+            self._resolver = None
+        for conn in list(self._conns):
+            self._close(conn)
+        for s in (self._server_sock, *(self._wakeup or ())):
+            if s is not None:
+                try:
+                    s.close()
+                except OSError:
+                    pass
+        self._server_sock = None
+        self._wakeup = None
+        if self._selector:
+            self._selector.close()
+            self._selector = None
         try:
             self.socket_path.unlink(missing_ok=True)
         except OSError:
@@ -134,139 +415,353 @@ class NetworkProxy:
     def __exit__(self, *exc):
         self.stop()
 
-    def _accept_loop(self) -> None:
+    # -- event loop ---------------------------------------------------------
+
+    def _loop(self) -> None:
         while not self._stop_event.is_set():
             try:
-                conn, _ = self._server_sock.accept()
-            except socket.timeout:
+                events = self._selector.select(timeout=1.0)
+            except (OSError, ValueError):
+                break  # Selector closed
+            for key, mask in events:
+                try:
+                    key.data(key.fileobj, mask)
+                except Exception:
+                    logger.debug("Error in network proxy event handler", exc_info=True)
+            self._expire()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            try:
+                self._wakeup[1].send(b"\0")
+            except OSError:
+                pass
+
+    def _on_wakeup(self, sock: socket.socket, mask: int) -> None:
+        try:
+            while sock.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._resolved:
+            conn, addrs, error = self._resolved.popleft()
+            if conn not in self._conns:
+                continue
+            if error is not None or not addrs:
+                logger.debug("Network proxy DNS lookup failed: %s: %s", conn.target, error)
+                self._fail(conn, b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
                 continue
+            conn.addrs = list(addrs)
+            self._connect_next(conn)
+
+    def _on_accept(self, sock: socket.socket, mask: int) -> None:
+        while True:
+            try:
+                client, _ = sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
             except OSError:
-                break
+                return
+            client.setblocking(False)
+            conn = _Conn(client, self.allowed_hosts)
+            self._conns.add(conn)
+            with self._lock:
+                self._stats["connections"] += 1
+                self._stats["active"] += 1
+            self._set_events(conn, client, selectors.EVENT_READ)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for conn in list(self._conns):
+            if conn.phase == "tunnel" or now < conn.deadline:
+                continue
+            if conn.phase == "connecting":
+                logger.debug("Network proxy upstream connect timed out: %s", conn.target)
+                self._fail(conn, b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
+            elif conn.phase == "header":
+                self._close(conn)
+            # "resolving" waits for the resolver, which has its own timeouts
 
-            threading.Thread(
-                target=self._handle_connection, args=(conn,),
-                daemon=True, name="network-proxy-handler",
-            ).start()
+    # -- request parsing ----------------------------------------------------
 
-    def _handle_connection(self, client: socket.socket) -> None:
+    def _on_client_header(self, sock: socket.socket, mask: int, conn: _Conn) -> None:
         try:
-            client.settimeout(30)
-            # Read until we have the full request line
-            data = b""
-            while b"\r\n" not in data:
-                chunk = client.recv(4096)
-                if not chunk:
-                    return
-                data += chunk
+            chunk = sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._close(conn)
+            return
+        if not chunk:
+            self._close(conn)
+            return
+        conn.buf += chunk
+        if len(conn.buf) > _MAX_HEADER_BYTES:
+            self._fail(conn, b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return
+        self._parse_request(conn)
+
+    def _parse_request(self, conn: _Conn) -> None:
+        if b"\r\n" not in conn.buf:
+            return
 
-            first_line = data.split(b"\r\n")[0].decode("utf-8", errors="replace")
-            parts = first_line.split()
-            if len(parts) < 2:
-                client.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+        if not conn.scoped:
+            if conn.buf.startswith(_SCOPE_PREFIX):
+                scope_line, _, conn.buf = conn.buf.partition(b"\r\n")
+                token = scope_line[len(_SCOPE_PREFIX):].decode("utf-8", errors="replace").strip()
+                with self._lock:
+                    allowed = self._scopes.get(token)
+                if allowed is None:
+                    self._fail(conn, b"HTTP/1.1 403 Forbidden\r\n\r\n")
+                    return
+                conn.allowed_hosts = allowed
+            elif self.require_token:
+                self._fail(conn, b"HTTP/1.1 403 Forbidden\r\n\r\n")
+                return
+            conn.scoped = True
+            if b"\r\n" not in conn.buf:
                 return
 
-            method = parts[0].upper()
+        first_line = conn.buf.split(b"\r\n")[0].decode("utf-8", errors="replace")
+        parts = first_line.split()
+        if len(parts) < 2:
+            self._fail(conn, b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return
 
-            if method == "CONNECT":
-                # Consume remaining headers up to blank line
-                while b"\r\n\r\n" not in data:
-                    chunk = client.recv(4096)
-                    if not chunk:
-                        return
-                    data += chunk
+        if parts[0].upper() != "CONNECT":
+            self._fail(conn, b"HTTP/1.1 405 Method Not Allowed\r\n\r\n")
+            return
 
-                target = parts[1]
-                if ":" in target:
-                    host, port_str = target.rsplit(":", 1)
-                    try:
-                        port = int(port_str)
-                    except ValueError:
-                        client.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
-                        return
-                else:
-                    host = target
-                    port = 443
-
-                self._handle_connect(client, host, port)
-            else:
-                client.sendall(b"HTTP/1.1 405 Method Not Allowed\r\n\r\n")
+        # Wait for the rest of the headers up to the blank line
+        if b"\r\n\r\n" not in conn.buf:
+            return
+        _, _, leftover = conn.buf.partition(b"\r\n\r\n")
+        conn.buf = leftover
 
-        except Exception:
-            logger.debug("Error handling network proxy connection", exc_info=True)
-        finally:
+        target = parts[1]
+        if ":" in target:
+            host, port_str = target.rsplit(":", 1)
             try:
-                client.close()
-            except OSError:
-                pass
+                port = int(port_str)
+            except ValueError:
+                self._fail(conn, b"HTTP/1.1 400 Bad Request\r\n\r\n")
+                return
+        else:
+            host = target
+            port = 443
+
+        conn.host, conn.port = host, port
+        conn.target = f"{host}:{port}"
+        if conn.target not in conn.allowed_hosts:
+            logger.debug("Network proxy blocked: %s", conn.target)
+            with self._lock:
+                self._stats["blocked"] += 1
+                self._host(conn.target)["blocked"] += 1
+            self._fail(conn, b"HTTP/1.1 403 Forbidden\r\n\r\n")
+            return
 
-    def _handle_connect(
-        self, client: socket.socket, host: str, port: int,
-    ) -> None:
-        target = f"{host}:{port}"
-        if target not in self.allowed_hosts:
-            logger.debug("Network proxy blocked: %s", target)
-            client.sendall(b"HTTP/1.1 403 Forbidden\r\n\r\n")
+        # Stop reading from the client until the tunnel is up
+        self._set_events(conn, conn.client, 0)
+        conn.started = time.monotonic()
+        self._resolve(conn)
+
+    # -- upstream setup -----------------------------------------------------
+
+    def _host(self, target: str) -> dict:
+        """Per-host counters (caller holds ``_lock``)."""
+        stats = self._host_stats.get(target)
+        if stats is None:
+            stats = {
+                "tunnels": 0, "blocked": 0, "failed": 0,
+                "bytes_up": 0, "bytes_down": 0, "connect_ms": 0.0,
+            }
+            self._host_stats[target] = stats
+        return stats
+
+    def _resolve(self, conn: _Conn) -> None:
+        key = (conn.host, conn.port)
+        cached = self._dns_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            conn.addrs = list(cached[1])
+            self._connect_next(conn)
             return
 
-        try:
-            upstream = socket.create_connection((host, port), timeout=10)
-        except OSError as e:
+        conn.phase = "resolving"
+
+        def lookup():
+            try:
+                infos = socket.getaddrinfo(conn.host, conn.port, type=socket.SOCK_STREAM)
+                addrs = [(family, sockaddr) for family, _, _, _, sockaddr in infos]
+                # Only allowlisted targets get here, so the cache stays small
+                self._dns_cache[key] = (time.monotonic() + _DNS_TTL, addrs)
+                self._resolved.append((conn, addrs, None))
+            except OSError as e:
+                self._resolved.append((conn, None, e))
+            self._wake()
+
+        self._resolver.submit(lookup)
+
+    def _connect_next(self, conn: _Conn) -> None:
+        """Start a non-blocking connect to the next candidate address."""
+        if conn.upstream is not None:
+            self._set_events(conn, conn.upstream, 0)
+            conn.upstream.close()
+            conn.upstream = None
+        if not conn.addrs:
+            logger.debug("Network proxy upstream connect failed: %s", conn.target)
+            self._fail(conn, b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
+            return
+        family, sockaddr = conn.addrs.pop(0)
+        upstream = socket.socket(family, socket.SOCK_STREAM)
+        upstream.setblocking(False)
+        conn.upstream = upstream
+        conn.phase = "connecting"
+        conn.deadline = time.monotonic() + _CONNECT_TIMEOUT
+        err = upstream.connect_ex(sockaddr)
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            self._connect_next(conn)
+            return
+        self._set_events(conn, upstream, selectors.EVENT_WRITE)
+
+    def _on_upstream_connected(self, sock: socket.socket, mask: int, conn: _Conn) -> None:
+        err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
             logger.debug(
-                "Network proxy upstream connect failed: %s: %s", target, e,
+                "Network proxy upstream connect failed: %s: %s",
+                conn.target, os.strerror(err),
             )
-            client.sendall(b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
+            self._connect_next(conn)
             return
 
-        client.sendall(b"HTTP/1.1 200 Connection Established\r\n\r\n")
-
-        # Clear the 30s request-parsing timeout — the tunnel may be
-        # idle for long stretches during streaming API responses.
-        client.settimeout(None)
-        upstream.settimeout(None)
+        elapsed_ms = (time.monotonic() - conn.started) * 1000
+        with self._lock:
+            self._stats["tunnels"] += 1
+            self._stats["connect_ms"] += elapsed_ms
+            self._stats["max_connect_ms"] = max(self._stats["max_connect_ms"], elapsed_ms)
+            host = self._host(conn.target)
+            host["tunnels"] += 1
+            host["connect_ms"] += elapsed_ms
 
         # Enable TCP keepalive on upstream to detect dead connections
         # (NAT timeouts, load balancer drops, etc.)
-        _enable_tcp_keepalive(upstream)
-
-        logger.debug("Network proxy tunnel established: %s", target)
+        _enable_tcp_keepalive(sock)
 
         try:
-            self._bridge(client, upstream, target)
-        finally:
-            try:
-                upstream.close()
-            except OSError:
-                pass
+            conn.client.send(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+        except OSError:
+            self._close(conn)
+            return
 
-    @staticmethod
-    def _bridge(
-        a: socket.socket, b: socket.socket, target: str = "",
-    ) -> None:
-        """Bidirectional forwarding between two sockets."""
+        conn.phase = "tunnel"
+        conn.up = _Relay(conn.client, sock, self.use_splice)
+        conn.down = _Relay(sock, conn.client, self.use_splice)
+        if conn.buf:
+            conn.up.preload(conn.buf)
+            conn.buf = b""
+        logger.debug("Network proxy tunnel established: %s", conn.target)
+        self._pump(conn, conn.up, writable=True)
+        if conn in self._conns:
+            self._update_tunnel(conn)
+
+    # -- tunnel relay -------------------------------------------------------
+
+    def _on_tunnel(self, sock: socket.socket, mask: int, conn: _Conn) -> None:
+        for relay in (conn.up, conn.down):
+            readable = bool(mask & selectors.EVENT_READ) and relay.src is sock
+            writable = bool(mask & selectors.EVENT_WRITE) and relay.dst is sock
+            if readable or writable:
+                self._pump(conn, relay, readable=readable, writable=writable)
+                if conn not in self._conns:
+                    return
+        if conn.up.done and conn.down.done:
+            self._close(conn)
+        else:
+            self._update_tunnel(conn)
 
-        def forward(
-            src: socket.socket, dst: socket.socket, label: str,
-        ) -> None:
-            try:
-                while True:
-                    data = src.recv(65536)
-                    if not data:
-                        break
-                    dst.sendall(data)
-            except OSError as e:
-                logger.debug("Network proxy bridge %s error: %s", label, e)
-            finally:
+    def _pump(self, conn: _Conn, relay: _Relay, readable: bool = False, writable: bool = False) -> None:
+        try:
+            if writable and relay.pending:
+                relay.drain()
+            if readable and not relay.pending and not relay.eof:
+                relay.fill()
+                relay.drain()
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            logger.debug("Network proxy bridge [%s] error: %s", conn.target, e)
+            self._close(conn)
+
+    def _update_tunnel(self, conn: _Conn) -> None:
+        for sock in (conn.client, conn.upstream):
+            events = 0
+            for relay in (conn.up, conn.down):
+                if relay.src is sock and not relay.pending and not relay.eof:
+                    events |= selectors.EVENT_READ
+                if relay.dst is sock and relay.pending:
+                    events |= selectors.EVENT_WRITE
+            self._set_events(conn, sock, events)
+
+    # -- bookkeeping --------------------------------------------------------
+
+    def _set_events(self, conn: _Conn, sock: socket.socket, events: int) -> None:
+        old, old_phase = conn.events.get(sock, (0, None))
+        if events == old and (not events or conn.phase == old_phase):
+            return
+        if sock is conn.client:
+            handler = self._on_tunnel if conn.phase == "tunnel" else self._on_client_header
+        elif conn.phase == "tunnel":
+            handler = self._on_tunnel
+        else:
+            handler = self._on_upstream_connected
+
+        def callback(s, mask, _conn=conn, _handler=handler):
+            _handler(s, mask, _conn)
+
+        if not events:
+            self._selector.unregister(sock)
+        elif not old:
+            self._selector.register(sock, events, callback)
+        else:
+            self._selector.modify(sock, events, callback)
+        conn.events[sock] = (events, conn.phase)
+
+    def _fail(self, conn: _Conn, response: bytes) -> None:
+        # Count before replying so a client that reads stats() after the
+        # 502 sees the failure
+        if conn.target and response.startswith(b"HTTP/1.1 502"):
+            with self._lock:
+                self._host(conn.target)["failed"] += 1
+        try:
+            conn.client.send(response)
+        except OSError:
+            pass
+        self._close(conn)
+
+    def _close(self, conn: _Conn) -> None:
+        if conn not in self._conns:
+            return
+        self._conns.discard(conn)
+        for sock in (conn.client, conn.upstream):
+            if sock is None:
+                continue
+            if conn.events.get(sock, (0,))[0] and self._selector is not None:
                 try:
-                    dst.shutdown(socket.SHUT_WR)
-                except OSError:
+                    self._selector.unregister(sock)
+                except (KeyError, ValueError):
                     pass
-
-        label = f"[{target}]" if target else ""
-        t = threading.Thread(
-            target=forward, args=(a, b, f"{label} client→upstream"),
-            daemon=True,
-        )
-        t.start()
-        forward(b, a, f"{label} upstream→client")
-        t.join(timeout=5)
-        logger.debug("Network proxy tunnel closed: %s", target)
+            try:
+                sock.close()
+            except OSError:
+                pass
+        conn.events.clear()
+        for relay in (conn.up, conn.down):
+            if relay is not None:
+                relay.close()
+        with self._lock:
+            self._stats["active"] -= 1
+            if conn.phase == "tunnel":
+                host = self._host(conn.target)
+                host["bytes_up"] += conn.up.bytes
+                host["bytes_down"] += conn.down.bytes
+        if conn.phase == "tunnel":
+            logger.debug("Network proxy tunnel closed: %s", conn.target)
@@ -0,0 +1,161 @@
+"""Daemon-level registry of long-lived skill and network proxies.
+
+Instead of a SkillProxy and NetworkProxy per task (each with its own socket
+and accept thread), the daemon keeps one of each per user for its whole
+lifetime. A task registers its credential scope and host allowlist under a
+random token when it starts and revokes them when it finishes; requests on
+the shared socket carry the token and are served with that task's scope.
+
+Sockets are per user, so each user's sandbox only ever sees its own proxy.
+"""
+
+import logging
+import re
+import secrets
+import tempfile
+import threading
+from pathlib import Path
+
+from .network_proxy import NetworkProxy
+from .skill_proxy import SkillProxy
+
+logger = logging.getLogger("istota.proxy_hub")
+
+_hub: "ProxyHub | None" = None
+_hub_lock = threading.Lock()
+
+
+def _socket_name(prefix: str, user_id: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)
+    return f"{prefix}-{safe}.sock"
+
+
+class ScopeLease:
+    """Context manager that registers a task scope on a shared proxy.
+
+    ``socket_path`` and ``token`` are known up front so they can be put in
+    the task's env before the scope is entered.
+    """
+
+    def __init__(self, proxy: SkillProxy | NetworkProxy, task_id: int, kind: str, **scope):
+        self.proxy = proxy
+        self.task_id = task_id
+        self.kind = kind
+        self.socket_path = proxy.socket_path
+        self.token = secrets.token_urlsafe(24)
+        self._scope = scope
+
+    def __enter__(self):
+        self.proxy.register_scope(self.token, **self._scope)
+        return self
+
+    def __exit__(self, *exc):
+        usage = self.proxy.revoke_scope(self.token)
+        if usage:
+            logger.debug("Task %d %s proxy scope revoked: %s", self.task_id, self.kind, usage)
+
+
+class ProxyHub:
+    """Per-user SkillProxy/NetworkProxy instances shared across tasks."""
+
+    def __init__(
+        self,
+        socket_dir: Path | None = None,
+        skill_timeout: int = 300,
+        skill_warm: bool = False,
+    ):
+        self.socket_dir = socket_dir or Path(tempfile.gettempdir())
+        self.skill_timeout = skill_timeout
+        self.skill_warm = skill_warm
+        self._skill_proxies: dict[str, SkillProxy] = {}
+        self._network_proxies: dict[str, NetworkProxy] = {}
+        self._lock = threading.Lock()
+
+    def skill_scope(
+        self,
+        task_id: int,
+        user_id: str,
+        credential_env: dict[str, str],
+        base_env: dict[str, str],
+        allowed_credentials: set[str] | None = None,
+        skill_credential_map: dict[str, set[str]] | None = None,
+    ) -> ScopeLease:
+        """Lease a credential scope on the user's skill proxy."""
+        with self._lock:
+            proxy = self._skill_proxies.get(user_id)
+            if proxy is None:
+                proxy = SkillProxy(
+                    self.socket_dir / _socket_name("istota-proxy", user_id),
+                    {}, {},
+                    timeout=self.skill_timeout,
+                    warm=self.skill_warm,
+                    require_token=True,
+                )
+                proxy.start()
+                self._skill_proxies[user_id] = proxy
+        return ScopeLease(
+            proxy, task_id, "skill",
+            credential_env=credential_env,
+            base_env=base_env,
+            allowed_credentials=allowed_credentials,
+            skill_credential_map=skill_credential_map,
+        )
+
+    def network_scope(self, task_id: int, user_id: str, allowed_hosts: set[str]) -> ScopeLease:
+        """Lease a host allowlist on the user's network proxy."""
+        with self._lock:
+            proxy = self._network_proxies.get(user_id)
+            if proxy is None:
+                proxy = NetworkProxy(
+                    self.socket_dir / _socket_name("istota-net", user_id),
+                    set(),
+                    require_token=True,
+                )
+                proxy.start()
+                self._network_proxies[user_id] = proxy
+        return ScopeLease(proxy, task_id, "network", allowed_hosts=allowed_hosts)
+
+    def stats(self) -> dict[str, dict]:
+        """Connection counts and latency per user, for both proxy kinds."""
+        with self._lock:
+            skill = dict(self._skill_proxies)
+            network = dict(self._network_proxies)
+        result: dict[str, dict] = {}
+        for user_id, proxy in skill.items():
+            result.setdefault(user_id, {})["skill"] = proxy.stats()
+        for user_id, proxy in network.items():
+            result.setdefault(user_id, {})["network"] = proxy.stats()
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            proxies = list(self._skill_proxies.values()) + list(self._network_proxies.values())
+            self._skill_proxies.clear()
+            self._network_proxies.clear()
+        for proxy in proxies:
+            try:
+                proxy.stop()
+            except Exception:
+                logger.debug("Error stopping proxy %s", proxy.socket_path, exc_info=True)
+
+
+def start_hub(skill_timeout: int = 300, skill_warm: bool = False) -> ProxyHub:
+    """Create the process-wide hub. Called once by the scheduler daemon."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = ProxyHub(skill_timeout=skill_timeout, skill_warm=skill_warm)
+        return _hub
+
+
+def get_hub() -> ProxyHub | None:
+    """The daemon's hub, or None outside the daemon (per-task proxies)."""
+    return _hub
+
+
+def stop_hub() -> None:
+    global _hub
+    with _hub_lock:
+        hub, _hub = _hub, None
+    if hub is not None:
+        hub.shutdown()
@@ -12,16 +12,16 @@ import socket
 import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from croniter import croniter
-
 logger = logging.getLogger("istota.scheduler")
 
 from . import db
+from .cron_index import FireTimeIndex, format_utc, next_fire_time, parse_utc, zone
 from .skills.briefing import (
     build_briefing_prompt,
     get_briefings_for_user,
@@ -840,17 +840,16 @@ def _process_deferred_tracking(
             source_file = csv_imported[0].get("source_file") if csv_imported else None
             count += db.track_csv_transactions_batch(conn, task.user_id, hashes, source_file)
 
-        for txn_id in data.get("monarch_recategorized", []):
-            if db.mark_monarch_transaction_recategorized(conn, task.user_id, txn_id):
-                count += 1
-
-        for update in data.get("monarch_category_updates", []):
-            if db.update_monarch_transaction_posted_account(
-                conn, task.user_id,
-                update["monarch_transaction_id"],
-                update["posted_account"],
-            ):
-                count += 1
+        count += db.mark_monarch_transactions_recategorized_batch(
+            conn, task.user_id, data.get("monarch_recategorized", []),
+        )
+        count += db.update_monarch_transactions_posted_account_batch(
+            conn, task.user_id, data.get("monarch_category_updates", []),
+        )
+        # The cursor is written last: it only advances once the sync's
+        # transactions are tracked
+        if data.get("monarch_sync_cursor"):
+            db.set_monarch_sync_cursor(conn, task.user_id, data["monarch_sync_cursor"])
 
     if count:
         logger.info("Processed %d deferred tracking entries for task %d", count, task.id)
@@ -1824,7 +1823,55 @@ async def post_result_to_email(config: Config, task: db.Task, message: str) -> b
             return False
 
 
-def check_briefings(db_path, app_config: Config) -> list[int]:
+def _due_briefings(
+    conn, app_config: Config, index: FireTimeIndex,
+) -> list[tuple[str, str, "BriefingConfig"]]:
+    """(user_id, timezone name, briefing) for each briefing whose cron has fired since its last run."""
+    definitions: dict[tuple[str, str], tuple[str, str]] = {}
+    by_key: dict[tuple[str, str], "BriefingConfig"] = {}
+    for user_id, user_config in app_config.users.items():
+        briefings = get_briefings_for_user(app_config, user_id)
+        if not briefings:
+            continue
+
+        user_tz_str = zone(user_config.timezone).key
+        for briefing in briefings:
+            if not briefing.cron:
+                continue
+            if not briefing.conversation_token and briefing.output in ("talk", "both"):
+                continue
+            key = (user_id, briefing.name)
+            definitions[key] = (briefing.cron, user_tz_str)
+            by_key[key] = briefing
+
+    due_keys = index.due(
+        definitions,
+        lambda key: db.get_briefing_last_run(conn, *key),
+        _now(ZoneInfo("UTC")),
+    )
+    return [
+        (user_id, definitions[(user_id, name)][1], by_key[(user_id, name)])
+        for user_id, name in due_keys
+    ]
+
+
+def _queue_briefing(conn, user_id: str, briefing: "BriefingConfig", prompt: str) -> int:
+    """Create a prepared briefing's task and record the run. Returns the task ID."""
+    task_id = db.create_task(
+        conn,
+        prompt=prompt,
+        user_id=user_id,
+        source_type="briefing",
+        conversation_token=briefing.conversation_token,
+        output_target=briefing.output,
+        priority=8,
+        queue="background",
+    )
+    db.set_briefing_last_run(conn, user_id, briefing.name)
+    return task_id
+
+
+def check_briefings(db_path, app_config: Config, index: FireTimeIndex | None = None) -> list[int]:
     """
     Check for briefings that should run and queue them as tasks.
 
@@ -1833,61 +1880,25 @@ def check_briefings(db_path, app_config: Config) -> list[int]:
     2. Network pre-fetch (market data, newsletters) with NO DB connection
     3. Short DB write to create tasks
 
+    Briefings are prepared one after another; the daemon uses
+    BriefingRunner instead.
+
     Args:
         db_path: Path to the database file
         app_config: Application config with user briefings
+        index: Next-fire-time index kept across checks, so only briefings
+            coming due are evaluated. Without one, every briefing is
+            evaluated.
 
     Returns:
         List of created task IDs
     """
-    # Phase 1: Short DB read — check which briefings are due
-    due_briefings: list[tuple[str, str, "BriefingConfig"]] = []
+    if index is None:
+        index = FireTimeIndex()
 
+    # Phase 1: Short DB read — check which briefings are due
     with db.get_db(db_path) as conn:
-        for user_id, user_config in app_config.users.items():
-            briefings = get_briefings_for_user(app_config, user_id)
-            if not briefings:
-                continue
-
-            user_tz_str = user_config.timezone
-
-            try:
-                user_tz = ZoneInfo(user_tz_str)
-            except Exception:
-                user_tz = ZoneInfo("UTC")
-                user_tz_str = "UTC"
-
-            now = _now(user_tz)
-            # Use naive wall-clock times for croniter to avoid DST bugs.
-            # croniter miscomputes next fire time when a tz-aware datetime
-            # crosses a DST boundary (e.g. PST→PDT), causing double-fires.
-            now_naive = now.replace(tzinfo=None)
-
-            for briefing in briefings:
-                if not briefing.cron:
-                    continue
-                if not briefing.conversation_token and briefing.output in ("talk", "both"):
-                    continue
-
-                should_run = False
-                last_run_at = db.get_briefing_last_run(conn, user_id, briefing.name)
-
-                if last_run_at:
-                    last_run = datetime.fromisoformat(last_run_at)
-                    if last_run.tzinfo is None:
-                        last_run = last_run.replace(tzinfo=ZoneInfo("UTC"))
-                    base = last_run.astimezone(user_tz).replace(tzinfo=None)
-                    cron = croniter(briefing.cron, base)
-                    next_run = cron.get_next(datetime)
-                    should_run = now_naive >= next_run
-                else:
-                    today_start = now_naive.replace(hour=0, minute=0, second=0, microsecond=0)
-                    cron = croniter(briefing.cron, today_start)
-                    next_run = cron.get_next(datetime)
-                    should_run = now_naive >= next_run
-
-                if should_run:
-                    due_briefings.append((user_id, user_tz_str, briefing))
+        due_briefings = _due_briefings(conn, app_config, index)
 
     if not due_briefings:
         return []
@@ -1907,22 +1918,75 @@ def check_briefings(db_path, app_config: Config) -> list[int]:
     created_tasks = []
     with db.get_db(db_path) as conn:
         for user_id, briefing, prompt in prepared:
-            task_id = db.create_task(
-                conn,
-                prompt=prompt,
-                user_id=user_id,
-                source_type="briefing",
-                conversation_token=briefing.conversation_token,
-                output_target=briefing.output,
-                priority=8,
-                queue="background",
-            )
-            db.set_briefing_last_run(conn, user_id, briefing.name)
-            created_tasks.append(task_id)
+            created_tasks.append(_queue_briefing(conn, user_id, briefing, prompt))
 
     return created_tasks
 
 
+class BriefingRunner:
+    """
+    Prepares due briefings as background jobs.
+
+    The scheduler loop calls schedule(), which submits each due briefing
+    that isn't already being prepared to a pool of
+    scheduler.briefing_max_workers threads and returns without waiting, so
+    slow market, FinViz or newsletter fetches never hold up the loop or
+    other briefings. Each job builds its prompt with no DB connection held,
+    then creates the task and records the run in one short write.
+    """
+
+    def __init__(self, config: Config, max_workers: int | None = None):
+        self.config = config
+        self.max_workers = max_workers or config.scheduler.briefing_max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="briefing",
+        )
+        self._lock = threading.Lock()
+        self._in_flight: set[tuple[str, str]] = set()
+        # Fire times are recomputed only as briefings come due or change
+        self._index = FireTimeIndex()
+
+    def schedule(self, conn) -> list[tuple[str, str]]:
+        """Submit due briefings not already in flight. Returns their (user_id, name) keys."""
+        # Taken before reading last runs: a job that finishes after this
+        # is skipped, and one that finished before has recorded its run
+        with self._lock:
+            in_flight = set(self._in_flight)
+        due_briefings = _due_briefings(conn, self.config, self._index)
+
+        submitted = []
+        for user_id, user_tz_str, briefing in due_briefings:
+            key = (user_id, briefing.name)
+            if key in in_flight:
+                continue
+            with self._lock:
+                self._in_flight.add(key)
+            self._executor.submit(self._execute, user_id, user_tz_str, briefing)
+            submitted.append(key)
+        return submitted
+
+    def _execute(self, user_id: str, user_tz_str: str, briefing: "BriefingConfig") -> None:
+        try:
+            prompt = build_briefing_prompt(briefing, user_id, self.config, user_tz_str)
+            with db.get_db(self.config.db_path) as conn:
+                task_id = _queue_briefing(conn, user_id, briefing, prompt)
+            logger.info("Queued briefing '%s' for %s as task %d", briefing.name, user_id, task_id)
+        except Exception as e:
+            logger.error("Error preparing briefing '%s' for %s: %s", briefing.name, user_id, e)
+        finally:
+            with self._lock:
+                self._in_flight.discard((user_id, briefing.name))
+
+    def running(self) -> list[tuple[str, str]]:
+        """(user_id, name) keys of briefings queued or being prepared."""
+        with self._lock:
+            return sorted(self._in_flight)
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs; queued ones are dropped, running ones finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 def cleanup_old_temp_files(config: Config, retention_days: int) -> int:
     """
     Delete temp files older than retention_days.
@@ -2129,12 +2193,18 @@ def _sync_cron_files(conn, app_config: Config) -> None:
             logger.error("Error syncing CRON.md for %s: %s", user_id, e)
 
 
+# Timezone each user's stored job fire times were last checked against
+_job_timezones: dict[str, str] = {}
+
+
 def check_scheduled_jobs(conn, app_config: Config) -> list[int]:
     """
     Check for scheduled jobs that should run and queue them as tasks.
 
-    Syncs CRON.md files to DB, then reads job definitions from the
-    scheduled_jobs table and evaluates cron expressions in each user's timezone.
+    Syncs CRON.md files to DB, then reads the jobs that are due from the
+    scheduled_jobs table. Each job's next fire time is stored in UTC and
+    computed in its user's timezone only when missing: for a new job, after
+    it fires, or after its cron expression or the user's timezone changes.
 
     Returns:
         List of created task IDs.
@@ -2144,88 +2214,65 @@ def check_scheduled_jobs(conn, app_config: Config) -> list[int]:
     # Sync file-based definitions to DB before evaluating
     _sync_cron_files(conn, app_config)
 
-    jobs = db.get_enabled_scheduled_jobs(conn)
+    # A timezone change moves every fire time of that user's jobs
+    for user_id, user_config in app_config.users.items():
+        tz_name = zone(user_config.timezone).key
+        if _job_timezones.get(user_id) != tz_name:
+            db.clear_scheduled_job_next_runs(conn, user_id, tz_name)
+            _job_timezones[user_id] = tz_name
+
+    now = _now(ZoneInfo("UTC"))
+    jobs = db.get_due_scheduled_jobs(conn, format_utc(now))
     if not jobs:
-        logger.debug("No enabled scheduled jobs found")
+        logger.debug("No scheduled jobs due")
         return created_tasks
-    logger.debug("Found %d enabled scheduled job(s)", len(jobs))
+    logger.debug("Found %d scheduled job(s) due or to schedule", len(jobs))
 
-    # Group by user_id to look up timezone once per user
-    jobs_by_user: dict[str, list[db.ScheduledJob]] = {}
     for job in jobs:
-        jobs_by_user.setdefault(job.user_id, []).append(job)
-
-    for user_id, user_jobs in jobs_by_user.items():
         # Look up timezone from config; fall back to UTC
-        user_config = app_config.users.get(user_id)
-        user_tz_str = user_config.timezone if user_config else "UTC"
-        try:
-            user_tz = ZoneInfo(user_tz_str)
-        except Exception:
-            user_tz = ZoneInfo("UTC")
-
-        now = _now(user_tz)
-        # Use naive wall-clock times for croniter to avoid DST bugs.
-        # croniter miscomputes next fire time when a tz-aware datetime
-        # crosses a DST boundary (e.g. PST→PDT), causing double-fires.
-        now_naive = now.replace(tzinfo=None)
-
-        for job in user_jobs:
-            should_run = False
+        user_config = app_config.users.get(job.user_id)
+        user_tz = zone(user_config.timezone if user_config else "UTC")
 
+        if job.next_run_at is None or job.next_run_tz != user_tz.key:
             if job.last_run_at:
-                last_run = datetime.fromisoformat(job.last_run_at)
-                if last_run.tzinfo is None:
-                    # DB stores UTC via datetime('now')
-                    last_run = last_run.replace(tzinfo=ZoneInfo("UTC"))
-                base = last_run.astimezone(user_tz).replace(tzinfo=None)
-                cron = croniter(job.cron_expression, base)
-                next_run = cron.get_next(datetime)
-                should_run = now_naive >= next_run
-                logger.debug(
-                    "Job '%s': last_run=%s next_run=%s now=%s should_run=%s",
-                    job.name, last_run, next_run, now_naive, should_run,
-                )
-            else:
+                base = parse_utc(job.last_run_at)
+            elif job.created_at:
                 # Use created_at as base so jobs don't fire immediately
                 # when the cron time has already passed today
-                if job.created_at:
-                    base = datetime.fromisoformat(job.created_at)
-                    if base.tzinfo is None:
-                        # DB stores UTC via datetime('now')
-                        base = base.replace(tzinfo=ZoneInfo("UTC"))
-                    base = base.astimezone(user_tz).replace(tzinfo=None)
-                else:
-                    base = now_naive.replace(hour=0, minute=0, second=0, microsecond=0)
-                cron = croniter(job.cron_expression, base)
-                next_run = cron.get_next(datetime)
-                should_run = now_naive >= next_run
-                logger.debug(
-                    "Job '%s' (never run): base=%s next_run=%s now=%s should_run=%s",
-                    job.name, base, next_run, now_naive, should_run,
-                )
+                base = parse_utc(job.created_at)
+            else:
+                base = now.astimezone(user_tz).replace(hour=0, minute=0, second=0, microsecond=0)
+            next_run = next_fire_time(job.cron_expression, user_tz, base)
+            db.set_scheduled_job_next_run(conn, job.id, format_utc(next_run), user_tz.key)
+            should_run = now >= next_run
+            logger.debug(
+                "Job '%s': last_run=%s next_run=%s now=%s should_run=%s",
+                job.name, job.last_run_at, next_run, now, should_run,
+            )
+        else:
+            should_run = True
 
-            if should_run:
-                task_id = db.create_task(
-                    conn,
-                    prompt=job.prompt,
-                    user_id=job.user_id,
-                    source_type="scheduled",
-                    conversation_token=job.conversation_token,
-                    output_target=job.output_target,
-                    priority=5,
-                    heartbeat_silent=job.silent_unless_action,
-                    skip_log_channel=job.skip_log_channel,
-                    scheduled_job_id=job.id,
-                    command=job.command,
-                    queue="background",
-                )
-                db.set_scheduled_job_last_run(conn, job.id)
-                created_tasks.append(task_id)
-                logger.info(
-                    "Scheduled job '%s' (user: %s) queued as task %d",
-                    job.name, job.user_id, task_id,
-                )
+        if should_run:
+            task_id = db.create_task(
+                conn,
+                prompt=job.prompt,
+                user_id=job.user_id,
+                source_type="scheduled",
+                conversation_token=job.conversation_token,
+                output_target=job.output_target,
+                priority=5,
+                heartbeat_silent=job.silent_unless_action,
+                skip_log_channel=job.skip_log_channel,
+                scheduled_job_id=job.id,
+                command=job.command,
+                queue="background",
+            )
+            db.set_scheduled_job_last_run(conn, job.id)
+            created_tasks.append(task_id)
+            logger.info(
+                "Scheduled job '%s' (user: %s) queued as task %d",
+                job.name, job.user_id, task_id,
+            )
 
     return created_tasks
 
@@ -2361,6 +2408,13 @@ def _talk_poll_loop(config: Config) -> None:
         time.sleep(config.scheduler.talk_poll_interval)
 
 
+def _email_idle_loop(config: Config, wakeup: threading.Event) -> None:
+    """Background thread: sets wakeup when the IMAP server reports new mail."""
+    from .email_poller import watch_for_mail
+
+    watch_for_mail(config, wakeup, lambda: _shutdown_requested)
+
+
 def run_daemon(config: Config) -> None:
     """
     Run the scheduler as a daemon (continuous loop).
@@ -2394,9 +2448,14 @@ def run_daemon(config: Config) -> None:
     logger.info("STARTUP Talk poll timeout: %ds", config.scheduler.talk_poll_timeout)
     logger.info("STARTUP Email poll interval: %ds", config.scheduler.email_poll_interval)
     logger.info("STARTUP Briefing check interval: %ds", config.scheduler.briefing_check_interval)
+    logger.info("STARTUP Briefing workers: %d", config.scheduler.briefing_max_workers)
     logger.info("STARTUP TASKS.md poll interval: %ds", config.scheduler.tasks_file_poll_interval)
     logger.info("STARTUP Shared file check interval: %ds", config.scheduler.shared_file_check_interval)
     logger.info("STARTUP Heartbeat check interval: %ds", config.scheduler.heartbeat_check_interval)
+    logger.info(
+        "STARTUP Heartbeat workers/check timeout: %d/%ds",
+        config.scheduler.heartbeat_max_workers, config.scheduler.heartbeat_check_timeout,
+    )
     logger.info("STARTUP Scheduled job check interval: %ds", config.scheduler.briefing_check_interval)
     logger.info("STARTUP Cleanup interval: %ds", config.scheduler.briefing_check_interval)
     logger.info("STARTUP Feed page regen interval: %ds", config.scheduler.feed_page_regen_interval)
@@ -2426,9 +2485,45 @@ def run_daemon(config: Config) -> None:
         talk_thread.start()
         logger.info("STARTUP Started Talk polling thread")
 
+    # With IMAP IDLE, new mail triggers a poll right away; the interval
+    # remains as a fallback
+    email_wakeup = threading.Event()
+    if config.email.enabled and config.email.idle:
+        idle_thread = threading.Thread(
+            target=_email_idle_loop, args=(config, email_wakeup), daemon=True, name="email-idle",
+        )
+        idle_thread.start()
+        logger.info("STARTUP Started email IDLE thread")
+
+    # Long-lived per-user skill/network proxies; tasks register scopes on
+    # them instead of starting their own sockets.
+    if config.security.skill_proxy_enabled or (
+        config.security.network.enabled and config.security.sandbox_enabled
+    ):
+        from .proxy_hub import start_hub
+        start_hub(
+            skill_timeout=config.security.skill_proxy_timeout,
+            skill_warm=config.security.skill_proxy_warm,
+        )
+        logger.info("STARTUP Started shared proxy hub")
+
     # Create worker pool for per-user concurrent task processing
     pool = WorkerPool(config)
 
+    # Heartbeat checks run on their own bounded pool so a slow URL or
+    # command can't hold up task dispatch and polling
+    from .heartbeat import HeartbeatRunner
+    heartbeat_runner = HeartbeatRunner(config)
+
+    # Sleep cycles likewise run as background jobs (one CLI call each, can
+    # take minutes) bounded by sleep_cycle.max_concurrent
+    from .sleep_cycle import SleepCycleRunner
+    sleep_runner = SleepCycleRunner(config)
+
+    # Briefings are prepared on their own pool too: building a prompt
+    # fetches market data, FinViz and newsletters, which can take minutes
+    briefing_runner = BriefingRunner(config)
+
     last_email_poll = 0.0
     last_briefing_check = 0.0
     last_tasks_file_poll = 0.0
@@ -2436,7 +2531,6 @@ def run_daemon(config: Config) -> None:
     last_scheduled_job_check = 0.0
     last_cleanup_check = 0.0
     last_sleep_cycle_check = 0.0
-    last_channel_sleep_cycle_check = 0.0
     last_heartbeat_check = 0.0
     last_invoice_schedule_check = 0.0
     last_feed_check = 0.0
@@ -2450,13 +2544,13 @@ def run_daemon(config: Config) -> None:
 
         now = time.time()
 
-        # Check briefings periodically (manages own DB connections to avoid
-        # holding locks during slow network pre-fetching)
+        # Submit due briefings to the briefing pool (never waits on them)
         if now - last_briefing_check >= config.scheduler.briefing_check_interval:
             try:
-                briefing_tasks = check_briefings(config.db_path, config)
-                if briefing_tasks:
-                    logger.info("Queued %d briefing(s)", len(briefing_tasks))
+                with db.get_db(config.db_path) as conn:
+                    started = briefing_runner.schedule(conn)
+                if started:
+                    logger.info("Preparing %d briefing(s)", len(started))
             except Exception as e:
                 logger.error("Error checking briefings: %s", e)
             last_briefing_check = now
@@ -2472,32 +2566,22 @@ def run_daemon(config: Config) -> None:
                 logger.error("Error checking scheduled jobs: %s", e)
             last_scheduled_job_check = now
 
-        # Check sleep cycles periodically (same interval as briefings)
+        # Submit due user and channel sleep cycles (same interval as briefings)
         if now - last_sleep_cycle_check >= config.scheduler.briefing_check_interval:
             try:
-                from .sleep_cycle import check_sleep_cycles
                 with db.get_db(config.db_path) as conn:
-                    sleep_users = check_sleep_cycles(conn, config)
-                    if sleep_users:
-                        logger.info("Ran sleep cycle for %d user(s): %s", len(sleep_users), ", ".join(sleep_users))
+                    started = sleep_runner.schedule(conn)
+                    if started:
+                        logger.info("Started sleep cycle for %d subject(s): %s", len(started), ", ".join(started))
             except Exception as e:
-                logger.error("Error running sleep cycles: %s", e)
+                logger.error("Error scheduling sleep cycles: %s", e)
             last_sleep_cycle_check = now
 
-        # Check channel sleep cycles periodically (same interval as briefings)
-        if now - last_channel_sleep_cycle_check >= config.scheduler.briefing_check_interval:
-            try:
-                from .sleep_cycle import check_channel_sleep_cycles
-                with db.get_db(config.db_path) as conn:
-                    channel_tokens = check_channel_sleep_cycles(conn, config)
-                    if channel_tokens:
-                        logger.info("Ran channel sleep cycle for %d channel(s): %s", len(channel_tokens), ", ".join(channel_tokens))
-            except Exception as e:
-                logger.error("Error running channel sleep cycles: %s", e)
-            last_channel_sleep_cycle_check = now
-
-        # Poll emails periodically
-        if config.email.enabled and now - last_email_poll >= config.scheduler.email_poll_interval:
+        # Poll emails periodically, or as soon as IDLE reports new mail
+        if config.email.enabled and (
+            email_wakeup.is_set() or now - last_email_poll >= config.scheduler.email_poll_interval
+        ):
+            email_wakeup.clear()
             try:
                 from .email_poller import poll_emails
                 email_tasks = poll_emails(config)
@@ -2537,14 +2621,13 @@ def run_daemon(config: Config) -> None:
                 logger.error("Error running cleanup checks: %s", e)
             last_cleanup_check = now
 
-        # Check heartbeats periodically
+        # Schedule due heartbeat checks on the heartbeat pool (never waits on them)
         if now - last_heartbeat_check >= config.scheduler.heartbeat_check_interval:
             try:
-                from .heartbeat import check_heartbeats
                 with db.get_db(config.db_path) as conn:
-                    checked_users = check_heartbeats(conn, config)
+                    checked_users = heartbeat_runner.schedule(conn)
                     if checked_users:
-                        logger.debug("Checked heartbeats for %d user(s)", len(checked_users))
+                        logger.debug("Scheduled heartbeats for %d user(s)", len(checked_users))
             except Exception as e:
                 logger.error("Error checking heartbeats: %s", e)
             last_heartbeat_check = now
@@ -2578,6 +2661,21 @@ def run_daemon(config: Config) -> None:
 
     # Shutdown workers before releasing lock
     pool.shutdown()
+    heartbeat_runner.shutdown()
+    sleep_runner.shutdown()
+    briefing_runner.shutdown()
+    try:
+        with db.get_db(config.db_path) as conn:
+            heartbeat_runner.flush(conn)
+    except Exception as e:
+        logger.error("Error saving heartbeat state: %s", e)
+
+    from .proxy_hub import get_hub, stop_hub
+    hub = get_hub()
+    if hub is not None:
+        for user_id, user_stats in hub.stats().items():
+            logger.info("Proxy stats for %s: %s", user_id, user_stats)
+        stop_hub()
 
     # Release lock on shutdown
     fcntl.flock(lock_file, fcntl.LOCK_UN)
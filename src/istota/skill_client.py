@@ -2,7 +2,8 @@
 
 Console script entry point ``istota-skill``. When ``ISTOTA_SKILL_PROXY_SOCK``
 is set, connects to the proxy socket and delegates execution. Otherwise falls
-back to running the skill module directly via subprocess.
+back to running the skill module directly via subprocess. On a shared proxy,
+``ISTOTA_SKILL_PROXY_TOKEN`` identifies the task's credential scope.
 
 Usage::
 
@@ -35,7 +36,11 @@ def main() -> None:
 
 def _run_via_proxy(sock_path: str, skill: str, args: list[str]) -> None:
     """Send request to proxy socket, print result, exit with returncode."""
-    request = json.dumps({"skill": skill, "args": args}) + "\n"
+    payload = {"skill": skill, "args": args}
+    token = os.environ.get("ISTOTA_SKILL_PROXY_TOKEN")
+    if token:
+        payload["token"] = token
+    request = json.dumps(payload) + "\n"
 
     try:
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
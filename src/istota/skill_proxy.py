@@ -3,15 +3,29 @@
 Runs skill CLI commands with credentials injected server-side, so the
 Claude subprocess never sees secret env vars. The protocol is one JSON
 request/response per connection, newline-terminated.
+
+With ``warm=True`` skill commands are forked from a shared forkserver that
+has the skill modules (and their heavy dependencies) already imported,
+instead of cold-starting ``python -m istota.skills.<skill>`` per call.
+
+A few commands (whisper transcription) are served by a long-lived worker
+process per skill, so state such as loaded models survives between calls
+without running the skill inside the proxy itself.
 """
 
+import importlib
 import json
 import logging
+import multiprocessing
 import os
+import runpy
 import socket
 import subprocess
 import sys
+import tempfile
 import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
 logger = logging.getLogger("istota.skill_proxy")
@@ -34,6 +48,189 @@ _ALLOWED_SKILLS = frozenset({
     "whisper",
 })
 
+# (skill, subcommand) pairs served by the skill's resident worker process
+# through ``cli.serve(args)``, so they can reuse state that is expensive to
+# rebuild per call (the whisper model pool).
+_RESIDENT_COMMANDS = frozenset({
+    ("whisper", "transcribe"),
+})
+
+_warm_lock = threading.Lock()
+_warm_ctx = None
+
+
+def _get_warm_context():
+    """Return the shared forkserver context, configured to preload skills.
+
+    The forkserver is process-wide: every SkillProxy in the daemon forks
+    from the same warm server, which is started lazily on first use.
+    """
+    global _warm_ctx
+    with _warm_lock:
+        if _warm_ctx is None:
+            ctx = multiprocessing.get_context("forkserver")
+            # Children re-run the parent's main module before the target
+            # (multiprocessing's __mp_main__ fixup); preloading it keeps that
+            # to a no-op for scripts and a cheap re-exec for ``python -m``.
+            preload = ["__main__", __name__]
+            main_spec = getattr(sys.modules.get("__main__"), "__spec__", None)
+            if main_spec is not None and main_spec.name:
+                preload.append(main_spec.name)
+            # Skills with missing optional deps fail to import; the
+            # forkserver ignores ImportError during preload.
+            preload += [f"istota.skills.{s}" for s in sorted(_ALLOWED_SKILLS)]
+            ctx.set_forkserver_preload(preload)
+            _warm_ctx = ctx
+        return _warm_ctx
+
+
+def _ensure_warm_server() -> None:
+    """Start the forkserver (and its skill imports) ahead of the first call."""
+    try:
+        _get_warm_context()
+        from multiprocessing import forkserver
+        forkserver.ensure_running()
+    except Exception:
+        logger.debug("Failed to pre-start skill forkserver", exc_info=True)
+
+
+def _warm_skill_main(
+    skill: str, args: list[str], env: dict[str, str],
+    stdout_path: str, stderr_path: str,
+) -> None:
+    """Entry point of a forked skill worker (runs in the child process).
+
+    Replaces the inherited environment with the scoped one and points fd 1/2
+    at the capture files, so the skill (and anything it spawns) sees exactly
+    what ``subprocess.run(..., env=env, capture_output=True)`` would give it.
+    """
+    os.environ.clear()
+    os.environ.update(env)
+    if hasattr(time, "tzset"):
+        time.tzset()
+    for fd, path in ((1, stdout_path), (2, stderr_path)):
+        out = os.open(path, os.O_WRONLY | os.O_TRUNC)
+        os.dup2(out, fd)
+        os.close(out)
+    module = f"istota.skills.{skill}"
+    sys.argv = [module] + list(args)
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+def _resident_worker_main(skill: str, conn) -> None:
+    """Entry point of a resident skill worker (runs in the child process).
+
+    Serves one ``(args, env)`` request at a time: the environment is replaced
+    with the request's scoped env, as for a forked skill, and the reply is
+    the skill's ``cli.serve(args)`` response (None when it can't serve them).
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    cli = importlib.import_module(f"istota.skills.{skill}.cli")
+    while True:
+        try:
+            args, env = conn.recv()
+        except EOFError:
+            return
+        os.environ.clear()
+        os.environ.update(env)
+        if hasattr(time, "tzset"):
+            time.tzset()
+        try:
+            response = cli.serve(args)
+        except BaseException:
+            response = None
+        conn.send(response)
+
+
+class _ResidentWorker:
+    """Long-lived child process serving one skill's resident commands.
+
+    Shared by every SkillProxy in the daemon. It is started on first use and
+    restarted on the next call after it dies or is killed on a timeout.
+    """
+
+    def __init__(self, skill: str, target=_resident_worker_main):
+        self.skill = skill
+        self.lock = threading.Lock()
+        self._target = target
+        self._proc = None
+        self._conn = None
+
+    def _start(self) -> None:
+        ctx = _get_warm_context()
+        parent_conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(
+            target=self._target,
+            args=(self.skill, child_conn),
+            name=f"skill-{self.skill}-resident",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        self._proc, self._conn = proc, parent_conn
+
+    def stop(self) -> None:
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._proc = self._conn = None
+
+    def run(self, args: list[str], env: dict[str, str], timeout: float) -> dict | None:
+        """Serve one call; the caller must hold ``self.lock``.
+
+        Returns the response, a 124 response (after killing the worker) if it
+        doesn't answer within ``timeout``, or None if the worker couldn't
+        start, died, or can't serve these args.
+        """
+        try:
+            if self._proc is None or not self._proc.is_alive():
+                self.stop()
+                self._start()
+            self._conn.send((list(args), env))
+            if not self._conn.poll(timeout):
+                self.stop()
+                return {
+                    "stdout": "",
+                    "stderr": f"Skill command timed out after {timeout}s",
+                    "returncode": 124,
+                }
+            return self._conn.recv()
+        except Exception:
+            logger.warning(
+                "Resident %s worker failed, running the CLI instead",
+                self.skill, exc_info=True,
+            )
+            self.stop()
+            return None
+
+
+_resident_lock = threading.Lock()
+_resident_workers: dict[str, _ResidentWorker] = {}
+
+
+def _get_resident_worker(skill: str) -> _ResidentWorker:
+    """Return the process-wide resident worker for ``skill``."""
+    with _resident_lock:
+        worker = _resident_workers.get(skill)
+        if worker is None:
+            worker = _resident_workers[skill] = _ResidentWorker(skill)
+        return worker
+
+
+@dataclass
+class _SkillScope:
+    """Credentials and env one task's skill calls are allowed to use."""
+    credential_env: dict[str, str]
+    base_env: dict[str, str]
+    allowed_credentials: set[str] | None = None
+    skill_credential_map: dict[str, set[str]] | None = None
+    calls: int = 0
+    total_ms: float = 0.0
+
 
 class SkillProxy:
     """Unix socket server that proxies skill CLI commands with credentials.
@@ -46,6 +243,11 @@ class SkillProxy:
 
     The server accepts connections, reads a JSON request, runs the skill
     CLI with merged env (base_env + credential_env), and returns the result.
+
+    A long-lived proxy shared by several tasks (see ``proxy_hub``) is created
+    with ``require_token=True`` and holds one scope per task, registered via
+    ``register_scope()``. Requests then carry the task's ``token`` and are
+    served with that scope's credentials only.
     """
 
     def __init__(
@@ -56,6 +258,8 @@ class SkillProxy:
         timeout: int = 300,
         allowed_credentials: set[str] | None = None,
         skill_credential_map: dict[str, set[str]] | None = None,
+        warm: bool = False,
+        require_token: bool = False,
     ):
         self.socket_path = socket_path
         self.credential_env = credential_env
@@ -63,10 +267,62 @@ class SkillProxy:
         self.timeout = timeout
         self.allowed_credentials = allowed_credentials
         self.skill_credential_map = skill_credential_map
+        self.warm = warm
+        self.require_token = require_token
+        self._scopes: dict[str, _SkillScope] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "connections": 0, "active": 0, "skill_calls": 0,
+            "total_ms": 0.0, "max_ms": 0.0,
+        }
         self._server_sock: socket.socket | None = None
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
 
+    def register_scope(
+        self,
+        token: str,
+        credential_env: dict[str, str],
+        base_env: dict[str, str],
+        allowed_credentials: set[str] | None = None,
+        skill_credential_map: dict[str, set[str]] | None = None,
+    ) -> None:
+        """Make a task's credential scope reachable under ``token``."""
+        with self._lock:
+            self._scopes[token] = _SkillScope(
+                credential_env, base_env, allowed_credentials, skill_credential_map,
+            )
+
+    def revoke_scope(self, token: str) -> dict:
+        """Drop a task's scope. Returns its call count and latency."""
+        with self._lock:
+            scope = self._scopes.pop(token, None)
+        if scope is None:
+            return {"skill_calls": 0, "total_ms": 0.0}
+        return {"skill_calls": scope.calls, "total_ms": round(scope.total_ms, 1)}
+
+    def stats(self) -> dict:
+        """Connection counts and skill call latency since start."""
+        with self._lock:
+            result = dict(self._stats)
+            result["scopes"] = len(self._scopes)
+        calls = result["skill_calls"]
+        result["avg_ms"] = round(result["total_ms"] / calls, 1) if calls else 0.0
+        result["total_ms"] = round(result["total_ms"], 1)
+        result["max_ms"] = round(result["max_ms"], 1)
+        return result
+
+    def _resolve_scope(self, token: str | None) -> _SkillScope | None:
+        if token:
+            with self._lock:
+                return self._scopes.get(token)
+        if self.require_token:
+            return None
+        return _SkillScope(
+            self.credential_env, self.base_env,
+            self.allowed_credentials, self.skill_credential_map,
+        )
+
     def start(self) -> None:
         # Clean up stale socket file
         if self.socket_path.exists():
@@ -81,6 +337,10 @@ class SkillProxy:
             target=self._accept_loop, daemon=True, name="skill-proxy",
         )
         self._thread.start()
+        if self.warm:
+            threading.Thread(
+                target=_ensure_warm_server, daemon=True, name="skill-forkserver",
+            ).start()
         logger.debug("Skill proxy started on %s", self.socket_path)
 
     def stop(self) -> None:
@@ -124,6 +384,9 @@ class SkillProxy:
             handler.start()
 
     def _handle_connection(self, conn: socket.socket) -> None:
+        with self._lock:
+            self._stats["connections"] += 1
+            self._stats["active"] += 1
         try:
             conn.settimeout(self.timeout + 10)  # Allow for subprocess timeout + buffer
             data = self._recv_all(conn)
@@ -140,20 +403,33 @@ class SkillProxy:
                 })
                 return
 
+            scope = self._resolve_scope(request.get("token"))
+
             # Route by request type: "credential" for lookups, default for skill calls
             req_type = request.get("type")
 
             if req_type == "credential":
+                if scope is None:
+                    self._send_response(conn, {"error": "Unknown or expired proxy token"})
+                    return
                 name = request.get("name", "")
                 # Scope check: if allowed_credentials is set, only return
                 # credentials needed by the selected skills for this task.
-                if self.allowed_credentials is not None and name not in self.allowed_credentials:
+                if scope.allowed_credentials is not None and name not in scope.allowed_credentials:
                     self._send_response(conn, {"error": f"Credential not available for this task: {name!r}"})
                     return
-                if name not in self.credential_env:
+                if name not in scope.credential_env:
                     self._send_response(conn, {"error": f"Unknown credential: {name!r}"})
                     return
-                self._send_response(conn, {"value": self.credential_env[name]})
+                self._send_response(conn, {"value": scope.credential_env[name]})
+                return
+
+            if scope is None:
+                self._send_response(conn, {
+                    "stdout": "",
+                    "stderr": "Unknown or expired proxy token",
+                    "returncode": 1,
+                })
                 return
 
             skill = request.get("skill", "")
@@ -168,54 +444,150 @@ class SkillProxy:
                 })
                 return
 
-            # Build command
-            cmd = [sys.executable, "-m", f"istota.skills.{skill}"] + args
-
             # Merge envs: base gets only the credentials this skill needs
-            merged_env = dict(self.base_env)
-            if self.skill_credential_map is not None:
-                allowed_vars = self.skill_credential_map.get(skill, set())
+            merged_env = dict(scope.base_env)
+            if scope.skill_credential_map is not None:
+                allowed_vars = scope.skill_credential_map.get(skill, set())
                 for var in allowed_vars:
-                    if var in self.credential_env:
-                        merged_env[var] = self.credential_env[var]
+                    if var in scope.credential_env:
+                        merged_env[var] = scope.credential_env[var]
             else:
                 # Backward compat: no map means all credentials
-                merged_env.update(self.credential_env)
+                merged_env.update(scope.credential_env)
 
-            try:
-                result = subprocess.run(
-                    cmd,
-                    env=merged_env,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout,
-                )
-                self._send_response(conn, {
-                    "stdout": result.stdout,
-                    "stderr": result.stderr,
-                    "returncode": result.returncode,
-                })
-            except subprocess.TimeoutExpired:
-                self._send_response(conn, {
-                    "stdout": "",
-                    "stderr": f"Skill command timed out after {self.timeout}s",
-                    "returncode": 124,
-                })
-            except Exception as e:
-                self._send_response(conn, {
-                    "stdout": "",
-                    "stderr": f"Failed to run skill: {e}",
-                    "returncode": 1,
-                })
+            started = time.monotonic()
+            response = None
+            if args and (skill, args[0]) in _RESIDENT_COMMANDS:
+                response = self._run_resident(skill, args, merged_env)
+            if response is None and self.warm:
+                response = self._run_warm(skill, args, merged_env)
+            if response is None:
+                response = self._run_cold(skill, args, merged_env)
+            elapsed_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                scope.calls += 1
+                scope.total_ms += elapsed_ms
+                self._stats["skill_calls"] += 1
+                self._stats["total_ms"] += elapsed_ms
+                self._stats["max_ms"] = max(self._stats["max_ms"], elapsed_ms)
+            self._send_response(conn, response)
 
         except Exception:
             logger.debug("Error handling proxy connection", exc_info=True)
         finally:
+            with self._lock:
+                self._stats["active"] -= 1
             try:
                 conn.close()
             except OSError:
                 pass
 
+    def _run_resident(self, skill: str, args: list[str], env: dict[str, str]) -> dict | None:
+        """Serve the command in the skill's resident worker process.
+
+        Returns None (run it as a child instead) if the worker is busy with
+        another call, died, or can't serve these args.
+        """
+        worker = _get_resident_worker(skill)
+        if not worker.lock.acquire(blocking=False):
+            return None
+        try:
+            return worker.run(args, env, self.timeout)
+        finally:
+            worker.lock.release()
+
+    def _run_cold(self, skill: str, args: list[str], env: dict[str, str]) -> dict:
+        """Run the skill CLI in a fresh interpreter."""
+        cmd = [sys.executable, "-m", f"istota.skills.{skill}"] + args
+        try:
+            result = subprocess.run(
+                cmd,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+            return {
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "returncode": result.returncode,
+            }
+        except subprocess.TimeoutExpired:
+            return {
+                "stdout": "",
+                "stderr": f"Skill command timed out after {self.timeout}s",
+                "returncode": 124,
+            }
+        except Exception as e:
+            return {
+                "stdout": "",
+                "stderr": f"Failed to run skill: {e}",
+                "returncode": 1,
+            }
+
+    def _run_warm(self, skill: str, args: list[str], env: dict[str, str]) -> dict | None:
+        """Run the skill CLI in a child forked from the preloaded forkserver.
+
+        Output is captured through private temp files rather than pipes so
+        large outputs can't deadlock the child before it exits. Returns None
+        if the worker could not be started, so the caller can fall back to a
+        cold subprocess without risking running the command twice.
+        """
+        out_path = err_path = None
+        try:
+            ctx = _get_warm_context()
+            out_fd, out_path = tempfile.mkstemp(prefix="istota-skill-", suffix=".out")
+            os.close(out_fd)
+            err_fd, err_path = tempfile.mkstemp(prefix="istota-skill-", suffix=".err")
+            os.close(err_fd)
+            proc = ctx.Process(
+                target=_warm_skill_main,
+                args=(skill, list(args), env, out_path, err_path),
+                name=f"skill-{skill}",
+            )
+            proc.start()
+        except Exception:
+            logger.warning(
+                "Warm skill worker unavailable for %s, falling back to subprocess",
+                skill, exc_info=True,
+            )
+            self._remove_capture_files(out_path, err_path)
+            return None
+
+        try:
+            proc.join(self.timeout)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+                return {
+                    "stdout": "",
+                    "stderr": f"Skill command timed out after {self.timeout}s",
+                    "returncode": 124,
+                }
+            return {
+                "stdout": Path(out_path).read_text(errors="replace"),
+                "stderr": Path(err_path).read_text(errors="replace"),
+                "returncode": proc.exitcode,
+            }
+        except Exception as e:
+            return {
+                "stdout": "",
+                "stderr": f"Failed to run skill: {e}",
+                "returncode": 1,
+            }
+        finally:
+            self._remove_capture_files(out_path, err_path)
+
+    @staticmethod
+    def _remove_capture_files(*paths: str | None) -> None:
+        for path in paths:
+            if path is None:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
     @staticmethod
     def _recv_all(conn: socket.socket) -> str:
         """Read until newline (protocol delimiter)."""
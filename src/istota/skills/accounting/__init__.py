@@ -6,10 +6,11 @@ Provides a CLI for ledger operations from Claude Code:
     python -m istota.skills.accounting query "BQL"
     python -m istota.skills.accounting report TYPE [--year YYYY]
     python -m istota.skills.accounting lots SYMBOL
-    python -m istota.skills.accounting wash-sales [--year YYYY]
+    python -m istota.skills.accounting wash-sales [--year YYYY] [--end-year YYYY]
     python -m istota.skills.accounting import-monarch FILE --account ACCT [--tag TAG] [--exclude-tag TAG]
     python -m istota.skills.accounting sync-monarch [--dry-run]
     python -m istota.skills.accounting add-transaction --date DATE --payee PAYEE ...
+    python -m istota.skills.accounting add-transactions FILE
     python -m istota.skills.accounting invoice generate [--period YYYY-MM] [--client CLIENT]
     python -m istota.skills.accounting invoice list [--client CLIENT] [--overdue]
     python -m istota.skills.accounting invoice paid INV-XXX --date YYYY-MM-DD
@@ -17,12 +18,12 @@ Provides a CLI for ledger operations from Claude Code:
 """
 
 import argparse
+import asyncio
 import csv
 import hashlib
 import json
 import os
 import re
-import subprocess
 import sys
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
@@ -33,6 +34,10 @@ try:
 except ImportError:
     tomli = None  # type: ignore
 
+from . import ledger as ledger_engine
+from . import txn_index
+from .write_session import LedgerWriteSession, backup_file
+
 
 # =============================================================================
 # Monarch Money Configuration Dataclasses
@@ -53,6 +58,7 @@ class MonarchSyncSettings:
     lookback_days: int = 30
     default_account: str = "Assets:Bank:Checking"
     recategorize_account: str = "Expenses:Personal-Expense"
+    reconcile_interval_hours: int = 24
 
 
 @dataclass
@@ -123,6 +129,7 @@ def parse_accounting_config(config_path: Path) -> MonarchConfig:
         lookback_days=sync_data.get("lookback_days", 30),
         default_account=sync_data.get("default_account", "Assets:Bank:Checking"),
         recategorize_account=sync_data.get("recategorize_account", "Expenses:Personal-Expense"),
+        reconcile_interval_hours=sync_data.get("reconcile_interval_hours", 24),
     )
 
     accounts = monarch.get("accounts", {})
@@ -180,67 +187,38 @@ def _get_ledger_path(ledger_name: str | None = None) -> Path:
     return Path(path)
 
 
-def _run_bean_check(ledger_path: Path) -> tuple[bool, list[str]]:
-    """Run bean-check on the ledger file.
+def _run_bean_check(
+    ledger_path: Path,
+    staged: dict[Path, str] | None = None,
+) -> tuple[bool, list[str]]:
+    """Validate the ledger like bean-check, against the cached load.
+
+    With staged (see LedgerWriteSession.pending), the ledger is checked as
+    if that text were appended, and only the errors it would introduce are
+    reported.
 
     Returns:
         Tuple of (success, list of error messages)
     """
-    try:
-        result = subprocess.run(
-            ["bean-check", str(ledger_path)],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        if result.returncode == 0:
-            return True, []
-
-        # Parse errors from stderr
-        errors = [line.strip() for line in result.stderr.strip().split("\n") if line.strip()]
-        return False, errors
-    except FileNotFoundError:
-        raise ValueError("bean-check not found. Is beancount installed?")
-    except subprocess.TimeoutExpired:
-        raise ValueError("bean-check timed out")
+    if staged is None:
+        errors = ledger_engine.check_ledger(ledger_path)
+    else:
+        errors = ledger_engine.check_staged(ledger_path, staged)
+    return not errors, errors
 
 
 def _run_bean_query(ledger_path: Path, query: str) -> list[dict]:
-    """Run bean-query and return results as list of dicts.
+    """Run a BQL query against the cached ledger.
 
     Args:
         ledger_path: Path to ledger file
         query: BQL query string
 
     Returns:
-        List of result rows as dictionaries
+        List of result rows as dictionaries, values rendered as strings
+        the way ``bean-query -f csv`` prints them
     """
-    try:
-        result = subprocess.run(
-            ["bean-query", str(ledger_path), query, "-f", "csv"],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() or "Query failed"
-            raise ValueError(error_msg)
-
-        # Parse CSV output
-        output = result.stdout.strip()
-        if not output:
-            return []
-
-        rows = []
-        reader = csv.DictReader(output.split("\n"))
-        for row in reader:
-            rows.append(dict(row))
-
-        return rows
-    except FileNotFoundError:
-        raise ValueError("bean-query not found. Is beancount installed?")
-    except subprocess.TimeoutExpired:
-        raise ValueError("bean-query timed out")
+    return ledger_engine.query_text_rows(ledger_path, query)
 
 
 def cmd_check(args) -> dict:
@@ -371,6 +349,7 @@ class SaleTransaction:
     proceeds: float
     cost_basis: float
     gain_loss: float
+    lot_date: date | None = None  # Acquisition date of the lot sold
 
 
 @dataclass
@@ -384,21 +363,26 @@ class PurchaseTransaction:
 
 
 def _parse_transactions_for_wash_sales(
-    ledger_path: Path, year: int
+    ledger_path: Path, year: int, end_year: int | None = None,
 ) -> tuple[list[SaleTransaction], list[PurchaseTransaction]]:
     """Parse ledger for sales with losses and purchases for wash sale detection.
 
+    Covers ``year`` through ``end_year`` (inclusive, default ``year``).
+
     Returns:
         Tuple of (sales with losses, all purchases in wash sale window)
     """
     # Get sales (negative units indicates a sale)
-    # We need to look at the year and 30 days before/after
+    # We need to look at the years and 30 days before/after
     start_date = date(year, 1, 1) - timedelta(days=30)
-    end_date = date(year, 12, 31) + timedelta(days=30)
+    end_date = date(end_year or year, 12, 31) + timedelta(days=30)
 
+    # Postings held at cost: negative units are sales, positive are purchases
     sales_query = f"""
-        SELECT date, account, currency, units(position), cost(position), value(position)
-        WHERE units(position) < 0
+        SELECT date, account, currency, units(position), cost(position), cost_date, price,
+            value(position)
+        WHERE number < 0
+        AND cost_number IS NOT NULL
         AND date >= {start_date.isoformat()}
         AND date <= {end_date.isoformat()}
         AND account ~ '^Assets:'
@@ -407,79 +391,71 @@ def _parse_transactions_for_wash_sales(
 
     purchases_query = f"""
         SELECT date, account, currency, units(position), cost(position)
-        WHERE units(position) > 0
+        WHERE number > 0
+        AND cost_number IS NOT NULL
         AND date >= {start_date.isoformat()}
         AND date <= {end_date.isoformat()}
         AND account ~ '^Assets:'
         ORDER BY date
     """
 
+    # Rows come back typed (date, Amount), so no string parsing is needed
     sales = []
     try:
-        sale_rows = _run_bean_query(ledger_path, sales_query)
-        for row in sale_rows:
-            try:
-                # Parse the date
-                txn_date = datetime.strptime(row.get("date", ""), "%Y-%m-%d").date()
-
-                # Parse units (negative for sales)
-                units_str = row.get("units(position)", "0")
-                units = abs(float(re.sub(r"[^\d.-]", "", units_str.split()[0])))
-
-                # Parse cost basis
-                cost_str = row.get("cost(position)", "0")
-                cost_match = re.search(r"([\d.]+)", cost_str)
-                cost_basis = float(cost_match.group(1)) if cost_match else 0.0
-
-                # Parse proceeds (value)
-                value_str = row.get("value(position)", "0")
-                value_match = re.search(r"([\d.]+)", value_str)
-                proceeds = float(value_match.group(1)) if value_match else 0.0
-
-                # Calculate gain/loss
-                gain_loss = proceeds - cost_basis
-
-                # Only include losses
-                if gain_loss < 0:
-                    sales.append(SaleTransaction(
-                        date=txn_date,
-                        account=row.get("account", ""),
-                        symbol=row.get("currency", ""),
-                        units=units,
-                        proceeds=proceeds,
-                        cost_basis=cost_basis,
-                        gain_loss=gain_loss,
-                    ))
-            except (ValueError, TypeError):
-                continue
+        sale_rows = ledger_engine.query_rows(ledger_path, sales_query)
     except ValueError:
-        pass
+        sale_rows = []
+    for row in sale_rows:
+        units_amount = row.get("units(position)")
+        cost_amount = row.get("cost(position)")
+        if units_amount is None or cost_amount is None:
+            continue
+        units = abs(float(units_amount.number))
+        cost_basis = abs(float(cost_amount.number))
+
+        # Proceeds from the sale price; value() only differs from the units
+        # when the ledger has a price for the symbol
+        price = row.get("price")
+        value = row.get("value(position)")
+        if price is not None:
+            proceeds = units * float(price.number)
+        elif value is not None and value.currency != units_amount.currency:
+            proceeds = abs(float(value.number))
+        else:
+            continue
+
+        gain_loss = proceeds - cost_basis
+
+        # Only include losses
+        if gain_loss < 0:
+            sales.append(SaleTransaction(
+                date=row["date"],
+                account=row.get("account", ""),
+                symbol=row.get("currency", ""),
+                units=units,
+                proceeds=proceeds,
+                cost_basis=cost_basis,
+                gain_loss=gain_loss,
+                lot_date=row.get("cost_date"),
+            ))
 
     purchases = []
     try:
-        purchase_rows = _run_bean_query(ledger_path, purchases_query)
-        for row in purchase_rows:
-            try:
-                txn_date = datetime.strptime(row.get("date", ""), "%Y-%m-%d").date()
-
-                units_str = row.get("units(position)", "0")
-                units = float(re.sub(r"[^\d.-]", "", units_str.split()[0]))
-
-                cost_str = row.get("cost(position)", "0")
-                cost_match = re.search(r"([\d.]+)", cost_str)
-                cost = float(cost_match.group(1)) if cost_match else 0.0
-
-                purchases.append(PurchaseTransaction(
-                    date=txn_date,
-                    account=row.get("account", ""),
-                    symbol=row.get("currency", ""),
-                    units=units,
-                    cost=cost,
-                ))
-            except (ValueError, TypeError):
-                continue
+        purchase_rows = ledger_engine.query_rows(ledger_path, purchases_query)
     except ValueError:
-        pass
+        purchase_rows = []
+    for row in purchase_rows:
+        units_amount = row.get("units(position)")
+        cost_amount = row.get("cost(position)")
+        if units_amount is None:
+            continue
+        purchases.append(PurchaseTransaction(
+            date=row["date"],
+            account=row.get("account", ""),
+            symbol=row.get("currency", ""),
+            units=float(units_amount.number),
+            cost=float(cost_amount.number) if cost_amount is not None else 0.0,
+        ))
 
     return sales, purchases
 
@@ -488,46 +464,101 @@ def _detect_wash_sales(
     sales: list[SaleTransaction],
     purchases: list[PurchaseTransaction],
     year: int,
+    end_year: int | None = None,
 ) -> list[dict]:
     """Detect wash sale violations.
 
     A wash sale occurs when you sell a security at a loss and purchase
     substantially identical securities within 30 days before or after the sale.
-    """
-    violations = []
 
-    for sale in sales:
-        # Only check sales in the target year
-        if sale.date.year != year:
-            continue
+    Sales and purchases are grouped by symbol and swept in date order with
+    a sliding 61-day window over the purchases, so the cost is
+    O((sales + purchases) log n) rather than sales x purchases. Each
+    replacement share offsets one share of loss, earliest sale first; when
+    fewer shares are bought back than were sold, only that fraction of the
+    loss is disallowed. The shares sold themselves (purchases of the lot's
+    acquisition date) don't count as replacements.
 
-        # Find purchases of same symbol within 30 days
-        wash_window_start = sale.date - timedelta(days=30)
-        wash_window_end = sale.date + timedelta(days=30)
+    Reports sales dated in ``year`` through ``end_year`` (default ``year``);
+    sales just outside the range still consume replacement shares.
+    """
+    last_year = end_year or year
+    window = timedelta(days=30)
+
+    purchases_by_symbol: dict[str, list[PurchaseTransaction]] = {}
+    for p in purchases:
+        if p.units > 0:
+            purchases_by_symbol.setdefault(p.symbol, []).append(p)
+    sales_by_symbol: dict[str, list[SaleTransaction]] = {}
+    for sale in sales:
+        if sale.gain_loss < 0 and sale.symbol in purchases_by_symbol:
+            sales_by_symbol.setdefault(sale.symbol, []).append(sale)
 
-        matching_purchases = [
-            p for p in purchases
-            if p.symbol == sale.symbol
-            and wash_window_start <= p.date <= wash_window_end
-            and p.date != sale.date  # Exclude same-day transactions
-        ]
+    violations = []
+    for symbol, symbol_sales in sales_by_symbol.items():
+        symbol_purchases = sorted(purchases_by_symbol[symbol], key=lambda p: p.date)
+        available = [p.units for p in symbol_purchases]
+
+        # The shares being sold were bought on the lot date; they are not
+        # replacement shares for their own sale
+        lot_purchases: dict[tuple[str, date], list[int]] = {}
+        for i, p in enumerate(symbol_purchases):
+            lot_purchases.setdefault((p.account, p.date), []).append(i)
+        for sale in symbol_sales:
+            remaining = sale.units
+            for i in lot_purchases.get((sale.account, sale.lot_date), ()):
+                taken = min(available[i], remaining)
+                available[i] -= taken
+                remaining -= taken
+
+        symbol_sales.sort(key=lambda s: s.date)
+        lo = hi = 0
+        for sale in symbol_sales:
+            while hi < len(symbol_purchases) and symbol_purchases[hi].date <= sale.date + window:
+                hi += 1
+            # A purchase that is used up, or too old for this sale, is no use
+            # to any later sale either
+            while lo < hi and (
+                symbol_purchases[lo].date < sale.date - window or available[lo] <= 0
+            ):
+                lo += 1
+
+            needed = sale.units
+            matched = []
+            for i in range(lo, hi):
+                if needed <= 0:
+                    break
+                p = symbol_purchases[i]
+                if available[i] <= 0 or p.date == sale.date:  # Exclude same-day transactions
+                    continue
+                units = min(available[i], needed)
+                available[i] -= units
+                needed -= units
+                matched.append((p, units))
 
-        if matching_purchases:
+            if not matched or not year <= sale.date.year <= last_year:
+                continue
+            replacement_units = sale.units - needed
+            fraction = replacement_units / sale.units if sale.units else 1.0
             violations.append({
                 "sale_date": sale.date.isoformat(),
                 "symbol": sale.symbol,
                 "units_sold": sale.units,
                 "loss_amount": round(sale.gain_loss, 2),
+                "replacement_units": replacement_units,
+                "disallowed_loss": round(-sale.gain_loss * fraction, 2),
                 "triggering_purchases": [
                     {
                         "date": p.date.isoformat(),
                         "units": p.units,
+                        "units_matched": units,
                         "days_from_sale": (p.date - sale.date).days,
                     }
-                    for p in matching_purchases
+                    for p, units in matched
                 ],
             })
 
+    violations.sort(key=lambda v: (v["sale_date"], v["symbol"]))
     return violations
 
 
@@ -535,18 +566,25 @@ def cmd_wash_sales(args) -> dict:
     """Detect potential wash sale violations."""
     ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
     year = args.year or date.today().year
+    end_year = getattr(args, 'end_year', None)
+    if end_year is not None and end_year < year:
+        return {"status": "error", "error": "--end-year must not be before --year"}
 
     try:
-        sales, purchases = _parse_transactions_for_wash_sales(ledger_path, year)
-        violations = _detect_wash_sales(sales, purchases, year)
+        sales, purchases = _parse_transactions_for_wash_sales(ledger_path, year, end_year)
+        violations = _detect_wash_sales(sales, purchases, year, end_year)
 
-        return {
+        last_year = end_year or year
+        result = {
             "status": "ok",
             "year": year,
-            "sales_with_losses": len(sales),
+            "sales_with_losses": sum(1 for s in sales if year <= s.date.year <= last_year),
             "violation_count": len(violations),
             "violations": violations,
         }
+        if end_year is not None:
+            result["end_year"] = end_year
+        return result
     except ValueError as e:
         return {"status": "error", "error": str(e)}
 
@@ -761,6 +799,7 @@ def _write_deferred_tracking(
     csv_imported: list[dict] | None = None,
     monarch_recategorized: list[str] | None = None,
     monarch_category_updates: list[dict] | None = None,
+    monarch_sync_cursor: dict | None = None,
 ) -> bool | None:
     """Write deferred transaction tracking to JSON file for scheduler processing.
 
@@ -794,6 +833,8 @@ def _write_deferred_tracking(
         existing["monarch_recategorized"].extend(monarch_recategorized)
     if monarch_category_updates:
         existing.setdefault("monarch_category_updates", []).extend(monarch_category_updates)
+    if monarch_sync_cursor:
+        existing["monarch_sync_cursor"] = monarch_sync_cursor
 
     path.write_text(json.dumps(existing))
     return True
@@ -831,32 +872,27 @@ def cmd_import_monarch(args) -> dict:
     db_path = Path(db_path_str) if db_path_str else None
     user_id = os.environ.get("ISTOTA_USER_ID", "default")
 
-    db_conn = None
+    txn_hashes = [
+        compute_transaction_hash(txn["date"].isoformat(), abs(txn["amount"]), txn["merchant"])
+        for txn in transactions
+    ]
+    synced_hashes: set[str] = set()
     if db_path:
-        from istota.db import get_db, is_content_hash_synced
+        from istota.db import get_db, get_synced_content_hashes
+        with get_db(db_path) as conn:
+            synced_hashes = get_synced_content_hashes(conn, user_id, txn_hashes)
 
     # Build beancount entries, skipping duplicates
     entries = []
     content_hashes = []
     content_skipped_count = 0
 
-    for txn in transactions:
-        content_hash = compute_transaction_hash(
-            txn["date"].isoformat(), abs(txn["amount"]), txn["merchant"],
-        )
-
-        # Check ledger
-        if content_hash in ledger_hashes:
+    for txn, content_hash in zip(transactions, txn_hashes):
+        # Check ledger and DB
+        if content_hash in ledger_hashes or content_hash in synced_hashes:
             content_skipped_count += 1
             continue
 
-        # Check DB
-        if db_path:
-            with get_db(db_path) as conn:
-                if is_content_hash_synced(conn, user_id, content_hash):
-                    content_skipped_count += 1
-                    continue
-
         posting_account = _map_monarch_category(txn["category"])
 
         entry = _format_beancount_transaction(
@@ -967,19 +1003,16 @@ def _map_monarch_category_with_config(
     return _map_monarch_category(category)
 
 
-async def _fetch_monarch_transactions(
-    config: MonarchConfig,
-    lookback_days: int,
-) -> list[dict]:
-    """Fetch transactions from Monarch Money API.
+# Monarch API paging and request fan-out
+_MONARCH_PAGE_SIZE = 100
+_MONARCH_CONCURRENCY = 8
+# Incremental syncs re-request this many days before the cursor, so pending
+# transactions that post (or get tagged) a few days late are still seen
+_SYNC_OVERLAP_DAYS = 7
 
-    Args:
-        config: MonarchConfig with credentials
-        lookback_days: Number of days to look back
 
-    Returns:
-        List of transaction dicts from Monarch API
-    """
+async def _monarch_client(config: MonarchConfig):
+    """Create an authenticated Monarch Money client."""
     try:
         from monarchmoney import MonarchMoney
     except ImportError:
@@ -993,16 +1026,128 @@ async def _fetch_monarch_transactions(
         await mm.login(config.credentials.email, config.credentials.password)
     else:
         raise ValueError("No Monarch credentials configured (need email+password or session_token)")
+    return mm
+
+
+async def _fetch_monarch_transactions(
+    mm,
+    start_date: date,
+    end_date: date,
+    concurrency: int = _MONARCH_CONCURRENCY,
+) -> list[dict]:
+    """Fetch all transactions between two dates from Monarch Money API.
+
+    The first page reports the total count; the remaining pages are then
+    requested concurrently, at most `concurrency` at a time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_page(offset: int) -> dict:
+        async with semaphore:
+            page = await mm.get_transactions(
+                limit=_MONARCH_PAGE_SIZE,
+                offset=offset,
+                start_date=start_date.isoformat(),
+                end_date=end_date.isoformat(),
+            )
+        return page.get("allTransactions", {})
+
+    first = await fetch_page(0)
+    transactions = list(first.get("results", []))
+    total = first.get("totalCount")
+    if len(transactions) < _MONARCH_PAGE_SIZE:
+        return transactions
+
+    if total is not None:
+        pages = await asyncio.gather(*(
+            fetch_page(offset) for offset in range(_MONARCH_PAGE_SIZE, total, _MONARCH_PAGE_SIZE)
+        ))
+        for page in pages:
+            transactions.extend(page.get("results", []))
+        return transactions
 
-    # Fetch transactions
-    start_date = date.today() - timedelta(days=lookback_days)
-    end_date = date.today()
-    transactions = await mm.get_transactions(
-        start_date=start_date.isoformat(),
-        end_date=end_date.isoformat(),
+    # No total reported: page until a short page
+    offset = _MONARCH_PAGE_SIZE
+    while True:
+        results = (await fetch_page(offset)).get("results", [])
+        transactions.extend(results)
+        if len(results) < _MONARCH_PAGE_SIZE:
+            return transactions
+        offset += _MONARCH_PAGE_SIZE
+
+
+async def _fetch_transactions_by_ids(
+    mm,
+    transaction_ids: list[str],
+    concurrency: int = _MONARCH_CONCURRENCY,
+) -> dict[str, dict]:
+    """Fetch specific transactions from Monarch by ID.
+
+    Requests run concurrently, at most `concurrency` at a time. Transactions
+    that can't be fetched (e.g. deleted in Monarch) are left out.
+
+    Returns a dict mapping transaction_id -> transaction data.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(txn_id: str) -> dict | None:
+        async with semaphore:
+            try:
+                details = await mm.get_transaction_details(txn_id)
+            except Exception:
+                return None
+        return (details or {}).get("getTransaction")
+
+    results = await asyncio.gather(*(fetch(txn_id) for txn_id in transaction_ids))
+    return {txn["id"]: txn for txn in results if txn and txn.get("id")}
+
+
+async def _fetch_monarch_sync(
+    config: MonarchConfig,
+    start_date: date,
+    end_date: date,
+    reconcile_ids: list[str],
+) -> tuple[list[dict], dict[str, dict]]:
+    """Fetch a sync window plus, by ID, synced transactions outside it.
+
+    Both run concurrently on one authenticated client.
+
+    Returns (window transactions, transaction_id -> transaction data).
+    """
+    mm = await _monarch_client(config)
+    return await asyncio.gather(
+        _fetch_monarch_transactions(mm, start_date, end_date),
+        _fetch_transactions_by_ids(mm, reconcile_ids),
     )
 
-    return transactions.get("allTransactions", {}).get("results", [])
+
+def _monarch_sync_window(
+    config: MonarchConfig,
+    cursor: dict | None,
+    now: datetime,
+) -> tuple[date, bool]:
+    """Work out where a sync starts and whether a full reconcile is due.
+
+    Without a cursor the whole lookback window is fetched. With one, only
+    the days since the last sync (plus an overlap) are; synced transactions
+    older than that are re-fetched by ID once reconcile_interval_hours has
+    passed since the last full reconcile.
+
+    Returns (start_date, reconcile_due).
+    """
+    lookback_start = now.date() - timedelta(days=config.sync.lookback_days)
+    if not cursor:
+        # Fetching the whole window reconciles everything in it
+        return lookback_start, True
+    try:
+        synced_through = date.fromisoformat(cursor["synced_through"])
+        reconciled_at = datetime.fromisoformat(cursor["reconciled_at"])
+    except (KeyError, TypeError, ValueError):
+        return lookback_start, True
+
+    start_date = max(lookback_start, synced_through - timedelta(days=_SYNC_OVERLAP_DAYS))
+    interval = timedelta(hours=config.sync.reconcile_interval_hours)
+    return start_date, now - reconciled_at >= interval
 
 
 def _format_recategorization_entry(
@@ -1042,134 +1187,47 @@ def _format_category_change_entry(
     return "\n".join(lines)
 
 
-async def _fetch_transactions_by_ids(
-    config: MonarchConfig,
-    transaction_ids: list[str],
-) -> dict[str, dict]:
-    """Fetch specific transactions from Monarch by ID.
-
-    Returns a dict mapping transaction_id -> transaction data.
-    """
-    try:
-        from monarchmoney import MonarchMoney
-    except ImportError:
-        raise ValueError("monarchmoneycommunity package is required for API sync")
-
-    # Authenticate
-    if config.credentials.session_token:
-        mm = MonarchMoney(token=config.credentials.session_token)
-    elif config.credentials.email and config.credentials.password:
-        mm = MonarchMoney()
-        await mm.login(config.credentials.email, config.credentials.password)
-    else:
-        raise ValueError("No Monarch credentials configured")
-
-    # Fetch all transactions in a wide range to find the ones we need
-    # Use a large lookback to cover historical transactions
-    start_date = date.today() - timedelta(days=365)
-    end_date = date.today()
-    all_txns = await mm.get_transactions(
-        start_date=start_date.isoformat(),
-        end_date=end_date.isoformat(),
-    )
-
-    results = all_txns.get("allTransactions", {}).get("results", [])
-    return {txn.get("id"): txn for txn in results if txn.get("id") in transaction_ids}
-
-
 def _backup_ledger(ledger_path: Path, max_backups: int = 10) -> Path | None:
     """Create a timestamped backup of the ledger file before modification.
 
     Rotates old backups, keeping at most max_backups files.
     Returns the backup path, or None if the ledger doesn't exist.
     """
-    if not ledger_path.exists():
-        return None
-
-    backups_dir = ledger_path.parent / "backups"
-    backups_dir.mkdir(exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = backups_dir / f"{ledger_path.name}.{timestamp}"
-
-    import shutil
-    shutil.copy2(ledger_path, backup_path)
-
-    # Prune old backups beyond max_backups
-    existing = sorted(backups_dir.glob(f"{ledger_path.name}.*"), reverse=True)
-    for old_backup in existing[max_backups:]:
-        old_backup.unlink()
-
-    return backup_path
+    return backup_file(ledger_path, max_backups)
 
 
 def _append_to_ledger(ledger_path: Path, entries: list[str]) -> None:
     """Append beancount entries to the main ledger file with backup."""
-    if not entries:
-        return
-    _backup_ledger(ledger_path)
-    with open(ledger_path, "a") as f:
-        for entry in entries:
-            f.write(f"\n{entry}\n")
+    session = LedgerWriteSession(ledger_path)
+    for entry in entries:
+        session.stage(entry)
+    session.commit()
 
 
 def _parse_ledger_transactions(ledger_path: Path) -> set[str]:
     """Parse beancount ledger and return content hashes of existing transactions.
 
-    Extracts (date, amount, payee) from each transaction for cross-source dedup.
+    Extracts (date, amount, payee) from each transaction for cross-source dedup,
+    from the ledger and the import staging files in imports/. Per-file hashes
+    are indexed (see txn_index), so unchanged files aren't re-scanned.
     Returns a set of SHA-256 hashes.
     """
-    from istota.db import compute_transaction_hash
-
     if not ledger_path.exists():
         return set()
 
-    text = ledger_path.read_text()
-    hashes = set()
+    hashes = txn_index.file_hashes(ledger_path)
 
     # Also scan import staging files in the imports/ directory
     imports_dir = ledger_path.parent / "imports"
-    texts = [text]
     if imports_dir.is_dir():
         for f in imports_dir.glob("*.beancount"):
-            texts.append(f.read_text())
-
-    # Match transaction header: YYYY-MM-DD * "payee" "narration"
-    # Then extract amount from the first posting line
-    txn_pattern = re.compile(
-        r'^(\d{4}-\d{2}-\d{2})\s+[*!]\s+"([^"]*)"',
-        re.MULTILINE,
-    )
-    # Match posting line with amount: e.g. "  Expenses:Food  50.00 USD"
-    amount_pattern = re.compile(
-        r'^\s+\S+\s+(-?[\d,]+\.?\d*)\s+[A-Z]{3}',
-        re.MULTILINE,
-    )
-
-    for content in texts:
-        for match in txn_pattern.finditer(content):
-            txn_date = match.group(1)
-            payee = match.group(2)
-
-            # Find the first posting with an amount after this header
-            rest = content[match.end():]
-            amount_match = amount_pattern.match(rest) or amount_pattern.search(
-                rest.split("\n\n")[0]  # Only look within the same transaction block
-            )
-            if not amount_match:
-                continue
-
-            amount = abs(float(amount_match.group(1).replace(",", "")))
-            content_hash = compute_transaction_hash(txn_date, amount, payee)
-            hashes.add(content_hash)
+            hashes |= txn_index.file_hashes(f)
 
     return hashes
 
 
 def cmd_sync_monarch(args) -> dict:
     """Sync transactions from Monarch Money API and reconcile tag changes."""
-    import asyncio
-
     ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
     dry_run = getattr(args, 'dry_run', False)
 
@@ -1187,20 +1245,44 @@ def cmd_sync_monarch(args) -> dict:
     except Exception as e:
         return {"status": "error", "error": f"Failed to parse config: {e}"}
 
+    # Get user_id from env for deduplication (set by executor)
+    user_id = os.environ.get("ISTOTA_USER_ID", "default")
+
+    # Import DB functions only when needed (avoid circular imports)
+    db_path_str = os.environ.get("ISTOTA_DB_PATH")
+    db_path = Path(db_path_str) if db_path_str else None
+
+    # The cursor limits the fetch to what changed since the last sync;
+    # previously synced transactions in the lookback window are reconciled
+    now = datetime.now()
+    lookback_start = now.date() - timedelta(days=config.sync.lookback_days)
+    cursor = None
+    active_synced = []
+    if db_path:
+        from istota.db import get_db, get_monarch_sync_cursor, get_active_monarch_synced_transactions
+
+        with get_db(db_path) as conn:
+            cursor = get_monarch_sync_cursor(conn, user_id)
+            active_synced = get_active_monarch_synced_transactions(
+                conn, user_id, since=lookback_start.isoformat(),
+            )
+    start_date, reconcile_due = _monarch_sync_window(config, cursor, now)
+    reconcile_ids = [
+        t.monarch_transaction_id for t in active_synced
+        if reconcile_due and (t.txn_date or "") < start_date.isoformat()
+    ]
+
     # Fetch transactions from API
     try:
-        transactions = asyncio.run(_fetch_monarch_transactions(
-            config,
-            config.sync.lookback_days,
+        transactions, reconcile_txns = asyncio.run(_fetch_monarch_sync(
+            config, start_date, now.date(), reconcile_ids,
         ))
     except Exception as e:
         return {"status": "error", "error": f"Failed to fetch transactions: {e}"}
 
-    # Get user_id from env for deduplication (set by executor)
-    user_id = os.environ.get("ISTOTA_USER_ID", "default")
-
     # Build lookup of all fetched transactions by ID for reconciliation
     all_txn_by_id = {txn.get("id"): txn for txn in transactions if txn.get("id")}
+    all_txn_by_id.update(reconcile_txns)
 
     # Filter by tags if configured
     filtered_transactions = []
@@ -1216,10 +1298,6 @@ def cmd_sync_monarch(args) -> dict:
 
         filtered_transactions.append(txn)
 
-    # Import DB functions only when needed (avoid circular imports)
-    db_path_str = os.environ.get("ISTOTA_DB_PATH")
-    db_path = Path(db_path_str) if db_path_str else None
-
     # Deduplicate against previously synced transactions and ledger content
     new_transactions = []
     skipped_count = 0
@@ -1228,49 +1306,44 @@ def cmd_sync_monarch(args) -> dict:
     # Parse existing ledger for content-based dedup
     ledger_hashes = _parse_ledger_transactions(ledger_path)
 
+    from istota.db import compute_transaction_hash
+
+    content_hashes = []
+    for txn in filtered_transactions:
+        merchant = txn.get("merchant", {}).get("name", "") or txn.get("name", "Unknown")
+        amount = float(txn.get("amount", 0))
+        txn_date_str = txn.get("date", "")[:10]
+        content_hashes.append(compute_transaction_hash(txn_date_str, abs(amount), merchant))
+
+    # Look up the whole batch at once rather than probing the DB per transaction
+    synced_ids: set[str] = set()
+    synced_hashes: set[str] = set()
     if db_path:
         from istota.db import (
-            compute_transaction_hash,
-            get_db,
-            is_content_hash_synced,
-            is_monarch_transaction_synced,
+            get_synced_content_hashes,
+            get_synced_monarch_transaction_ids,
             track_monarch_transactions_batch,
-            get_active_monarch_synced_transactions,
-            mark_monarch_transaction_recategorized,
+            mark_monarch_transactions_recategorized_batch,
         )
 
         with get_db(db_path) as conn:
-            for txn in filtered_transactions:
-                txn_id = txn.get("id", "")
-                if txn_id and is_monarch_transaction_synced(conn, user_id, txn_id):
-                    skipped_count += 1
-                    continue
-
-                # Content-based dedup: check ledger + DB
-                merchant = txn.get("merchant", {}).get("name", "") or txn.get("name", "Unknown")
-                amount = float(txn.get("amount", 0))
-                txn_date_str = txn.get("date", "")[:10]
-                content_hash = compute_transaction_hash(txn_date_str, abs(amount), merchant)
-
-                if content_hash in ledger_hashes or is_content_hash_synced(conn, user_id, content_hash):
-                    content_skipped_count += 1
-                    continue
+            synced_ids = get_synced_monarch_transaction_ids(
+                conn, user_id, [txn["id"] for txn in filtered_transactions if txn.get("id")],
+            )
+            synced_hashes = get_synced_content_hashes(conn, user_id, content_hashes)
 
-                new_transactions.append(txn)
-    else:
-        # No DB available, still check ledger content hashes
-        from istota.db import compute_transaction_hash
+    for txn, content_hash in zip(filtered_transactions, content_hashes):
+        txn_id = txn.get("id", "")
+        if txn_id and txn_id in synced_ids:
+            skipped_count += 1
+            continue
 
-        for txn in filtered_transactions:
-            merchant = txn.get("merchant", {}).get("name", "") or txn.get("name", "Unknown")
-            amount = float(txn.get("amount", 0))
-            txn_date_str = txn.get("date", "")[:10]
-            content_hash = compute_transaction_hash(txn_date_str, abs(amount), merchant)
+        # Content-based dedup: check ledger + DB
+        if content_hash in ledger_hashes or content_hash in synced_hashes:
+            content_skipped_count += 1
+            continue
 
-            if content_hash in ledger_hashes:
-                content_skipped_count += 1
-            else:
-                new_transactions.append(txn)
+        new_transactions.append(txn)
 
     # Build beancount entries for new transactions
     entries = []
@@ -1307,7 +1380,6 @@ def cmd_sync_monarch(args) -> dict:
         entries.append(entry)
 
         if txn_id:
-            from istota.db import compute_transaction_hash as _cth
             synced_data.append({
                 "id": txn_id,
                 "tags_json": json.dumps(txn_tags),
@@ -1315,7 +1387,7 @@ def cmd_sync_monarch(args) -> dict:
                 "merchant": merchant,
                 "posted_account": posting_account,
                 "txn_date": txn_date.isoformat(),
-                "content_hash": _cth(txn_date.isoformat(), abs(amount), merchant),
+                "content_hash": compute_transaction_hash(txn_date.isoformat(), abs(amount), merchant),
             })
 
     # === RECONCILIATION: Check for tag/category changes on previously synced transactions ===
@@ -1324,76 +1396,73 @@ def cmd_sync_monarch(args) -> dict:
     category_change_entries = []
     category_change_updates = []  # dicts with monarch_transaction_id + new posted_account
 
-    if db_path:
-        with get_db(db_path) as conn:
-            active_synced = get_active_monarch_synced_transactions(conn, user_id)
+    if active_synced:
+        # Check each previously synced transaction against current Monarch state
+        for synced_txn in active_synced:
+            current_txn = all_txn_by_id.get(synced_txn.monarch_transaction_id)
+
+            if current_txn is None:
+                # Not fetched this run (older than the window, no full
+                # reconcile due, or gone from Monarch) - skip
+                continue
 
-        if active_synced:
-            # Check each previously synced transaction against current Monarch state
-            for synced_txn in active_synced:
-                current_txn = all_txn_by_id.get(synced_txn.monarch_transaction_id)
+            # Get current tags from Monarch
+            current_tags = [t.get("name", "") for t in current_txn.get("tags", [])]
 
-                if current_txn is None:
-                    # Transaction not in current fetch window - skip (might be too old)
-                    continue
+            # Check if it still passes the include filter
+            still_has_business_tag = _filter_by_tags(
+                current_tags,
+                config.tags.include if config.tags.include else None,
+                config.tags.exclude if config.tags.exclude else None,
+            )
 
-                # Get current tags from Monarch
-                current_tags = [t.get("name", "") for t in current_txn.get("tags", [])]
-
-                # Check if it still passes the include filter
-                still_has_business_tag = _filter_by_tags(
-                    current_tags,
-                    config.tags.include if config.tags.include else None,
-                    config.tags.exclude if config.tags.exclude else None,
-                )
-
-                if not still_has_business_tag:
-                    # Business tag was removed - create recategorization entry
-                    if (
-                        synced_txn.amount is not None
-                        and synced_txn.posted_account
-                        and synced_txn.merchant
-                        and synced_txn.txn_date
-                    ):
-                        try:
-                            original_date = datetime.strptime(synced_txn.txn_date, "%Y-%m-%d").date()
-                        except ValueError:
-                            original_date = date.today()
-
-                        recat_entry = _format_recategorization_entry(
-                            txn_date=date.today(),  # Recategorization happens today
-                            merchant=synced_txn.merchant,
-                            original_account=synced_txn.posted_account,
-                            recategorize_account=config.sync.recategorize_account,
-                            amount=synced_txn.amount,
-                        )
-                        recategorized_entries.append(recat_entry)
-                        recategorized_ids.append(synced_txn.monarch_transaction_id)
-                    continue  # Tag removal takes priority over category change
-
-                # Check if category changed in Monarch
+            if not still_has_business_tag:
+                # Business tag was removed - create recategorization entry
                 if (
                     synced_txn.amount is not None
                     and synced_txn.posted_account
                     and synced_txn.merchant
                     and synced_txn.txn_date
                 ):
-                    current_category = current_txn.get("category", {}).get("name", "") or "Uncategorized"
-                    new_posted_account = _map_monarch_category_with_config(current_category, config)
-
-                    if new_posted_account != synced_txn.posted_account:
-                        cat_entry = _format_category_change_entry(
-                            txn_date=date.today(),
-                            merchant=synced_txn.merchant,
-                            old_account=synced_txn.posted_account,
-                            new_account=new_posted_account,
-                            amount=synced_txn.amount,
-                        )
-                        category_change_entries.append(cat_entry)
-                        category_change_updates.append({
-                            "monarch_transaction_id": synced_txn.monarch_transaction_id,
-                            "posted_account": new_posted_account,
-                        })
+                    try:
+                        original_date = datetime.strptime(synced_txn.txn_date, "%Y-%m-%d").date()
+                    except ValueError:
+                        original_date = date.today()
+
+                    recat_entry = _format_recategorization_entry(
+                        txn_date=date.today(),  # Recategorization happens today
+                        merchant=synced_txn.merchant,
+                        original_account=synced_txn.posted_account,
+                        recategorize_account=config.sync.recategorize_account,
+                        amount=synced_txn.amount,
+                    )
+                    recategorized_entries.append(recat_entry)
+                    recategorized_ids.append(synced_txn.monarch_transaction_id)
+                continue  # Tag removal takes priority over category change
+
+            # Check if category changed in Monarch
+            if (
+                synced_txn.amount is not None
+                and synced_txn.posted_account
+                and synced_txn.merchant
+                and synced_txn.txn_date
+            ):
+                current_category = current_txn.get("category", {}).get("name", "") or "Uncategorized"
+                new_posted_account = _map_monarch_category_with_config(current_category, config)
+
+                if new_posted_account != synced_txn.posted_account:
+                    cat_entry = _format_category_change_entry(
+                        txn_date=date.today(),
+                        merchant=synced_txn.merchant,
+                        old_account=synced_txn.posted_account,
+                        new_account=new_posted_account,
+                        amount=synced_txn.amount,
+                    )
+                    category_change_entries.append(cat_entry)
+                    category_change_updates.append({
+                        "monarch_transaction_id": synced_txn.monarch_transaction_id,
+                        "posted_account": new_posted_account,
+                    })
 
     # Prepare result
     ledger_dir = ledger_path.parent
@@ -1426,7 +1495,7 @@ def cmd_sync_monarch(args) -> dict:
     if entries:
         staging_file = imports_dir / f"monarch_sync_{timestamp}.beancount"
         header = f"; Synced from Monarch Money API on {datetime.now().isoformat()}\n"
-        header += f"; Lookback days: {config.sync.lookback_days}\n"
+        header += f"; Window: {start_date.isoformat()} to {now.date().isoformat()}\n"
         header += f"; Transaction count: {len(entries)}\n"
         if skipped_count > 0:
             header += f"; Skipped (already synced): {skipped_count}\n"
@@ -1462,30 +1531,33 @@ def cmd_sync_monarch(args) -> dict:
     # Append to main ledger
     _append_to_ledger(ledger_path, entries + recategorized_entries + category_change_entries)
 
+    # Advance the cursor; reconciled_at only moves when the whole lookback
+    # window was checked
+    new_cursor = {
+        "synced_through": now.date().isoformat(),
+        "reconciled_at": now.isoformat() if reconcile_due else cursor["reconciled_at"],
+    }
+
     # Track synced transactions, recategorizations, and category changes in DB
     deferred = _write_deferred_tracking(
         monarch_synced=synced_data or None,
         monarch_recategorized=recategorized_ids or None,
         monarch_category_updates=category_change_updates or None,
+        monarch_sync_cursor=new_cursor,
     )
-    if deferred is None:
+    if deferred is None and db_path:
         # No deferred dir — fall back to direct DB writes
-        if db_path and synced_data:
-            with get_db(db_path) as conn:
-                track_monarch_transactions_batch(conn, user_id, synced_data)
-        if db_path and recategorized_ids:
-            with get_db(db_path) as conn:
-                for txn_id in recategorized_ids:
-                    mark_monarch_transaction_recategorized(conn, user_id, txn_id)
-        if db_path and category_change_updates:
-            from istota.db import update_monarch_transaction_posted_account
-            with get_db(db_path) as conn:
-                for update in category_change_updates:
-                    update_monarch_transaction_posted_account(
-                        conn, user_id,
-                        update["monarch_transaction_id"],
-                        update["posted_account"],
-                    )
+        from istota.db import (
+            set_monarch_sync_cursor,
+            update_monarch_transactions_posted_account_batch,
+        )
+        with get_db(db_path) as conn:
+            track_monarch_transactions_batch(conn, user_id, synced_data)
+            mark_monarch_transactions_recategorized_batch(conn, user_id, recategorized_ids)
+            update_monarch_transactions_posted_account_batch(
+                conn, user_id, category_change_updates,
+            )
+            set_monarch_sync_cursor(conn, user_id, new_cursor)
 
     # Build message
     messages = []
@@ -1664,8 +1736,8 @@ def cmd_invoice_list(args) -> dict:
     """List invoices from work log (outstanding by default, --all for all)."""
     from .invoicing import (
         build_line_items,
+        load_work_log,
         parse_invoicing_config,
-        parse_work_log,
         _resolve_nc_path,
     )
 
@@ -1687,26 +1759,24 @@ def cmd_invoice_list(args) -> dict:
     if not work_log_path.exists():
         return {"status": "ok", "invoice_count": 0, "invoices": []}
 
-    entries = parse_work_log(work_log_path)
-
-    # Group entries by invoice number
-    invoice_groups: dict[str, list] = {}
-    for entry in entries:
-        if not entry.invoice:
-            continue
-        if entry.invoice not in invoice_groups:
-            invoice_groups[entry.invoice] = []
-        invoice_groups[entry.invoice].append(entry)
+    work_log = load_work_log(work_log_path)
 
     # Apply client filter
     client_filter = getattr(args, 'client', None)
     show_all = getattr(args, 'all', False)
 
+    invoice_numbers = work_log.by_invoice.keys()
+    if client_filter:
+        # Invoices with at least one entry for the client
+        invoice_numbers = {
+            work_log.entries[idx].invoice
+            for idx in work_log.by_client.get(client_filter, [])
+            if work_log.entries[idx].invoice
+        }
+
     invoices = []
-    for inv_num, inv_entries in sorted(invoice_groups.items()):
-        # Filter by client if specified
-        if client_filter and not any(e.client == client_filter for e in inv_entries):
-            continue
+    for inv_num in sorted(invoice_numbers):
+        inv_entries = [e for _, e in work_log.invoice_entries(inv_num)]
 
         # Compute total from line items
         items = build_line_items(inv_entries, config.services)
@@ -1753,8 +1823,8 @@ def cmd_invoice_paid(args) -> dict:
     from .invoicing import (
         compute_income_lines,
         create_income_posting,
+        load_work_log,
         parse_invoicing_config,
-        parse_work_log,
         resolve_bank_account,
         resolve_currency,
         resolve_entity,
@@ -1788,8 +1858,7 @@ def cmd_invoice_paid(args) -> dict:
     if not work_log_path.exists():
         return {"status": "error", "error": f"Work log not found: {work_log_path}"}
 
-    entries = parse_work_log(work_log_path)
-    matching = [(idx, e) for idx, e in enumerate(entries) if e.invoice == invoice_number]
+    matching = load_work_log(work_log_path).invoice_entries(invoice_number)
 
     if not matching:
         return {"status": "error", "error": f"Invoice {invoice_number} not found in work log"}
@@ -1831,17 +1900,20 @@ def cmd_invoice_paid(args) -> dict:
         )
 
         ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
-        _append_to_ledger(ledger_path, [posting])
+        session = LedgerWriteSession(ledger_path)
+        session.stage(posting)
 
-        # Validate ledger
-        success, errors = _run_bean_check(ledger_path)
+        # Validate before writing; neither the ledger nor the work log is
+        # touched if the posting breaks the ledger
+        success, errors = _run_bean_check(ledger_path, session.pending())
         if not success:
             return {
                 "status": "error",
-                "error": "Payment recorded but ledger validation failed",
+                "error": "Payment not recorded: ledger validation failed",
                 "validation_errors": errors[:5],
                 "file": str(ledger_path),
             }
+        session.commit()
 
     # Stamp paid_date on matching entries
     paid_stamps = {idx: payment_date.isoformat() for idx, _ in matching}
@@ -1994,62 +2066,130 @@ def cmd_invoice_create(args) -> dict:
     return result
 
 
-def cmd_add_transaction(args) -> dict:
-    """Add a transaction to the ledger."""
-    ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
+def _format_added_transaction(item: dict) -> tuple[dict | None, str | None]:
+    """Validate and format one transaction for add-transaction(s).
 
-    # Parse and validate date
+    item has date, payee, narration, debit, credit, amount and optionally
+    currency. Returns (transaction, None) with the parsed fields plus the
+    beancount text under "text", or (None, error message).
+    """
     try:
-        txn_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        txn_date = datetime.strptime(str(item["date"]), "%Y-%m-%d").date()
     except ValueError:
-        return {"status": "error", "error": "Invalid date format. Use YYYY-MM-DD"}
+        return None, "Invalid date format. Use YYYY-MM-DD"
 
-    # Parse and validate amount
     try:
-        amount = float(args.amount)
-        if amount <= 0:
-            return {"status": "error", "error": "Amount must be positive"}
-    except ValueError:
-        return {"status": "error", "error": "Invalid amount"}
+        amount = float(item["amount"])
+    except (TypeError, ValueError):
+        return None, "Invalid amount"
+    if amount <= 0:
+        return None, "Amount must be positive"
 
-    currency = args.currency or "USD"
+    currency = item.get("currency") or "USD"
 
     # Escape quotes in payee/narration
-    payee = args.payee.replace('"', '\\"')
-    narration = args.narration.replace('"', '\\"')
+    payee = str(item["payee"]).replace('"', '\\"')
+    narration = str(item["narration"]).replace('"', '\\"')
+
+    text = f'{txn_date} * "{payee}" "{narration}"\n'
+    text += f'  {item["debit"]}  {amount:.2f} {currency}\n'
+    text += f'  {item["credit"]}\n'
+
+    return {
+        "date": txn_date,
+        "payee": item["payee"],
+        "amount": amount,
+        "currency": currency,
+        "debit": item["debit"],
+        "credit": item["credit"],
+        "text": text,
+    }, None
 
-    # Format transaction
-    txn = f'{txn_date} * "{payee}" "{narration}"\n'
-    txn += f'  {args.debit}  {amount:.2f} {currency}\n'
-    txn += f'  {args.credit}\n'
 
-    # Determine target file
-    txn_dir = ledger_path.parent / "transactions"
-    txn_dir.mkdir(exist_ok=True)
-    txn_file = txn_dir / f"{txn_date.year}.beancount"
+def _transactions_file(ledger_path: Path, txn_date: date) -> Path:
+    """Per-year file under transactions/ that added transactions go to."""
+    return ledger_path.parent / "transactions" / f"{txn_date.year}.beancount"
 
-    # Append transaction
-    with open(txn_file, "a") as f:
-        f.write(f"\n{txn}")
 
-    # Validate ledger after adding
-    success, errors = _run_bean_check(ledger_path)
+def cmd_add_transaction(args) -> dict:
+    """Add a transaction to the ledger."""
+    ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
+
+    txn, error = _format_added_transaction({
+        "date": args.date,
+        "payee": args.payee,
+        "narration": args.narration,
+        "debit": args.debit,
+        "credit": args.credit,
+        "amount": args.amount,
+        "currency": args.currency,
+    })
+    if error:
+        return {"status": "error", "error": error}
+
+    session = LedgerWriteSession(ledger_path)
+    session.stage(txn["text"], _transactions_file(ledger_path, txn["date"]))
+
+    # Validate before writing; nothing is added if the entry breaks the ledger
+    success, errors = _run_bean_check(ledger_path, session.pending())
     if not success:
         return {
             "status": "error",
-            "error": "Transaction added but ledger validation failed",
+            "error": "Transaction not added: ledger validation failed",
             "validation_errors": errors[:5],
             "file": str(ledger_path),
         }
+    session.commit()
 
     return {
         "status": "ok",
-        "date": txn_date.isoformat(),
-        "payee": args.payee,
-        "amount": amount,
-        "currency": currency,
-        "debit": args.debit,
-        "credit": args.credit,
+        "date": txn["date"].isoformat(),
+        "payee": txn["payee"],
+        "amount": txn["amount"],
+        "currency": txn["currency"],
+        "debit": txn["debit"],
+        "credit": txn["credit"],
+        "file": str(ledger_path),
+    }
+
+
+def cmd_add_transactions(args) -> dict:
+    """Add a batch of transactions: one validation, one backup and write per file."""
+    ledger_path = _get_ledger_path(getattr(args, 'ledger', None))
+
+    try:
+        items = json.loads(Path(args.file).read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        return {"status": "error", "error": f"Failed to read transactions: {e}"}
+    if not isinstance(items, list) or not items:
+        return {"status": "error", "error": "Expected a non-empty JSON list of transactions"}
+
+    required = ("date", "payee", "narration", "debit", "credit", "amount")
+    session = LedgerWriteSession(ledger_path)
+    for i, item in enumerate(items):
+        missing = [key for key in required if not isinstance(item, dict) or key not in item]
+        if missing:
+            return {"status": "error", "error": f"Transaction {i + 1}: missing {', '.join(missing)}"}
+        txn, error = _format_added_transaction(item)
+        if error:
+            return {"status": "error", "error": f"Transaction {i + 1}: {error}"}
+        session.stage(txn["text"], _transactions_file(ledger_path, txn["date"]))
+
+    success, errors = _run_bean_check(ledger_path, session.pending())
+    if not success:
+        return {
+            "status": "error",
+            "error": "Transactions not added: ledger validation failed",
+            "validation_errors": errors[:5],
+            "file": str(ledger_path),
+        }
+    files = sorted(str(path) for path in session.pending())
+    session.commit()
+
+    return {
+        "status": "ok",
+        "transaction_count": len(items),
+        "files": files,
         "file": str(ledger_path),
     }
 
@@ -2121,6 +2261,7 @@ def build_parser():
     # wash-sales
     p_wash = sub.add_parser("wash-sales", help="Detect wash sale violations")
     p_wash.add_argument("--year", "-y", type=int, help="Year to analyze (default: current year)")
+    p_wash.add_argument("--end-year", type=int, help="Analyze --year through this year in one pass")
 
     # import-monarch
     p_import = sub.add_parser("import-monarch", help="Import from Monarch Money CSV")
@@ -2143,6 +2284,10 @@ def build_parser():
     p_add.add_argument("--amount", "-a", required=True, help="Transaction amount (positive number)")
     p_add.add_argument("--currency", "-c", default="USD", help="Currency (default: USD)")
 
+    # add-transactions
+    p_add_many = sub.add_parser("add-transactions", help="Add a batch of transactions, validated once")
+    p_add_many.add_argument("file", help="JSON file with a list of transactions (keys as add-transaction)")
+
     # invoice (with subcommands)
     p_inv = sub.add_parser("invoice", help="Invoice management")
     inv_sub = p_inv.add_subparsers(dest="invoice_command", required=True)
@@ -2200,6 +2345,7 @@ def main(argv=None):
         "import-monarch": cmd_import_monarch,
         "sync-monarch": cmd_sync_monarch,
         "add-transaction": cmd_add_transaction,
+        "add-transactions": cmd_add_transactions,
     }
 
     try:
@@ -15,9 +15,15 @@ Used by the accounting skill CLI:
 """
 
 import base64
+import bisect
+import hashlib
 import mimetypes
+import multiprocessing
 import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 from pathlib import Path
@@ -299,20 +305,7 @@ def parse_invoicing_config(config_path: Path) -> InvoicingConfig:
     )
 
 
-def parse_work_log(work_log_path: Path) -> list[WorkEntry]:
-    """Parse work log markdown file with embedded TOML entries.
-
-    Format:
-    ```toml
-    [[entries]]
-    date = 2026-02-01
-    client = "acme"
-    service = "consulting"
-    hours = 4
-    description = "Architecture review"
-    ```
-    """
-    text = work_log_path.read_text()
+def _parse_work_log_text(text: str) -> list[WorkEntry]:
     toml_str = _extract_toml_from_markdown(text)
     data = tomli.loads(toml_str)
 
@@ -348,6 +341,102 @@ def parse_work_log(work_log_path: Path) -> list[WorkEntry]:
     return entries
 
 
+def _month_end(period: str) -> date:
+    year, month = map(int, period.split("-"))
+    if month == 12:
+        return date(year + 1, 1, 1) - timedelta(days=1)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+
+class WorkLogIndex:
+    """Parsed work log entries with lookups by client, invoice and date.
+
+    Entry indexes are positions in the work log, as used for stamping.
+    Entries are shared with the cache and must not be modified.
+    """
+
+    def __init__(self, entries: list[WorkEntry]):
+        self.entries = entries
+        self.by_client: dict[str, list[int]] = {}
+        self.by_invoice: dict[str, list[int]] = {}  # in order of first appearance
+        for idx, entry in enumerate(entries):
+            self.by_client.setdefault(entry.client, []).append(idx)
+            if entry.invoice:
+                self.by_invoice.setdefault(entry.invoice, []).append(idx)
+        # Uninvoiced entry indexes sorted by date, for period bounds by bisection
+        self._uninvoiced = sorted(
+            (idx for idx, entry in enumerate(entries) if not entry.invoice),
+            key=lambda idx: entries[idx].date,
+        )
+        self._uninvoiced_dates = [entries[idx].date for idx in self._uninvoiced]
+
+    def invoice_entries(self, invoice_number: str) -> list[tuple[int, WorkEntry]]:
+        """(index, entry) pairs stamped with an invoice number."""
+        return [(idx, self.entries[idx]) for idx in self.by_invoice.get(invoice_number, [])]
+
+    def uninvoiced(
+        self,
+        period: str | None = None,
+        client: str | None = None,
+    ) -> list[tuple[int, WorkEntry]]:
+        """Same selection as select_uninvoiced_entries(), from the index."""
+        end = len(self._uninvoiced)
+        if period:
+            end = bisect.bisect_right(self._uninvoiced_dates, _month_end(period))
+        selected = self._uninvoiced[:end]
+        if client:
+            client_idxs = set(self.by_client.get(client, []))
+            selected = [idx for idx in selected if idx in client_idxs]
+        return [(idx, self.entries[idx]) for idx in sorted(selected)]
+
+
+_work_log_cache: dict[str, tuple[tuple[int, int], str, WorkLogIndex]] = {}
+_work_log_lock = threading.Lock()
+_WORK_LOG_SETTLE_NS = 2_000_000_000
+
+
+def load_work_log(work_log_path: Path) -> WorkLogIndex:
+    """Parse the work log into a WorkLogIndex, cached until the file changes.
+
+    The cache is keyed by mtime and size; when those change but the content
+    hash doesn't (a touch, a sync client rewrite), the parse is reused. A
+    file modified in the last couple of seconds is always hashed, since a
+    same-size rewrite can land within one mtime tick.
+    """
+    key = str(work_log_path.resolve())
+    st = work_log_path.stat()
+    stat_key = (st.st_mtime_ns, st.st_size)
+    settled = time.time_ns() - st.st_mtime_ns > _WORK_LOG_SETTLE_NS
+    with _work_log_lock:
+        cached = _work_log_cache.get(key)
+        if cached and cached[0] == stat_key and settled:
+            return cached[2]
+        text = work_log_path.read_text()
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        if cached and cached[1] == digest:
+            index = cached[2]
+        else:
+            index = WorkLogIndex(_parse_work_log_text(text))
+        _work_log_cache[key] = (stat_key, digest, index)
+        return index
+
+
+def parse_work_log(work_log_path: Path) -> list[WorkEntry]:
+    """Parse work log markdown file with embedded TOML entries.
+
+    Format:
+    ```toml
+    [[entries]]
+    date = 2026-02-01
+    client = "acme"
+    service = "consulting"
+    hours = 4
+    description = "Architecture review"
+    ```
+    """
+    return list(load_work_log(work_log_path).entries)
+
+
 def filter_entries_by_period(
     entries: list[WorkEntry],
     period: str,
@@ -383,13 +472,7 @@ def select_uninvoiced_entries(
     date <= last day of that month). If client is given, filters by client key.
     """
     # Compute upper date bound from period
-    upper_bound = None
-    if period:
-        year, month = map(int, period.split("-"))
-        if month == 12:
-            upper_bound = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            upper_bound = date(year, month + 1, 1) - timedelta(days=1)
+    upper_bound = _month_end(period) if period else None
 
     result = []
     for idx, entry in enumerate(entries):
@@ -520,6 +603,117 @@ def generate_invoice(
     )
 
 
+INVOICE_CSS = """\
+@page {
+    size: letter;
+    margin: 0.75in;
+}
+body {
+    font-family: "Helvetica Neue", Helvetica, Arial, sans-serif;
+    font-size: 11pt;
+    color: #333;
+    margin: 0;
+    padding: 0;
+}
+.header {
+    display: flex;
+    justify-content: space-between;
+    align-items: flex-start;
+    margin-bottom: 40px;
+    padding-bottom: 20px;
+    border-bottom: 2px solid #2c3e50;
+}
+.company-name {
+    font-size: 24pt;
+    font-weight: bold;
+    color: #2c3e50;
+}
+.company-logo {
+    max-width: 200px;
+    height: auto;
+}
+.invoice-meta {
+    text-align: right;
+}
+.invoice-title {
+    font-size: 18pt;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 8px;
+}
+.meta-row {
+    margin: 4px 0;
+}
+.meta-label {
+    font-weight: bold;
+    color: #7f8c8d;
+}
+.addresses {
+    display: flex;
+    justify-content: space-between;
+    margin-bottom: 30px;
+}
+.address-block {
+    width: 45%;
+}
+.section-label {
+    font-weight: bold;
+    color: #7f8c8d;
+    text-transform: uppercase;
+    font-size: 9pt;
+    letter-spacing: 0.5px;
+    margin-bottom: 8px;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-bottom: 30px;
+}
+th {
+    background: #2c3e50;
+    color: white;
+    padding: 10px 12px;
+    text-align: left;
+    font-size: 10pt;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}
+th.right {
+    text-align: right;
+}
+td {
+    padding: 10px 12px;
+    border-bottom: 1px solid #e0e0e0;
+}
+td.right {
+    text-align: right;
+}
+.item-desc {
+    font-size: 9pt;
+    color: #666;
+}
+tfoot .summary-row td {
+    border-bottom: none;
+    padding-top: 6px;
+    padding-bottom: 6px;
+}
+tfoot .amount-due {
+    font-size: 14pt;
+    font-weight: bold;
+    color: #2c3e50;
+    border-top: 2px solid #2c3e50;
+    padding-top: 10px;
+}
+.payment {
+    margin-top: 30px;
+    padding: 16px;
+    background: #f8f9fa;
+    border-radius: 6px;
+    border-left: 4px solid #2c3e50;
+}
+"""
+
+
 def _embed_logo(logo_path: Path) -> str:
     """Read a logo file and return a base64 data URI for embedding in HTML."""
     mime_type = mimetypes.guess_type(str(logo_path))[0] or "image/png"
@@ -527,8 +721,22 @@ def _embed_logo(logo_path: Path) -> str:
     return f"data:{mime_type};base64,{data}"
 
 
-def generate_invoice_html(invoice: Invoice, logo_path: Path | None = None) -> str:
-    """Generate HTML for an invoice, suitable for PDF conversion."""
+def generate_invoice_html(
+    invoice: Invoice,
+    logo_path: Path | None = None,
+    *,
+    logo_uri: str | None = None,
+    inline_css: bool = True,
+) -> str:
+    """Generate HTML for an invoice, suitable for PDF conversion.
+
+    ``logo_uri`` is an already-embedded logo (see ``_embed_logo``) and takes
+    precedence over ``logo_path``. With ``inline_css=False`` the stylesheet
+    is left out, for rendering with the precompiled one.
+    """
+    if logo_uri is None and logo_path and logo_path.exists():
+        logo_uri = _embed_logo(logo_path)
+    style_html = f"<style>\n{INVOICE_CSS}</style>" if inline_css else ""
     items_html = ""
     has_discounts = any(item.discount > 0 for item in invoice.items)
     for item in invoice.items:
@@ -561,120 +769,12 @@ def generate_invoice_html(invoice: Invoice, logo_path: Path | None = None) -> st
 <head>
     <meta charset="utf-8">
     <title>Invoice {invoice.number}</title>
-    <style>
-        @page {{
-            size: letter;
-            margin: 0.75in;
-        }}
-        body {{
-            font-family: "Helvetica Neue", Helvetica, Arial, sans-serif;
-            font-size: 11pt;
-            color: #333;
-            margin: 0;
-            padding: 0;
-        }}
-        .header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 40px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #2c3e50;
-        }}
-        .company-name {{
-            font-size: 24pt;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        .company-logo {{
-            max-width: 200px;
-            height: auto;
-        }}
-        .invoice-meta {{
-            text-align: right;
-        }}
-        .invoice-title {{
-            font-size: 18pt;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 8px;
-        }}
-        .meta-row {{
-            margin: 4px 0;
-        }}
-        .meta-label {{
-            font-weight: bold;
-            color: #7f8c8d;
-        }}
-        .addresses {{
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 30px;
-        }}
-        .address-block {{
-            width: 45%;
-        }}
-        .section-label {{
-            font-weight: bold;
-            color: #7f8c8d;
-            text-transform: uppercase;
-            font-size: 9pt;
-            letter-spacing: 0.5px;
-            margin-bottom: 8px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 30px;
-        }}
-        th {{
-            background: #2c3e50;
-            color: white;
-            padding: 10px 12px;
-            text-align: left;
-            font-size: 10pt;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        th.right {{
-            text-align: right;
-        }}
-        td {{
-            padding: 10px 12px;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-        td.right {{
-            text-align: right;
-        }}
-        .item-desc {{
-            font-size: 9pt;
-            color: #666;
-        }}
-        tfoot .summary-row td {{
-            border-bottom: none;
-            padding-top: 6px;
-            padding-bottom: 6px;
-        }}
-        tfoot .amount-due {{
-            font-size: 14pt;
-            font-weight: bold;
-            color: #2c3e50;
-            border-top: 2px solid #2c3e50;
-            padding-top: 10px;
-        }}
-        .payment {{
-            margin-top: 30px;
-            padding: 16px;
-            background: #f8f9fa;
-            border-radius: 6px;
-            border-left: 4px solid #2c3e50;
-        }}
-    </style>
+    {style_html}
 </head>
 <body>
     <div class="header">
         <div>
-            {f'<img class="company-logo" src="{_embed_logo(logo_path)}" alt="{invoice.company.name}">' if logo_path and logo_path.exists() else f'<div class="company-name">{invoice.company.name}</div>'}
+            {f'<img class="company-logo" src="{logo_uri}" alt="{invoice.company.name}">' if logo_uri else f'<div class="company-name">{invoice.company.name}</div>'}
             <div style="white-space: pre-line; color: #666; margin-top: 4px;">{invoice.company.address}</div>
         </div>
         <div class="invoice-meta">
@@ -727,12 +827,83 @@ def generate_invoice_html(invoice: Invoice, logo_path: Path | None = None) -> st
 </html>"""
 
 
+_render_state: tuple | None = None  # (stylesheet, font_config), per process
+
+
+def _compiled_stylesheet() -> tuple:
+    """INVOICE_CSS parsed once per process, with its font configuration."""
+    global _render_state
+    if _render_state is None:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        _render_state = (CSS(string=INVOICE_CSS, font_config=font_config), font_config)
+    return _render_state
+
+
 def generate_invoice_pdf(html: str, output_path: Path) -> None:
-    """Convert invoice HTML to PDF using WeasyPrint."""
+    """Convert invoice HTML to PDF using WeasyPrint.
+
+    The invoice stylesheet is applied from its precompiled form, so HTML
+    generated with ``inline_css=False`` renders the same as the default.
+    """
     from weasyprint import HTML
 
+    stylesheet, font_config = _compiled_stylesheet()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    HTML(string=html).write_pdf(str(output_path))
+    HTML(string=html).write_pdf(
+        str(output_path), stylesheets=[stylesheet], font_config=font_config,
+    )
+
+
+def _render_workers(job_count: int) -> int:
+    """Render processes for a run: INVOICE_RENDER_WORKERS, else up to 4 by CPU count."""
+    env_val = os.environ.get("INVOICE_RENDER_WORKERS", "").strip()
+    try:
+        workers = int(env_val) if env_val else min(4, os.cpu_count() or 1)
+    except ValueError:
+        workers = 1
+    return max(1, min(workers, job_count))
+
+
+def _init_render_worker() -> None:
+    try:
+        _compiled_stylesheet()
+    except ImportError:
+        pass  # Reported by the first render
+
+
+def _timed_render(html: str, output_path: Path) -> float:
+    started = time.perf_counter()
+    generate_invoice_pdf(html, output_path)
+    return time.perf_counter() - started
+
+
+def render_invoice_pdfs(jobs: list[tuple[str, Path]]) -> list[float]:
+    """Render (html, output_path) jobs to PDF; returns seconds per job, in order.
+
+    Several jobs render in a bounded process pool whose workers compile the
+    stylesheet and fonts once. If any render fails, PDFs written by this
+    call are removed and the first error is raised, so callers can commit
+    invoice numbers only after everything rendered.
+    """
+    workers = _render_workers(len(jobs))
+    try:
+        if workers == 1:
+            return [_timed_render(html, path) for html, path in jobs]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=_init_render_worker,
+        ) as pool:
+            futures = [pool.submit(_timed_render, html, path) for html, path in jobs]
+            wait(futures)
+            return [future.result() for future in futures]
+    except BaseException:
+        for _html, path in jobs:
+            path.unlink(missing_ok=True)
+        raise
 
 
 def create_income_posting(
@@ -813,8 +984,8 @@ def _stamp_work_log_field(
     """Stamp work log entries with arbitrary key-value pairs.
 
     Reads the raw markdown file, finds each [[entries]] block by position,
-    and inserts a `key = "value"` line. Processes in reverse index order
-    to avoid position shifts.
+    and inserts a `key = "value"` line after the block's last key-value
+    line. The new text is assembled in one forward pass and written once.
 
     Args:
         work_log_path: Path to the work log markdown file.
@@ -829,8 +1000,9 @@ def _stamp_work_log_field(
     entry_pattern = re.compile(r"^\[\[entries\]\]\s*$", re.MULTILINE)
     entry_positions = [m.start() for m in entry_pattern.finditer(text)]
 
-    # Process in reverse order to preserve positions
-    for idx in sorted(stamps.keys(), reverse=True):
+    pieces = []
+    copied_to = 0
+    for idx in sorted(stamps):
         if idx >= len(entry_positions):
             continue
 
@@ -846,13 +1018,10 @@ def _stamp_work_log_field(
             fence_pos = text.find("```", entry_start)
             block_end = fence_pos if fence_pos != -1 else len(text)
 
-        # Find last key = value line in this block
-        block_text = text[entry_start:block_end]
         # Find the last non-empty, non-comment line with a key = value pattern
-        lines = block_text.split("\n")
         last_kv_offset = 0
         running_offset = 0
-        for line in lines:
+        for line in text[entry_start:block_end].split("\n"):
             line_end = running_offset + len(line)
             stripped = line.strip()
             if stripped and not stripped.startswith("#") and "=" in stripped and not stripped.startswith("[["):
@@ -860,9 +1029,12 @@ def _stamp_work_log_field(
             running_offset = line_end + 1  # +1 for the newline
 
         insert_pos = entry_start + last_kv_offset
-        text = text[:insert_pos] + f'\n{field_name} = "{value}"' + text[insert_pos:]
+        pieces.append(text[copied_to:insert_pos])
+        pieces.append(f'\n{field_name} = "{value}"')
+        copied_to = insert_pos
 
-    work_log_path.write_text(text)
+    pieces.append(text[copied_to:])
+    work_log_path.write_text("".join(pieces))
 
 
 def stamp_work_log_entries(
@@ -920,9 +1092,10 @@ def generate_invoices_for_period(
     1. Parses work log entries
     2. Selects uninvoiced entries (optionally bounded by period/client/entity)
     3. Groups by (client, entity) then by bundle rules
-    4. Generates invoice HTML + PDF for each group
-    5. Increments invoice number counter
-    6. Stamps processed entries with invoice numbers in the work log
+    4. Generates invoice HTML for each group, numbered in group order
+    5. Renders all PDFs (in parallel, see render_invoice_pdfs)
+    6. Once every PDF rendered, increments the invoice number counter
+    7. Stamps processed entries with invoice numbers in the work log
 
     No ledger entries are created at invoice time (cash-basis accounting).
     Income is recognized when payment is recorded via `invoice paid`.
@@ -940,8 +1113,7 @@ def generate_invoices_for_period(
         work_log_path.write_text(WORK_LOG_TEMPLATE)
         return []  # Newly created, no entries to process
 
-    entries = parse_work_log(work_log_path)
-    indexed_entries = select_uninvoiced_entries(entries, period, client_filter)
+    indexed_entries = load_work_log(work_log_path).uninvoiced(period, client_filter)
 
     if not indexed_entries:
         return []
@@ -978,6 +1150,8 @@ def generate_invoices_for_period(
     invoice_number = config.next_invoice_number
     results = []
     stamps: dict[int, str] = {}  # entry_index -> invoice_number_str
+    render_jobs: list[tuple[str, Path]] = []
+    logo_uris: dict[Path, str] = {}  # embedded once per run, shared by entities
 
     for (client_key, entity_key), client_entity_entries in sorted(grouped.items()):
         client_config = config.clients.get(client_key)
@@ -987,11 +1161,13 @@ def generate_invoices_for_period(
         entity = config.companies.get(entity_key, config.company)
 
         # Resolve logo per entity
-        logo_path = None
+        logo_uri = None
         if entity.logo:
             logo_path = accounting_path / entity.logo
-            if not logo_path.exists():
-                logo_path = None
+            if logo_path.exists():
+                if logo_path not in logo_uris:
+                    logo_uris[logo_path] = _embed_logo(logo_path)
+                logo_uri = logo_uris[logo_path]
 
         groups = group_entries_by_bundle(client_entity_entries, client_config)
 
@@ -1021,11 +1197,11 @@ def generate_invoices_for_period(
                 summary["entity"] = entity_key
 
             if not dry_run:
-                # Generate PDF
-                html = generate_invoice_html(invoice, logo_path=logo_path)
+                # Queue the PDF; all invoices render together below
+                html = generate_invoice_html(invoice, logo_uri=logo_uri, inline_css=False)
                 pdf_filename = f"Invoice-{invoice_number:06d}-{invoice_date.strftime('%m_%d_%Y')}.pdf"
                 pdf_path = output_dir / pdf_filename
-                generate_invoice_pdf(html, pdf_path)
+                render_jobs.append((html, pdf_path))
                 summary["file"] = str(pdf_path)
 
                 # Record stamps for each entry in this group
@@ -1037,6 +1213,15 @@ def generate_invoices_for_period(
             results.append(summary)
             invoice_number += 1
 
+    # Render everything before committing numbers or stamps: a failed render
+    # raises here and leaves the config and work log untouched
+    if render_jobs:
+        render_seconds = render_invoice_pdfs(render_jobs)
+        rendered = iter(render_seconds)
+        for summary in results:
+            if "file" in summary:
+                summary["render_seconds"] = round(next(rendered), 3)
+
     # Update invoice number counter
     if not dry_run and results:
         update_invoice_number(config_path, invoice_number)
@@ -0,0 +1,420 @@
+"""In-process beancount ledger engine with a parsed-ledger cache.
+
+Loads a ledger through the beancount Python API and keeps the booked
+entries, keyed by the mtime, size and SHA-256 of the ledger and every file
+it includes. BQL runs against the cached entries through beanquery, so
+commands don't fork bean-query/bean-check and re-parse the whole ledger on
+every call.
+
+Invalidation is incremental when the only change is an append: the new
+tail of each grown file is parsed on its own and merged with the cached
+parse. Appended transactions that don't touch cost lots are booked on
+their own as well; plugins and validation always re-run. Anything else
+(edits, new or removed included files, new include/option/plugin lines)
+reloads from scratch.
+
+The cache lives in memory for the process and is persisted as a pickle
+under LEDGER_CACHE_DIR (default ~/.cache/istota/ledger), so separate CLI
+invocations reuse it too.
+"""
+
+import copy
+import csv
+import fnmatch
+import glob
+import hashlib
+import io
+import os
+import pickle
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import beanquery
+    from beancount import __version__ as _beancount_version
+    from beancount import loader
+    from beancount.core import data
+    from beancount.ops import validation
+    from beancount.parser import booking, printer
+    from beancount.parser import parser as bc_parser
+    from beanquery.query_render import render_csv
+except ImportError:
+    beanquery = None  # type: ignore
+    _beancount_version = ""
+
+_INCLUDE_LINE = re.compile(rb'^include\s+"([^"]+)"', re.M)
+
+# Appended lines that change how the rest of the ledger is loaded
+_STRUCTURAL_LINE = re.compile(rb"^(include|option|plugin|pushtag|poptag|pushmeta|popmeta)\b", re.M)
+
+_CACHE_FORMAT = 1
+
+
+@dataclass
+class _FileState:
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+@dataclass
+class LoadedLedger:
+    """A booked ledger plus what's needed to extend it incrementally."""
+    entries: list
+    errors: list
+    options: dict
+    parsed_entries: list = field(repr=False)
+    parse_errors: list = field(repr=False)
+    booked_entries: list = field(repr=False)
+    booking_errors: list = field(repr=False)
+    files: dict[str, _FileState] = field(repr=False)
+    include_globs: list[str] = field(repr=False)
+
+
+_cache: dict[str, LoadedLedger] = {}
+_cache_lock = threading.Lock()
+
+
+def available() -> bool:
+    """Whether the beancount/beanquery Python APIs are importable."""
+    return beanquery is not None
+
+
+def clear_cache() -> None:
+    """Drop the in-memory cache (the on-disk copy is revalidated on load)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def cache_dir() -> Path:
+    """Directory for persisted ledger caches (LEDGER_CACHE_DIR or XDG cache)."""
+    env_val = os.environ.get("LEDGER_CACHE_DIR", "").strip()
+    if env_val:
+        return Path(env_val)
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or str(Path.home() / ".cache")
+    return Path(base) / "istota" / "ledger"
+
+
+def _cache_file(key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return cache_dir() / f"{digest}.pickle"
+
+
+def _read_disk_cache(key: str) -> LoadedLedger | None:
+    try:
+        with open(_cache_file(key), "rb") as f:
+            header = pickle.load(f)
+            if header != (_CACHE_FORMAT, _beancount_version, key):
+                return None
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_disk_cache(key: str, ledger: LoadedLedger) -> None:
+    path = _cache_file(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((_CACHE_FORMAT, _beancount_version, key), f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(ledger, f, pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        # The cache is an optimization; an unwritable cache dir is not an error
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+def _file_state(path: str, content: bytes | None = None) -> _FileState:
+    st = os.stat(path)
+    if content is None:
+        content = Path(path).read_bytes()
+    return _FileState(st.st_mtime_ns, st.st_size, hashlib.sha256(content).hexdigest())
+
+
+def _include_globs(name: str, content: bytes) -> list[str]:
+    """Absolute include patterns of one ledger file."""
+    base = os.path.dirname(name)
+    return [
+        os.path.normpath(os.path.join(base, m.decode("utf-8", errors="replace")))
+        for m in _INCLUDE_LINE.findall(content)
+    ]
+
+
+def _glob_matches(patterns: list[str]) -> set[str]:
+    """Files the include patterns match now; a new file for a glob shows up here."""
+    return {os.path.normpath(f) for p in patterns for f in glob.glob(p, recursive=True)}
+
+
+def _books_alone(entry) -> bool:
+    """Whether booking the entry needs no inventory state from other entries.
+
+    Only postings held at cost are matched against existing lots; anything
+    else is interpolated within its own transaction.
+    """
+    if not isinstance(entry, data.Transaction):
+        return True
+    return all(posting.cost is None for posting in entry.postings)
+
+
+def _finish(
+    parsed_entries: list,
+    parse_errors: list,
+    options: dict,
+    files: dict[str, _FileState],
+    include_globs: list[str],
+    booked: tuple[list, list] | None = None,
+) -> LoadedLedger:
+    """Book, run plugins and validate, as ``loader._load`` does after parsing.
+
+    ``booked`` skips booking with entries/errors already booked.
+    """
+    if booked is None:
+        booked = booking.book(parsed_entries, options)
+    booked_entries, booking_errors = booked
+    errors = list(parse_errors) + booking_errors
+
+    # Plugins and validation look at the whole ledger (pad, balance
+    # assertions), so they always re-run
+    saved_pythonpath = list(sys.path)
+    try:
+        if "pythonpath" in options:
+            sys.path[0:0] = options["pythonpath"]
+        entries, errors = loader.run_transformations(booked_entries, errors, options, None)
+    finally:
+        sys.path[:] = saved_pythonpath
+
+    errors.extend(validation.validate(entries, options, None, None))
+    return LoadedLedger(
+        entries=entries,
+        errors=errors,
+        options=options,
+        parsed_entries=parsed_entries,
+        parse_errors=list(parse_errors),
+        booked_entries=booked_entries,
+        booking_errors=booking_errors,
+        files=files,
+        include_globs=include_globs,
+    )
+
+
+def _full_load(key: str) -> LoadedLedger:
+    parsed_entries, parse_errors, options = loader._parse_recursive([(key, True)], None)
+    parsed_entries.sort(key=data.entry_sortkey)
+    files = {}
+    include_globs = []
+    for name in options["include"]:
+        try:
+            content = Path(name).read_bytes()
+            files[name] = _file_state(name, content)
+        except OSError:
+            continue
+        include_globs.extend(_include_globs(name, content))
+    return _finish(parsed_entries, parse_errors, options, files, include_globs)
+
+
+def _extend(cached: LoadedLedger) -> LoadedLedger | None:
+    """Bring a cached ledger up to date with the files on disk.
+
+    Returns ``cached`` itself when nothing changed, an incrementally
+    extended ledger when files only grew, or None when a full reload is
+    needed.
+    """
+    if not _glob_matches(cached.include_globs) <= cached.files.keys():
+        return None
+
+    files = dict(cached.files)
+    new_entries: list = []
+    new_errors: list = []
+    for name, old in cached.files.items():
+        try:
+            st = os.stat(name)
+        except OSError:
+            return None
+        if st.st_mtime_ns == old.mtime_ns and st.st_size == old.size:
+            continue
+        try:
+            content = Path(name).read_bytes()
+        except OSError:
+            return None
+        state = _file_state(name, content)
+        if state.sha256 == old.sha256:
+            files[name] = state  # Touched but unchanged
+            continue
+        prefix = content[:old.size]
+        if (
+            len(content) <= old.size
+            or hashlib.sha256(prefix).hexdigest() != old.sha256
+            or (prefix and not prefix.endswith(b"\n"))
+        ):
+            return None
+        tail = content[old.size:]
+        if _STRUCTURAL_LINE.search(tail):
+            return None
+        entries, errors, tail_options = bc_parser.parse_string(
+            tail,
+            report_filename=name,
+            report_firstline=prefix.count(b"\n") + 1,
+        )
+        cached.options["dcontext"].update_from(tail_options["dcontext"])
+        new_entries.extend(entries)
+        new_errors.extend(errors)
+        files[name] = state
+
+    if files == cached.files:
+        return cached
+    if not new_entries and not new_errors:
+        cached.files = files
+        return cached
+
+    new_entries.sort(key=data.entry_sortkey)
+    parsed_entries = sorted(cached.parsed_entries + new_entries, key=data.entry_sortkey)
+    booked = None
+    if all(_books_alone(entry) for entry in new_entries):
+        booked_new, booking_errors = booking.book(new_entries, cached.options)
+        booked = (
+            sorted(cached.booked_entries + booked_new, key=data.entry_sortkey),
+            cached.booking_errors + booking_errors,
+        )
+    return _finish(
+        parsed_entries, cached.parse_errors + new_errors, cached.options, files,
+        cached.include_globs, booked,
+    )
+
+
+def load_ledger(ledger_path: Path) -> LoadedLedger:
+    """Return the booked ledger, reusing the cache where the files allow.
+
+    Raises ValueError if the ledger can't be read or beancount isn't
+    installed.
+    """
+    if beanquery is None:
+        raise ValueError("beancount is not installed")
+    key = os.path.abspath(ledger_path)
+    if not os.path.exists(key):
+        raise ValueError(f"Ledger file not found: {ledger_path}")
+
+    with _cache_lock:
+        cached = _cache.get(key) or _read_disk_cache(key)
+        seen_files = cached.files if cached is not None else None
+        ledger = _extend(cached) if cached is not None else None
+        if ledger is None:
+            ledger = _full_load(key)
+        _cache[key] = ledger
+        if ledger is not cached or ledger.files is not seen_files:
+            _write_disk_cache(key, ledger)
+        return ledger
+
+
+def format_errors(errors: list) -> list[str]:
+    """One ``file:line: message`` string per beancount error."""
+    result = []
+    for error in errors:
+        source = printer.render_source(error.source) if error.source else ""
+        result.append(f"{source} {error.message}".strip())
+    return result
+
+
+def check_ledger(ledger_path: Path) -> list[str]:
+    """Validate the ledger like bean-check; returns formatted errors."""
+    return format_errors(load_ledger(ledger_path).errors)
+
+
+def check_staged(ledger_path: Path, staged: dict[Path, str]) -> list[str]:
+    """Validate the ledger as if staged text were appended, without writing it.
+
+    ``staged`` maps ledger files (existing, or new ones an include glob
+    picks up) to the text to append. The staged text is parsed on its own
+    and checked together with the cached ledger, as an append would be.
+    Text for files the ledger doesn't include is ignored, as bean-check
+    wouldn't see it either.
+
+    Returns the formatted errors the staged text would introduce; errors
+    already in the ledger are left out.
+    """
+    ledger = load_ledger(ledger_path)
+    options = dict(ledger.options)
+    options["dcontext"] = copy.deepcopy(ledger.options["dcontext"])
+
+    new_entries: list = []
+    new_errors: list = []
+    for path, text in staged.items():
+        name = os.path.abspath(path)
+        if name not in ledger.files and not any(
+            fnmatch.fnmatch(name, pattern) for pattern in ledger.include_globs
+        ):
+            continue
+        content = text.encode()
+        if _STRUCTURAL_LINE.search(content):
+            raise ValueError(f"Staged text for {path} changes how the ledger loads")
+        try:
+            firstline = Path(name).read_bytes().count(b"\n") + 1
+        except OSError:
+            firstline = 1
+        entries, errors, staged_options = bc_parser.parse_string(
+            content, report_filename=name, report_firstline=firstline,
+        )
+        options["dcontext"].update_from(staged_options["dcontext"])
+        new_entries.extend(entries)
+        new_errors.extend(errors)
+
+    if not new_entries and not new_errors:
+        return []
+
+    new_entries.sort(key=data.entry_sortkey)
+    parsed_entries = sorted(ledger.parsed_entries + new_entries, key=data.entry_sortkey)
+    booked = None
+    if all(_books_alone(entry) for entry in new_entries):
+        booked_new, booking_errors = booking.book(new_entries, options)
+        booked = (
+            sorted(ledger.booked_entries + booked_new, key=data.entry_sortkey),
+            ledger.booking_errors + booking_errors,
+        )
+    checked = _finish(
+        parsed_entries, ledger.parse_errors + new_errors, options, ledger.files,
+        ledger.include_globs, booked,
+    )
+    existing = set(format_errors(ledger.errors))
+    return [error for error in format_errors(checked.errors) if error not in existing]
+
+
+def run_query(ledger_path: Path, query: str) -> tuple[list, list[tuple]]:
+    """Run BQL against the cached ledger.
+
+    Returns the beanquery column descriptions and rows of typed values
+    (``date``, ``Decimal``, ``Amount``, ``Position``, ``Inventory``...).
+    Raises ValueError on parse/compile errors.
+    """
+    ledger = load_ledger(ledger_path)
+    try:
+        conn = beanquery.connect(
+            "beancount:", entries=ledger.entries, errors=ledger.errors, options=ledger.options,
+        )
+        cursor = conn.execute(query)
+        return cursor.description, cursor.fetchall()
+    except (beanquery.Error, beanquery.ParseError, beanquery.CompilationError) as e:
+        raise ValueError(str(e).strip() or "Query failed")
+
+
+def query_rows(ledger_path: Path, query: str) -> list[dict]:
+    """Run BQL and return rows as dicts of typed values keyed by column."""
+    columns, rows = run_query(ledger_path, query)
+    names = [c.name for c in columns]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def query_text_rows(ledger_path: Path, query: str) -> list[dict]:
+    """Run BQL and return rows rendered as strings, as ``bean-query -f csv`` does."""
+    columns, rows = run_query(ledger_path, query)
+    if not rows:
+        return []
+    out = io.StringIO()
+    render_csv(columns, rows, load_ledger(ledger_path).options["dcontext"], out)
+    return [dict(row) for row in csv.DictReader(io.StringIO(out.getvalue()))]
@@ -0,0 +1,120 @@
+"""Content-hash index of ledger transactions for cross-source dedup.
+
+Scans beancount text block by block (blocks are separated by a blank line)
+and hashes each transaction's (date, amount, payee) with
+``istota.db.compute_transaction_hash``. The scan is a single pass over the
+file; no per-transaction copies of the remaining text.
+
+Each file's hashes are persisted under the ledger cache dir together with
+its mtime/size and how far the file has been scanned. Unchanged files are
+not read at all, and a file that only grew is scanned from the last block
+boundary instead of from the start.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from .ledger import cache_dir
+
+# Transaction header: YYYY-MM-DD * "payee" "narration"
+_TXN_HEADER = re.compile(
+    r'^(\d{4}-\d{2}-\d{2})\s+[*!]\s+"([^"]*)"',
+    re.MULTILINE,
+)
+# Posting line with amount: e.g. "  Expenses:Food  50.00 USD"
+_POSTING_AMOUNT = re.compile(
+    r'^\s+\S+\s+(-?[\d,]+\.?\d*)\s+[A-Z]{3}',
+    re.MULTILINE,
+)
+
+_INDEX_FORMAT = 1
+
+
+def scan_hashes(text: str) -> set[str]:
+    """Content hashes of the transactions in beancount text.
+
+    The amount is the first posting amount in the transaction's block,
+    i.e. between its header and the next blank line.
+    """
+    from istota.db import compute_transaction_hash
+
+    hashes = set()
+    for block in text.split("\n\n"):
+        for match in _TXN_HEADER.finditer(block):
+            rest = block[match.end():]
+            amount_match = _POSTING_AMOUNT.match(rest) or _POSTING_AMOUNT.search(rest)
+            if not amount_match:
+                continue
+            amount = abs(float(amount_match.group(1).replace(",", "")))
+            hashes.add(compute_transaction_hash(match.group(1), amount, match.group(2)))
+    return hashes
+
+
+def _index_path(path: Path) -> Path:
+    digest = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:24]
+    return cache_dir() / "txn-index" / f"{digest}.json"
+
+
+def _load_index(path: Path) -> dict | None:
+    try:
+        index = json.loads(_index_path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if index.get("format") != _INDEX_FORMAT:
+        return None
+    return index
+
+
+def _save_index(path: Path, index: dict) -> None:
+    target = _index_path(path)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(index))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, target)
+    except OSError:
+        pass  # The index is an optimization; scanning again is always correct
+
+
+def file_hashes(path: Path) -> set[str]:
+    """Content hashes of one ledger file, using and refreshing its index."""
+    try:
+        st = path.stat()
+    except OSError:
+        return set()
+
+    index = _load_index(path)
+    if index and index["mtime_ns"] == st.st_mtime_ns and index["size"] == st.st_size:
+        return set(index["hashes"]) | set(index["tail_hashes"])
+
+    data = path.read_bytes()
+    start = 0
+    hashes: set[str] = set()
+    if index and len(data) >= index["offset"]:
+        offset = index["offset"]
+        if hashlib.sha256(data[:offset]).hexdigest() == index["prefix_sha256"]:
+            # Grew (or only the last, still-open block changed)
+            start = offset
+            hashes = set(index["hashes"])
+
+    # Everything up to the last blank line is complete; the block after it
+    # may still be appended to, so it is rescanned next time
+    boundary = data.rfind(b"\n\n", start)
+    offset = boundary + 2 if boundary >= 0 else start
+    hashes |= scan_hashes(data[start:offset].decode("utf-8", errors="replace"))
+    tail_hashes = scan_hashes(data[offset:].decode("utf-8", errors="replace"))
+
+    _save_index(path, {
+        "format": _INDEX_FORMAT,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "offset": offset,
+        "prefix_sha256": hashlib.sha256(data[:offset]).hexdigest(),
+        "hashes": sorted(hashes),
+        "tail_hashes": sorted(tail_hashes),
+    })
+    return hashes | tail_hashes
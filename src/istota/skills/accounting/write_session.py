@@ -0,0 +1,119 @@
+"""Batched ledger writes: stage entries, validate once, commit atomically.
+
+A LedgerWriteSession collects entries for the ledger and the files it
+includes. The caller validates the whole batch once (``pending()`` is what
+``ledger.check_staged`` takes), then ``commit()`` writes each touched file
+once: the new content goes to a temp file next to it and replaces the
+original with ``os.replace``, so readers never see a half-written ledger.
+
+Because the original is replaced rather than appended to in place, the
+pre-commit backup can be a hard link to the old file instead of a copy;
+once the replace is done the backup is the only name left for it. Where
+hard links aren't supported the file is copied.
+"""
+
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+
+def backup_file(
+    path: Path,
+    max_backups: int = 10,
+    *,
+    link: bool = False,
+    timestamp: str | None = None,
+) -> Path | None:
+    """Snapshot a ledger file into backups/ next to it, rotating old ones.
+
+    With link, the snapshot is a hard link, which is only a true snapshot
+    if the file is then replaced rather than modified in place.
+    Returns the backup path, or None if the file doesn't exist.
+    """
+    if not path.exists():
+        return None
+
+    backups_dir = path.parent / "backups"
+    backups_dir.mkdir(exist_ok=True)
+
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = backups_dir / f"{path.name}.{timestamp}"
+
+    linked = False
+    if link:
+        backup_path.unlink(missing_ok=True)
+        try:
+            os.link(path, backup_path)
+            linked = True
+        except OSError:
+            pass
+    if not linked:
+        shutil.copy2(path, backup_path)
+
+    # Prune old backups beyond max_backups
+    existing = sorted(backups_dir.glob(f"{path.name}.*"), reverse=True)
+    for old_backup in existing[max_backups:]:
+        old_backup.unlink()
+
+    return backup_path
+
+
+class LedgerWriteSession:
+    """Entries staged for one or more ledger files, written in one commit."""
+
+    def __init__(self, ledger_path: Path, max_backups: int = 10):
+        self.ledger_path = ledger_path
+        self.max_backups = max_backups
+        self._staged: dict[Path, list[str]] = {}
+
+    def stage(self, entry: str, path: Path | None = None) -> None:
+        """Stage an entry for path (default: the main ledger file)."""
+        self._staged.setdefault(path or self.ledger_path, []).append(entry.rstrip("\n"))
+
+    def pending(self) -> dict[Path, str]:
+        """Text each file will have appended on commit."""
+        return {
+            path: "".join(f"\n{entry}\n" for entry in entries)
+            for path, entries in self._staged.items()
+        }
+
+    def commit(self) -> list[Path]:
+        """Write all staged entries, one backup and one replace per file.
+
+        Every new file is written out before any original is replaced, so
+        a failure while writing leaves the ledger untouched.
+        Returns the backup paths.
+        """
+        pending = self.pending()
+        if not pending:
+            return []
+
+        writes: list[tuple[Path, Path]] = []
+        try:
+            for path, text in pending.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                writes.append((path, tmp))
+                current = path.read_bytes() if path.exists() else b""
+                with open(tmp, "wb") as f:
+                    f.write(current + text.encode())
+                    f.flush()
+                    os.fsync(f.fileno())
+                if path.exists():
+                    shutil.copymode(path, tmp)
+        except BaseException:
+            for _, tmp in writes:
+                tmp.unlink(missing_ok=True)
+            raise
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backups = []
+        for path, tmp in writes:
+            backup = backup_file(path, self.max_backups, link=True, timestamp=timestamp)
+            if backup is not None:
+                backups.append(backup)
+            os.replace(tmp, path)
+
+        self._staged.clear()
+        return backups
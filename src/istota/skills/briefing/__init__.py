@@ -12,6 +12,10 @@ import json
 import logging
 import random
 import re
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -253,6 +257,84 @@ def save_briefing_digest(
         logger.warning("Failed to save briefing digest for %s: %s", user_id, e)
 
 
+# Deadline for each pre-fetched component, in seconds from the start of
+# the pre-fetch. A component still fetching at its deadline is left out of
+# the briefing rather than holding up the rest.
+PREFETCH_TIMEOUTS = {
+    "markets": 30.0,
+    "finviz": 150.0,
+    "news": 90.0,
+    "headlines": 150.0,
+    "calendar": 30.0,
+    "todos": 20.0,
+    "reminders": 20.0,
+}
+
+_PREFETCH_LABELS = {
+    "markets": "market quotes",
+    "finviz": "FinViz market data",
+    "news": "newsletters",
+    "headlines": "news frontpages",
+    "calendar": "calendar",
+    "todos": "TODO",
+    "reminders": "daily reminder",
+}
+
+
+def _prefetch_components(
+    jobs: dict[str, Callable[[], str | None]],
+    timeouts: dict[str, float] | None = None,
+) -> tuple[dict[str, str | None], list[str]]:
+    """Run component fetchers concurrently, each bounded by its own deadline.
+
+    Preparation takes as long as the slowest component that makes its
+    deadline, not the sum of all of them. Fetchers past their deadline are
+    not waited for; their threads finish (or time out) in the background.
+    Per-component latency is logged.
+
+    Returns:
+        (results, late): each finished component's value (None if its
+        fetcher raised), and the components that missed their deadline
+    """
+    if not jobs:
+        return {}, []
+    timeouts = timeouts or PREFETCH_TIMEOUTS
+
+    def timed(fetch: Callable[[], str | None]) -> tuple[str | None, float]:
+        start = time.monotonic()
+        try:
+            return fetch(), time.monotonic() - start
+        except Exception as e:
+            logger.warning("Briefing component fetch failed: %s", e)
+            return None, time.monotonic() - start
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="briefing-prefetch")
+    futures = {name: executor.submit(timed, fetch) for name, fetch in jobs.items()}
+    results: dict[str, str | None] = {}
+    latencies: dict[str, float] = {}
+    late: list[str] = []
+    try:
+        for name, future in futures.items():
+            deadline = started + timeouts.get(name, max(timeouts.values()))
+            try:
+                results[name], latencies[name] = future.result(
+                    timeout=max(0.0, deadline - time.monotonic()),
+                )
+            except FutureTimeoutError:
+                late.append(name)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(
+        "Briefing pre-fetch took %.2fs (%s)%s",
+        time.monotonic() - started,
+        ", ".join(f"{name} {seconds:.2f}s" for name, seconds in latencies.items()),
+        f"; past deadline: {', '.join(late)}" if late else "",
+    )
+    return results, late
+
+
 def build_briefing_prompt(
     briefing: BriefingConfig,
     user_id: str,
@@ -309,26 +391,55 @@ def build_briefing_prompt(
             "and if so, lead with what changed, not the full recap."
         )
 
-    # Market data - pre-fetch and include (skip quotes on weekends)
-    has_market_quotes = False
-    if _component_enabled(components, "markets") and not is_weekend:
+    # Pre-fetch every enabled component concurrently (quotes are skipped
+    # on weekends, FinViz only enriches weekday evening briefings)
+    markets_enabled = _component_enabled(components, "markets")
+    jobs: dict[str, Callable[[], str | None]] = {}
+    if markets_enabled and not is_weekend:
         market_config = components["markets"] if isinstance(components.get("markets"), dict) else {}
-        market_data = _fetch_market_data(market_config, mode)
-        if market_data:
-            prompt_parts.append("")
-            prompt_parts.append(market_data)
+        jobs["markets"] = lambda: _fetch_market_data(market_config, mode)
+        if not is_morning:
+            jobs["finviz"] = _fetch_finviz_market_data
+    elif markets_enabled and is_weekend:
+        logger.debug("Skipping market quotes on weekend")
+    if _component_enabled(components, "news"):
+        news_config = components["news"] if isinstance(components.get("news"), dict) else {}
+        jobs["news"] = lambda: _fetch_newsletter_content(news_config, config)
+    if _component_enabled(components, "headlines"):
+        headlines_config = components["headlines"] if isinstance(components.get("headlines"), dict) else {}
+        jobs["headlines"] = lambda: _fetch_headlines(headlines_config, config)
+    if components.get("calendar"):
+        jobs["calendar"] = lambda: _fetch_calendar_events(config, user_id, is_morning, user_timezone)
+    if components.get("todos"):
+        jobs["todos"] = lambda: _fetch_todo_items(config, user_id)
+    if _component_enabled(components, "reminders"):
+        jobs["reminders"] = lambda: _fetch_random_reminder(config, user_id)
+
+    fetched, late = _prefetch_components(jobs)
+    if late:
+        prompt_parts.append("")
+        for name in late:
             prompt_parts.append(
-                "Use ONLY these yfinance quotes for the MARKETS quote lines. "
-                "Do NOT substitute prices or percentages from newsletters."
+                f"- Note: the {_PREFETCH_LABELS.get(name, name)} component timed out and is "
+                "left out of this briefing. Do not fill it in from other sources."
             )
-            has_market_quotes = True
-            logger.debug("Fetched market data for %s briefing", mode)
-    elif _component_enabled(components, "markets") and is_weekend:
-        logger.debug("Skipping market quotes on weekend")
+
+    # Market data
+    has_market_quotes = False
+    market_data = fetched.get("markets")
+    if market_data:
+        prompt_parts.append("")
+        prompt_parts.append(market_data)
+        prompt_parts.append(
+            "Use ONLY these yfinance quotes for the MARKETS quote lines. "
+            "Do NOT substitute prices or percentages from newsletters."
+        )
+        has_market_quotes = True
+        logger.debug("Fetched market data for %s briefing", mode)
 
     # FinViz market data - enrich evening briefings with headlines, movers, etc.
-    if _component_enabled(components, "markets") and not is_morning and not is_weekend:
-        finviz_content = _fetch_finviz_market_data()
+    if "finviz" in jobs:
+        finviz_content = fetched.get("finviz")
         if not finviz_content:
             logger.warning("Evening briefing for %s will have no FinViz data", user_id)
         if finviz_content:
@@ -342,45 +453,41 @@ def build_briefing_prompt(
             )
             logger.debug("Fetched FinViz market data for evening briefing")
 
-    # Newsletter emails - pre-fetch full content
-    if _component_enabled(components, "news"):
-        news_config = components["news"] if isinstance(components.get("news"), dict) else {}
-        newsletter_content = _fetch_newsletter_content(news_config, config)
-        if newsletter_content:
-            prompt_parts.append("")
-            prompt_parts.append(newsletter_content)
-            prompt_parts.append("")
-            quote_note = (
-                " The MARKETS quote lines are already provided above from yfinance — "
-                "do not replace them with numbers from newsletters."
-                if has_market_quotes
-                else ""
-            )
-            prompt_parts.append(
-                "Summarize these newsletters. Place general/world news stories in the NEWS section "
-                "and market/economic stories in the MARKETS section (after any quote data). "
-                f"See the briefing skill for section format and story count targets.{quote_note}"
-            )
+    # Newsletter emails - full content
+    newsletter_content = fetched.get("news")
+    if newsletter_content:
+        prompt_parts.append("")
+        prompt_parts.append(newsletter_content)
+        prompt_parts.append("")
+        quote_note = (
+            " The MARKETS quote lines are already provided above from yfinance — "
+            "do not replace them with numbers from newsletters."
+            if has_market_quotes
+            else ""
+        )
+        prompt_parts.append(
+            "Summarize these newsletters. Place general/world news stories in the NEWS section "
+            "and market/economic stories in the MARKETS section (after any quote data). "
+            f"See the briefing skill for section format and story count targets.{quote_note}"
+        )
 
-    # Headlines - pre-fetch frontpages from news sources
-    if _component_enabled(components, "headlines"):
-        headlines_config = components["headlines"] if isinstance(components.get("headlines"), dict) else {}
-        headlines_content = _fetch_headlines(headlines_config, config)
-        if headlines_content:
-            prompt_parts.append("")
-            prompt_parts.append(headlines_content)
-            prompt_parts.append("")
-            prompt_parts.append(
-                "These are frontpage headlines from major news sources. "
-                "Group stories by theme, with cross-source attribution. "
-                "Target 10-15 stories. Flag angles that only appear in one source. "
-                "Place stories in the appropriate section (NEWS for general, MARKETS for economic/financial)."
-            )
-            logger.debug("Fetched headlines for briefing")
+    # Headlines - frontpages from news sources
+    headlines_content = fetched.get("headlines")
+    if headlines_content:
+        prompt_parts.append("")
+        prompt_parts.append(headlines_content)
+        prompt_parts.append("")
+        prompt_parts.append(
+            "These are frontpage headlines from major news sources. "
+            "Group stories by theme, with cross-source attribution. "
+            "Target 10-15 stories. Flag angles that only appear in one source. "
+            "Place stories in the appropriate section (NEWS for general, MARKETS for economic/financial)."
+        )
+        logger.debug("Fetched headlines for briefing")
 
-    # Calendar events - pre-fetch with correct timezone
-    if components.get("calendar"):
-        calendar_content = _fetch_calendar_events(config, user_id, is_morning, user_timezone)
+    # Calendar events - fetched with the user's timezone
+    if "calendar" in jobs:
+        calendar_content = fetched.get("calendar")
         if calendar_content:
             prompt_parts.append("")
             prompt_parts.append(calendar_content)
@@ -393,13 +500,13 @@ def build_briefing_prompt(
                 user_id,
             )
 
-    # TODO items - pre-fetch content
-    if components.get("todos"):
-        todo_content = _fetch_todo_items(config, user_id)
+    # TODO items
+    if "todos" in jobs:
+        todo_content = fetched.get("todos")
         if todo_content:
             prompt_parts.append("")
             prompt_parts.append(todo_content)
-        else:
+        elif "todos" not in late:
             prompt_parts.append("- Pending TODO items from their TODO file")
 
     # Notes files
@@ -412,9 +519,9 @@ def build_briefing_prompt(
     if components.get("email"):
         prompt_parts.append("- Summary of unread emails")
 
-    # Daily reminder - pre-fetch random reminder
-    if _component_enabled(components, "reminders"):
-        reminder = _fetch_random_reminder(config, user_id)
+    # Daily reminder - pre-selected at random
+    if "reminders" in jobs:
+        reminder = fetched.get("reminders")
         if reminder:
             prompt_parts.append("")
             prompt_parts.append("## Daily Reminder (pre-selected)")
@@ -498,9 +605,9 @@ def _fetch_finviz_market_data() -> str | None:
         Formatted FinViz data string, or None if unavailable.
     """
     try:
-        from ..markets.finviz import fetch_finviz_data, format_finviz_briefing
+        from ..markets.finviz import format_finviz_briefing, get_finviz_data
 
-        data = fetch_finviz_data()
+        data = get_finviz_data()
         if data is None:
             return None
 
@@ -514,10 +621,21 @@ def _fetch_finviz_market_data() -> str | None:
         return None
 
 
+def _newsletter_text(body: str) -> str:
+    """Plain text of a newsletter body, stripping HTML if needed."""
+    if body and ("<html" in body.lower() or "<body" in body.lower() or "<div" in body.lower()):
+        return _strip_html(body)
+    return body
+
+
 def _fetch_newsletter_content(news_config: dict, app_config: Config) -> str | None:
     """
     Pre-fetch newsletter emails and include their full content.
 
+    All matching messages are read in one IMAP session. Stripped text is
+    shared through the briefing cache by Message-ID, so only messages no
+    earlier briefing has seen are downloaded.
+
     Args:
         news_config: News configuration dict with sources and lookback_hours
         app_config: Application config for email settings
@@ -527,7 +645,8 @@ def _fetch_newsletter_content(news_config: dict, app_config: Config) -> str | No
     """
     try:
         from ...email_poller import get_email_config
-        from ..email import get_newsletters, read_email
+        from ..email import fetch_newsletters
+        from . import cache
 
         sources = news_config.get("sources", [])
         lookback_hours = news_config.get("lookback_hours", 12)
@@ -536,45 +655,52 @@ def _fetch_newsletter_content(news_config: dict, app_config: Config) -> str | No
             return None
 
         email_config = get_email_config(app_config)
-        envelopes = get_newsletters(sources, lookback_hours, config=email_config)
+        known: dict[str, dict] = {}
+
+        def have_text(message_id: str) -> bool:
+            entry = cache.get_newsletter(message_id)
+            if entry is not None:
+                known[message_id] = entry
+            return entry is not None
+
+        emails = fetch_newsletters(
+            sources,
+            lookback_hours,
+            folder=app_config.email.poll_folder,
+            config=email_config,
+            skip_body=have_text,
+        )
 
-        if not envelopes:
+        if not emails:
             return None
 
         lines = [f"## Newsletter content (past {lookback_hours} hours):"]
 
-        for envelope in envelopes:
-            try:
-                # Fetch full email content
-                email = read_email(
-                    envelope.id,
-                    folder=app_config.email.poll_folder,
-                    config=email_config,
-                )
-                lines.append("")
-                lines.append(f"### From: {email.sender}")
-                lines.append(f"**Subject:** {email.subject}")
-                lines.append("")
-
-                # Get body, stripping HTML if needed
-                body = email.body
-                if body and ("<html" in body.lower() or "<body" in body.lower() or "<div" in body.lower()):
-                    body = _strip_html(body)
-
-                # Truncate very long emails to avoid overwhelming the prompt
-                if len(body) > 5000:
-                    body = body[:5000] + "\n\n[Content truncated...]"
-                lines.append(body)
-                lines.append("")
-                lines.append("---")
-            except Exception as e:
-                logger.warning("Failed to read newsletter %s: %s", envelope.id, e)
-                continue
-
-        if len(lines) <= 1:
-            # Only header, no content
-            return None
+        for email in emails:
+            entry = known.get(email.message_id)
+            if entry is not None:
+                body = entry["text"]
+            else:
+                body = _newsletter_text(email.body)
+                if email.message_id and body:
+                    cache.put_newsletter(email.message_id, email.sender, email.subject, body)
+
+            lines.append("")
+            lines.append(f"### From: {email.sender}")
+            lines.append(f"**Subject:** {email.subject}")
+            lines.append("")
+
+            # Truncate very long emails to avoid overwhelming the prompt
+            if len(body) > 5000:
+                body = body[:5000] + "\n\n[Content truncated...]"
+            lines.append(body)
+            lines.append("")
+            lines.append("---")
 
+        logger.debug(
+            "Newsletters: %d messages, %d from cache", len(emails), len(known),
+        )
+        cache.prune_newsletters()
         return "\n".join(lines)
     except Exception as e:
         logger.warning("Newsletter fetch failed: %s", e)
@@ -597,6 +723,8 @@ HEADLINE_SOURCES = {
 
 _HEADLINE_PAGE_MAX_CHARS = 5000
 _HEADLINE_FETCH_TIMEOUT = 60.0
+_HEADLINE_FETCH_WORKERS = 4
+HEADLINE_CACHE_TTL = 1800  # seconds a fetched frontpage is reused
 
 
 def _fetch_headlines(headlines_config: dict, app_config: "Config") -> str | None:
@@ -616,15 +744,11 @@ def _fetch_headlines(headlines_config: dict, app_config: "Config") -> str | None
     if not sources:
         return None
 
-    api_url = app_config.browser.api_url
-    results = []
+    from . import cache
 
-    for source_key in sources:
-        source = HEADLINE_SOURCES.get(source_key)
-        if not source:
-            logger.warning("Unknown headline source: %s", source_key)
-            continue
+    api_url = app_config.browser.api_url
 
+    def fetch_page(source_key: str, source: dict) -> str | None:
         try:
             resp = httpx.post(
                 f"{api_url}/browse",
@@ -638,18 +762,45 @@ def _fetch_headlines(headlines_config: dict, app_config: "Config") -> str | None
                     "Headlines fetch from %s returned status %s",
                     source_key, data.get("status"),
                 )
-                continue
+                return None
 
             text = data.get("text", "")
-            if not text:
-                continue
-
             if len(text) > _HEADLINE_PAGE_MAX_CHARS:
                 text = text[:_HEADLINE_PAGE_MAX_CHARS] + "\n[truncated]"
-
-            results.append(f"### {source['name']} ({source['url']})\n{text}")
+            return text or None
         except Exception as e:
             logger.warning("Failed to fetch headlines from %s: %s", source_key, e)
+            return None
+
+    known_sources = []
+    for source_key in sources:
+        source = HEADLINE_SOURCES.get(source_key)
+        if not source:
+            logger.warning("Unknown headline source: %s", source_key)
+            continue
+        known_sources.append((source_key, source))
+    if not known_sources:
+        return None
+
+    # Pages are cached per URL and shared by every briefing that lists the
+    # source; misses are fetched in parallel
+    ttl = headlines_config.get("cache_ttl", HEADLINE_CACHE_TTL)
+    with ThreadPoolExecutor(
+        max_workers=min(len(known_sources), _HEADLINE_FETCH_WORKERS),
+        thread_name_prefix="briefing-headlines",
+    ) as executor:
+        pages = list(executor.map(
+            lambda item: cache.headline_page(
+                item[1]["url"], ttl, lambda: fetch_page(*item),
+            ),
+            known_sources,
+        ))
+
+    results = [
+        f"### {source['name']} ({source['url']})\n{text}"
+        for (_, source), text in zip(known_sources, pages)
+        if text
+    ]
 
     if not results:
         return None
@@ -0,0 +1,136 @@
+"""Shared cache for newsletter and headline content used by briefings.
+
+Briefings for different users often draw on the same newsletter senders
+and frontpage sources. Newsletter text is stored by Message-ID once it has
+been stripped, so each message is downloaded and parsed once however many
+briefings include it. Headline pages are kept until their TTL runs out,
+and concurrent briefings asking for the same page share one fetch.
+
+Entries live under BRIEFING_CACHE_DIR (default ~/.cache/istota/briefing).
+Failed fetches are never cached.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+NEWSLETTER_RETENTION_DAYS = 7
+
+_key_locks: dict[str, threading.Lock] = {}
+_key_locks_lock = threading.Lock()
+
+
+def cache_dir() -> Path:
+    """Directory for cached briefing content (BRIEFING_CACHE_DIR or XDG cache)."""
+    env_val = os.environ.get("BRIEFING_CACHE_DIR", "").strip()
+    if env_val:
+        return Path(env_val)
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or str(Path.home() / ".cache")
+    return Path(base) / "istota" / "briefing"
+
+
+def _entry_path(kind: str, key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return cache_dir() / kind / f"{digest}.json"
+
+
+def _read(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        return None
+
+
+def _write(path: Path, data: dict) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp.write_text(json.dumps(data))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        # The cache is an optimization; an unwritable cache dir is not an error
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+def get_newsletter(message_id: str) -> dict | None:
+    """Cached newsletter entry (sender, subject, text) for a Message-ID."""
+    entry = _read(_entry_path("newsletters", message_id))
+    if entry is None or entry.get("message_id") != message_id:
+        return None
+    return entry
+
+
+def put_newsletter(message_id: str, sender: str, subject: str, text: str) -> None:
+    """Store a newsletter's stripped text under its Message-ID."""
+    _write(_entry_path("newsletters", message_id), {
+        "message_id": message_id,
+        "sender": sender,
+        "subject": subject,
+        "text": text,
+    })
+
+
+def prune_newsletters(max_age_days: int = NEWSLETTER_RETENTION_DAYS) -> int:
+    """Delete newsletter entries not written in max_age_days. Returns count."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in (cache_dir() / "newsletters").glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+@contextmanager
+def _process_lock(path: Path):
+    """Hold the entry's lock file so other processes wait for this fetch."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        yield  # No cache dir: fetch without cross-process dedup
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def headline_page(url: str, ttl: float, fetch: Callable[[], str | None]) -> str | None:
+    """Return the cached page text for url, calling fetch at most once when stale."""
+    path = _entry_path("headlines", url)
+
+    def fresh() -> str | None:
+        entry = _read(path)
+        if entry and entry.get("url") == url and entry.get("expires_at", 0) > time.time():
+            return entry.get("text")
+        return None
+
+    text = fresh()
+    if text is not None:
+        return text
+
+    with _key_locks_lock:
+        key_lock = _key_locks.setdefault(url, threading.Lock())
+    with key_lock, _process_lock(path):
+        # Another briefing may have fetched it while this one waited
+        text = fresh()
+        if text is None:
+            text = fetch()
+            if text:
+                _write(path, {"url": url, "expires_at": time.time() + ttl, "text": text})
+    return text
@@ -13,6 +13,8 @@ import argparse
 import json
 import os
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import Iterator
@@ -47,10 +49,12 @@ def _require_caldav():
         raise ImportError("caldav not installed. Install with: uv sync --extra calendar")
 
 
-def get_caldav_client(url: str, username: str, password: str):
-    """Create a CalDAV client."""
+def get_caldav_client(url: str, username: str, password: str, timeout: float | None = None):
+    """Create a CalDAV client. timeout (seconds) applies to each request."""
     _require_caldav()
-    return caldav.DAVClient(url=url, username=username, password=password)
+    if timeout is None:
+        return caldav.DAVClient(url=url, username=username, password=password)
+    return caldav.DAVClient(url=url, username=username, password=password, timeout=timeout)
 
 
 def list_calendars(client: caldav.DAVClient) -> list[tuple[str, str]]:
@@ -229,6 +233,102 @@ def get_week_events(
     return get_events(client, calendar_url, today, week_end)
 
 
+def get_calendar_sync_token(client: caldav.DAVClient, calendar_url: str) -> str | None:
+    """Current {DAV:}sync-token of a calendar, or None if the server has none.
+
+    The token changes whenever any event in the calendar does, so one small
+    PROPFIND tells whether previously fetched events are still current.
+    """
+    calendar = client.calendar(url=calendar_url)
+    try:
+        props = calendar.get_properties([caldav.dav.SyncToken()])
+    except Exception:
+        return None
+    token = props.get("{DAV:}sync-token")
+    return str(token) if token else None
+
+
+@dataclass
+class _CachedRange:
+    sync_token: str | None
+    start: datetime
+    end: datetime
+    events: list[CalendarEvent]
+    fetched_at: float
+
+
+class EventCache:
+    """
+    In-memory cache of calendar listings and events for repeated range queries.
+
+    Events are fetched for whole days around the requested range and reused
+    while the calendar's sync token is unchanged and later requests fall
+    inside those days; a changed token refetches only that calendar. Servers
+    without sync tokens are refetched once entries are max_age seconds old.
+    The user's calendar list is cached for max_age seconds. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_age: float = 900.0):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._calendars: dict[str, tuple[float, list[tuple[str, str, bool]]]] = {}
+        self._events: dict[str, _CachedRange] = {}
+
+    def calendars_for_user(
+        self, client: caldav.DAVClient, username: str,
+    ) -> list[tuple[str, str, bool]]:
+        """Cached get_calendars_for_user."""
+        with self._lock:
+            hit = self._calendars.get(username)
+        if hit is not None and time.monotonic() - hit[0] < self.max_age:
+            return hit[1]
+        calendars = get_calendars_for_user(client, username)
+        with self._lock:
+            self._calendars[username] = (time.monotonic(), calendars)
+        return calendars
+
+    def get_events(
+        self,
+        client: caldav.DAVClient,
+        calendar_url: str,
+        start: datetime,
+        end: datetime,
+    ) -> list[CalendarEvent]:
+        """Events overlapping [start, end), from cache when still current."""
+        with self._lock:
+            cached = self._events.get(calendar_url)
+
+        token = get_calendar_sync_token(client, calendar_url)
+        if cached is not None and cached.start <= start and end <= cached.end:
+            if token is not None and token == cached.sync_token:
+                fresh = True
+            else:
+                fresh = token is None and time.monotonic() - cached.fetched_at < self.max_age
+            if fresh:
+                return _overlapping(cached.events, start, end)
+
+        # Whole days, so a range that slides forward a little still hits
+        range_start = datetime.combine(start.date(), datetime.min.time(), start.tzinfo)
+        range_end = datetime.combine(end.date() + timedelta(days=1), datetime.min.time(), end.tzinfo)
+        events = get_events(client, calendar_url, range_start, range_end)
+        with self._lock:
+            self._events[calendar_url] = _CachedRange(
+                sync_token=token,
+                start=range_start,
+                end=range_end,
+                events=events,
+                fetched_at=time.monotonic(),
+            )
+        return _overlapping(events, start, end)
+
+
+def _overlapping(events: list[CalendarEvent], start: datetime, end: datetime) -> list[CalendarEvent]:
+    # Event times are naive (see get_events), so compare on wall-clock time
+    start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    return [e for e in events if e.start < end and e.end > start]
+
+
 def create_event(
     client: caldav.DAVClient,
     calendar_url: str,
@@ -13,6 +13,8 @@ import smtplib
 import ssl
 import sys
 import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from email.message import EmailMessage
@@ -20,9 +22,10 @@ from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 
 try:
-    from imap_tools import AND, MailBox, MailboxLoginError
+    from imap_tools import AND, U, MailBox, MailboxLoginError
 except ImportError:
     AND = None
+    U = None
     MailBox = None
     MailboxLoginError = None
 
@@ -34,6 +37,9 @@ class EmailEnvelope:
     sender: str
     date: str
     is_read: bool
+    message_id: str | None = None  # Set by list_new_envelopes (from headers)
+    in_reply_to: str | None = None
+    references: str | None = None
 
 
 @dataclass
@@ -200,6 +206,109 @@ def download_attachments(
     return downloaded
 
 
+@contextmanager
+def open_mailbox(folder: str = "INBOX", config: EmailConfig | None = None) -> Iterator[MailBox]:
+    """Log in once and select folder, for several operations in one IMAP session."""
+    if config is None:
+        raise ValueError("config is required")
+
+    with _get_mailbox(config) as mailbox:
+        mailbox.login(config.imap_user, config.imap_password)
+        mailbox.folder.set(folder)
+        yield mailbox
+
+
+def folder_uid_status(mailbox: MailBox, folder: str) -> tuple[int, int]:
+    """(UIDVALIDITY, UIDNEXT) of a folder; UIDs above a watermark are new while UIDVALIDITY holds."""
+    status = mailbox.folder.status(folder, ["UIDVALIDITY", "UIDNEXT"])
+    return int(status["UIDVALIDITY"]), int(status["UIDNEXT"])
+
+
+def list_new_envelopes(
+    mailbox: MailBox,
+    min_uid: int | None = None,
+    limit: int = 50,
+) -> list[EmailEnvelope]:
+    """
+    Envelopes from headers and flags only, oldest first.
+
+    With min_uid, lists up to limit messages with UID >= min_uid (the
+    oldest ones, so a backlog drains in order). Without, lists the newest
+    limit messages. Bodies and attachments are not downloaded.
+    """
+    if min_uid is None:
+        messages = mailbox.fetch(
+            limit=limit, reverse=True, mark_seen=False, headers_only=True, bulk=True,
+        )
+    else:
+        messages = mailbox.fetch(
+            AND(uid=U(min_uid, "*")), limit=limit,
+            mark_seen=False, headers_only=True, bulk=True,
+        )
+
+    envelopes = []
+    for msg in messages:
+        # "N:*" always matches the highest UID, even when it is below N
+        if min_uid is not None and int(msg.uid) < min_uid:
+            continue
+        envelopes.append(EmailEnvelope(
+            id=msg.uid,
+            subject=msg.subject or "(no subject)",
+            sender=msg.from_ or "unknown",
+            date=msg.date_str or "",
+            is_read="\\Seen" in msg.flags,
+            message_id=_header_value(msg, "message-id"),
+            in_reply_to=_header_value(msg, "in-reply-to"),
+            references=_header_value(msg, "references"),
+        ))
+    envelopes.sort(key=lambda e: int(e.id))
+    return envelopes
+
+
+def fetch_emails(
+    mailbox: MailBox,
+    uids: list[str],
+    attachment_dir: Callable[[str], Path] | None = None,
+) -> Iterator[tuple[Email, list[Path]]]:
+    """
+    Download full messages by UID, one at a time, in the current session.
+
+    Attachments are written from the same fetch to attachment_dir(uid)
+    when given. Yields (email, attachment paths) for each UID found.
+    """
+    for msg in mailbox.fetch(uid_list=uids, mark_seen=False):
+        saved = []
+        if attachment_dir is not None:
+            attachments = [att for att in msg.attachments if att.filename]
+            if attachments:
+                target_dir = attachment_dir(msg.uid)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                for att in attachments:
+                    # Sender-supplied names may carry path components
+                    name = Path(att.filename).name
+                    if name in ("", ".", ".."):
+                        continue
+                    file_path = target_dir / name
+                    file_path.write_bytes(att.payload)
+                    saved.append(file_path)
+        email = Email(
+            id=msg.uid,
+            subject=msg.subject or "(no subject)",
+            sender=msg.from_ or "unknown",
+            date=msg.date_str or "",
+            body=msg.text or msg.html or "",
+            attachments=[att.filename for att in msg.attachments if att.filename],
+            message_id=_header_value(msg, "message-id"),
+            references=_header_value(msg, "references"),
+        )
+        yield email, saved
+
+
+def wait_for_mail(mailbox: MailBox, timeout: float) -> bool:
+    """Block in IMAP IDLE for up to timeout seconds. True if the server reported changes."""
+    return bool(mailbox.idle.wait(timeout=timeout))
+
+
 def send_email(
     to: str,
     subject: str,
@@ -452,18 +561,7 @@ def get_newsletters(
     if not sources:
         return []
 
-    # Separate sources by type
-    email_senders = []
-    domains = []
-    for source in sources:
-        source_type = source.get("type", "email")
-        value = source.get("value", "")
-        if not value:
-            continue
-        if source_type == "domain":
-            domains.append(value.lower())
-        else:
-            email_senders.append(value.lower())
+    matches_source = _newsletter_matcher(sources)
 
     # Fetch recent emails - get a larger batch to filter
     all_emails = list_emails(folder=folder, limit=100, config=config)
@@ -479,23 +577,125 @@ def get_newsletters(
             continue
         if email_dt.timestamp() < cutoff:
             continue
+        if matches_source(email.sender):
+            recent.append(email)
+
+    return recent
+
+
+def _newsletter_matcher(sources: list[dict]) -> Callable[[str], bool]:
+    """Build a sender predicate from newsletter source dicts."""
+    # Separate sources by type
+    email_senders = set()
+    domains = []
+    for source in sources:
+        source_type = source.get("type", "email")
+        value = source.get("value", "")
+        if not value:
+            continue
+        if source_type == "domain":
+            domains.append(value.lower())
+        else:
+            email_senders.add(value.lower())
 
-        # Check if sender matches any source
-        sender_lower = email.sender.lower()
+    def matches(sender: str) -> bool:
+        sender_lower = sender.lower()
 
         # Check exact email match
         if sender_lower in email_senders:
-            recent.append(email)
-            continue
+            return True
 
         # Check domain match (supports subdomains - news.bloomberg.com matches bloomberg.com)
         sender_domain = sender_lower.split("@")[-1] if "@" in sender_lower else ""
-        for domain in domains:
-            if sender_domain == domain or sender_domain.endswith("." + domain):
-                recent.append(email)
-                break
+        return any(
+            sender_domain == domain or sender_domain.endswith("." + domain)
+            for domain in domains
+        )
 
-    return recent
+    return matches
+
+
+def _header_value(msg, name: str) -> str | None:
+    value = msg.headers.get(name)
+    if isinstance(value, tuple):
+        value = value[0] if value else None
+    return value.strip() if value else None
+
+
+def fetch_newsletters(
+    sources: list[dict],
+    lookback_hours: int = 12,
+    folder: str = "INBOX",
+    config: EmailConfig | None = None,
+    skip_body: Callable[[str], bool] | None = None,
+) -> list[Email]:
+    """
+    Fetch recent newsletter emails with their bodies in one IMAP session.
+
+    Headers for the most recent 100 messages since the lookback day come
+    back in one FETCH; bodies of the matching messages are then fetched
+    together in one UID FETCH. skip_body is asked about each matching
+    Message-ID; messages it accepts are returned with an empty body and not
+    downloaded, for callers that already hold their text.
+
+    Args:
+        sources: Newsletter sources, as for get_newsletters
+        lookback_hours: Maximum age of emails to include
+        folder: IMAP folder to search
+        config: Email configuration
+        skip_body: Predicate on Message-ID for bodies the caller already has
+
+    Returns:
+        Matching emails, newest first
+    """
+    if config is None:
+        raise ValueError("config is required")
+
+    if not sources:
+        return []
+
+    matches_source = _newsletter_matcher(sources)
+    cutoff = datetime.now().timestamp() - (lookback_hours * 3600)
+    since = datetime.fromtimestamp(cutoff).date()
+
+    with _get_mailbox(config) as mailbox:
+        mailbox.login(config.imap_user, config.imap_password)
+        mailbox.folder.set(folder)
+
+        matched = []
+        for msg in mailbox.fetch(
+            AND(date_gte=since), limit=100, reverse=True,
+            mark_seen=False, headers_only=True, bulk=True,
+        ):
+            email_dt = _parse_email_date(msg.date_str or "")
+            if email_dt is None or email_dt.timestamp() < cutoff:
+                continue
+            if matches_source(msg.from_ or ""):
+                matched.append(msg)
+
+        to_download = []
+        for msg in matched:
+            message_id = _header_value(msg, "message-id")
+            if not (message_id and skip_body and skip_body(message_id)):
+                to_download.append(msg.uid)
+        bodies = {}
+        if to_download:
+            for msg in mailbox.fetch(uid_list=to_download, mark_seen=False, bulk=True):
+                bodies[msg.uid] = msg.text or msg.html or ""
+
+    return [
+        Email(
+            id=msg.uid,
+            subject=msg.subject or "(no subject)",
+            sender=msg.from_ or "unknown",
+            date=msg.date_str or "",
+            body=bodies.get(msg.uid, ""),
+            attachments=[],
+            message_id=_header_value(msg, "message-id"),
+            references=_header_value(msg, "references"),
+        )
+        for msg in matched
+    ]
 
 
 def delete_email(
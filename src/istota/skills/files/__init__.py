@@ -2,8 +2,10 @@
 
 import json
 import logging
+import os
 import shutil
 import subprocess
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -40,6 +42,43 @@ def list_files(config: "Config", path: str) -> list[dict]:
         return rclone_list(config.rclone_remote, path)
 
 
+def list_dirs(config: "Config", paths: list[str]) -> dict[str, list[dict]]:
+    """
+    List the files in several directories in one sweep (mount-aware).
+
+    On the mount each directory is one scandir; otherwise a single
+    filtered recursive rclone listing covers them all. Returns
+    {directory: [entries]} with the same entry dicts as list_files
+    (mod_time as an ISO timestamp), omitting directories that don't exist
+    or hold no files. Subdirectories are not included.
+    """
+    if not paths:
+        return {}
+    if config.use_mount:
+        listed = {}
+        for path in paths:
+            mount_path = config.nextcloud_mount_path / path.lstrip("/")
+            try:
+                with os.scandir(mount_path) as entries:
+                    items = []
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                        items.append({
+                            "name": entry.name,
+                            "size": st.st_size,
+                            "mod_time": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
+                            "is_dir": False,
+                        })
+            except OSError:
+                continue
+            listed[path] = items
+        return listed
+    else:
+        return rclone_list_dirs(config.rclone_remote, paths)
+
+
 def read_text(config: "Config", path: str) -> str:
     """Read a text file (mount-aware)."""
     if config.use_mount:
@@ -190,6 +229,65 @@ def rclone_list(remote: str, path: str) -> list[dict]:
     ]
 
 
+# rclone exit status when the source directory doesn't exist
+_RCLONE_DIR_NOT_FOUND = 3
+
+
+def rclone_list_dirs(remote: str, paths: list[str]) -> dict[str, list[dict]]:
+    """
+    List files in several directories with one rclone call.
+
+    Lists their common parent recursively, filtered to the given
+    directories, so the remote is walked once instead of per directory.
+    A missing common parent lists as empty. If the sweep fails otherwise,
+    each directory is listed on its own, so one unreadable directory
+    doesn't hide the rest; directories that still fail are omitted.
+    """
+    parts = [[p for p in path.strip("/").split("/") if p] for path in paths]
+    common = []
+    for segments in zip(*parts):
+        if len(set(segments)) != 1:
+            break
+        common.append(segments[0])
+    root = "/" + "/".join(common)
+    rel_dirs = {"/".join(segments[len(common):]): path for segments, path in zip(parts, paths)}
+
+    cmd = ["rclone", "lsjson", "-R", "--files-only", f"{remote}:{root}"]
+    cmd.extend(["--max-depth", str(max(len(rel.split("/")) if rel else 0 for rel in rel_dirs) + 1)])
+    for rel in rel_dirs:
+        cmd.extend(["--include", f"/{rel}/*" if rel else "/*"])
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode == _RCLONE_DIR_NOT_FOUND:
+        return {}
+    if result.returncode != 0:
+        logger.warning("rclone sweep of %s failed, listing directories one by one: %s", root, result.stderr)
+        listed: dict[str, list[dict]] = {}
+        for path in paths:
+            try:
+                items = rclone_list(remote, path)
+            except RuntimeError as e:
+                logger.warning("Skipping %s: %s", path, e)
+                continue
+            files = [item for item in items if not item["is_dir"]]
+            if files:
+                listed[path] = files
+        return listed
+
+    listed = {}
+    for item in json.loads(result.stdout):
+        rel_dir, _, name = item["Path"].rpartition("/")
+        path = rel_dirs.get(rel_dir)
+        if path is None:
+            continue
+        listed.setdefault(path, []).append({
+            "name": name,
+            "size": item.get("Size", 0),
+            "mod_time": item.get("ModTime", ""),
+            "is_dir": False,
+        })
+    return listed
+
+
 def rclone_download(remote: str, remote_path: str, local_path: Path) -> None:
     """Download a file from Nextcloud."""
     local_path.parent.mkdir(parents=True, exist_ok=True)
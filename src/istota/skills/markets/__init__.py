@@ -1,5 +1,9 @@
 """Market data via yfinance.
 
+Quotes are fetched in one batched download per symbol set and shared
+through a TTL cache (see cache.py), so briefings for many users and the
+CLI don't each re-fetch the same data.
+
 Also provides a CLI for interactive market queries:
     python -m istota.skills.markets quote AAPL MSFT
     python -m istota.skills.markets summary
@@ -43,9 +47,51 @@ SYMBOL_NAMES = {
 }
 
 
-def get_quotes(symbols: list[str]) -> list[MarketQuote]:
+# How long fetched quotes are reused, in seconds
+QUOTE_TTL = 120
+
+
+def _download_prices(yf, symbols: list[str]) -> dict[str, tuple[float, float]]:
+    """Last and previous daily close per symbol from one batched download.
+
+    Symbols missing from the download (or all of them, if it fails) are
+    left out; the caller looks those up one by one.
+    """
+    try:
+        import pandas as pd
+
+        frame = yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            group_by="column",
+            auto_adjust=False,
+            progress=False,
+        )
+    except Exception:
+        return {}
+    if not isinstance(frame, pd.DataFrame) or frame.empty or "Close" not in frame:
+        return {}
+
+    closes = frame["Close"]
+    if isinstance(closes, pd.Series):
+        if len(symbols) != 1:
+            return {}
+        closes = closes.to_frame(symbols[0])
+
+    prices = {}
+    for symbol in symbols:
+        if symbol not in closes.columns:
+            continue
+        series = closes[symbol].dropna()
+        if len(series) >= 2:
+            prices[symbol] = (float(series.iloc[-1]), float(series.iloc[-2]))
+    return prices
+
+
+def fetch_quotes(symbols: list[str]) -> list[MarketQuote]:
     """
-    Fetch current quotes for given symbols.
+    Fetch current quotes for given symbols, bypassing the cache.
 
     Returns list of MarketQuote objects. Failed fetches are silently skipped.
     """
@@ -54,15 +100,17 @@ def get_quotes(symbols: list[str]) -> list[MarketQuote]:
     except ImportError:
         return []
 
+    prices = _download_prices(yf, symbols)
+
     quotes = []
     for symbol in symbols:
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.fast_info
-
-            # Get current price and previous close
-            price = info.last_price
-            prev_close = info.previous_close
+            if symbol in prices:
+                price, prev_close = prices[symbol]
+            else:
+                info = yf.Ticker(symbol).fast_info
+                price = info.last_price
+                prev_close = info.previous_close
 
             if price is None or prev_close is None:
                 continue
@@ -85,6 +133,25 @@ def get_quotes(symbols: list[str]) -> list[MarketQuote]:
     return quotes
 
 
+def get_quotes(symbols: list[str], ttl: float = QUOTE_TTL) -> list[MarketQuote]:
+    """
+    Current quotes for given symbols, from the shared cache when fresh.
+
+    The cache is keyed by the symbol set, so callers asking for the same
+    symbols in any order share one fetch. Quotes come back in the order
+    asked for.
+
+    Returns list of MarketQuote objects. Failed fetches are silently skipped.
+    """
+    from .cache import cached
+
+    symbols = list(dict.fromkeys(symbols))
+    key = "quotes:" + ",".join(sorted(symbols))
+    quotes = cached(key, ttl, lambda: fetch_quotes(symbols))
+    by_symbol = {q.symbol: q for q in quotes}
+    return [by_symbol[s] for s in symbols if s in by_symbol]
+
+
 def get_futures_quotes(symbols: list[str] | None = None) -> list[MarketQuote]:
     """
     Fetch futures quotes.
@@ -180,10 +247,10 @@ def cmd_summary(args: argparse.Namespace) -> None:
 
 
 def cmd_finviz(args: argparse.Namespace) -> None:
-    from .finviz import fetch_finviz_data, format_finviz_briefing
+    from .finviz import format_finviz_briefing, get_finviz_data
 
     api_url = os.environ.get("BROWSER_API_URL")
-    data = fetch_finviz_data(api_url=api_url)
+    data = get_finviz_data(api_url=api_url)
     if data is None:
         print(json.dumps({"error": "Failed to fetch FinViz data"}))
         sys.exit(1)
@@ -0,0 +1,137 @@
+"""Shared, TTL-bounded cache for market data.
+
+Briefings for many users ask for the same quotes and FinViz page at about
+the same time, and the markets CLI asks again from its own process. Results
+are kept in memory for the process and on disk under MARKETS_CACHE_DIR
+(default ~/.cache/istota/markets), keyed by what was asked for, until their
+TTL runs out.
+
+Concurrent requests for one key share a single fetch: threads in this
+process wait for the one in flight, and other processes wait on the key's
+lock file and then read what it wrote. Empty results (a failed fetch) are
+never cached.
+"""
+
+import fcntl
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_CACHE_FORMAT = 1
+
+_memory: dict[str, tuple[float, object]] = {}
+_memory_lock = threading.Lock()
+_key_locks: dict[str, threading.Lock] = {}
+
+
+def cache_dir() -> Path:
+    """Directory for persisted market data (MARKETS_CACHE_DIR or XDG cache)."""
+    env_val = os.environ.get("MARKETS_CACHE_DIR", "").strip()
+    if env_val:
+        return Path(env_val)
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or str(Path.home() / ".cache")
+    return Path(base) / "istota" / "markets"
+
+
+def clear_cache() -> None:
+    """Drop the in-memory cache (entries on disk still expire by TTL)."""
+    with _memory_lock:
+        _memory.clear()
+
+
+def _cache_file(key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return cache_dir() / f"{digest}.pickle"
+
+
+def _memory_get(key: str):
+    with _memory_lock:
+        hit = _memory.get(key)
+    if hit is not None and hit[0] > time.time():
+        return hit
+    return None
+
+
+def _read_disk(key: str) -> tuple[float, object] | None:
+    try:
+        with open(_cache_file(key), "rb") as f:
+            fmt, stored_key, expires_at, value = pickle.load(f)
+    except Exception:
+        return None
+    if fmt != _CACHE_FORMAT or stored_key != key or expires_at <= time.time():
+        return None
+    return expires_at, value
+
+
+def _write_disk(key: str, expires_at: float, value: object) -> None:
+    path = _cache_file(key)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        with open(tmp, "wb") as f:
+            pickle.dump((_CACHE_FORMAT, key, expires_at, value), f, pickle.HIGHEST_PROTOCOL)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        # The cache is an optimization; an unwritable cache dir is not an error
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+@contextmanager
+def _process_lock(key: str):
+    """Hold the key's lock file so other processes wait for this fetch."""
+    lock_path = _cache_file(key).with_suffix(".lock")
+    try:
+        lock_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        yield  # No cache dir: fetch without cross-process dedup
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def cached(key: str, ttl: float, fetch: Callable[[], T]) -> T:
+    """Return the cached value for key, calling fetch at most once when stale.
+
+    ttl is in seconds and applies to values this call fetches.
+    """
+    hit = _memory_get(key)
+    if hit is not None:
+        return hit[1]
+
+    with _memory_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        # Another thread may have fetched it while this one waited
+        hit = _memory_get(key)
+        if hit is not None:
+            return hit[1]
+
+        with _process_lock(key):
+            stored = _read_disk(key)
+            if stored is None:
+                value = fetch()
+                stored = (time.time() + ttl, value)
+                if value:
+                    _write_disk(key, *stored)
+
+        expires_at, value = stored
+        if value:
+            with _memory_lock:
+                _memory[key] = (expires_at, value)
+        return value
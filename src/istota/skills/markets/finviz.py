@@ -448,3 +448,21 @@ def fetch_finviz_data(api_url: str | None = None, retries: int = 2) -> FinVizDat
 
     logger.warning("FinViz fetch failed after %d attempts: %s", 1 + retries, last_error)
     return None
+
+
+# How long a fetched FinViz page is reused, in seconds
+FINVIZ_TTL = 600
+
+
+def get_finviz_data(api_url: str | None = None, ttl: float = FINVIZ_TTL) -> FinVizData | None:
+    """FinViz data from the shared market data cache, fetching it when stale.
+
+    Briefings for several users within the TTL share one browser scrape.
+    The cache is keyed by the browser API URL, so callers pointing at
+    different browsers don't share results.
+    """
+    from .cache import cached
+
+    if api_url is None:
+        api_url = os.environ.get("BROWSER_API_URL", DEFAULT_API_URL)
+    return cached(f"finviz:{api_url}", ttl, lambda: fetch_finviz_data(api_url=api_url))
@@ -90,8 +90,8 @@ def cmd_download(args) -> dict:
     return download_model(args.model_name)
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
+def build_parser(parser_class=argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser = parser_class(
         prog="python -m istota.skills.whisper",
         description="Audio transcription using faster-whisper (CPU, int8)",
     )
@@ -128,21 +128,54 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv=None):
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
-    commands = {
+def _commands() -> dict:
+    return {
         "transcribe": cmd_transcribe,
         "models": cmd_models,
         "download": cmd_download,
     }
 
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
     try:
-        result = commands[args.command](args)
+        result = _commands()[args.command](args)
         print(json.dumps(result, indent=2, ensure_ascii=False))
         if result.get("status") == "error":
             sys.exit(1)
     except Exception as e:
         print(json.dumps({"status": "error", "error": str(e)}))
         sys.exit(1)
+
+
+class _ServeParser(argparse.ArgumentParser):
+    """Raises on bad arguments instead of printing usage and exiting."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def serve(argv: list[str]) -> dict | None:
+    """Run a command for the skill proxy's resident whisper worker.
+
+    Lets transcription reuse the worker's resident model pool instead of
+    loading the model in a fresh child. Returns the proxy response dict,
+    or None when argv doesn't parse so the caller can fall back to running
+    the CLI normally (which reports the usage error).
+    """
+    try:
+        args = build_parser(_ServeParser).parse_args(argv)
+    except (ValueError, SystemExit):
+        return None
+
+    try:
+        result = _commands()[args.command](args)
+    except Exception as e:
+        result = {"status": "error", "error": str(e)}
+    return {
+        "stdout": json.dumps(result, indent=2, ensure_ascii=False) + "\n",
+        "stderr": "",
+        "returncode": 1 if result.get("status") == "error" else 0,
+    }
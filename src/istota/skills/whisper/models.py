@@ -1,9 +1,16 @@
-"""Model selection and RAM guard for faster-whisper."""
+"""Model selection, RAM guard and resident model pool for faster-whisper."""
 
 import json
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
+logger = logging.getLogger("istota.skills.whisper")
+
 # Approximate RAM requirements per model (GB)
 MODEL_REQUIREMENTS = {
     "tiny": 1.0,
@@ -21,6 +28,10 @@ _DEFAULT_MAX_MODEL = "small"
 
 _MODEL_ORDER = list(MODEL_REQUIREMENTS.keys())
 
+# Loaded models are dropped after this long unused. Override via
+# WHISPER_MODEL_IDLE_SECONDS env var (0 disables the pool).
+_DEFAULT_IDLE_SECONDS = 600
+
 
 def _get_headroom_gb(override: float | None = None) -> float:
     """Return headroom in GB, checking env var RAM_HEADROOM_MB if no override."""
@@ -60,10 +71,15 @@ def select_model(preferred: str | None = None, headroom_gb: float | None = None)
     Headroom defaults to 0.3 GB. Override via headroom_gb param or
     RAM_HEADROOM_MB env var.
 
+    A model already resident in the pool always fits, and memory held by
+    other resident models counts as available since get_model() evicts
+    them before loading something new.
+
     Raises ValueError if no model fits or preferred model doesn't fit.
     """
     headroom = _get_headroom_gb(headroom_gb)
-    available = get_available_memory_gb()
+    resident = resident_models()
+    available = get_available_memory_gb() + resident_memory_gb()
 
     if preferred and preferred != "auto":
         if preferred not in MODEL_REQUIREMENTS:
@@ -71,6 +87,8 @@ def select_model(preferred: str | None = None, headroom_gb: float | None = None)
                 f"Unknown model '{preferred}'. "
                 f"Available: {', '.join(MODEL_REQUIREMENTS)}"
             )
+        if preferred in resident:
+            return preferred
         needed = MODEL_REQUIREMENTS[preferred]
         if needed + headroom > available:
             raise ValueError(
@@ -86,7 +104,7 @@ def select_model(preferred: str | None = None, headroom_gb: float | None = None)
 
     for name in reversed(candidates):
         needed = MODEL_REQUIREMENTS[name]
-        if needed + headroom <= available:
+        if name in resident or needed + headroom <= available:
             return name
 
     raise ValueError(
@@ -96,6 +114,139 @@ def select_model(preferred: str | None = None, headroom_gb: float | None = None)
     )
 
 
+# --- Resident model pool ---
+
+
+@dataclass
+class _Resident:
+    model: object
+    last_used: float
+    in_use: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_pool: dict[tuple[str, str], _Resident] = {}
+_pool_lock = threading.Lock()
+_janitor: threading.Thread | None = None
+
+
+def _get_idle_seconds() -> float:
+    """Return the idle eviction timeout, from env or default."""
+    env_val = os.environ.get("WHISPER_MODEL_IDLE_SECONDS")
+    if env_val:
+        try:
+            return max(0.0, float(env_val))
+        except ValueError:
+            pass
+    return _DEFAULT_IDLE_SECONDS
+
+
+def resident_models() -> set[str]:
+    """Names of the models currently loaded in this process."""
+    with _pool_lock:
+        return {name for name, _ in _pool}
+
+
+def resident_memory_gb() -> float:
+    """Approximate RAM held by resident models."""
+    with _pool_lock:
+        return sum(MODEL_REQUIREMENTS.get(name, 0.0) for name, _ in _pool)
+
+
+def evict_models(idle_seconds: float | None = None) -> list[str]:
+    """Drop resident models that are not in use.
+
+    With ``idle_seconds``, only models unused for at least that long are
+    dropped. Returns the evicted model names.
+    """
+    now = time.monotonic()
+    evicted = []
+    with _pool_lock:
+        for key, entry in list(_pool.items()):
+            if entry.in_use:
+                continue
+            if idle_seconds is not None and now - entry.last_used < idle_seconds:
+                continue
+            del _pool[key]
+            evicted.append(key[0])
+    for name in evicted:
+        logger.info("Evicted whisper model %s", name)
+    return evicted
+
+
+def _make_room(name: str) -> None:
+    """Evict least recently used models until ``name`` fits the RAM guard."""
+    needed = MODEL_REQUIREMENTS.get(name, 0.0) + _get_headroom_gb()
+    while get_available_memory_gb() < needed:
+        with _pool_lock:
+            idle = sorted(
+                ((e.last_used, k) for k, e in _pool.items() if not e.in_use),
+            )
+            if not idle:
+                return
+            key = idle[0][1]
+            del _pool[key]
+        logger.info("Evicted whisper model %s to make room for %s", key[0], name)
+
+
+def _janitor_loop() -> None:
+    global _janitor
+    while True:
+        idle = _get_idle_seconds()
+        time.sleep(min(60.0, max(idle / 4, 1.0)))
+        evict_models(idle)
+        # Free memory early when the host is under pressure
+        if get_available_memory_gb() < _get_headroom_gb():
+            evict_models()
+        with _pool_lock:
+            if not _pool:
+                _janitor = None
+                return
+
+
+@contextmanager
+def get_model(name: str, compute_type: str = "int8"):
+    """Lease a loaded WhisperModel, loading it on first use.
+
+    Models stay resident (keyed by name and compute type) until they have
+    been idle for WHISPER_MODEL_IDLE_SECONDS or another model needs their
+    RAM. Concurrent users of the same model are serialized.
+    """
+    global _janitor
+    from faster_whisper import WhisperModel
+
+    key = (name, compute_type)
+    with _pool_lock:
+        entry = _pool.get(key)
+        if entry is not None:
+            entry.in_use += 1
+    if entry is None:
+        _make_room(name)
+        started = time.monotonic()
+        model = WhisperModel(name, device="cpu", compute_type=compute_type)
+        logger.info("Loaded whisper model %s in %.1fs", name, time.monotonic() - started)
+        with _pool_lock:
+            # Another thread may have loaded it meanwhile; keep the first
+            entry = _pool.get(key)
+            if entry is None:
+                entry = _Resident(model=model, last_used=time.monotonic())
+                if _get_idle_seconds() > 0:
+                    _pool[key] = entry
+            entry.in_use += 1
+            if _pool and _janitor is None:
+                _janitor = threading.Thread(
+                    target=_janitor_loop, daemon=True, name="whisper-pool",
+                )
+                _janitor.start()
+    try:
+        with entry.lock:
+            yield entry.model
+    finally:
+        with _pool_lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+
+
 def list_models() -> list[dict]:
     """List available models with download status and RAM requirements."""
     models = []
@@ -3,7 +3,7 @@
 import time
 from pathlib import Path
 
-from istota.skills.whisper.models import select_model
+from istota.skills.whisper.models import get_model, select_model
 
 
 def transcribe_audio(
@@ -13,6 +13,9 @@ def transcribe_audio(
 ) -> dict:
     """Transcribe an audio file using faster-whisper.
 
+    The model comes from the process-wide pool, so repeated calls in a
+    long-lived process (the daemon, the skill proxy) skip the load.
+
     Returns a result dict with status, model used, detected language,
     duration, processing time, text, and segments.
     """
@@ -21,7 +24,7 @@ def transcribe_audio(
         return {"status": "error", "error": f"Audio file not found: {path}"}
 
     try:
-        from faster_whisper import WhisperModel
+        import faster_whisper  # noqa: F401
     except ImportError:
         return {
             "status": "error",
@@ -34,31 +37,31 @@ def transcribe_audio(
         return {"status": "error", "error": str(e)}
 
     start = time.monotonic()
-    whisper_model = WhisperModel(model_name, device="cpu", compute_type="int8")
-    segments_iter, info = whisper_model.transcribe(
-        str(audio_path),
-        language=language,
-        beam_size=5,
-        word_timestamps=True,
-    )
-
-    segments = []
-    full_text_parts = []
-    for seg in segments_iter:
-        words = []
-        if seg.words:
-            words = [
-                {"start": w.start, "end": w.end, "word": w.word, "probability": round(w.probability, 4)}
-                for w in seg.words
-            ]
-        segment_data = {
-            "start": seg.start,
-            "end": seg.end,
-            "text": seg.text.strip(),
-            "words": words,
-        }
-        segments.append(segment_data)
-        full_text_parts.append(seg.text.strip())
+    with get_model(model_name) as whisper_model:
+        segments_iter, info = whisper_model.transcribe(
+            str(audio_path),
+            language=language,
+            beam_size=5,
+            word_timestamps=True,
+        )
+
+        segments = []
+        full_text_parts = []
+        for seg in segments_iter:
+            words = []
+            if seg.words:
+                words = [
+                    {"start": w.start, "end": w.end, "word": w.word, "probability": round(w.probability, 4)}
+                    for w in seg.words
+                ]
+            segment_data = {
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text.strip(),
+                "words": words,
+            }
+            segments.append(segment_data)
+            full_text_parts.append(seg.text.strip())
 
     elapsed = time.monotonic() - start
 
@@ -1,15 +1,20 @@
 """Nightly sleep cycle — extract long-term memories from the day's interactions."""
 
 import logging
+import os
 import subprocess
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from croniter import croniter
-
 from . import db
 from .config import Config
+from .cron_index import FireTimeIndex, zone
 from .storage import (
     _get_mount_path,
     get_user_memories_path,
@@ -29,25 +34,142 @@ MAX_DAY_DATA_CHARS = 50000
 # Minimum per-task budget to avoid tiny fragments
 _MIN_TASK_BUDGET = 500
 
+_TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+# Ranking weight by task source when the day's data exceeds the budget.
+# Direct conversation holds most of what's worth remembering; briefings
+# and scheduled jobs mostly restate external content.
+_SOURCE_SALIENCE = {
+    "talk": 3.0,
+    "email": 3.0,
+    "cli": 2.0,
+    "istota_file": 2.0,
+    "subtask": 1.0,
+    "scheduled": 0.5,
+    "briefing": 0.2,
+}
+
+# A "running" record older than this is treated as abandoned
+_RUN_STALE_AFTER = timedelta(hours=2)
+
 # Sentinel output from Claude indicating nothing worth saving
 NO_NEW_MEMORIES = "NO_NEW_MEMORIES"
 
 
-def _excerpt(text: str, budget: int) -> str:
-    """Return head+tail excerpt of text within budget chars.
+def _excerpt_bounds(length: int, budget: int) -> tuple[int, int]:
+    """(head, tail) chars to keep from text of length to fit budget.
 
     Keeps the first 40% and last 60% when truncation is needed,
     since conclusions and outcomes tend to appear at the end.
+    A tail of 0 means the head is kept without a truncation marker.
     """
-    if not text or len(text) <= budget:
-        return text or ""
-    marker = "\n...[truncated]...\n"
-    usable = budget - len(marker)
+    if length <= budget:
+        return length, 0
+    usable = budget - len(_TRUNCATION_MARKER)
     if usable < 40:
-        return text[:budget]
+        return budget, 0
     head_size = int(usable * 0.4)
-    tail_size = usable - head_size
-    return text[:head_size] + marker + text[-tail_size:]
+    return head_size, usable - head_size
+
+
+def _excerpt(text: str, budget: int) -> str:
+    """Return head+tail excerpt of text within budget chars."""
+    if not text:
+        return ""
+    head, tail = _excerpt_bounds(len(text), budget)
+    if not tail:
+        return text[:head]
+    return text[:head] + _TRUNCATION_MARKER + text[-tail:]
+
+
+def _task_salience(info: "db.CompletedTaskInfo", thread_sizes: Counter) -> float:
+    """Rank a task by how likely it is to hold something worth remembering."""
+    score = _SOURCE_SALIENCE.get(info.source_type, 1.0)
+    # What the user actually wrote is the best signal of what mattered to them
+    score += min(info.prompt_chars, 2000) / 1000
+    if info.conversation_token and thread_sizes[info.conversation_token] > 1:
+        score += 0.5
+    return score
+
+
+def _allocate_budgets(
+    infos: list["db.CompletedTaskInfo"],
+    overheads: dict[int, int],
+    total: int,
+) -> dict[int, int]:
+    """
+    Split total chars of day data between tasks by salience.
+
+    Tasks are admitted in salience order at up to _MIN_TASK_BUDGET chars
+    plus their header overhead; those that no longer fit are dropped. The
+    rest of the budget is shared in proportion to salience, never giving a
+    task more than its full prompt and result. Returns {task_id: budget}.
+    """
+    thread_sizes = Counter(i.conversation_token for i in infos if i.conversation_token)
+    salience = {i.id: _task_salience(i, thread_sizes) for i in infos}
+    full = {i.id: i.prompt_chars + i.result_chars for i in infos}
+
+    budgets: dict[int, int] = {}
+    remaining = total
+    for info in sorted(infos, key=lambda i: (-salience[i.id], -i.id)):
+        floor = min(full[info.id], _MIN_TASK_BUDGET)
+        if floor + overheads[info.id] > remaining:
+            continue
+        budgets[info.id] = floor
+        remaining -= floor + overheads[info.id]
+
+    growing = [task_id for task_id in budgets if budgets[task_id] < full[task_id]]
+    while remaining > 0 and growing:
+        weight = sum(salience[task_id] for task_id in growing)
+        granted = 0
+        for task_id in growing:
+            grant = min(
+                int(remaining * salience[task_id] / weight),
+                full[task_id] - budgets[task_id],
+            )
+            budgets[task_id] += grant
+            granted += grant
+        if not granted:
+            break
+        remaining -= granted
+        growing = [task_id for task_id in growing if budgets[task_id] < full[task_id]]
+
+    return budgets
+
+
+def _stream_excerpts(
+    conn: "db.sqlite3.Connection",
+    infos: list["db.CompletedTaskInfo"],
+    header: Callable[["db.CompletedTaskInfo"], str],
+) -> Iterator[tuple["db.CompletedTaskInfo", str]]:
+    """
+    Yield (task info, formatted entry) for the tasks that fit MAX_DAY_DATA_CHARS.
+
+    Budgets are decided from text lengths before any text is read; each
+    task's prompt gets 40% of its budget (more if the result is short) and
+    its result the rest. Entries come in id order.
+    """
+    by_id = {info.id: info for info in infos}
+    headers = {info.id: header(info) for info in infos}
+    # Header, the "User: " / "Bot: " labels and the joining newline
+    overheads = {task_id: len(text) + 14 for task_id, text in headers.items()}
+    budgets = _allocate_budgets(infos, overheads, MAX_DAY_DATA_CHARS)
+    if len(budgets) < len(infos):
+        logger.debug("Day data budget: dropped %d low-salience task(s)", len(infos) - len(budgets))
+
+    slices = {}
+    for task_id, budget in budgets.items():
+        info = by_id[task_id]
+        prompt_budget = min(info.prompt_chars, max(int(budget * 0.4), budget - info.result_chars))
+        slices[task_id] = (
+            *_excerpt_bounds(info.prompt_chars, prompt_budget),
+            *_excerpt_bounds(info.result_chars, budget - prompt_budget),
+        )
+
+    for task_id, prompt_head, prompt_tail, result_head, result_tail in db.iter_task_text_slices(conn, slices):
+        prompt_text = prompt_head + (_TRUNCATION_MARKER + prompt_tail if prompt_tail else "")
+        result_text = result_head + (_TRUNCATION_MARKER + result_tail if result_tail else "")
+        yield by_id[task_id], f"{headers[task_id]}\nUser: {prompt_text}\nBot: {result_text}\n"
 
 
 def gather_day_data(
@@ -60,9 +182,11 @@ def gather_day_data(
     """
     Gather the day's interaction data for memory extraction.
 
-    Uses dynamic per-task budget allocation and tail-biased truncation
-    to preserve conclusions and decisions. Groups tasks by conversation
-    for threading context.
+    Ranks tasks by salience and allocates the MAX_DAY_DATA_CHARS budget
+    from their text lengths before reading any text, so the most useful
+    tasks survive and only the excerpts are loaded (see _stream_excerpts).
+    Truncation is tail-biased to preserve conclusions and decisions.
+    Groups tasks by conversation for threading context.
     """
     from collections import defaultdict
 
@@ -70,35 +194,26 @@ def gather_day_data(
     # DB stores naive UTC timestamps, so strip tzinfo for comparison
     since_str = since.replace(tzinfo=None).isoformat()
 
-    tasks = db.get_completed_tasks_since(conn, user_id, since_str, after_task_id)
+    infos = db.get_completed_task_info(conn, since_str, after_task_id, user_id=user_id)
 
-    if not tasks:
+    if not infos:
         return ""
 
-    # Dynamic budget: distribute proportionally with per-task minimum
-    per_task_budget = max(_MIN_TASK_BUDGET, MAX_DAY_DATA_CHARS // len(tasks))
-
     # Group tasks by conversation_token for threading context
-    groups: dict[str | None, list] = defaultdict(list)
-    for task in tasks:
-        groups[task.conversation_token].append(task)
+    groups: dict[str | None, list[str]] = defaultdict(list)
+    for info, entry in _stream_excerpts(
+        conn, infos,
+        lambda info: f"--- Task {info.id} ({info.source_type}, {info.created_at or 'unknown'}) ---",
+    ):
+        groups[info.conversation_token].append(entry)
 
     parts = []
-    for conv_token, conv_tasks in groups.items():
-        if conv_token and len(conv_tasks) > 1:
+    for conv_token, entries in groups.items():
+        if conv_token and len(entries) > 1:
             parts.append(
-                f"=== Conversation {conv_token} ({len(conv_tasks)} messages) ==="
-            )
-        for task in conv_tasks:
-            prompt_budget = int(per_task_budget * 0.4)
-            result_budget = per_task_budget - prompt_budget
-            prompt_text = _excerpt(task.prompt or "", prompt_budget)
-            result_text = _excerpt(task.result or "", result_budget)
-            parts.append(
-                f"--- Task {task.id} ({task.source_type}, {task.created_at or 'unknown'}) ---\n"
-                f"User: {prompt_text}\n"
-                f"Bot: {result_text}\n"
+                f"=== Conversation {conv_token} ({len(entries)} messages) ==="
             )
+        parts.extend(entries)
 
     combined = "\n".join(parts)
     if len(combined) > MAX_DAY_DATA_CHARS:
@@ -403,11 +518,9 @@ def _update_state(
     """Update sleep cycle state with the latest completed task ID."""
     # Find the latest completed task ID for this user
     since = (datetime.now(tz=ZoneInfo("UTC")) - timedelta(hours=48)).replace(tzinfo=None).isoformat()
-    tasks = db.get_completed_tasks_since(conn, user_id, since, previous_last_task_id)
-    if tasks:
-        latest_id = tasks[-1].id
-    else:
-        latest_id = previous_last_task_id
+    latest_id = db.get_latest_completed_task_id(
+        conn, since, previous_last_task_id, user_id=user_id,
+    ) or previous_last_task_id
     db.set_sleep_cycle_last_run(conn, user_id, latest_id)
 
 
@@ -450,52 +563,105 @@ def cleanup_old_memory_files(
     return deleted
 
 
+def due_user_sleep_cycles(
+    conn: "db.sqlite3.Connection", config: Config, index: FireTimeIndex | None = None,
+) -> list[str]:
+    """User IDs whose sleep cycle cron is due, evaluated in each user's timezone.
+
+    index carries fire times across calls (see SleepCycleRunner); without
+    one, every user is evaluated.
+    """
+    if not config.sleep_cycle.enabled:
+        return []
+
+    definitions = {
+        user_id: (config.sleep_cycle.cron, zone(user_config.timezone).key)
+        for user_id, user_config in config.users.items()
+    }
+    if index is None:
+        index = FireTimeIndex()
+    return index.due(
+        definitions,
+        lambda user_id: db.get_sleep_cycle_last_run(conn, user_id)[0],
+        datetime.now(ZoneInfo("UTC")),
+    )
+
+
+def _running_elsewhere(run: dict | None) -> bool:
+    """Whether a run record belongs to a job another live process is running."""
+    if not run or run.get("status") != "running":
+        return False
+    pid = run.get("pid")
+    if not isinstance(pid, int) or pid == os.getpid():
+        return False
+    try:
+        started_at = datetime.fromisoformat(run["started_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if datetime.now(ZoneInfo("UTC")).replace(tzinfo=None) - started_at > _RUN_STALE_AFTER:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False  # Interrupted by a restart; run it again
+    except PermissionError:
+        pass
+    return True
+
+
+def _run_recorded(
+    conn: "db.sqlite3.Connection",
+    subject: str,
+    job: Callable[[], bool],
+) -> bool | None:
+    """
+    Run a sleep cycle job under a persisted run record.
+
+    The record is committed as "running" before the job starts, so another
+    scheduler process (a restarted daemon, a single-pass run) skips the job
+    while this one is alive. Returns the job's result, or None if the job
+    was skipped for that reason.
+    """
+    if _running_elsewhere(db.get_sleep_cycle_run(conn, subject)):
+        logger.info("Sleep cycle for %s already running in another process, skipping", subject)
+        return None
+
+    def record(status: str, **fields) -> None:
+        now = datetime.now(ZoneInfo("UTC")).replace(tzinfo=None).isoformat()
+        db.set_sleep_cycle_run(conn, subject, {"status": status, "pid": os.getpid(), **fields, **{
+            "started_at" if status == "running" else "finished_at": now,
+        }})
+        conn.commit()
+
+    record("running")
+    status = "failed"
+    try:
+        result = job()
+        status = "done"
+        return result
+    finally:
+        record(status)
+
+
 def check_sleep_cycles(conn: "db.sqlite3.Connection", config: Config) -> list[str]:
     """
     Evaluate sleep cycle cron for all users, process when due.
 
+    Runs each due user's cycle in turn; the daemon uses SleepCycleRunner.
     Returns list of user_ids that were processed.
     """
-    if not config.sleep_cycle.enabled:
-        return []
-
-    sleep_config = config.sleep_cycle
     processed = []
 
-    for user_id, user_config in config.users.items():
-        # Evaluate cron in user's timezone
+    for user_id in due_user_sleep_cycles(conn, config):
+        logger.info("Running sleep cycle for user %s", user_id)
         try:
-            user_tz = ZoneInfo(user_config.timezone)
-        except Exception:
-            user_tz = ZoneInfo("UTC")
-
-        now = datetime.now(user_tz)
-
-        should_run = False
-        last_run_at, _ = db.get_sleep_cycle_last_run(conn, user_id)
-
-        if last_run_at:
-            last_run = datetime.fromisoformat(last_run_at)
-            if last_run.tzinfo is None:
-                last_run = last_run.replace(tzinfo=ZoneInfo("UTC"))
-            cron = croniter(sleep_config.cron, last_run.astimezone(user_tz))
-            next_run = cron.get_next(datetime)
-            should_run = now >= next_run
-        else:
-            # Never run — check if we're past first scheduled time today
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            cron = croniter(sleep_config.cron, today_start)
-            next_run = cron.get_next(datetime)
-            should_run = now >= next_run
-
-        if should_run:
-            logger.info("Running sleep cycle for user %s", user_id)
-            try:
-                wrote = process_user_sleep_cycle(config, conn, user_id)
-                if wrote:
-                    processed.append(user_id)
-            except Exception as e:
-                logger.error("Sleep cycle failed for %s: %s", user_id, e)
+            wrote = _run_recorded(
+                conn, user_id, lambda: process_user_sleep_cycle(config, conn, user_id),
+            )
+            if wrote:
+                processed.append(user_id)
+        except Exception as e:
+            logger.error("Sleep cycle failed for %s: %s", user_id, e)
 
     return processed
 
@@ -521,26 +687,23 @@ def gather_channel_data(
     since = datetime.now(tz=ZoneInfo("UTC")) - timedelta(hours=lookback_hours)
     since_str = since.replace(tzinfo=None).isoformat()
 
-    tasks = db.get_completed_channel_tasks_since(
-        conn, conversation_token, since_str, after_task_id
+    infos = db.get_completed_task_info(
+        conn, since_str, after_task_id, conversation_token=conversation_token,
     )
 
-    if not tasks:
+    if not infos:
         return ""
 
-    per_task_budget = max(_MIN_TASK_BUDGET, MAX_DAY_DATA_CHARS // len(tasks))
-
-    parts = []
-    for task in tasks:
-        prompt_budget = int(per_task_budget * 0.4)
-        result_budget = per_task_budget - prompt_budget
-        prompt_text = _excerpt(task.prompt or "", prompt_budget)
-        result_text = _excerpt(task.result or "", result_budget)
-        parts.append(
-            f"--- Task {task.id} (user: {task.user_id}, {task.source_type}, {task.created_at or 'unknown'}) ---\n"
-            f"User: {prompt_text}\n"
-            f"Bot: {result_text}\n"
+    parts = [
+        entry
+        for _, entry in _stream_excerpts(
+            conn, infos,
+            lambda info: (
+                f"--- Task {info.id} (user: {info.user_id}, {info.source_type}, "
+                f"{info.created_at or 'unknown'}) ---"
+            ),
         )
+    ]
 
     combined = "\n".join(parts)
     if len(combined) > MAX_DAY_DATA_CHARS:
@@ -757,13 +920,9 @@ def _update_channel_state(
         .replace(tzinfo=None)
         .isoformat()
     )
-    tasks = db.get_completed_channel_tasks_since(
-        conn, conversation_token, since, previous_last_task_id
-    )
-    if tasks:
-        latest_id = tasks[-1].id
-    else:
-        latest_id = previous_last_task_id
+    latest_id = db.get_latest_completed_task_id(
+        conn, since, previous_last_task_id, conversation_token=conversation_token,
+    ) or previous_last_task_id
     db.set_channel_sleep_cycle_last_run(conn, conversation_token, latest_id)
 
 
@@ -812,20 +971,14 @@ def cleanup_old_channel_memory_files(
     return deleted
 
 
-def check_channel_sleep_cycles(
-    conn: "db.sqlite3.Connection",
-    config: Config,
+def due_channel_sleep_cycles(
+    conn: "db.sqlite3.Connection", config: Config, index: FireTimeIndex | None = None,
 ) -> list[str]:
-    """
-    Evaluate channel sleep cycle cron, auto-discover active channels, process when due.
-
-    Returns list of conversation_tokens that were processed.
-    """
+    """Conversation tokens of recently active channels whose sleep cycle cron is due."""
     if not config.channel_sleep_cycle.enabled:
         return []
 
     csc = config.channel_sleep_cycle
-    processed = []
 
     # Auto-discover active channels from recent completed tasks
     since = (
@@ -835,39 +988,111 @@ def check_channel_sleep_cycles(
     )
     active_tokens = db.get_active_channel_tokens(conn, since)
 
-    if not active_tokens:
-        return []
-
     # Evaluate cron in UTC (channels span users in different timezones)
-    now = datetime.now(ZoneInfo("UTC"))
-
-    for token in active_tokens:
-        should_run = False
-        last_run_at, _ = db.get_channel_sleep_cycle_last_run(conn, token)
-
-        if last_run_at:
-            last_run = datetime.fromisoformat(last_run_at)
-            if last_run.tzinfo is None:
-                last_run = last_run.replace(tzinfo=ZoneInfo("UTC"))
-            cron = croniter(csc.cron, last_run)
-            next_run = cron.get_next(datetime)
-            should_run = now >= next_run
-        else:
-            # Never run — check if we're past first scheduled time today
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            cron = croniter(csc.cron, today_start)
-            next_run = cron.get_next(datetime)
-            should_run = now >= next_run
-
-        if should_run:
-            logger.info("Running channel sleep cycle for %s", token)
-            try:
-                wrote = process_channel_sleep_cycle(config, conn, token)
-                if wrote:
-                    processed.append(token)
-            except Exception as e:
-                logger.error(
-                    "Channel sleep cycle failed for %s: %s", token, e
-                )
+    if index is None:
+        index = FireTimeIndex()
+    return index.due(
+        {token: (csc.cron, "UTC") for token in active_tokens},
+        lambda token: db.get_channel_sleep_cycle_last_run(conn, token)[0],
+        datetime.now(ZoneInfo("UTC")),
+    )
+
+
+def check_channel_sleep_cycles(
+    conn: "db.sqlite3.Connection",
+    config: Config,
+) -> list[str]:
+    """
+    Evaluate channel sleep cycle cron, auto-discover active channels, process when due.
+
+    Runs each due channel's cycle in turn; the daemon uses SleepCycleRunner.
+    Returns list of conversation_tokens that were processed.
+    """
+    processed = []
+
+    for token in due_channel_sleep_cycles(conn, config):
+        logger.info("Running channel sleep cycle for %s", token)
+        try:
+            wrote = _run_recorded(
+                conn, f"channel:{token}", lambda: process_channel_sleep_cycle(config, conn, token),
+            )
+            if wrote:
+                processed.append(token)
+        except Exception as e:
+            logger.error(
+                "Channel sleep cycle failed for %s: %s", token, e
+            )
 
     return processed
+
+
+class SleepCycleRunner:
+    """
+    Runs due user and channel sleep cycles as background jobs.
+
+    The scheduler loop calls schedule(), which submits each due cycle that
+    isn't already running to a pool of sleep_cycle.max_concurrent threads
+    and returns without waiting, so extraction and curation never hold up
+    task dispatch. Each job uses its own database connection and runs
+    under a persisted run record (see _run_recorded).
+    """
+
+    def __init__(self, config: Config, max_workers: int | None = None):
+        self.config = config
+        self.max_workers = max_workers or config.sleep_cycle.max_concurrent
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sleep-cycle",
+        )
+        self._lock = threading.Lock()
+        self._in_flight: set[str] = set()
+        # Fire times are recomputed only as cycles come due or their cron
+        # or timezone changes, not on every check
+        self._user_index = FireTimeIndex()
+        self._channel_index = FireTimeIndex()
+
+    def schedule(self, conn: "db.sqlite3.Connection") -> list[str]:
+        """Submit due cycles not already in flight. Returns the subjects submitted."""
+        jobs = [
+            (user_id, process_user_sleep_cycle, user_id)
+            for user_id in due_user_sleep_cycles(conn, self.config, self._user_index)
+        ] + [
+            (f"channel:{token}", process_channel_sleep_cycle, token)
+            for token in due_channel_sleep_cycles(conn, self.config, self._channel_index)
+        ]
+
+        submitted = []
+        for subject, process, target in jobs:
+            with self._lock:
+                if subject in self._in_flight:
+                    continue
+                self._in_flight.add(subject)
+            self._executor.submit(self._execute, subject, process, target)
+            submitted.append(subject)
+        return submitted
+
+    def _execute(self, subject: str, process: Callable, target: str) -> None:
+        logger.info("Running sleep cycle for %s", subject)
+        started = time.monotonic()
+        try:
+            with db.get_db(self.config.db_path) as conn:
+                wrote = _run_recorded(conn, subject, lambda: process(self.config, conn, target))
+            if wrote is not None:
+                logger.info(
+                    "Sleep cycle for %s finished in %.1fs (%s)",
+                    subject, time.monotonic() - started,
+                    "memories written" if wrote else "nothing written",
+                )
+        except Exception as e:
+            logger.error("Sleep cycle failed for %s: %s", subject, e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(subject)
+
+    def running(self) -> list[str]:
+        """Subjects whose cycles are queued or running."""
+        with self._lock:
+            return sorted(self._in_flight)
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs; queued ones are dropped, running ones finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
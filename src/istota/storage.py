@@ -773,6 +773,9 @@ password = "your_password"
 [monarch.sync]
 lookback_days = 30
 default_account = "Assets:Bank:Checking"
+# Syncs after the first only fetch recent days; older synced transactions
+# are re-checked for tag/category changes this often
+reconcile_interval_hours = 24
 
 # Map Monarch account names to beancount accounts
 [monarch.accounts]
@@ -2,11 +2,34 @@
 
 import json
 import logging
+import re
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("istota.stream_parser")
 
+if orjson is not None:
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+else:
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+# Only these top-level event types can produce a StreamEvent. Everything else
+# (system init, user tool_result echoes, ...) is dropped without decoding.
+_RELEVANT_TYPES = frozenset({"assistant", "result"})
+
+# Claude Code emits "type" as the first key of every stream-json event, so it
+# can be read from the head of the line. Bounded by _PEEK_CHARS so a
+# multi-megabyte tool_result line is never scanned past its prefix.
+_TYPE_PREFIX_RE = re.compile(r'\s*\{\s*"type"\s*:\s*"([A-Za-z_]+)"')
+_PEEK_CHARS = 256
+
 
 @dataclass
 class ToolUseEvent:
@@ -85,23 +108,42 @@ def _describe_tool_use(name: str, input_data: dict) -> str:
     return f"{emoji} Using {name}"
 
 
+def peek_event_type(line: str) -> str | None:
+    """
+    Read the top-level ``type`` of a stream-json line without decoding it.
+
+    Returns None when the line doesn't start with a ``"type"`` key, in which
+    case the caller has to fall back to a full decode.
+    """
+    match = _TYPE_PREFIX_RE.match(line, 0, _PEEK_CHARS)
+    return match.group(1) if match else None
+
+
 def parse_stream_line(line: str) -> StreamEvent | None:
     """
     Parse a single line of stream-json output into a StreamEvent.
 
     Returns None for lines that don't map to a user-visible event
-    (system init, user tool results, etc.).
+    (system init, user tool results, etc.). Those are recognised from the
+    line prefix and skipped without a JSON decode.
     """
+    peeked = peek_event_type(line)
+    if peeked is not None and peeked not in _RELEVANT_TYPES:
+        return None
+
     line = line.strip()
     if not line:
         return None
 
     try:
-        data = json.loads(line)
-    except json.JSONDecodeError:
+        data = _loads(line)
+    except _JSONDecodeError:
         logger.debug("Skipping non-JSON stream line: %s", line[:100])
         return None
 
+    if not isinstance(data, dict):
+        return None
+
     event_type = data.get("type")
 
     if event_type == "result":
@@ -3,12 +3,13 @@
 import hashlib
 import logging
 import re
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 
 from . import db
 from .config import Config
-from .skills.files import list_files, read_text, write_text
+from .skills.files import list_dirs, read_text, write_text
 
 logger = logging.getLogger("istota.tasks_file_poller")
 
@@ -44,13 +45,35 @@ class DiscoveredTasksFile:
     """A discovered TASKS.md file with owner info."""
     file_path: str
     owner_id: str  # Nextcloud username of the file owner
+    mod_time: str = ""
+    size: int = 0
+
+
+@dataclass
+class _FileState:
+    """What a TASKS.md file looked like when last polled."""
+    signature: tuple[str, int] | None  # (mod_time, size) from discovery
+    content_hash: str
+
+
+# Per-file state from previous polls, so unchanged files are skipped
+# without reading (signature) or re-parsing (content hash)
+_file_states: dict[str, _FileState] = {}
+_file_states_lock = threading.Lock()
+
+
+def clear_file_states() -> None:
+    """Forget previous polls, so every file is read and parsed again."""
+    with _file_states_lock:
+        _file_states.clear()
 
 
 def discover_tasks_files(config: Config) -> list[DiscoveredTasksFile]:
     """
     Discover TASKS.md files in users' bot-managed directories.
 
-    Scans /Users/{user_id}/istota/config/ for TASKS.md files.
+    Lists /Users/{user_id}/istota/config/ for every user in one sweep
+    (see list_dirs), with each file's modification time and size.
     The owner is known from the path structure.
 
     Args:
@@ -61,18 +84,20 @@ def discover_tasks_files(config: Config) -> list[DiscoveredTasksFile]:
     """
     from .storage import get_user_config_path
 
-    discovered = []
-
-    for user_id in config.users:
-        user_path = get_user_config_path(user_id, config.bot_dir_name)
-
-        try:
-            files = list_files(config, user_path)
-        except Exception:
-            # User directory may not exist yet
-            continue
+    user_paths = {
+        user_id: get_user_config_path(user_id, config.bot_dir_name)
+        for user_id in config.users
+    }
+    try:
+        listed = list_dirs(config, list(user_paths.values()))
+    except Exception as e:
+        logger.error("Error listing TASKS.md directories: %s", e)
+        return []
 
-        for item in files:
+    discovered = []
+    for user_id, user_path in user_paths.items():
+        # User directory may not exist yet
+        for item in listed.get(user_path, []):
             if item["is_dir"]:
                 continue
 
@@ -83,6 +108,8 @@ def discover_tasks_files(config: Config) -> list[DiscoveredTasksFile]:
             discovered.append(DiscoveredTasksFile(
                 file_path=f"{user_path}/{filename}",
                 owner_id=user_id,
+                mod_time=item.get("mod_time", ""),
+                size=item.get("size", 0),
             ))
 
     return discovered
@@ -226,14 +253,24 @@ def update_task_in_file(
     return '\n'.join(updated_lines)
 
 
-def poll_user_tasks_file(config: Config, user_id: str, file_path: str) -> list[int]:
+def poll_user_tasks_file(
+    config: Config,
+    user_id: str,
+    file_path: str,
+    signature: tuple[str, int] | None = None,
+) -> list[int]:
     """
     Poll a user's TASKS.md file and create tasks for new pending items.
 
+    Content identical to the last poll of this file is not parsed again.
+    Tracked tasks are looked up with one query for the whole file.
+
     Args:
         config: Application config
         user_id: User ID to poll for
         file_path: Path to the TASKS.md file
+        signature: (mod_time, size) the file was discovered with, recorded
+            so poll_all_tasks_files can skip it while it stays the same
 
     Returns:
         List of created task IDs
@@ -246,21 +283,28 @@ def poll_user_tasks_file(config: Config, user_id: str, file_path: str) -> list[i
         logger.error("Error reading %s for %s: %s", file_path, user_id, e)
         return []
 
+    content_hash = hashlib.sha256(file_content.encode("utf-8")).hexdigest()
+    with _file_states_lock:
+        previous = _file_states.get(file_path)
+        if previous is not None and previous.content_hash == content_hash:
+            _file_states[file_path] = _FileState(signature, content_hash)
+            return []
+
     # Parse tasks from file
-    parsed_tasks = parse_tasks_file(file_content)
+    pending = [t for t in parse_tasks_file(file_content) if t.status == 'pending']
     created_task_ids = []
     file_updated = False
     updated_content = file_content
 
     with db.get_db(config.db_path) as conn:
-        for parsed_task in parsed_tasks:
-            # Only process pending tasks
-            if parsed_task.status != 'pending':
-                continue
-
-            # Check if already tracked
-            if db.is_istota_task_tracked(conn, user_id, parsed_task.content_hash):
+        tracked = db.get_tracked_istota_task_hashes(
+            conn, user_id, [t.content_hash for t in pending],
+        )
+        for parsed_task in pending:
+            # Check if already tracked (or a duplicate line in this file)
+            if parsed_task.content_hash in tracked:
                 continue
+            tracked.add(parsed_task.content_hash)
 
             # Create the main task
             task_id = db.create_task(
@@ -297,9 +341,14 @@ def poll_user_tasks_file(config: Config, user_id: str, file_path: str) -> list[i
         try:
             write_text(config, file_path, updated_content)
             logger.debug("Updated %s with %d new task(s)", file_path, len(created_task_ids))
+            # Our own write changes the file; its next read only needs hashing
+            content_hash = hashlib.sha256(updated_content.encode("utf-8")).hexdigest()
         except Exception as e:
             logger.error("Error updating %s for %s: %s", file_path, user_id, e)
 
+    with _file_states_lock:
+        _file_states[file_path] = _FileState(signature, content_hash)
+
     return created_task_ids
 
 
@@ -307,8 +356,9 @@ def poll_all_tasks_files(config: Config) -> list[int]:
     """
     Poll all TASKS.md files and create tasks.
 
-    Auto-discovers TASKS.md files in users' bot-managed directories
-    and processes them.
+    Auto-discovers TASKS.md files in users' bot-managed directories and
+    processes those whose modification time or size changed since the
+    last poll; unchanged files are not read.
 
     Args:
         config: Application config
@@ -322,7 +372,15 @@ def poll_all_tasks_files(config: Config) -> list[int]:
     discovered_files = discover_tasks_files(config)
 
     for tasks_file in discovered_files:
-        task_ids = poll_user_tasks_file(config, tasks_file.owner_id, tasks_file.file_path)
+        signature = (tasks_file.mod_time, tasks_file.size) if tasks_file.mod_time else None
+        if signature is not None:
+            with _file_states_lock:
+                previous = _file_states.get(tasks_file.file_path)
+            if previous is not None and previous.signature == signature:
+                continue
+        task_ids = poll_user_tasks_file(
+            config, tasks_file.owner_id, tasks_file.file_path, signature,
+        )
         all_task_ids.extend(task_ids)
 
     return all_task_ids
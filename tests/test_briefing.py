@@ -1,7 +1,10 @@
 """Tests for istota.skills.briefing module."""
 
+import time
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 from istota.skills.briefing import (
     _strip_html,
     _parse_reminders,
@@ -11,15 +14,37 @@ from istota.skills.briefing import (
     _fetch_todo_items,
     _fetch_calendar_events,
     _fetch_headlines,
+    _fetch_newsletter_content,
+    _prefetch_components,
     _get_briefing_digest_path,
     load_previous_briefing_digest,
     save_briefing_digest,
     build_briefing_prompt,
     HEADLINE_SOURCES,
 )
+from istota.skills.email import Email
 from istota.config import Config, BriefingConfig, BrowserConfig, NextcloudConfig, ResourceConfig, UserConfig
 
 
+@pytest.fixture(autouse=True)
+def market_cache_dir(tmp_path, monkeypatch):
+    """Keep the shared market data cache per-test."""
+    from istota.skills.markets import cache
+
+    monkeypatch.setenv("MARKETS_CACHE_DIR", str(tmp_path / "markets-cache"))
+    cache.clear_cache()
+    yield
+    cache.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def briefing_cache_dir(tmp_path, monkeypatch):
+    """Keep the shared newsletter/headline cache per-test."""
+    path = tmp_path / "briefing-cache"
+    monkeypatch.setenv("BRIEFING_CACHE_DIR", str(path))
+    return path
+
+
 class TestStripHtml:
     def test_plain_text_unchanged(self):
         assert _strip_html("Hello world") == "Hello world"
@@ -1127,11 +1152,9 @@ class TestFetchHeadlines:
     @patch("istota.skills.briefing.httpx")
     def test_partial_failure_still_returns_successful(self, mock_httpx):
         """If one source fails but another succeeds, return the successful one."""
-        call_count = [0]
-
+        # Sources are fetched concurrently, so fail by URL rather than call order
         def side_effect(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
+            if "apnews.com" in kwargs.get("json", {}).get("url", ""):
                 raise Exception("timeout")
             mock_resp = MagicMock()
             mock_resp.json.return_value = {"status": "ok", "text": "Reuters headlines"}
@@ -1147,6 +1170,114 @@ class TestFetchHeadlines:
         assert "AP" not in result
 
 
+class TestHeadlineCache:
+    """Headline pages are shared across briefings until their TTL runs out."""
+
+    def _config(self):
+        return Config(browser=BrowserConfig(enabled=True, api_url="http://localhost:9223"))
+
+    def _ok(self, text):
+        response = MagicMock()
+        response.json.return_value = {"status": "ok", "text": text}
+        return response
+
+    @patch("istota.skills.briefing.httpx")
+    def test_second_briefing_reuses_page(self, mock_httpx):
+        mock_httpx.post.return_value = self._ok("AP story")
+        first = _fetch_headlines({"sources": ["ap", "reuters"]}, self._config())
+        second = _fetch_headlines({"sources": ["ap"]}, self._config())
+
+        assert mock_httpx.post.call_count == 2
+        assert "AP story" in first
+        assert "AP story" in second
+
+    @patch("istota.skills.briefing.httpx")
+    def test_expired_page_refetched(self, mock_httpx):
+        mock_httpx.post.return_value = self._ok("AP story")
+        _fetch_headlines({"sources": ["ap"], "cache_ttl": 0}, self._config())
+        _fetch_headlines({"sources": ["ap"], "cache_ttl": 0}, self._config())
+        assert mock_httpx.post.call_count == 2
+
+    @patch("istota.skills.briefing.httpx")
+    def test_failed_fetch_not_cached(self, mock_httpx):
+        mock_httpx.post.side_effect = [Exception("down"), self._ok("AP story")]
+        assert _fetch_headlines({"sources": ["ap"]}, self._config()) is None
+        assert "AP story" in _fetch_headlines({"sources": ["ap"]}, self._config())
+
+    @patch("istota.skills.briefing.httpx")
+    def test_source_order_kept(self, mock_httpx):
+        mock_httpx.post.side_effect = lambda url, json, timeout: self._ok(f"page {json['url']}")
+        result = _fetch_headlines({"sources": ["spiegel", "ap", "ft"]}, self._config())
+        assert result.index("Der Spiegel") < result.index("AP News") < result.index("Financial Times")
+
+
+class TestNewsletterCache:
+    """Newsletter text is stripped once and shared by Message-ID."""
+
+    def _email(self, message_id, body):
+        return Email(
+            id=message_id.strip("<>"), subject="Daily", sender="news@semafor.com",
+            date="Mon, 27 Jan 2025 12:00:00 +0000", body=body, attachments=[],
+            message_id=message_id,
+        )
+
+    def _fetch(self, emails, calls):
+        def fake_fetch(sources, lookback_hours, folder, config, skip_body):
+            calls.append([e.message_id for e in emails if not skip_body(e.message_id)])
+            return [
+                e if e.message_id in calls[-1] else Email(**{**e.__dict__, "body": ""})
+                for e in emails
+            ]
+        return fake_fetch
+
+    def test_known_messages_not_downloaded(self):
+        news = {"sources": [{"type": "domain", "value": "semafor.com"}]}
+        first = [self._email("<a@x>", "<html><body><p>Story A</p></body></html>")]
+        second = first + [self._email("<b@x>", "Story B")]
+        calls = []
+
+        with patch("istota.skills.email.fetch_newsletters", self._fetch(first, calls)):
+            result1 = _fetch_newsletter_content(news, Config())
+        with patch("istota.skills.email.fetch_newsletters", self._fetch(second, calls)), \
+                patch("istota.skills.briefing._strip_html") as mock_strip:
+            result2 = _fetch_newsletter_content(news, Config())
+
+        assert calls == [["<a@x>"], ["<b@x>"]]
+        assert "Story A" in result1
+        assert "<p>" not in result1
+        assert "Story A" in result2 and "Story B" in result2
+        mock_strip.assert_not_called()
+
+    def test_message_without_id_always_downloaded(self):
+        news = {"sources": [{"type": "domain", "value": "semafor.com"}]}
+        mock_fetch = MagicMock(return_value=[
+            Email(id="1", subject="S", sender="news@semafor.com", date="", body="Story",
+                  attachments=[], message_id=None),
+        ])
+        with patch("istota.skills.email.fetch_newsletters", mock_fetch):
+            _fetch_newsletter_content(news, Config())
+            result = _fetch_newsletter_content(news, Config())
+        assert "Story" in result
+        assert mock_fetch.call_count == 2
+
+    def test_old_entries_pruned(self, briefing_cache_dir):
+        import os
+
+        from istota.skills.briefing import cache
+
+        cache.put_newsletter("<old@x>", "a@x", "Old", "old text")
+        cache.put_newsletter("<new@x>", "a@x", "New", "new text")
+        old_path = next(
+            p for p in (briefing_cache_dir / "newsletters").glob("*.json")
+            if "old text" in p.read_text()
+        )
+        os.utime(old_path, (0, 0))
+
+        assert cache.prune_newsletters() == 1
+        assert cache.get_newsletter("<old@x>") is None
+        assert cache.get_newsletter("<new@x>")["text"] == "new text"
+
+
 class TestHeadlinesInBriefingPrompt:
     """Test headlines integration in build_briefing_prompt."""
 
@@ -1251,6 +1382,68 @@ class TestHeadlinesInBriefingPrompt:
         assert "Newsletter stories" in result
 
 
+class TestPrefetchComponents:
+    """Test concurrent component pre-fetch with per-component deadlines."""
+
+    def test_runs_concurrently(self):
+        def slow(value):
+            def fetch():
+                time.sleep(0.3)
+                return value
+            return fetch
+
+        jobs = {name: slow(name) for name in ("markets", "news", "headlines", "calendar")}
+        start = time.monotonic()
+        results, late = _prefetch_components(jobs)
+        elapsed = time.monotonic() - start
+
+        assert results == {name: name for name in jobs}
+        assert late == []
+        assert elapsed < 0.9
+
+    def test_late_component_left_out(self):
+        jobs = {
+            "calendar": lambda: "events",
+            "headlines": lambda: time.sleep(1.0) or "too late",
+        }
+        start = time.monotonic()
+        results, late = _prefetch_components(jobs, {"calendar": 5.0, "headlines": 0.1})
+
+        assert results == {"calendar": "events"}
+        assert late == ["headlines"]
+        assert time.monotonic() - start < 0.8
+
+    def test_failed_component_is_none(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        results, late = _prefetch_components({"todos": broken, "calendar": lambda: "ok"})
+        assert results == {"todos": None, "calendar": "ok"}
+        assert late == []
+
+    def test_no_jobs(self):
+        assert _prefetch_components({}) == ({}, [])
+
+    @patch("istota.skills.briefing._fetch_calendar_events")
+    @patch("istota.skills.briefing._fetch_headlines")
+    def test_prompt_notes_timed_out_component(self, mock_headlines, mock_cal):
+        mock_headlines.side_effect = lambda *a: time.sleep(1.0) or "## Frontpages\nLate story"
+        mock_cal.return_value = "## Today's Calendar (pre-fetched)\n- 09:00 Standup"
+
+        briefing = BriefingConfig(
+            name="morning", cron="0 6 * * *",
+            conversation_token="room1",
+            components={"calendar": True, "headlines": {"enabled": True, "sources": ["ap"]}},
+        )
+        timeouts = {"headlines": 0.1, "calendar": 5.0}
+        with patch.dict("istota.skills.briefing.PREFETCH_TIMEOUTS", timeouts):
+            result = build_briefing_prompt(briefing, "testuser", Config(), "UTC")
+
+        assert "Standup" in result
+        assert "Late story" not in result
+        assert "news frontpages component timed out" in result
+
+
 class TestParseBriefingJson:
     """Tests for parse_briefing_json() — extracts structured output from briefing results."""
 
@@ -330,6 +330,13 @@ class TestConfigLoading:
         cfg = load_config(p)
         assert cfg.security.skill_proxy_enabled is True
         assert cfg.security.skill_proxy_timeout == 300
+        assert cfg.security.skill_proxy_warm is True
+
+    def test_load_security_skill_proxy_warm_disabled(self, tmp_path):
+        p = tmp_path / "config.toml"
+        p.write_text('[security]\nskill_proxy_warm = false\n')
+        cfg = load_config(p)
+        assert cfg.security.skill_proxy_warm is False
 
 
 class TestConfigMethods:
@@ -0,0 +1,147 @@
+"""Tests for next-fire-time computation and the in-memory fire time index."""
+
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from istota.cron_index import (
+    FireTimeIndex,
+    fire_time_since,
+    format_utc,
+    next_fire_time,
+    parse_utc,
+    zone,
+)
+
+LA = ZoneInfo("America/Los_Angeles")
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestNextFireTime:
+    def test_returns_utc(self):
+        # 22:00 PST on March 1 is 06:00 UTC on March 2
+        fire_at = next_fire_time("0 22 * * *", LA, _utc(2026, 3, 1, 12, 0))
+        assert fire_at == _utc(2026, 3, 2, 6, 0)
+        assert fire_at.tzinfo == timezone.utc
+
+    def test_wall_clock_across_spring_forward(self):
+        """Last run 22:00 PST, next is 22:00 PDT — an hour less later in UTC."""
+        fire_at = next_fire_time("0 22 * * *", LA, parse_utc("2026-03-08 06:00:00"))
+        assert fire_at == _utc(2026, 3, 9, 5, 0)
+
+    def test_skipped_wall_time_fires_when_gap_ends(self):
+        # 02:30 doesn't exist on March 8 in LA; clocks jump 02:00 PST -> 03:00 PDT
+        fire_at = next_fire_time("30 2 * * *", LA, _utc(2026, 3, 8, 8, 0))
+        assert fire_at == _utc(2026, 3, 8, 10, 0)
+
+    def test_repeated_wall_time_fires_first_occurrence(self):
+        # 01:30 happens twice on November 1 in LA; the first is PDT
+        fire_at = next_fire_time("30 1 * * *", LA, _utc(2026, 11, 1, 7, 0))
+        assert fire_at == _utc(2026, 11, 1, 8, 30)
+
+
+class TestFireTimeSince:
+    def test_never_run_anchors_at_local_midnight(self):
+        now = datetime(2026, 6, 15, 14, 0, tzinfo=LA)
+        assert fire_time_since("0 6 * * *", LA, None, now) == datetime(2026, 6, 15, 6, 0, tzinfo=LA)
+
+    def test_naive_last_run_is_utc(self):
+        now = _utc(2026, 6, 15, 14, 0)
+        fire_at = fire_time_since("0 * * * *", zone("UTC"), "2026-06-15 12:00:00", now)
+        assert fire_at == _utc(2026, 6, 15, 13, 0)
+
+
+class TestHelpers:
+    def test_zone_falls_back_to_utc(self):
+        assert zone("Not/AZone").key == "UTC"
+        assert zone("").key == "UTC"
+
+    def test_format_utc(self):
+        assert format_utc(datetime(2026, 3, 8, 22, 0, tzinfo=LA)) == "2026-03-09 05:00:00"
+
+
+class TestFireTimeIndex:
+    NOW = _utc(2026, 6, 15, 14, 0)
+
+    def _last_runs(self, runs):
+        calls = []
+
+        def last_run(key):
+            calls.append(key)
+            return runs.get(key)
+
+        return last_run, calls
+
+    def test_due_on_first_check(self):
+        index = FireTimeIndex()
+        last_run, _ = self._last_runs({"a": "2026-06-14 06:00:00", "b": "2026-06-15 06:00:00"})
+        due = index.due({"a": ("0 6 * * *", "UTC"), "b": ("0 6 * * *", "UTC")}, last_run, self.NOW)
+        assert due == ["a"]
+        assert len(index) == 1
+
+    def test_not_due_entries_not_recomputed(self):
+        index = FireTimeIndex()
+        last_run, calls = self._last_runs({"b": "2026-06-15 06:00:00"})
+        definitions = {"b": ("0 6 * * *", "UTC")}
+        index.due(definitions, last_run, self.NOW)
+        calls.clear()
+
+        for minute in range(1, 30):
+            assert index.due(definitions, last_run, _utc(2026, 6, 15, 14, minute)) == []
+        assert calls == []
+
+    def test_comes_due_later(self):
+        index = FireTimeIndex()
+        runs = {"b": "2026-06-15 06:00:00"}
+        last_run, _ = self._last_runs(runs)
+        definitions = {"b": ("0 6 * * *", "UTC")}
+        index.due(definitions, last_run, self.NOW)
+
+        assert index.due(definitions, last_run, _utc(2026, 6, 16, 6, 0)) == ["b"]
+        # Not recorded as run: reported again on the next check
+        assert index.due(definitions, last_run, _utc(2026, 6, 16, 6, 1)) == ["b"]
+        runs["b"] = "2026-06-16 06:01:00"
+        assert index.due(definitions, last_run, _utc(2026, 6, 16, 6, 2)) == []
+
+    def test_run_recorded_elsewhere_is_noticed(self):
+        index = FireTimeIndex()
+        runs = {"b": "2026-06-15 06:00:00"}
+        last_run, _ = self._last_runs(runs)
+        definitions = {"b": ("0 6 * * *", "UTC")}
+        index.due(definitions, last_run, self.NOW)
+
+        runs["b"] = "2026-06-16 06:00:00"
+        assert index.due(definitions, last_run, _utc(2026, 6, 16, 7, 0)) == []
+        assert len(index) == 1
+
+    def test_definition_change_recomputes(self):
+        index = FireTimeIndex()
+        last_run, _ = self._last_runs({"b": "2026-06-15 06:00:00"})
+        index.due({"b": ("0 6 * * *", "UTC")}, last_run, self.NOW)
+
+        assert index.due({"b": ("0 13 * * *", "UTC")}, last_run, self.NOW) == ["b"]
+
+    def test_timezone_change_recomputes(self):
+        index = FireTimeIndex()
+        last_run, _ = self._last_runs({"b": "2026-06-15 06:00:00"})
+        index.due({"b": ("0 6 * * *", "UTC")}, last_run, self.NOW)
+
+        # 06:00 in New York is 10:00 UTC, after the last run and before now
+        assert index.due({"b": ("0 6 * * *", "America/New_York")}, last_run, self.NOW) == ["b"]
+
+    def test_removed_definition_dropped(self):
+        index = FireTimeIndex()
+        last_run, _ = self._last_runs({"b": "2026-06-15 06:00:00"})
+        index.due({"b": ("0 6 * * *", "UTC")}, last_run, self.NOW)
+
+        assert index.due({}, last_run, _utc(2026, 6, 16, 7, 0)) == []
+        assert len(index) == 0
+
+    def test_heap_compacted_after_churn(self):
+        index = FireTimeIndex()
+        last_run, _ = self._last_runs({})
+        for hour in range(200):
+            index.due({"b": (f"0 {hour % 24} 1 1 *", "UTC")}, last_run, self.NOW)
+        assert len(index._heap) <= 2 * len(index) + 64
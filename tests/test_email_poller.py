@@ -2,7 +2,9 @@
 
 import json
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -57,8 +59,11 @@ def _email_config():
     )
 
 
-def _envelope(id="1", subject="Hello", sender="alice@test.com", date="Mon, 01 Jan 2026 10:00:00 +0000"):
-    return EmailEnvelope(id=id, subject=subject, sender=sender, date=date, is_read=False)
+def _envelope(id="1", subject="Hello", sender="alice@test.com", date="Mon, 01 Jan 2026 10:00:00 +0000",
+              references=None):
+    return EmailEnvelope(
+        id=id, subject=subject, sender=sender, date=date, is_read=False, references=references,
+    )
 
 
 def _email(id="1", subject="Hello", sender="alice@test.com", body="Hi there"):
@@ -70,6 +75,27 @@ def _email(id="1", subject="Hello", sender="alice@test.com", body="Hi there"):
     )
 
 
+@contextmanager
+def _imap(envelopes, emails=(), uidvalidity=1, uid_next=None):
+    """Patch the poller's IMAP session: envelopes are listed, emails fetched by UID."""
+    by_id = {e.id: e for e in emails}
+    if uid_next is None:
+        uid_next = max((int(e.id) for e in envelopes), default=0) + 1
+
+    def fetch(mailbox, uids, attachment_dir=None):
+        for uid in uids:
+            if uid in by_id:
+                yield by_id[uid], []
+
+    with (
+        patch("istota.email_poller.open_mailbox") as mock_open,
+        patch("istota.email_poller.folder_uid_status", return_value=(uidvalidity, uid_next)),
+        patch("istota.email_poller.list_new_envelopes", return_value=list(envelopes)) as mock_list,
+        patch("istota.email_poller.fetch_emails", side_effect=fetch) as mock_fetch,
+    ):
+        yield SimpleNamespace(open=mock_open, list=mock_list, fetch=mock_fetch)
+
+
 # =============================================================================
 # TestNormalizeSubject
 # =============================================================================
@@ -145,9 +171,7 @@ class TestPollEmails:
         email = _email()
 
         with (
-            patch("istota.email_poller.list_emails", return_value=[envelope]),
-            patch("istota.email_poller.read_email", return_value=email),
-            patch("istota.email_poller.download_attachments", return_value=[]),
+            _imap([envelope], [email]),
             patch("istota.email_poller.ensure_user_directories_v2"),
             patch("istota.email_poller.upload_file_to_inbox_v2"),
         ):
@@ -174,7 +198,7 @@ class TestPollEmails:
         with db.get_db(config.db_path) as conn:
             db.mark_email_processed(conn, email_id="1", sender_email="alice@test.com", subject="Hello")
 
-        with patch("istota.email_poller.list_emails", return_value=[envelope]):
+        with _imap([envelope]):
             task_ids = poll_emails(config)
 
         assert task_ids == []
@@ -186,7 +210,7 @@ class TestPollEmails:
 
         envelope = _envelope(sender="bot@test.com")
 
-        with patch("istota.email_poller.list_emails", return_value=[envelope]):
+        with _imap([envelope]):
             task_ids = poll_emails(config)
 
         assert task_ids == []
@@ -202,7 +226,7 @@ class TestPollEmails:
 
         envelope = _envelope(sender="stranger@unknown.com")
 
-        with patch("istota.email_poller.list_emails", return_value=[envelope]):
+        with _imap([envelope]):
             task_ids = poll_emails(config)
 
         assert task_ids == []
@@ -222,12 +246,221 @@ class TestPollEmails:
         config = make_config()
         config.email = _email_config()
 
-        with patch("istota.email_poller.list_emails", side_effect=Exception("IMAP connection failed")):
+        with patch("istota.email_poller.open_mailbox", side_effect=Exception("IMAP connection failed")):
             task_ids = poll_emails(config)
 
         assert task_ids == []
 
 
+class TestPollEmailsSession:
+    """One IMAP session per poll, headers first, bodies only for accepted mail."""
+
+    def _config(self, make_config):
+        config = make_config()
+        config.email = _email_config()
+        config.users = {"alice": UserConfig(email_addresses=["alice@test.com"])}
+        return config
+
+    def _watermark(self, config):
+        with db.get_db(config.db_path) as conn:
+            return db.get_email_poll_watermark(conn, "user", "INBOX")
+
+    def test_only_accepted_emails_downloaded(self, make_config):
+        config = self._config(make_config)
+        envelopes = [
+            _envelope(id="1", sender="stranger@random.com"),
+            _envelope(id="2", sender="alice@test.com"),
+        ]
+
+        with _imap(envelopes, [_email(id="2")]) as imap:
+            task_ids = poll_emails(config)
+
+        assert len(task_ids) == 1
+        imap.open.assert_called_once()
+        imap.fetch.assert_called_once()
+        assert imap.fetch.call_args.args[1] == ["2"]
+        assert self._watermark(config) == (1, 3)
+
+    def test_no_fetch_when_nothing_accepted(self, make_config):
+        config = self._config(make_config)
+
+        with _imap([_envelope(id="1", sender="bot@test.com")]) as imap:
+            poll_emails(config)
+
+        imap.fetch.assert_not_called()
+
+    def test_lists_above_watermark(self, make_config):
+        config = self._config(make_config)
+        with db.get_db(config.db_path) as conn:
+            db.set_email_poll_watermark(conn, "user", "INBOX", 1, 5)
+
+        with _imap([_envelope(id="6")], [_email(id="6")]) as imap:
+            poll_emails(config)
+
+        assert imap.list.call_args.kwargs["min_uid"] == 5
+        assert self._watermark(config) == (1, 7)
+
+    def test_nothing_new_skips_listing(self, make_config):
+        config = self._config(make_config)
+        with db.get_db(config.db_path) as conn:
+            db.set_email_poll_watermark(conn, "user", "INBOX", 1, 5)
+
+        with _imap([], uid_next=5) as imap:
+            assert poll_emails(config) == []
+
+        imap.list.assert_not_called()
+
+    def test_uidvalidity_change_relists_newest(self, make_config):
+        config = self._config(make_config)
+        with db.get_db(config.db_path) as conn:
+            db.set_email_poll_watermark(conn, "user", "INBOX", 1, 500)
+
+        with _imap([_envelope(id="3")], [_email(id="3")], uidvalidity=2) as imap:
+            assert len(poll_emails(config)) == 1
+
+        assert "min_uid" not in imap.list.call_args.kwargs
+        assert self._watermark(config) == (2, 4)
+
+    def test_unread_email_retried(self, make_config):
+        """An accepted email that couldn't be downloaded holds the watermark."""
+        config = self._config(make_config)
+        envelopes = [_envelope(id="4"), _envelope(id="5")]
+
+        with _imap(envelopes, [_email(id="5")], uid_next=9):
+            poll_emails(config)
+
+        assert self._watermark(config) == (1, 4)
+        with db.get_db(config.db_path) as conn:
+            assert not db.is_email_processed(conn, "4")
+            assert db.is_email_processed(conn, "5")
+
+    def test_failing_email_does_not_block_the_rest(self, make_config):
+        """A message whose task can't be created is retried, then given up on."""
+        config = self._config(make_config)
+        envelopes = [_envelope(id="4"), _envelope(id="5")]
+        emails = [_email(id="4"), _email(id="5")]
+
+        from istota import email_poller
+        create = email_poller._create_email_task
+
+        def flaky_create(config, conn, envelope, *args):
+            if envelope.id == "4":
+                raise FileNotFoundError("no such directory")
+            return create(config, conn, envelope, *args)
+
+        with patch("istota.email_poller._create_email_task", side_effect=flaky_create):
+            with _imap(envelopes, emails, uid_next=9):
+                assert len(poll_emails(config)) == 1
+            assert self._watermark(config) == (1, 4)
+            with db.get_db(config.db_path) as conn:
+                assert db.is_email_processed(conn, "5")
+                assert not db.is_email_processed(conn, "4")
+
+            for _ in range(email_poller._MAX_EMAIL_ATTEMPTS - 1):
+                with _imap(envelopes, emails, uid_next=9):
+                    assert poll_emails(config) == []
+
+        assert self._watermark(config) == (1, 9)
+        with db.get_db(config.db_path) as conn:
+            assert db.is_email_processed(conn, "4")
+            assert db.get_email_poll_failures(conn, "user", "INBOX", 1) == {}
+
+    def test_aborted_fetch_blames_message_being_read(self, make_config):
+        config = self._config(make_config)
+        envelopes = [_envelope(id="4"), _envelope(id="5"), _envelope(id="6")]
+
+        def fetch(mailbox, uids, attachment_dir=None):
+            yield _email(id="4"), []
+            raise OSError("bad attachment name")
+
+        with _imap(envelopes, uid_next=9) as imap:
+            imap.fetch.side_effect = fetch
+            assert len(poll_emails(config)) == 1
+
+        assert self._watermark(config) == (1, 5)
+        with db.get_db(config.db_path) as conn:
+            assert db.get_email_poll_failures(conn, "user", "INBOX", 1) == {"5": 1}
+
+    def test_full_batch_advances_to_last_listed(self, make_config):
+        config = self._config(make_config)
+        envelopes = [_envelope(id=str(i), sender="bot@test.com") for i in range(1, 51)]
+
+        with _imap(envelopes, uid_next=80):
+            poll_emails(config)
+
+        assert self._watermark(config) == (1, 51)
+
+
+class TestPollEmailsBatchedLookups:
+    def test_query_count_per_poll(self, make_config):
+        """Lookups and markers for a full batch take a fixed number of queries."""
+        from istota.email_poller import _poll_mailbox
+
+        config = make_config()
+        config.email = _email_config()
+        config.users = {"alice": UserConfig(email_addresses=["alice@test.com"])}
+
+        envelopes = []
+        with db.get_db(config.db_path) as conn:
+            db.record_sent_email(conn, user_id="alice", message_id="<out@bot.com>", to_addr="x@ext.com")
+            for i in range(1, 31):
+                db.mark_email_processed(conn, email_id=str(i), sender_email="alice@test.com")
+                envelopes.append(_envelope(id=str(i)))
+        envelopes += [
+            _envelope(id=str(i), sender=f"stranger{i}@ext.com", references=f"<x{i}@ext.com>")
+            for i in range(31, 46)
+        ]
+        envelopes.append(_envelope(id="46", sender="x@ext.com", references="<out@bot.com>"))
+        envelopes += [_envelope(id=str(i), sender="bot@test.com") for i in range(47, 50)]
+        envelopes.append(_envelope(id="50"))
+
+        statements = []
+        with _imap(envelopes, [_email(id="46"), _email(id="50")]):
+            with db.get_db(config.db_path) as conn:
+                conn.set_trace_callback(statements.append)
+                task_ids = _poll_mailbox(config, conn, MagicMock())
+                conn.set_trace_callback(None)
+
+        assert len(task_ids) == 2
+        selects = [q for q in statements if q.lstrip().upper().startswith("SELECT")]
+        assert len([q for q in selects if "processed_emails" in q]) == 1
+        assert len([q for q in selects if "sent_emails" in q]) == 1
+        # Markers go out in one executemany, inside the cycle's one transaction
+        assert not [q for q in statements if q.strip().upper() == "COMMIT"]
+        assert sum(q.startswith("BEGIN") for q in statements) == 1
+        with db.get_db(config.db_path) as conn:
+            assert db.get_processed_email_ids(conn, [str(i) for i in range(1, 51)]) == {
+                str(i) for i in range(1, 51)
+            }
+
+    def test_in_reply_to_preferred_over_references(self, db_path):
+        from istota.email_poller import _match_thread
+
+        with db.get_db(db_path) as conn:
+            db.record_sent_email(conn, user_id="alice", message_id="<a@bot.com>", to_addr="x@ext.com")
+            db.record_sent_email(conn, user_id="bob", message_id="<b@bot.com>", to_addr="x@ext.com")
+            envelope = _envelope(sender="x@ext.com", references="<b@bot.com>")
+            envelope.in_reply_to = "<a@bot.com>"
+
+            assert _match_thread(conn, envelope).user_id == "alice"
+
+    def test_bulk_lookups(self, db_path):
+        with db.get_db(db_path) as conn:
+            db.mark_emails_processed(conn, [
+                db.ProcessedEmailRecord(email_id="1", sender_email="a@x.com"),
+                db.ProcessedEmailRecord(email_id="2", sender_email="b@x.com", task_id=None),
+            ])
+            # Re-marking an id is a no-op rather than an error
+            db.mark_emails_processed(conn, [db.ProcessedEmailRecord(email_id="1", sender_email="a@x.com")])
+            assert db.get_processed_email_ids(conn, ["1", "2", "3"]) == {"1", "2"}
+            assert db.get_processed_email_ids(conn, []) == set()
+
+            db.record_sent_email(conn, user_id="alice", message_id="<m@bot.com>", to_addr="x@ext.com")
+            found = db.find_sent_emails_by_message_ids(conn, ["<m@bot.com>", "<n@bot.com>"])
+            assert list(found) == ["<m@bot.com>"]
+            assert found["<m@bot.com>"].user_id == "alice"
+
+
 # =============================================================================
 # TestCleanupOldEmails
 # =============================================================================
@@ -521,7 +754,10 @@ class TestPollEmailsThreadMatching:
                 conversation_token="talk_room_42",
             )
 
-        envelope = _envelope(id="2", sender="external@proton.me", subject="Re: Set up a meeting")
+        envelope = _envelope(
+            id="2", sender="external@proton.me", subject="Re: Set up a meeting",
+            references="<outbound@bot.com>",
+        )
         email = Email(
             id="2", subject="Re: Set up a meeting", sender="external@proton.me",
             date="Mon, 01 Jan 2026 12:00:00 +0000",
@@ -531,9 +767,7 @@ class TestPollEmailsThreadMatching:
         )
 
         with (
-            patch("istota.email_poller.list_emails", return_value=[envelope]),
-            patch("istota.email_poller.read_email", return_value=email),
-            patch("istota.email_poller.download_attachments", return_value=[]),
+            _imap([envelope], [email]),
         ):
             task_ids = poll_emails(config)
 
@@ -564,9 +798,7 @@ class TestPollEmailsThreadMatching:
         )
 
         with (
-            patch("istota.email_poller.list_emails", return_value=[envelope]),
-            patch("istota.email_poller.read_email", return_value=email),
-            patch("istota.email_poller.download_attachments", return_value=[]),
+            _imap([envelope], [email]),
         ):
             task_ids = poll_emails(config)
 
@@ -586,9 +818,7 @@ class TestPollEmailsThreadMatching:
         email = _email(sender="alice@test.com")
 
         with (
-            patch("istota.email_poller.list_emails", return_value=[envelope]),
-            patch("istota.email_poller.read_email", return_value=email),
-            patch("istota.email_poller.download_attachments", return_value=[]),
+            _imap([envelope], [email]),
         ):
             task_ids = poll_emails(config)
 
@@ -616,7 +846,7 @@ class TestPollEmailsThreadMatching:
                 conversation_token=None,  # No Talk context
             )
 
-        envelope = _envelope(id="4", sender="ext@x.com", subject="Re: Hello")
+        envelope = _envelope(id="4", sender="ext@x.com", subject="Re: Hello", references="<out@bot.com>")
         email = Email(
             id="4", subject="Re: Hello", sender="ext@x.com",
             date="Mon, 01 Jan 2026 12:00:00 +0000",
@@ -626,9 +856,7 @@ class TestPollEmailsThreadMatching:
         )
 
         with (
-            patch("istota.email_poller.list_emails", return_value=[envelope]),
-            patch("istota.email_poller.read_email", return_value=email),
-            patch("istota.email_poller.download_attachments", return_value=[]),
+            _imap([envelope], [email]),
         ):
             task_ids = poll_emails(config)
 
@@ -1012,6 +1012,30 @@ class TestDeveloperProxyAwareScripts:
         assert "ISTOTA_SKILL_PROXY_SOCK" in content
         assert "credential" in content
 
+    @patch("istota.executor.subprocess.run")
+    def test_shared_hub_scope_used_in_daemon(self, mock_run, tmp_path):
+        """With a proxy hub running, the task registers a scope on the user's socket."""
+        from istota import proxy_hub
+        config = self._make_config(tmp_path, proxy_enabled=True)
+        (tmp_path / "temp" / "alice").mkdir(parents=True)
+        mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+        hub = proxy_hub.ProxyHub(socket_dir=tmp_path)
+
+        try:
+            with patch("istota.proxy_hub.get_hub", return_value=hub):
+                with db.get_db(config.db_path) as conn:
+                    task = self._make_task(conn)
+                    from istota.executor import execute_task
+                    execute_task(task, config, [], conn=conn)
+            env = self._get_claude_env(mock_run)
+            assert env["ISTOTA_SKILL_PROXY_SOCK"] == str(tmp_path / "istota-proxy-alice.sock")
+            assert env["ISTOTA_SKILL_PROXY_TOKEN"]
+            # Scope is revoked once the task is done; the socket stays up
+            assert hub.stats()["alice"]["skill"]["scopes"] == 0
+            assert (tmp_path / "istota-proxy-alice.sock").exists()
+        finally:
+            hub.shutdown()
+
     @patch("istota.executor.subprocess.run")
     def test_gitlab_scripts_use_credential_fetch(self, mock_run, tmp_path):
         config = self._make_config(tmp_path, proxy_enabled=True)
@@ -2,6 +2,8 @@
 
 import sqlite3
 import subprocess
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -17,12 +19,15 @@ from istota.heartbeat import (
     run_check,
     should_alert,
     check_heartbeats,
+    HeartbeatRunner,
+    _check_calendar_conflicts,
     _check_file_watch,
+    _find_overlaps,
     _check_self,
     _check_shell_command,
     _check_url_health,
 )
-from istota.config import Config, SecurityConfig, UserConfig
+from istota.config import Config, NextcloudConfig, SecurityConfig, UserConfig
 from istota import db
 
 
@@ -461,6 +466,18 @@ class TestCheckUrlHealth:
         assert result.healthy is False
         assert "timeout" in result.message.lower()
 
+    @patch("istota.heartbeat.httpx.get")
+    def test_runner_budget_caps_timeout(self, mock_get, tmp_path):
+        mock_get.return_value = MagicMock(status_code=200)
+        config = Config(nextcloud_mount_path=tmp_path)
+        check = HeartbeatCheck(
+            name="test",
+            type="url-health",
+            config={"url": "https://example.com/health", "timeout": 30},
+        )
+        run_check(check, config, "alice", timeout=5)
+        assert mock_get.call_args.kwargs["timeout"] == 5
+
 
 # ---------------------------------------------------------------------------
 # TestShouldAlert
@@ -739,6 +756,391 @@ path = "/test.txt"
             assert t2 is not None
 
 
+class TestCheckHeartbeatsBatching:
+    def test_one_read_and_one_write_per_cycle(self, db_path, tmp_path):
+        mount = tmp_path / "mount"
+        for user in ("alice", "bob"):
+            config_dir = mount / "Users" / user / "istota" / "config"
+            config_dir.mkdir(parents=True)
+            (config_dir / "HEARTBEAT.md").write_text("""
+```toml
+[[checks]]
+name = "one"
+type = "file-watch"
+path = "/a.txt"
+
+[[checks]]
+name = "two"
+type = "file-watch"
+path = "/b.txt"
+```
+""")
+        config = Config(
+            db_path=db_path,
+            nextcloud_mount_path=mount,
+            users={"alice": UserConfig(timezone="UTC"), "bob": UserConfig(timezone="UTC")},
+        )
+
+        healthy = CheckResult(healthy=True, message="ok")
+        with patch("istota.heartbeat.run_check", return_value=healthy), \
+                patch("istota.db.get_heartbeat_state") as mock_get_one, \
+                patch("istota.db.update_heartbeat_state") as mock_update_one, \
+                patch("istota.db.apply_heartbeat_updates", wraps=db.apply_heartbeat_updates) as mock_apply, \
+                db.get_db(db_path) as conn:
+            check_heartbeats(conn, config)
+            states = db.get_heartbeat_states(conn)
+
+        mock_get_one.assert_not_called()
+        mock_update_one.assert_not_called()
+        assert mock_apply.call_count == 1
+        assert len(states) == 4
+        assert all(s.last_healthy_at for s in states.values())
+
+
+# ---------------------------------------------------------------------------
+# TestCalendarConflicts
+# ---------------------------------------------------------------------------
+
+
+def _cal_event(summary, start_hour, end_hour, uid=None, all_day=False):
+    from istota.skills.calendar import CalendarEvent
+
+    day = datetime(2026, 3, 16)
+    return CalendarEvent(
+        uid=uid or summary,
+        summary=summary,
+        start=day + timedelta(hours=start_hour),
+        end=day + timedelta(hours=end_hour),
+        all_day=all_day,
+    )
+
+
+class TestFindOverlaps:
+    def _names(self, overlaps):
+        return [(a.summary, b.summary) for a, b in overlaps]
+
+    def test_no_overlap(self):
+        events = [_cal_event("A", 9, 10), _cal_event("B", 10, 11), _cal_event("C", 12, 13)]
+        assert _find_overlaps(events) == []
+
+    def test_overlapping_pairs_in_start_order(self):
+        events = [
+            _cal_event("Lunch", 12, 13),
+            _cal_event("Standup", 9, 10),
+            _cal_event("Review", 9.5, 12.5),
+        ]
+        assert self._names(_find_overlaps(events)) == [
+            ("Standup", "Review"),
+            ("Review", "Lunch"),
+        ]
+
+    def test_event_inside_long_event(self):
+        events = [_cal_event("Offsite", 8, 17), _cal_event("Call", 10, 11), _cal_event("Sync", 15, 16)]
+        assert self._names(_find_overlaps(events)) == [("Offsite", "Call"), ("Offsite", "Sync")]
+
+    def test_same_occurrence_in_two_calendars_ignored(self):
+        events = [_cal_event("Standup", 9, 10, uid="u1"), _cal_event("Standup", 9, 10, uid="u1")]
+        assert _find_overlaps(events) == []
+
+    def test_matches_pairwise_comparison(self):
+        import random
+
+        rng = random.Random(7)
+        events = []
+        for i in range(200):
+            start = rng.uniform(0, 48)
+            events.append(_cal_event(f"E{i}", start, start + rng.uniform(0.25, 3)))
+        expected = {
+            frozenset((a.summary, b.summary))
+            for i, a in enumerate(events) for b in events[i + 1:]
+            if a.start < b.end and b.start < a.end
+        }
+        found = {frozenset((a.summary, b.summary)) for a, b in _find_overlaps(events)}
+        assert found == expected
+
+
+class TestCheckCalendarConflicts:
+    def _check(self):
+        return HeartbeatCheck(name="cal", type="calendar-conflicts", config={"lookahead_hours": 24})
+
+    def _config(self):
+        return Config(nextcloud=NextcloudConfig(
+            url="https://cloud.example.com", username="bot", app_password="pw",
+        ))
+
+    def test_conflict_reported(self):
+        cache = MagicMock()
+        cache.calendars_for_user.return_value = [("Work", "https://cal/work", True)]
+        cache.get_events.return_value = [
+            _cal_event("Standup", 9, 10),
+            _cal_event("Dentist", 9.5, 10.5),
+            _cal_event("Holiday", 0, 24, all_day=True),
+        ]
+        with patch("istota.heartbeat._get_calendar_cache", return_value=cache), \
+                patch("istota.skills.calendar.get_caldav_client"):
+            result = _check_calendar_conflicts(self._check(), self._config(), "alice")
+
+        assert not result.healthy
+        assert "'Standup' and 'Dentist'" in result.message
+        assert len(result.details["conflicts"]) == 1
+        cache.calendars_for_user.assert_called_once()
+
+    def test_no_conflicts(self):
+        cache = MagicMock()
+        cache.calendars_for_user.return_value = [("Work", "https://cal/work", True)]
+        cache.get_events.return_value = [_cal_event("Standup", 9, 10), _cal_event("Lunch", 12, 13)]
+        with patch("istota.heartbeat._get_calendar_cache", return_value=cache), \
+                patch("istota.skills.calendar.get_caldav_client"):
+            result = _check_calendar_conflicts(self._check(), self._config(), "alice")
+        assert result.healthy
+        assert result.message == "No calendar conflicts"
+
+    def test_caldav_not_configured(self):
+        result = _check_calendar_conflicts(self._check(), Config(), "alice")
+        assert not result.healthy
+
+
+# ---------------------------------------------------------------------------
+# TestHeartbeatRunner
+# ---------------------------------------------------------------------------
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+class TestHeartbeatRunner:
+    @pytest.fixture
+    def runner_config(self, db_path, tmp_path):
+        mount = tmp_path / "mount"
+        config_dir = mount / "Users" / "alice" / "istota" / "config"
+        config_dir.mkdir(parents=True)
+        (config_dir / "HEARTBEAT.md").write_text("""
+```toml
+[settings]
+conversation_token = "room123"
+
+[[checks]]
+name = "slow"
+type = "url-health"
+url = "https://slow.example.com"
+
+[[checks]]
+name = "fast"
+type = "file-watch"
+path = "/test.txt"
+```
+""")
+        return Config(
+            db_path=db_path,
+            nextcloud_mount_path=mount,
+            users={"alice": UserConfig(timezone="UTC")},
+        )
+
+    def test_schedule_does_not_wait(self, runner_config):
+        release = threading.Event()
+
+        def fake_run(check, config, user_id, timeout=None):
+            if check.name == "slow":
+                release.wait(5)
+            return CheckResult(healthy=True, message="ok")
+
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=10)
+        try:
+            with patch("istota.heartbeat.run_check", side_effect=fake_run):
+                start = time.monotonic()
+                with db.get_db(runner_config.db_path) as conn:
+                    assert runner.schedule(conn) == ["alice"]
+                assert time.monotonic() - start < 1.0
+
+                _wait_until(lambda: runner.stats()[("alice", "fast")].runs == 1)
+                assert runner.backlog() == 1
+                release.set()
+                _wait_until(lambda: runner.backlog() == 0)
+        finally:
+            runner.shutdown()
+
+        with db.get_db(runner_config.db_path) as conn:
+            # Workers only queue transitions; nothing is written until a flush
+            assert db.get_heartbeat_state(conn, "alice", "fast") is None
+            assert runner.flush(conn) == 2
+            assert db.get_heartbeat_state(conn, "alice", "slow").last_healthy_at is not None
+            assert db.get_heartbeat_state(conn, "alice", "fast").last_healthy_at is not None
+
+    def test_flush_stamps_completion_time(self, runner_config):
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=10)
+        healthy = CheckResult(healthy=True, message="ok")
+        try:
+            with patch("istota.heartbeat.run_check", return_value=healthy):
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                _wait_until(lambda: runner.backlog() == 0)
+        finally:
+            runner.shutdown()
+
+        finished = {u.check_name: u.at for u in runner._pending}
+        assert all(finished.values())
+        with db.get_db(runner_config.db_path) as conn:
+            runner.flush(conn)
+            state = db.get_heartbeat_state(conn, "alice", "fast")
+        assert state.last_check_at == finished["fast"]
+        assert state.last_healthy_at == finished["fast"]
+
+    def test_next_schedule_flushes_before_reading_state(self, runner_config):
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=10)
+        healthy = CheckResult(healthy=True, message="ok")
+        try:
+            with patch("istota.heartbeat.run_check", return_value=healthy), \
+                    patch("istota.db.apply_heartbeat_updates", wraps=db.apply_heartbeat_updates) as mock_apply:
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.backlog() == 0)
+                    with patch("istota.db.get_heartbeat_states", wraps=db.get_heartbeat_states) as mock_states:
+                        runner.schedule(conn)
+                        state = db.get_heartbeat_state(conn, "alice", "fast")
+                _wait_until(lambda: runner.backlog() == 0)
+        finally:
+            runner.shutdown()
+
+        assert state.last_check_at is not None
+        assert mock_states.call_count == 1
+        # One write per cycle, covering both checks
+        assert [len(c.args[1]) for c in mock_apply.call_args_list] == [0, 2]
+
+    def test_check_in_flight_not_resubmitted(self, runner_config):
+        release = threading.Event()
+        calls = []
+
+        def fake_run(check, config, user_id, timeout=None):
+            calls.append(check.name)
+            if check.name == "slow":
+                release.wait(5)
+            return CheckResult(healthy=True, message="ok")
+
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=10)
+        try:
+            with patch("istota.heartbeat.run_check", side_effect=fake_run):
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.backlog() == 1)
+                    runner.schedule(conn)
+                    _wait_until(lambda: calls.count("fast") == 2)
+                release.set()
+                _wait_until(lambda: runner.backlog() == 0)
+        finally:
+            runner.shutdown()
+
+        assert calls.count("slow") == 1
+        assert runner.stats()[("alice", "slow")].skipped == 1
+
+    @patch("istota.heartbeat.send_heartbeat_alert", return_value=True)
+    def test_timed_out_check_reported(self, mock_alert, runner_config):
+        release = threading.Event()
+
+        def fake_run(check, config, user_id, timeout=None):
+            if check.name == "slow":
+                release.wait(5)
+            return CheckResult(healthy=True, message="ok")
+
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=0.2)
+        try:
+            with patch("istota.heartbeat.run_check", side_effect=fake_run):
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                _wait_until(lambda: runner.stats()[("alice", "slow")].runs == 1)
+        finally:
+            release.set()
+            runner.shutdown()
+
+        stats = runner.stats()[("alice", "slow")]
+        assert stats.timeouts == 1
+        assert stats.last_duration < 2.0
+        result = mock_alert.call_args.args[3]
+        assert not result.healthy
+        assert "timed out" in result.message
+
+    def test_abandoned_check_not_restarted_until_it_exits(self, runner_config):
+        release = threading.Event()
+        calls = []
+
+        def fake_run(check, config, user_id, timeout=None):
+            calls.append((check.name, timeout))
+            if check.name == "slow":
+                release.wait(5)
+            return CheckResult(healthy=True, message="ok")
+
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=0.2)
+        try:
+            with patch("istota.heartbeat.run_check", side_effect=fake_run), \
+                    patch("istota.heartbeat.send_heartbeat_alert", return_value=True):
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.stats()[("alice", "slow")].runs == 1)
+                    # Timed out but still running: held out of the next cycle
+                    assert runner.backlog() == 1
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.stats()[("alice", "fast")].runs == 2)
+                    assert [name for name, _ in calls].count("slow") == 1
+
+                    release.set()
+                    _wait_until(lambda: runner.backlog() == 0)
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.stats()[("alice", "slow")].runs == 2)
+        finally:
+            release.set()
+            runner.shutdown()
+
+        # The budget is passed down to the check's own I/O
+        assert {timeout for _, timeout in calls} == {0.2}
+
+    @patch("istota.heartbeat.send_heartbeat_alert", return_value=True)
+    def test_check_finishing_between_flush_and_schedule_not_rerun(self, mock_alert, runner_config):
+        release = threading.Event()
+
+        def fake_run(check, config, user_id, timeout=None):
+            if check.name == "slow":
+                release.wait(5)
+                return CheckResult(healthy=False, message="down")
+            return CheckResult(healthy=True, message="ok")
+
+        from istota.heartbeat import load_heartbeat_config as real_load
+
+        finish_first = []
+
+        def load(config, user_id):
+            # The slow check finishes after this cycle's flush, before its key is reached
+            if finish_first:
+                release.set()
+                _wait_until(lambda: runner.stats()[("alice", "slow")].runs == 1)
+            return real_load(config, user_id)
+
+        runner = HeartbeatRunner(runner_config, max_workers=2, check_timeout=10)
+        try:
+            with patch("istota.heartbeat.run_check", side_effect=fake_run), \
+                    patch("istota.heartbeat.load_heartbeat_config", side_effect=load):
+                with db.get_db(runner_config.db_path) as conn:
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.stats()[("alice", "fast")].runs == 1)
+                    finish_first.append(True)
+                    runner.schedule(conn)
+                    finish_first.clear()
+                    _wait_until(lambda: runner.backlog() == 0)
+                    assert runner.stats()[("alice", "slow")].runs == 1
+
+                    # Next cycle writes the alert first, so cooldown applies
+                    runner.schedule(conn)
+                    _wait_until(lambda: runner.stats()[("alice", "slow")].runs == 2)
+                    _wait_until(lambda: runner.backlog() == 0)
+        finally:
+            runner.shutdown()
+
+        assert mock_alert.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # TestHeartbeatStateDB
 # ---------------------------------------------------------------------------
@@ -782,6 +1184,60 @@ class TestHeartbeatStateDB:
             state = db.get_heartbeat_state(conn, "alice", "test")
             assert state.consecutive_errors == 2
 
+    def test_get_all_states(self, db_path):
+        with db.get_db(db_path) as conn:
+            db.update_heartbeat_state(conn, "alice", "a", last_check_at=True)
+            db.update_heartbeat_state(conn, "bob", "b", increment_errors=True)
+            states = db.get_heartbeat_states(conn)
+        assert set(states) == {("alice", "a"), ("bob", "b")}
+        assert states[("bob", "b")].consecutive_errors == 1
+
+    def test_apply_updates_batch(self, db_path):
+        with db.get_db(db_path) as conn:
+            db.update_heartbeat_state(conn, "alice", "flaky", increment_errors=True)
+            conn.commit()
+            statements = []
+            conn.set_trace_callback(statements.append)
+            db.apply_heartbeat_updates(conn, [
+                db.HeartbeatUpdate("alice", "flaky", last_check_at=True, last_error_at=True,
+                                   increment_errors=True),
+                db.HeartbeatUpdate("alice", "ok", last_check_at=True, last_healthy_at=True,
+                                   reset_errors=True),
+                db.HeartbeatUpdate("bob", "new", last_check_at=True, increment_errors=True),
+            ])
+            conn.set_trace_callback(None)
+            states = db.get_heartbeat_states(conn)
+
+        assert sum(stmt.strip().upper().startswith("COMMIT") for stmt in statements) == 1
+        flaky = states[("alice", "flaky")]
+        assert flaky.consecutive_errors == 2
+        assert flaky.last_error_at is not None
+        assert flaky.last_healthy_at is None
+        ok = states[("alice", "ok")]
+        assert ok.consecutive_errors == 0
+        assert ok.last_healthy_at is not None
+        assert states[("bob", "new")].consecutive_errors == 1
+
+    def test_apply_updates_uses_completion_time(self, db_path):
+        with db.get_db(db_path) as conn:
+            db.apply_heartbeat_updates(conn, [
+                db.HeartbeatUpdate("alice", "a", last_check_at=True, last_alert_at=True,
+                                   at="2026-01-01 12:00:00"),
+            ])
+            state = db.get_heartbeat_state(conn, "alice", "a")
+        assert state.last_check_at == "2026-01-01 12:00:00"
+        assert state.last_alert_at == "2026-01-01 12:00:00"
+
+    def test_apply_updates_keeps_untouched_fields(self, db_path):
+        with db.get_db(db_path) as conn:
+            db.update_heartbeat_state(conn, "alice", "a", last_alert_at=True, increment_errors=True)
+            before = db.get_heartbeat_state(conn, "alice", "a")
+            db.apply_heartbeat_updates(conn, [db.HeartbeatUpdate("alice", "a", last_check_at=True)])
+            after = db.get_heartbeat_state(conn, "alice", "a")
+        assert after.last_alert_at == before.last_alert_at
+        assert after.consecutive_errors == 1
+        assert after.last_check_at is not None
+
     def test_reset_errors(self, db_path):
         with db.get_db(db_path) as conn:
             # First increment
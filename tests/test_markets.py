@@ -8,6 +8,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+try:
+    # Imported up front: tests patch sys.modules around yfinance, and
+    # pandas/numpy imported inside such a patch can't be imported again
+    import pandas as pd
+except ImportError:
+    pd = None
+
 from istota.skills.markets import (
     DEFAULT_FUTURES,
     DEFAULT_INDICES,
@@ -23,6 +30,17 @@ from istota.skills.markets import (
 )
 
 
+@pytest.fixture(autouse=True)
+def market_cache_dir(tmp_path, monkeypatch):
+    """Keep the shared market data cache per-test."""
+    from istota.skills.markets import cache
+
+    monkeypatch.setenv("MARKETS_CACHE_DIR", str(tmp_path / "markets-cache"))
+    cache.clear_cache()
+    yield
+    cache.clear_cache()
+
+
 def _make_mock_yf(prices: dict[str, tuple[float, float]]):
     """Create a mock yfinance module.
 
@@ -130,6 +148,144 @@ class TestGetQuotes:
         assert result[1].symbol == "NQ=F"
 
 
+@pytest.mark.skipif(pd is None, reason="pandas not installed")
+class TestBatchedDownload:
+    @staticmethod
+    def _frame(closes: dict[str, list[float]]):
+        index = pd.date_range("2026-01-05", periods=3, freq="D")
+        columns = pd.MultiIndex.from_product([["Close", "Open"], list(closes)])
+        rows = [
+            [closes[s][i] for s in closes] * 2
+            for i in range(3)
+        ]
+        return pd.DataFrame(rows, index=index, columns=columns)
+
+    def test_one_download_for_all_symbols(self):
+        mock_yf = MagicMock()
+        mock_yf.download.return_value = self._frame({
+            "ES=F": [4900.0, 4950.0, 5000.0],
+            "NQ=F": [17800.0, 17900.0, 18000.0],
+        })
+        with patch.dict(sys.modules, {"yfinance": mock_yf}):
+            from istota.skills.markets import fetch_quotes
+            result = fetch_quotes(["ES=F", "NQ=F"])
+
+        mock_yf.download.assert_called_once()
+        mock_yf.Ticker.assert_not_called()
+        assert [q.symbol for q in result] == ["ES=F", "NQ=F"]
+        assert result[0].price == 5000.0
+        assert result[0].change == pytest.approx(50.0)
+
+    def test_missing_symbols_looked_up_singly(self):
+        mock_yf = _make_mock_yf({"^VIX": (15.0, 16.0)})
+        mock_yf.download.return_value = self._frame({
+            "ES=F": [4900.0, 4950.0, 5000.0],
+            "^VIX": [float("nan")] * 3,
+        })
+        with patch.dict(sys.modules, {"yfinance": mock_yf}):
+            from istota.skills.markets import fetch_quotes
+            result = fetch_quotes(["ES=F", "^VIX"])
+
+        mock_yf.Ticker.assert_called_once_with("^VIX")
+        assert [q.symbol for q in result] == ["ES=F", "^VIX"]
+        assert result[1].change == pytest.approx(-1.0)
+
+
+class TestSharedCache:
+    def test_same_symbol_set_fetched_once(self):
+        mock_yf = _make_mock_yf({"ES=F": (5000.0, 4950.0), "NQ=F": (18000.0, 17900.0)})
+        with patch.dict(sys.modules, {"yfinance": mock_yf}):
+            from istota.skills.markets import get_quotes
+            first = get_quotes(["ES=F", "NQ=F"])
+            second = get_quotes(["NQ=F", "ES=F"])
+
+        assert mock_yf.Ticker.call_count == 2
+        assert [q.symbol for q in second] == ["NQ=F", "ES=F"]
+        assert second[1] == first[0]
+
+    def test_expired_entries_refetched(self):
+        mock_yf = _make_mock_yf({"ES=F": (5000.0, 4950.0)})
+        with patch.dict(sys.modules, {"yfinance": mock_yf}):
+            from istota.skills.markets import get_quotes
+            get_quotes(["ES=F"], ttl=0)
+            get_quotes(["ES=F"], ttl=0)
+
+        assert mock_yf.Ticker.call_count == 2
+
+    def test_failures_not_cached(self):
+        from istota.skills.markets.cache import cached
+
+        fetch = MagicMock(side_effect=[[], ["ok"]])
+        assert cached("k", 60, fetch) == []
+        assert cached("k", 60, fetch) == ["ok"]
+        assert cached("k", 60, fetch) == ["ok"]
+        assert fetch.call_count == 2
+
+    def test_shared_across_processes_via_disk(self):
+        from istota.skills.markets import cache
+
+        cache.cached("k", 60, lambda: ["value"])
+        cache.clear_cache()  # as a fresh process would start
+        assert cache.cached("k", 60, MagicMock(side_effect=AssertionError)) == ["value"]
+
+    def test_concurrent_requests_share_one_fetch(self):
+        import threading
+        import time as time_mod
+        from istota.skills.markets.cache import cached
+
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time_mod.sleep(0.2)
+            return ["quote"]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cached("k", 60, slow_fetch)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [["quote"]] * 8
+
+    def test_unwritable_cache_dir_ignored(self, monkeypatch):
+        from istota.skills.markets.cache import cached
+
+        monkeypatch.setenv("MARKETS_CACHE_DIR", "/proc/no-such-dir")
+        assert cached("k", 60, lambda: ["value"]) == ["value"]
+
+    def test_finviz_scraped_once_for_several_briefings(self):
+        from istota.skills.markets.finviz import FinVizData, get_finviz_data
+
+        with patch(
+            "istota.skills.markets.finviz.fetch_finviz_data",
+            return_value=FinVizData(headlines=[]),
+        ) as mock_fetch:
+            for _ in range(5):
+                assert get_finviz_data() is not None
+        mock_fetch.assert_called_once()
+
+    def test_finviz_cached_per_browser(self, monkeypatch):
+        from istota.skills.markets.finviz import FinVizData, get_finviz_data
+
+        monkeypatch.setenv("BROWSER_API_URL", "http://browser-a:9223")
+        with patch(
+            "istota.skills.markets.finviz.fetch_finviz_data",
+            return_value=FinVizData(headlines=[]),
+        ) as mock_fetch:
+            get_finviz_data()
+            get_finviz_data(api_url="http://browser-a:9223")
+            get_finviz_data(api_url="http://browser-b:9223")
+        assert [c.kwargs["api_url"] for c in mock_fetch.call_args_list] == [
+            "http://browser-a:9223", "http://browser-b:9223",
+        ]
+
+
 # --- format_quote tests ---
 
 
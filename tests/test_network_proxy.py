@@ -180,3 +180,191 @@ class TestBridgeScript:
 
     def test_bridge_port_is_defined(self):
         assert BRIDGE_PORT == 18080
+
+
+def _echo_upstream():
+    """Upstream that echoes everything until the client half-closes."""
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(64)
+
+    def handle(conn):
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                conn.sendall(data)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = srv.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return srv, srv.getsockname()[1]
+
+
+def _open_tunnel(sock_path, target, extra=b""):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(10)
+    client.connect(str(sock_path))
+    client.sendall(f"CONNECT {target} HTTP/1.1\r\n\r\n".encode() + extra)
+    response = b""
+    while b"\r\n\r\n" not in response:
+        response += client.recv(4096)
+    header, _, rest = response.partition(b"\r\n\r\n")
+    return client, header, rest
+
+
+def _roundtrip(client, payload, already=b""):
+    client.sendall(payload)
+    client.shutdown(socket.SHUT_WR)
+    received = bytearray(already)
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            break
+        received += chunk
+    client.close()
+    return bytes(received)
+
+
+class TestNetworkProxyRelay:
+    @pytest.mark.parametrize("use_splice", [
+        pytest.param(True, marks=pytest.mark.skipif(not hasattr(os, "splice"), reason="no splice")),
+        False,
+    ])
+    def test_large_transfer_and_byte_stats(self, proxy_sock, use_splice):
+        srv, port = _echo_upstream()
+        target = f"127.0.0.1:{port}"
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        try:
+            with NetworkProxy(proxy_sock, {target}, use_splice=use_splice) as proxy:
+                client, header, rest = _open_tunnel(proxy_sock, target)
+                assert b"200" in header
+                assert _roundtrip(client, payload, rest) == payload
+                for _ in range(50):
+                    if proxy.stats()["active"] == 0:
+                        break
+                    threading.Event().wait(0.05)
+                stats = proxy.stats()
+        finally:
+            srv.close()
+        host = stats["hosts"][target]
+        assert host["tunnels"] == 1
+        assert host["bytes_up"] == len(payload)
+        assert host["bytes_down"] == len(payload)
+
+    def test_bytes_after_headers_are_forwarded(self, proxy_sock):
+        srv, port = _echo_upstream()
+        target = f"127.0.0.1:{port}"
+        try:
+            with NetworkProxy(proxy_sock, {target}):
+                client, header, rest = _open_tunnel(proxy_sock, target, extra=b"early-")
+                assert b"200" in header
+                assert _roundtrip(client, b"late", rest) == b"early-late"
+        finally:
+            srv.close()
+
+    def test_many_concurrent_tunnels_single_thread(self, proxy_sock):
+        srv, port = _echo_upstream()
+        target = f"127.0.0.1:{port}"
+        try:
+            with NetworkProxy(proxy_sock, {target}) as proxy:
+                tunnels = [_open_tunnel(proxy_sock, target) for _ in range(40)]
+                # Upstream handlers add one thread per tunnel; the proxy none
+                proxy_threads = [
+                    t for t in threading.enumerate()
+                    if t.name.startswith("network-proxy")
+                ]
+                assert len(proxy_threads) <= 1 + 4  # loop + resolver pool
+                for i, (client, _, rest) in enumerate(tunnels):
+                    assert _roundtrip(client, b"msg-%d" % i, rest) == b"msg-%d" % i
+                assert proxy.stats()["tunnels"] == 40
+        finally:
+            srv.close()
+
+    def test_dns_lookup_cached(self, proxy_sock):
+        srv, port = _echo_upstream()
+        target = f"localhost:{port}"
+        real = socket.getaddrinfo
+        try:
+            with patch("istota.network_proxy.socket.getaddrinfo", side_effect=real) as lookup:
+                with NetworkProxy(proxy_sock, {target}):
+                    for _ in range(3):
+                        client, header, rest = _open_tunnel(proxy_sock, target)
+                        assert b"200" in header
+                        assert _roundtrip(client, b"x", rest) == b"x"
+        finally:
+            srv.close()
+        assert lookup.call_count == 1
+
+    def test_unresolvable_host_counts_failure(self, proxy_sock):
+        target = "no-such-host.invalid:443"
+        with NetworkProxy(proxy_sock, {target}) as proxy:
+            client, header, _ = _open_tunnel(proxy_sock, target)
+            client.close()
+            stats = proxy.stats()
+        assert b"502" in header
+        assert stats["hosts"][target]["failed"] == 1
+
+    def test_oversized_headers_rejected(self, proxy_sock):
+        with NetworkProxy(proxy_sock, {"example.com:443"}):
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.settimeout(10)
+            client.connect(str(proxy_sock))
+            try:
+                client.sendall(b"CONNECT example.com:443 HTTP/1.1\r\nX: " + b"a" * 32768)
+            except OSError:
+                pass
+            response = client.recv(4096)
+            client.close()
+        assert b"400" in response
+
+
+class TestBridgeScriptRelay:
+    def test_bridge_forwards_through_proxy(self, proxy_sock, tmp_path):
+        import subprocess
+        import sys
+        import time
+
+        srv, port = _echo_upstream()
+        target = f"127.0.0.1:{port}"
+        script = tmp_path / "net-bridge"
+        write_bridge_script(script)
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        bridge_port = probe.getsockname()[1]
+        probe.close()
+
+        payload = os.urandom(512 * 1024)
+        try:
+            with NetworkProxy(proxy_sock, {target}):
+                bridge = subprocess.Popen([sys.executable, str(script), str(proxy_sock), str(bridge_port)])
+                try:
+                    deadline = time.monotonic() + 10
+                    while True:
+                        try:
+                            client = socket.create_connection(("127.0.0.1", bridge_port), timeout=10)
+                            break
+                        except ConnectionRefusedError:
+                            if time.monotonic() > deadline:
+                                raise
+                            time.sleep(0.05)
+                    client.sendall(f"CONNECT {target} HTTP/1.1\r\n\r\n".encode())
+                    response = b""
+                    while b"\r\n\r\n" not in response:
+                        response += client.recv(4096)
+                    header, _, rest = response.partition(b"\r\n\r\n")
+                    assert b"200" in header
+                    assert _roundtrip(client, payload, rest) == payload
+                finally:
+                    bridge.kill()
+                    bridge.wait()
+        finally:
+            srv.close()
@@ -0,0 +1,212 @@
+"""Tests for the daemon-level shared proxy hub."""
+
+import json
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from istota import proxy_hub
+from istota.network_proxy import BRIDGE_SCRIPT, write_bridge_script
+from istota.proxy_hub import ProxyHub
+
+
+@pytest.fixture
+def hub():
+    d = Path(tempfile.mkdtemp(prefix="ph_", dir="/tmp"))
+    h = ProxyHub(socket_dir=d, skill_timeout=10)
+    yield h
+    h.shutdown()
+    for p in d.iterdir():
+        p.unlink()
+    d.rmdir()
+
+
+def _skill_request(sock_path, request_dict):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(10)
+    sock.connect(str(sock_path))
+    sock.sendall((json.dumps(request_dict) + "\n").encode())
+    data = b""
+    while b"\n" not in data:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    sock.close()
+    return json.loads(data.decode().strip())
+
+
+def _connect_request(sock_path, target, token=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(10)
+    sock.connect(str(sock_path))
+    preamble = f"ISTOTA-SCOPE {token}\r\n" if token else ""
+    sock.sendall(f"{preamble}CONNECT {target} HTTP/1.1\r\n\r\n".encode())
+    response = b""
+    while b"\r\n\r\n" not in response:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        response += chunk
+    sock.close()
+    return response
+
+
+class TestSkillScopes:
+    def test_one_socket_per_user(self, hub):
+        a1 = hub.skill_scope(1, "alice", {}, {})
+        a2 = hub.skill_scope(2, "alice", {}, {})
+        b1 = hub.skill_scope(3, "bob", {}, {})
+        assert a1.socket_path == a2.socket_path
+        assert a1.socket_path != b1.socket_path
+        assert a1.token != a2.token
+
+    def test_token_routes_to_task_credentials(self, hub):
+        with hub.skill_scope(1, "alice", {"NC_PASS": "one"}, {}) as s1, \
+                hub.skill_scope(2, "alice", {"NC_PASS": "two"}, {}) as s2:
+            r1 = _skill_request(s1.socket_path, {"type": "credential", "name": "NC_PASS", "token": s1.token})
+            r2 = _skill_request(s2.socket_path, {"type": "credential", "name": "NC_PASS", "token": s2.token})
+        assert r1 == {"value": "one"}
+        assert r2 == {"value": "two"}
+
+    def test_request_without_token_rejected(self, hub):
+        with hub.skill_scope(1, "alice", {"NC_PASS": "secret"}, {}) as scope:
+            resp = _skill_request(scope.socket_path, {"type": "credential", "name": "NC_PASS"})
+            skill_resp = _skill_request(scope.socket_path, {"skill": "nextcloud", "args": []})
+        assert "error" in resp
+        assert skill_resp["returncode"] == 1
+        assert "token" in skill_resp["stderr"]
+
+    def test_revoked_token_rejected(self, hub):
+        with hub.skill_scope(1, "alice", {"NC_PASS": "secret"}, {}) as scope:
+            pass
+        resp = _skill_request(scope.socket_path, {
+            "type": "credential", "name": "NC_PASS", "token": scope.token,
+        })
+        assert "expired" in resp["error"]
+
+    def test_scoped_allowlist_enforced(self, hub):
+        lease = hub.skill_scope(
+            1, "alice", {"NC_PASS": "x", "SMTP_PASSWORD": "y"}, {},
+            allowed_credentials={"NC_PASS"},
+        )
+        with lease:
+            resp = _skill_request(lease.socket_path, {
+                "type": "credential", "name": "SMTP_PASSWORD", "token": lease.token,
+            })
+        assert "not available" in resp["error"]
+
+    @patch("istota.skill_proxy.subprocess.run")
+    def test_skill_call_uses_scope_env(self, mock_run, hub):
+        mock_run.return_value = MagicMock(stdout="ok", stderr="", returncode=0)
+        lease = hub.skill_scope(
+            1, "alice", {"SMTP_PASSWORD": "secret"}, {"PATH": "/usr/bin"},
+            skill_credential_map={"email": {"SMTP_PASSWORD"}},
+        )
+        with lease:
+            resp = _skill_request(lease.socket_path, {
+                "skill": "email", "args": ["send"], "token": lease.token,
+            })
+        assert resp["stdout"] == "ok"
+        env = mock_run.call_args.kwargs["env"]
+        assert env == {"PATH": "/usr/bin", "SMTP_PASSWORD": "secret"}
+
+    @patch("istota.skill_proxy.subprocess.run")
+    def test_stats(self, mock_run, hub):
+        mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
+        with hub.skill_scope(1, "alice", {}, {}) as lease:
+            for _ in range(3):
+                _skill_request(lease.socket_path, {
+                    "skill": "email", "args": [], "token": lease.token,
+                })
+            stats = hub.stats()["alice"]["skill"]
+        assert stats["connections"] == 3
+        assert stats["skill_calls"] == 3
+        assert stats["scopes"] == 1
+        assert stats["avg_ms"] >= 0
+        assert hub.stats()["alice"]["skill"]["scopes"] == 0
+
+
+class TestNetworkScopes:
+    def _upstream(self):
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind(("127.0.0.1", 0))
+        srv.listen(4)
+
+        def serve():
+            while True:
+                try:
+                    conn, _ = srv.accept()
+                except OSError:
+                    return
+                conn.close()
+
+        threading.Thread(target=serve, daemon=True).start()
+        return srv, srv.getsockname()[1]
+
+    def test_token_selects_allowlist(self, hub):
+        srv, port = self._upstream()
+        target = f"127.0.0.1:{port}"
+        try:
+            with hub.network_scope(1, "alice", {target}) as allowed, \
+                    hub.network_scope(2, "alice", set()) as denied:
+                assert allowed.socket_path == denied.socket_path
+                ok = _connect_request(allowed.socket_path, target, allowed.token)
+                blocked = _connect_request(denied.socket_path, target, denied.token)
+            stats = hub.stats()["alice"]["network"]
+        finally:
+            srv.close()
+        assert b"200" in ok
+        assert b"403" in blocked
+        assert stats["tunnels"] == 1
+        assert stats["blocked"] == 1
+
+    def test_missing_or_revoked_token_forbidden(self, hub):
+        with hub.network_scope(1, "alice", {"example.com:443"}) as lease:
+            no_token = _connect_request(lease.socket_path, "example.com:443")
+        revoked = _connect_request(lease.socket_path, "example.com:443", lease.token)
+        assert b"403" in no_token
+        assert b"403" in revoked
+
+
+class TestHubLifecycle:
+    def test_start_get_stop(self):
+        assert proxy_hub.get_hub() is None
+        hub = proxy_hub.start_hub()
+        try:
+            assert proxy_hub.get_hub() is hub
+            assert proxy_hub.start_hub() is hub
+        finally:
+            proxy_hub.stop_hub()
+        assert proxy_hub.get_hub() is None
+
+    def test_shutdown_removes_sockets(self, hub):
+        lease = hub.skill_scope(1, "alice", {}, {})
+        assert lease.socket_path.exists()
+        hub.shutdown()
+        assert not lease.socket_path.exists()
+
+    def test_user_id_sanitized_in_socket_name(self, hub):
+        lease = hub.skill_scope(1, "../evil user", {}, {})
+        assert lease.socket_path.parent == hub.socket_dir
+        assert "/" not in lease.socket_path.name
+
+
+class TestBridgeScriptReuse:
+    def test_unchanged_script_not_rewritten(self, tmp_path):
+        path = tmp_path / "net-bridge"
+        write_bridge_script(path)
+        with patch.object(Path, "write_text") as mock_write:
+            write_bridge_script(path)
+        mock_write.assert_not_called()
+
+    def test_stale_script_replaced(self, tmp_path):
+        path = tmp_path / "net-bridge"
+        path.write_text("old")
+        write_bridge_script(path)
+        assert path.read_text() == BRIDGE_SCRIPT
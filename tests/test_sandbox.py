@@ -12,6 +12,7 @@ from istota.executor import (
     _build_network_allowlist,
     build_bwrap_cmd,
 )
+from istota.network_proxy import BRIDGE_PORT
 
 
 @pytest.fixture
@@ -523,6 +524,21 @@ class TestNetworkProxyBwrapIntegration:
         assert after_sep[4:] == ["claude", "-p", "-", "--allowedTools", "Read"]
 
 
+    def test_scope_token_passed_to_bridge(self, sandbox_config, make_sandbox_task):
+        task = make_sandbox_task()
+        user_temp = sandbox_config.temp_dir / task.user_id
+        user_temp.mkdir(parents=True)
+        sock = sandbox_config.temp_dir / "net.sock"
+        sock.touch()
+        with _patch_linux():
+            result = build_bwrap_cmd(
+                ["claude", "-p", "-"], sandbox_config, task, False,
+                [], user_temp, net_proxy_sock=sock, net_proxy_token="tok123",
+            )
+        shell_cmd = result[result.index("--") + 3]
+        assert f"{sock} {BRIDGE_PORT} tok123 &" in shell_cmd
+
+
 class TestBuildNetworkAllowlist:
     """Tests for _build_network_allowlist."""
 
@@ -3,6 +3,8 @@
 import json
 import sqlite3
 import subprocess
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -25,6 +27,7 @@ from istota.scheduler import (
     _format_error_for_user,
     _strip_action_prefix,
     _execute_command_task,
+    BriefingRunner,
     check_briefings,
     check_scheduled_jobs,
     post_result_to_email,
@@ -693,6 +696,243 @@ class TestCheckScheduledJobs:
         assert len(result) == 1, "Job should fire at the correct wall-clock time"
 
 
+class TestScheduledJobFireTimes:
+    """Stored next fire times for scheduled jobs."""
+
+    NOW = datetime(2026, 6, 15, 14, 0, 0, tzinfo=ZoneInfo("UTC"))
+
+    def _insert(self, conn, name="nightly", cron="0 22 * * *", last_run_at="2026-06-14 22:00:00"):
+        conn.execute(
+            """INSERT INTO scheduled_jobs
+               (user_id, name, cron_expression, prompt, enabled, last_run_at, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            ("alice", name, cron, "Check", 1, last_run_at, "2026-06-01 00:00:00"),
+        )
+
+    def _job(self, conn, name="nightly"):
+        return db.get_scheduled_job_by_name(conn, "alice", name)
+
+    @patch("istota.scheduler._sync_cron_files")
+    @patch("istota.scheduler._now")
+    def test_next_run_stored_in_utc(self, mock_now, mock_sync, db_path):
+        config = Config(db_path=db_path, users={"alice": UserConfig(timezone="America/Los_Angeles")})
+        mock_now.return_value = self.NOW
+        with db.get_db(db_path) as conn:
+            # Last ran 22:00 PDT on June 14
+            self._insert(conn, last_run_at="2026-06-15 05:00:00")
+            assert check_scheduled_jobs(conn, config) == []
+            job = self._job(conn)
+        # 22:00 PDT on June 15
+        assert job.next_run_at == "2026-06-16 05:00:00"
+        assert job.next_run_tz == "America/Los_Angeles"
+
+    @patch("istota.scheduler._sync_cron_files")
+    @patch("istota.scheduler._now")
+    def test_not_due_jobs_not_recomputed(self, mock_now, mock_sync, db_path):
+        config = Config(db_path=db_path, users={"alice": UserConfig(timezone="UTC")})
+        mock_now.return_value = self.NOW
+        with db.get_db(db_path) as conn:
+            self._insert(conn)
+            check_scheduled_jobs(conn, config)
+            with patch("istota.scheduler.next_fire_time") as mock_next:
+                assert check_scheduled_jobs(conn, config) == []
+            mock_next.assert_not_called()
+
+    @patch("istota.scheduler._sync_cron_files")
+    @patch("istota.scheduler._now")
+    def test_fires_when_stored_time_passes(self, mock_now, mock_sync, db_path):
+        config = Config(db_path=db_path, users={"alice": UserConfig(timezone="UTC")})
+        mock_now.return_value = self.NOW
+        with db.get_db(db_path) as conn:
+            self._insert(conn)
+            check_scheduled_jobs(conn, config)
+
+            mock_now.return_value = datetime(2026, 6, 15, 22, 1, tzinfo=ZoneInfo("UTC"))
+            with patch("istota.scheduler.next_fire_time") as mock_next:
+                assert len(check_scheduled_jobs(conn, config)) == 1
+            mock_next.assert_not_called()
+
+            # Firing records the run and clears the stored time for recompute
+            job = self._job(conn)
+            assert job.next_run_at is None
+            assert check_scheduled_jobs(conn, config) == []
+            assert self._job(conn).next_run_at > "2026-06-16"
+
+    @patch("istota.scheduler._sync_cron_files")
+    @patch("istota.scheduler._now")
+    def test_cron_change_clears_stored_time(self, mock_now, mock_sync, db_path):
+        config = Config(db_path=db_path, users={"alice": UserConfig(timezone="UTC")})
+        mock_now.return_value = self.NOW
+        with db.get_db(db_path) as conn:
+            self._insert(conn)
+            check_scheduled_jobs(conn, config)
+
+            # Same values rewritten by a CRON.md sync keep the stored time
+            conn.execute("UPDATE scheduled_jobs SET cron_expression = '0 22 * * *', prompt = 'Check'")
+            assert self._job(conn).next_run_at is not None
+
+            conn.execute("UPDATE scheduled_jobs SET cron_expression = '0 13 * * *'")
+            assert self._job(conn).next_run_at is None
+            assert len(check_scheduled_jobs(conn, config)) == 1
+
+    @patch("istota.scheduler._sync_cron_files")
+    @patch("istota.scheduler._now")
+    def test_timezone_change_recomputes(self, mock_now, mock_sync, db_path):
+        user = UserConfig(timezone="UTC")
+        config = Config(db_path=db_path, users={"alice": user})
+        mock_now.return_value = self.NOW
+        with db.get_db(db_path) as conn:
+            self._insert(conn, cron="0 8 * * *", last_run_at="2026-06-15 08:00:00")
+            check_scheduled_jobs(conn, config)
+            assert self._job(conn).next_run_at == "2026-06-16 08:00:00"
+
+            # 08:00 in Los Angeles is 15:00 UTC today
+            user.timezone = "America/Los_Angeles"
+            assert check_scheduled_jobs(conn, config) == []
+            job = self._job(conn)
+        assert job.next_run_at == "2026-06-15 15:00:00"
+        assert job.next_run_tz == "America/Los_Angeles"
+
+    def test_due_lookup_skips_future_and_disabled(self, db_conn):
+        db_conn.execute(
+            """INSERT INTO scheduled_jobs (user_id, name, cron_expression, enabled, next_run_at)
+               VALUES ('alice', 'due', '* * * * *', 1, '2026-06-15 13:00:00'),
+                      ('alice', 'later', '* * * * *', 1, '2026-06-15 15:00:00'),
+                      ('alice', 'new', '* * * * *', 1, NULL),
+                      ('alice', 'off', '* * * * *', 0, '2026-06-15 13:00:00')"""
+        )
+        jobs = db.get_due_scheduled_jobs(db_conn, "2026-06-15 14:00:00")
+        assert sorted(j.name for j in jobs) == ["due", "new"]
+
+
+class TestCheckBriefingsIndex:
+    @patch("istota.scheduler.db.set_briefing_last_run")
+    @patch("istota.scheduler.db.get_briefing_last_run")
+    @patch("istota.scheduler.build_briefing_prompt", return_value="Test prompt")
+    @patch("istota.scheduler._now")
+    def test_index_skips_briefings_not_due(self, mock_now, mock_build, mock_get, mock_set, db_path):
+        from istota.cron_index import FireTimeIndex
+
+        briefing = BriefingConfig(name="morning", cron="0 6 * * *", conversation_token="room1", components={})
+        config = Config(db_path=db_path, users={"alice": UserConfig(timezone="UTC", briefings=[briefing])})
+        index = FireTimeIndex()
+        runs = {}
+        mock_get.side_effect = lambda conn, user_id, name: runs.get((user_id, name))
+        mock_set.side_effect = lambda conn, user_id, name: runs.__setitem__(
+            (user_id, name), mock_now.return_value.isoformat(),
+        )
+
+        mock_now.return_value = datetime(2026, 6, 15, 7, 0, tzinfo=ZoneInfo("UTC"))
+        assert len(check_briefings(db_path, config, index)) == 1
+        mock_get.reset_mock()
+
+        for hour in (8, 9, 10):
+            mock_now.return_value = datetime(2026, 6, 15, hour, 0, tzinfo=ZoneInfo("UTC"))
+            assert check_briefings(db_path, config, index) == []
+        # Recomputed once after firing, then left alone until due
+        assert mock_get.call_count == 1
+
+        mock_now.return_value = datetime(2026, 6, 16, 6, 0, tzinfo=ZoneInfo("UTC"))
+        assert len(check_briefings(db_path, config, index)) == 1
+
+
+class TestBriefingRunner:
+    @pytest.fixture
+    def config(self, db_path):
+        briefings = [
+            BriefingConfig(name=name, cron="0 6 * * *", conversation_token="room1", components={})
+            for name in ("slow", "fast")
+        ]
+        return Config(db_path=db_path, users={"alice": UserConfig(timezone="UTC", briefings=briefings)})
+
+    @pytest.fixture(autouse=True)
+    def now(self):
+        # Both briefings never ran and are due at 06:00
+        with patch(
+            "istota.scheduler._now",
+            return_value=datetime(2026, 6, 15, 7, 0, tzinfo=ZoneInfo("UTC")),
+        ):
+            yield
+
+    def _wait_until(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            assert time.monotonic() < deadline, "condition not reached"
+            time.sleep(0.01)
+
+    def test_schedule_does_not_wait_for_slow_briefing(self, config, db_path):
+        release = threading.Event()
+
+        def build(briefing, user_id, app_config, user_tz):
+            if briefing.name == "slow":
+                release.wait(5)
+            return f"{briefing.name} prompt"
+
+        runner = BriefingRunner(config, max_workers=2)
+        try:
+            with patch("istota.scheduler.build_briefing_prompt", side_effect=build):
+                start = time.monotonic()
+                with db.get_db(db_path) as conn:
+                    assert sorted(runner.schedule(conn)) == [("alice", "fast"), ("alice", "slow")]
+                assert time.monotonic() - start < 1.0
+
+                # The fast briefing is queued while the slow one is still building
+                self._wait_until(lambda: runner.running() == [("alice", "slow")])
+                with db.get_db(db_path) as conn:
+                    prompts = [row[0] for row in conn.execute("SELECT prompt FROM tasks")]
+                assert prompts == ["fast prompt"]
+
+                release.set()
+                self._wait_until(lambda: runner.running() == [])
+        finally:
+            runner.shutdown()
+
+        with db.get_db(db_path) as conn:
+            assert conn.execute("SELECT count(*) FROM tasks").fetchone()[0] == 2
+            assert db.get_briefing_last_run(conn, "alice", "slow") is not None
+
+    def test_briefing_in_flight_not_resubmitted(self, config, db_path):
+        release = threading.Event()
+        calls = []
+
+        def build(briefing, user_id, app_config, user_tz):
+            calls.append(briefing.name)
+            release.wait(5)
+            return "prompt"
+
+        runner = BriefingRunner(config, max_workers=2)
+        try:
+            with patch("istota.scheduler.build_briefing_prompt", side_effect=build):
+                with db.get_db(db_path) as conn:
+                    runner.schedule(conn)
+                    assert runner.schedule(conn) == []
+                release.set()
+                self._wait_until(lambda: runner.running() == [])
+                with db.get_db(db_path) as conn:
+                    assert runner.schedule(conn) == []
+        finally:
+            runner.shutdown()
+
+        assert sorted(calls) == ["fast", "slow"]
+
+    def test_failed_briefing_retried_next_check(self, config, db_path):
+        runner = BriefingRunner(config, max_workers=2)
+        try:
+            with patch("istota.scheduler.build_briefing_prompt", side_effect=RuntimeError("down")):
+                with db.get_db(db_path) as conn:
+                    runner.schedule(conn)
+                self._wait_until(lambda: runner.running() == [])
+            with patch("istota.scheduler.build_briefing_prompt", return_value="prompt"):
+                with db.get_db(db_path) as conn:
+                    assert len(runner.schedule(conn)) == 2
+                self._wait_until(lambda: runner.running() == [])
+        finally:
+            runner.shutdown()
+
+        with db.get_db(db_path) as conn:
+            assert conn.execute("SELECT count(*) FROM tasks").fetchone()[0] == 2
+
+
 class TestCheckBriefingsDST:
     """DST-related tests for check_briefings."""
 
@@ -2338,6 +2578,30 @@ class TestDeferredOperations:
             ).fetchone()
         assert row["posted_account"] == "Expenses:Software:Subscriptions"
 
+    def test_process_deferred_tracking_sync_cursor(self, db_path, tmp_path):
+        """The Monarch sync cursor is persisted for the task's user."""
+        from istota.scheduler import _process_deferred_tracking
+        config = self._make_config(db_path, tmp_path)
+        user_temp = tmp_path / "temp" / "alice"
+        user_temp.mkdir(parents=True)
+
+        with db.get_db(db_path) as conn:
+            task_id = db.create_task(
+                conn, prompt="Sync", user_id="alice", source_type="talk",
+            )
+            task = db.get_task(conn, task_id)
+
+        cursor = {"synced_through": "2026-02-10", "reconciled_at": "2026-02-10T08:00:00"}
+        (user_temp / f"task_{task_id}_tracked_transactions.json").write_text(
+            json.dumps({"monarch_sync_cursor": cursor}),
+        )
+
+        _process_deferred_tracking(config, task, user_temp)
+
+        with db.get_db(db_path) as conn:
+            assert db.get_monarch_sync_cursor(conn, "alice") == cursor
+            assert db.get_monarch_sync_cursor(conn, "bob") is None
+
     def test_process_deferred_tracking_no_file(self, db_path, tmp_path):
         """No file means no-op."""
         from istota.scheduler import _process_deferred_tracking
@@ -13,7 +13,12 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from istota.skill_proxy import SkillProxy, _ALLOWED_SKILLS
+from istota.skill_proxy import (
+    SkillProxy,
+    _ALLOWED_SKILLS,
+    _ResidentWorker,
+    _get_resident_worker,
+)
 from istota.executor import _split_credential_env, _PROXY_CREDENTIAL_VARS
 
 
@@ -435,6 +440,168 @@ class TestSkillProxyProtocol:
         assert all(r["returncode"] == 0 for r in results)
 
 
+class TestWarmSkillExecution:
+    """Skill calls forked from the preloaded forkserver."""
+
+    def test_captures_stdout_and_exit_code(self, sock_path):
+        proxy = SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}, warm=True)
+        resp = proxy._run_warm("nextcloud", [], {"PATH": "/usr/bin"})
+        assert resp["returncode"] == 1
+        assert "usage" in resp["stdout"].lower()
+
+    def test_uses_scoped_env_only(self, sock_path, monkeypatch):
+        """Inherited daemon env must not leak into the forked skill."""
+        monkeypatch.setenv("NC_URL", "https://leak.example.com")
+        monkeypatch.setenv("NC_USER", "leak")
+        monkeypatch.setenv("NC_PASS", "leak")
+        proxy = SkillProxy(sock_path, {}, {}, warm=True)
+        resp = proxy._run_warm("nextcloud", ["share", "list"], {"PATH": "/usr/bin"})
+        assert resp["returncode"] == 1
+        assert "env vars required" in resp["stderr"]
+
+    def test_argparse_errors_on_stderr(self, sock_path):
+        proxy = SkillProxy(sock_path, {}, {}, warm=True)
+        resp = proxy._run_warm("nextcloud", ["--bogus-flag"], {"PATH": "/usr/bin"})
+        assert resp["returncode"] == 2
+        assert "--bogus-flag" in resp["stderr"]
+
+    @patch("istota.skill_proxy.subprocess.run")
+    def test_warm_path_skips_subprocess(self, mock_run, sock_path):
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}, warm=True):
+            resp = TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "nextcloud", "args": []},
+            )
+        assert resp["returncode"] == 1
+        mock_run.assert_not_called()
+
+    @patch("istota.skill_proxy.subprocess.run")
+    @patch("istota.skill_proxy._get_warm_context", side_effect=RuntimeError("no forkserver"))
+    def test_falls_back_to_subprocess(self, _mock_ctx, mock_run, sock_path):
+        mock_run.return_value = MagicMock(stdout="cold", stderr="", returncode=0)
+        proxy = SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}, warm=True)
+        assert proxy._run_warm("nextcloud", [], {}) is None
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}, warm=True):
+            resp = TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "nextcloud", "args": []},
+            )
+        assert resp["stdout"] == "cold"
+        mock_run.assert_called_once()
+
+    def test_timeout_kills_worker(self, sock_path):
+        proxy = SkillProxy(sock_path, {}, {}, timeout=0, warm=True)
+        resp = proxy._run_warm("nextcloud", [], {"PATH": "/usr/bin"})
+        assert resp["returncode"] in (124, 1)
+
+
+def _env_echo_worker(skill, conn):
+    """Resident worker whose serve() reports the env it ran under."""
+    from istota.skills.whisper import cli
+    cli.serve = lambda args: {
+        "stdout": os.environ.get("WHISPER_MAX_MODEL", ""),
+        "stderr": "",
+        "returncode": 0 if "LEAK" not in os.environ else 1,
+    }
+    from istota.skill_proxy import _resident_worker_main
+    _resident_worker_main(skill, conn)
+
+
+def _hung_worker(skill, conn):
+    conn.recv()
+    time.sleep(60)
+
+
+def _dying_worker(skill, conn):
+    conn.recv()
+    os._exit(1)
+
+
+class TestResidentCommands:
+    """Commands served by a long-lived worker process to reuse resident state."""
+
+    @patch("istota.skill_proxy.subprocess.run")
+    @patch.object(SkillProxy, "_run_resident")
+    def test_whisper_transcribe_served_by_resident_worker(self, mock_resident, mock_run, sock_path):
+        mock_resident.return_value = {"stdout": "{}", "stderr": "", "returncode": 0}
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}):
+            resp = TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "whisper", "args": ["transcribe", "/tmp/a.ogg"]},
+            )
+        assert resp == {"stdout": "{}", "stderr": "", "returncode": 0}
+        mock_resident.assert_called_once_with(
+            "whisper", ["transcribe", "/tmp/a.ogg"], {"PATH": "/usr/bin"},
+        )
+        mock_run.assert_not_called()
+
+    @patch("istota.skill_proxy.subprocess.run")
+    @patch.object(SkillProxy, "_run_resident", return_value=None)
+    def test_unserved_call_falls_back_to_cli(self, _mock_resident, mock_run, sock_path):
+        mock_run.return_value = MagicMock(stdout="", stderr="usage", returncode=2)
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}):
+            resp = TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "whisper", "args": ["transcribe"]},
+            )
+        assert resp["returncode"] == 2
+        mock_run.assert_called_once()
+
+    @patch("istota.skill_proxy.subprocess.run")
+    @patch.object(SkillProxy, "_run_resident")
+    def test_other_subcommands_run_as_cli(self, mock_resident, mock_run, sock_path):
+        mock_run.return_value = MagicMock(stdout="[]", stderr="", returncode=0)
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}):
+            TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "whisper", "args": ["models"]},
+            )
+        mock_resident.assert_not_called()
+        mock_run.assert_called_once()
+
+    def test_worker_serves_and_stays_up(self):
+        worker = _ResidentWorker("whisper")
+        try:
+            resp = worker.run(["transcribe", "/nonexistent/a.ogg"], {"PATH": "/usr/bin"}, 30)
+            assert resp["returncode"] == 1
+            assert "Audio file not found" in resp["stdout"]
+            pid = worker._proc.pid
+            assert worker.run(["transcribe"], {"PATH": "/usr/bin"}, 30) is None
+            assert worker._proc.pid == pid
+        finally:
+            worker.stop()
+
+    def test_worker_uses_scoped_env_only(self, monkeypatch):
+        monkeypatch.setenv("LEAK", "1")
+        worker = _ResidentWorker("whisper", target=_env_echo_worker)
+        try:
+            resp = worker.run(["transcribe", "a.ogg"], {"WHISPER_MAX_MODEL": "small"}, 30)
+        finally:
+            worker.stop()
+        assert resp == {"stdout": "small", "stderr": "", "returncode": 0}
+
+    def test_timeout_kills_worker(self):
+        worker = _ResidentWorker("whisper", target=_hung_worker)
+        resp = worker.run(["transcribe", "a.ogg"], {}, 0.5)
+        assert resp["returncode"] == 124
+        assert "timed out after 0.5s" in resp["stderr"]
+        assert worker._proc is None
+
+    @patch("istota.skill_proxy.subprocess.run")
+    def test_dead_worker_falls_back_to_cold(self, mock_run, sock_path, monkeypatch):
+        mock_run.return_value = MagicMock(stdout="cold", stderr="", returncode=0)
+        worker = _ResidentWorker("whisper", target=_dying_worker)
+        monkeypatch.setattr("istota.skill_proxy._get_resident_worker", lambda skill: worker)
+        with SkillProxy(sock_path, {}, {"PATH": "/usr/bin"}):
+            resp = TestSkillProxyProtocol()._send_request(
+                sock_path, {"skill": "whisper", "args": ["transcribe", "/tmp/a.ogg"]},
+            )
+        assert resp["stdout"] == "cold"
+        assert worker._proc is None
+        mock_run.assert_called_once()
+
+    def test_busy_worker_is_not_waited_on(self, sock_path):
+        proxy = SkillProxy(sock_path, {}, {})
+        worker = _get_resident_worker("whisper")
+        with worker.lock:
+            assert proxy._run_resident("whisper", ["transcribe", "a.ogg"], {}) is None
+
+
 class TestAllowedSkills:
     """Verify the allowlist matches actual __main__.py files."""
 
@@ -499,6 +666,29 @@ class TestSkillClientDirect:
         t.join(timeout=5)
         assert exc_info.value.code == 0
 
+    def test_proxy_request_carries_token(self, sock_path, monkeypatch):
+        from istota.skill_client import _run_via_proxy
+        monkeypatch.setenv("ISTOTA_SKILL_PROXY_TOKEN", "tok123")
+        received = []
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(1)
+
+        def serve():
+            conn, _ = server.accept()
+            received.append(json.loads(conn.recv(65536)))
+            conn.sendall(b'{"stdout": "", "stderr": "", "returncode": 0}\n')
+            conn.close()
+            server.close()
+
+        t = threading.Thread(target=serve)
+        t.start()
+        with pytest.raises(SystemExit):
+            _run_via_proxy(str(sock_path), "email", ["send"])
+        t.join(timeout=5)
+        assert received[0]["token"] == "tok123"
+
     def test_proxy_connection_refused(self):
         """Client handles missing proxy gracefully."""
         from istota.skill_client import _run_via_proxy
@@ -1,11 +1,11 @@
 """Tests for skills/accounting.py module."""
 
+import argparse
 import csv
 import json
-import subprocess
 from datetime import date, timedelta
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -32,6 +32,7 @@ from istota.skills.accounting import (
     _run_bean_query,
     build_parser,
     cmd_add_transaction,
+    cmd_add_transactions,
     cmd_balances,
     cmd_check,
     cmd_import_monarch,
@@ -48,6 +49,7 @@ from istota.skills.accounting import (
     main,
     parse_accounting_config,
 )
+from istota.skills.accounting import ledger as ledger_engine
 
 
 class TestLedgerPath:
@@ -106,72 +108,73 @@ class TestLedgerPath:
         assert result == Path("/path/personal.beancount")
 
 
-class TestBeanCheck:
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_check_success(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stderr="")
+@pytest.fixture(autouse=True)
+def ledger_cache_dir(tmp_path, monkeypatch):
+    """Keep ledger caches and transaction indexes out of ~/.cache."""
+    monkeypatch.setenv("LEDGER_CACHE_DIR", str(tmp_path / "cache"))
+
 
-        success, errors = _run_bean_check(Path("/test/ledger.beancount"))
+@pytest.fixture
+def real_ledger(tmp_path, monkeypatch):
+    ledger_engine.clear_cache()
+    ledger = tmp_path / "main.beancount"
+    ledger.write_text(
+        '2026-01-01 open Assets:Bank USD\n'
+        '2026-01-01 open Expenses:Food USD\n'
+        '\n'
+        '2026-01-15 * "Store" "Groceries"\n'
+        '  Expenses:Food  500.00 USD\n'
+        '  Assets:Bank\n'
+    )
+    yield ledger
+    ledger_engine.clear_cache()
+
+
+class TestBeanCheck:
+    def test_bean_check_success(self, real_ledger):
+        success, errors = _run_bean_check(real_ledger)
 
         assert success is True
         assert errors == []
-        mock_run.assert_called_once()
-        assert "bean-check" in mock_run.call_args[0][0]
-
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_check_errors(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stderr="ledger.beancount:10: Invalid account 'Foo'\nledger.beancount:20: Missing narration"
-        )
-
-        success, errors = _run_bean_check(Path("/test/ledger.beancount"))
 
-        assert success is False
-        assert len(errors) == 2
-        assert "Invalid account" in errors[0]
+    def test_bean_check_errors(self, real_ledger):
+        with open(real_ledger, "a") as f:
+            f.write('\n2026-02-01 * "Shop" "Unknown account"\n  Expenses:Foo  1.00 USD\n  Assets:Bank\n')
 
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_check_not_found(self, mock_run):
-        mock_run.side_effect = FileNotFoundError()
+        success, errors = _run_bean_check(real_ledger)
 
-        with pytest.raises(ValueError, match="bean-check not found"):
-            _run_bean_check(Path("/test/ledger.beancount"))
+        assert success is False
+        assert len(errors) == 1
+        assert "Expenses:Foo" in errors[0]
+        assert f"{real_ledger}:" in errors[0]
 
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_check_timeout(self, mock_run):
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="bean-check", timeout=60)
+    def test_bean_check_missing_file(self, tmp_path):
+        with pytest.raises(ValueError, match="not found"):
+            _run_bean_check(tmp_path / "missing.beancount")
 
-        with pytest.raises(ValueError, match="timed out"):
-            _run_bean_check(Path("/test/ledger.beancount"))
+    def test_bean_check_does_not_spawn_process(self, real_ledger):
+        with patch("subprocess.run") as mock_run:
+            _run_bean_check(real_ledger)
+        mock_run.assert_not_called()
 
 
 class TestBeanQuery:
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_query_success(self, mock_run):
-        csv_output = "account,sum(position)\nAssets:Bank,1000 USD\nExpenses:Food,500 USD\n"
-        mock_run.return_value = MagicMock(returncode=0, stdout=csv_output, stderr="")
-
-        result = _run_bean_query(Path("/test/ledger.beancount"), "SELECT account, sum(position)")
+    def test_bean_query_success(self, real_ledger):
+        result = _run_bean_query(real_ledger, "SELECT account, sum(position) GROUP BY account ORDER BY account")
 
         assert len(result) == 2
         assert result[0]["account"] == "Assets:Bank"
-        assert result[0]["sum(position)"] == "1000 USD"
-
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_query_empty_result(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        assert result[0]["sum(position)"].strip() == "-500.00 USD"
+        assert result[1]["sum(position)"].strip() == "500.00 USD"
 
-        result = _run_bean_query(Path("/test/ledger.beancount"), "SELECT * WHERE 1=0")
+    def test_bean_query_empty_result(self, real_ledger):
+        result = _run_bean_query(real_ledger, "SELECT account WHERE account ~ 'Nope'")
 
         assert result == []
 
-    @patch("istota.skills.accounting.subprocess.run")
-    def test_bean_query_error(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="Invalid query syntax")
-
-        with pytest.raises(ValueError, match="Invalid query syntax"):
-            _run_bean_query(Path("/test/ledger.beancount"), "INVALID QUERY")
+    def test_bean_query_error(self, real_ledger):
+        with pytest.raises(ValueError):
+            _run_bean_query(real_ledger, "INVALID QUERY")
 
 
 class TestCategoryMapping:
@@ -519,6 +522,75 @@ class TestWashSaleDetection:
         assert len(violations) == 0
 
 
+    @staticmethod
+    def _sale(day, units=10, loss=-100.0, symbol="AAPL", lot_date=None):
+        return SaleTransaction(
+            date=day, account="Assets:Investment", symbol=symbol, units=units,
+            proceeds=1500.0 + loss, cost_basis=1500.0, gain_loss=loss, lot_date=lot_date,
+        )
+
+    @staticmethod
+    def _buy(day, units, symbol="AAPL"):
+        return PurchaseTransaction(
+            date=day, account="Assets:Investment", symbol=symbol, units=units, cost=units * 100.0,
+        )
+
+    def test_partial_replacement_disallows_fraction(self):
+        violations = _detect_wash_sales(
+            [self._sale(date(2026, 6, 15), units=10, loss=-100.0)],
+            [self._buy(date(2026, 6, 20), 4)],
+            2026,
+        )
+        assert violations[0]["replacement_units"] == 4
+        assert violations[0]["disallowed_loss"] == 40.0
+
+    def test_replacement_shares_used_once(self):
+        sales = [
+            self._sale(date(2026, 6, 10), units=10),
+            self._sale(date(2026, 6, 12), units=10),
+        ]
+        violations = _detect_wash_sales(sales, [self._buy(date(2026, 6, 20), 15)], 2026)
+        assert [v["replacement_units"] for v in violations] == [10, 5]
+        assert violations[1]["disallowed_loss"] == 50.0
+        assert violations[1]["triggering_purchases"][0]["units_matched"] == 5
+
+    def test_sold_lot_is_not_its_own_replacement(self):
+        bought = date(2026, 6, 1)
+        violations = _detect_wash_sales(
+            [self._sale(date(2026, 6, 15), units=10, lot_date=bought)],
+            [self._buy(bought, 10)],
+            2026,
+        )
+        assert violations == []
+
+    def test_multi_year_range(self):
+        sales = [self._sale(date(y, 3, 1)) for y in (2023, 2024, 2025, 2026)]
+        purchases = [self._buy(date(y, 3, 10), 10) for y in (2023, 2024, 2025, 2026)]
+        violations = _detect_wash_sales(sales, purchases, 2024, 2025)
+        assert [v["sale_date"] for v in violations] == ["2024-03-01", "2025-03-01"]
+
+    def test_sweep_handles_large_trade_history(self):
+        import time
+
+        start = date(2016, 1, 1)
+        sales, purchases = [], []
+        for i in range(12000):
+            day = start + timedelta(days=i // 4)
+            symbol = f"SYM{(i // 2) % 20}"
+            if i % 2:
+                sales.append(self._sale(day, units=5, symbol=symbol))
+            else:
+                purchases.append(self._buy(day, 3, symbol=symbol))
+
+        began = time.perf_counter()
+        violations = _detect_wash_sales(sales, purchases, 2016, 2025)
+        assert time.perf_counter() - began < 1.0
+        assert violations
+        # Every replacement share is matched at most once
+        used = sum(v["replacement_units"] for v in violations)
+        assert used <= sum(p.units for p in purchases)
+
+
 class TestInvoiceGeneration:
     def test_generate_invoice_html(self):
         html = _generate_invoice_html(
@@ -923,6 +995,75 @@ class TestAddTransaction:
         assert '\\"Special\\"' in content
 
 
+class TestAddTransactions:
+    @pytest.fixture
+    def ledger_file(self, tmp_path, monkeypatch):
+        ledger_dir = tmp_path / "ledger"
+        ledger_dir.mkdir()
+        ledger_file = ledger_dir / "main.beancount"
+        ledger_file.write_text(
+            'include "transactions/*.beancount"\n'
+            "2025-01-01 open Assets:Bank:Checking USD\n"
+            "2025-01-01 open Expenses:Food USD\n"
+        )
+        monkeypatch.setenv("LEDGER_PATH", str(ledger_file))
+        return ledger_file
+
+    @staticmethod
+    def _item(day, year=2026, debit="Expenses:Food", amount="10.00"):
+        return {
+            "date": f"{year}-02-{day:02d}",
+            "payee": f"Store {day}",
+            "narration": "Groceries",
+            "debit": debit,
+            "credit": "Assets:Bank:Checking",
+            "amount": amount,
+        }
+
+    def _run(self, tmp_path, items):
+        path = tmp_path / "txns.json"
+        path.write_text(json.dumps(items))
+        return cmd_add_transactions(argparse.Namespace(ledger=None, file=str(path)))
+
+    def test_batch_validated_and_written_once(self, ledger_file, tmp_path):
+        items = [self._item(day) for day in range(1, 13)] + [self._item(1, year=2025)]
+        with patch(
+            "istota.skills.accounting._run_bean_check", side_effect=_run_bean_check,
+        ) as check:
+            result = self._run(tmp_path, items)
+
+        assert result["status"] == "ok", result
+        assert result["transaction_count"] == 13
+        assert check.call_count == 1
+        txn_dir = ledger_file.parent / "transactions"
+        assert (txn_dir / "2026.beancount").read_text().count("Store") == 12
+        assert (txn_dir / "2025.beancount").read_text().count("Store") == 1
+
+    def test_invalid_batch_writes_nothing(self, ledger_file, tmp_path):
+        items = [self._item(1), self._item(2, debit="Expenses:Unknown")]
+        result = self._run(tmp_path, items)
+        assert result["status"] == "error"
+        assert "validation failed" in result["error"]
+        assert any("Expenses:Unknown" in e for e in result["validation_errors"])
+        assert not (ledger_file.parent / "transactions").exists()
+
+    def test_bad_item_reported_with_position(self, ledger_file, tmp_path):
+        result = self._run(tmp_path, [self._item(1), self._item(2, amount="-5")])
+        assert result == {"status": "error", "error": "Transaction 2: Amount must be positive"}
+        result = self._run(tmp_path, [{"date": "2026-02-01"}])
+        assert result["error"].startswith("Transaction 1: missing payee")
+
+    def test_not_a_list(self, ledger_file, tmp_path):
+        result = self._run(tmp_path, {"date": "2026-02-01"})
+        assert result["status"] == "error"
+
+    def test_single_add_rejected_without_writing(self, ledger_file):
+        args = argparse.Namespace(ledger=None, **self._item(1, debit="Expenses:Unknown"), currency="USD")
+        result = cmd_add_transaction(args)
+        assert result["status"] == "error"
+        assert not (ledger_file.parent / "transactions").exists()
+
+
 class TestCLIMain:
     @patch("istota.skills.accounting._get_ledger_path")
     @patch("istota.skills.accounting._run_bean_check")
@@ -1518,6 +1659,66 @@ class TestDeduplicationFunctions:
             # Different user can't see it
             assert is_content_hash_synced(conn, "user2", "hash-csv") is False
 
+    def test_get_synced_monarch_transaction_ids(self, tmp_path):
+        from istota.db import (
+            get_db,
+            get_synced_monarch_transaction_ids,
+            init_db,
+            track_monarch_transactions_batch,
+        )
+
+        db_path = tmp_path / "test.db"
+        init_db(db_path)
+
+        with get_db(db_path) as conn:
+            track_monarch_transactions_batch(conn, "user1", [{"id": "a"}, {"id": "b"}])
+            track_monarch_transactions_batch(conn, "user2", [{"id": "c"}])
+
+            assert get_synced_monarch_transaction_ids(
+                conn, "user1", ["a", "b", "c", "d"],
+            ) == {"a", "b"}
+            assert get_synced_monarch_transaction_ids(conn, "user1", []) == set()
+
+    def test_get_synced_content_hashes(self, tmp_path):
+        from istota.db import (
+            get_db,
+            get_synced_content_hashes,
+            init_db,
+            track_csv_transactions_batch,
+            track_monarch_transactions_batch,
+        )
+
+        db_path = tmp_path / "test.db"
+        init_db(db_path)
+
+        with get_db(db_path) as conn:
+            assert track_csv_transactions_batch(conn, "user1", ["h-csv", "h-both"], "f.csv") == 2
+            track_monarch_transactions_batch(conn, "user1", [
+                {"id": "t1", "content_hash": "h-monarch"},
+                {"id": "t2", "content_hash": "h-both"},
+            ])
+            track_csv_transactions_batch(conn, "user2", ["h-other"])
+
+            assert get_synced_content_hashes(
+                conn, "user1", ["h-csv", "h-monarch", "h-both", "h-other", "h-new"],
+            ) == {"h-csv", "h-monarch", "h-both"}
+
+    def test_bulk_lookup_not_limited_by_sql_variables(self, tmp_path):
+        from istota.db import (
+            get_db,
+            get_synced_monarch_transaction_ids,
+            init_db,
+            track_monarch_transactions_batch,
+        )
+
+        db_path = tmp_path / "test.db"
+        init_db(db_path)
+        ids = [f"txn-{i}" for i in range(40000)]
+
+        with get_db(db_path) as conn:
+            track_monarch_transactions_batch(conn, "user1", [{"id": i} for i in ids[::2]])
+            assert len(get_synced_monarch_transaction_ids(conn, "user1", ids)) == 20000
+
 
 class TestParseLedgerTransactions:
     """Tests for _parse_ledger_transactions() ledger scanning."""
@@ -1693,7 +1894,7 @@ class TestAppendToLedgerNoRestart:
         ledger = tmp_path / "main.beancount"
         ledger.write_text("2026-01-01 open Assets:Bank USD\n")
 
-        with patch("istota.skills.accounting.subprocess.run") as mock_run:
+        with patch("subprocess.run") as mock_run:
             _append_to_ledger(ledger, ["2026-01-15 * \"Test\" \"\"\n  Expenses:Test  1 USD\n  Assets:Bank"])
             mock_run.assert_not_called()
 
@@ -1810,7 +2011,263 @@ class TestDeferredTracking:
         assert data["monarch_category_updates"][0]["posted_account"] == "Expenses:Entertainment"
 
 
+class FakeMonarch:
+    """In-memory stand-in for the Monarch Money client that counts requests."""
+
+    def __init__(self, transactions):
+        self.transactions = {txn["id"]: txn for txn in transactions}
+        self.requests = {"get_transactions": 0, "get_transaction_details": 0}
+        self.windows = []
+        self.in_flight = {name: 0 for name in self.requests}
+        self.max_in_flight = {name: 0 for name in self.requests}
+
+    async def _request(self, name):
+        import asyncio
+
+        self.requests[name] += 1
+        self.in_flight[name] += 1
+        self.max_in_flight[name] = max(self.max_in_flight[name], self.in_flight[name])
+        await asyncio.sleep(0)
+        self.in_flight[name] -= 1
+
+    async def get_transactions(self, limit=100, offset=0, start_date=None, end_date=None):
+        await self._request("get_transactions")
+        self.windows.append((start_date, end_date))
+        matches = sorted(
+            (t for t in self.transactions.values() if start_date <= t["date"] <= end_date),
+            key=lambda t: t["date"],
+            reverse=True,
+        )
+        return {"allTransactions": {
+            "totalCount": len(matches),
+            "results": matches[offset:offset + limit],
+        }}
+
+    async def get_transaction_details(self, transaction_id):
+        await self._request("get_transaction_details")
+        if transaction_id not in self.transactions:
+            raise RuntimeError(f"Transaction {transaction_id} not found")
+        return {"getTransaction": self.transactions[transaction_id]}
+
+
+def _monarch_txn(i, days_ago=1, tags=(), category="Groceries"):
+    return {
+        "id": f"txn-{i}",
+        "date": (date.today() - timedelta(days=days_ago)).isoformat(),
+        "amount": -(i + 1),
+        "merchant": {"name": f"Shop {i}"},
+        "category": {"name": category},
+        "account": {"displayName": "Checking"},
+        "tags": [{"name": tag} for tag in tags],
+    }
+
+
+@pytest.fixture
+def monarch_env(tmp_path, monkeypatch):
+    from istota.db import init_db
+
+    config = tmp_path / "ACCOUNTING.md"
+    config.write_text('```toml\n[monarch]\nsession_token = "t"\n```\n')
+    ledger = tmp_path / "main.beancount"
+    ledger.write_text("")
+    db_path = tmp_path / "test.db"
+    init_db(db_path)
+    monkeypatch.setenv("ACCOUNTING_CONFIG", str(config))
+    monkeypatch.setenv("LEDGER_PATH", str(ledger))
+    monkeypatch.setenv("ISTOTA_DB_PATH", str(db_path))
+    monkeypatch.setenv("ISTOTA_USER_ID", "user1")
+    monkeypatch.delenv("ISTOTA_DEFERRED_DIR", raising=False)
+    return db_path
+
+
+def _run_sync(client, dry_run=False):
+    with patch(
+        "istota.skills.accounting._monarch_client",
+        new=AsyncMock(return_value=client),
+    ):
+        result = cmd_sync_monarch(argparse.Namespace(ledger=None, dry_run=dry_run))
+    assert result["status"] == "ok", result
+    return result
+
+
+class TestSyncMonarchDedup:
+    """cmd_sync_monarch dedups against the DB in bulk, not per transaction."""
+
+    @staticmethod
+    def _txns(n, start=0):
+        return [_monarch_txn(i) for i in range(start, start + n)]
+
+    def _sync(self, txns):
+        """Run a sync and return the SQL statements it executed."""
+        import istota.db
+        from contextlib import contextmanager
+
+        statements = []
+        real_get_db = istota.db.get_db
+
+        @contextmanager
+        def traced_get_db(path):
+            with real_get_db(path) as conn:
+                conn.set_trace_callback(statements.append)
+                yield conn
+
+        with patch("istota.db.get_db", traced_get_db):
+            result = _run_sync(FakeMonarch(txns))
+        return result, statements
+
+    def test_skips_synced_ids_and_hashes(self, monarch_env):
+        from istota.db import get_db, compute_transaction_hash, track_csv_transactions_batch
+
+        self._sync(self._txns(3))
+        with get_db(monarch_env) as conn:
+            # Same content arriving via CSV under a different Monarch ID
+            track_csv_transactions_batch(conn, "user1", [
+                compute_transaction_hash(_monarch_txn(4)["date"], 5.0, "Shop 4"),
+            ])
+        result, _ = self._sync(self._txns(6))
+        assert result["transaction_count"] == 2
+        assert result["skipped_count"] == 3
+        assert result["content_skipped_count"] == 1
+
+    def test_query_count_independent_of_transaction_count(self, monarch_env):
+        self._sync(self._txns(20))
+        _, small = self._sync(self._txns(40))
+        self._sync(self._txns(400, start=1000))
+        _, large = self._sync(self._txns(800, start=1000))
+        # Sync cost in the DB stays linear: a fixed number of lookups and
+        # write transactions, not one probe (or commit) per transaction
+        def shape(statements):
+            return [s.split()[0] for s in statements if s.split()[0] in ("SELECT", "BEGIN", "COMMIT")]
+
+        assert shape(small) == shape(large)
+        assert shape(large).count("SELECT") <= 4
+
+
+class TestSyncMonarchIncremental:
+    """cmd_sync_monarch only requests what changed since the last sync."""
+
+    @pytest.fixture
+    def business(self, monarch_env, tmp_path):
+        (tmp_path / "ACCOUNTING.md").write_text(
+            '```toml\n[monarch]\nsession_token = "t"\n'
+            '[monarch.tags]\ninclude = ["business"]\n```\n'
+        )
+        return monarch_env
+
+    @staticmethod
+    def _set_reconciled(db_path, hours_ago):
+        from datetime import datetime
+        from istota.db import get_db, get_monarch_sync_cursor, set_monarch_sync_cursor
+
+        with get_db(db_path) as conn:
+            cursor = get_monarch_sync_cursor(conn, "user1")
+            cursor["reconciled_at"] = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+            set_monarch_sync_cursor(conn, "user1", cursor)
+
+    def test_first_sync_pages_whole_lookback(self, monarch_env):
+        from istota.db import get_db, get_monarch_sync_cursor
+
+        client = FakeMonarch([_monarch_txn(i, days_ago=i % 30) for i in range(250)])
+        result = _run_sync(client)
+        assert result["transaction_count"] == 250
+        assert client.requests == {"get_transactions": 3, "get_transaction_details": 0}
+        assert client.windows[0][0] == (date.today() - timedelta(days=30)).isoformat()
+        with get_db(monarch_env) as conn:
+            cursor = get_monarch_sync_cursor(conn, "user1")
+        assert cursor["synced_through"] == date.today().isoformat()
+
+    def test_next_sync_requests_recent_window(self, monarch_env):
+        txns = [_monarch_txn(i, days_ago=i % 30) for i in range(250)]
+        _run_sync(FakeMonarch(txns))
+
+        client = FakeMonarch(txns + [_monarch_txn(999, days_ago=0)])
+        result = _run_sync(client)
+        assert result["transaction_count"] == 1
+        assert client.requests == {"get_transactions": 1, "get_transaction_details": 0}
+        assert client.windows == [(
+            (date.today() - timedelta(days=7)).isoformat(),
+            date.today().isoformat(),
+        )]
+
+    def test_dry_run_keeps_cursor(self, monarch_env):
+        from istota.db import get_db, get_monarch_sync_cursor
+
+        _run_sync(FakeMonarch([_monarch_txn(1)]), dry_run=True)
+        with get_db(monarch_env) as conn:
+            assert get_monarch_sync_cursor(conn, "user1") is None
+
+    def test_older_changes_wait_for_reconcile(self, business):
+        txns = [_monarch_txn(i, days_ago=10 + i, tags=["business"]) for i in range(20)]
+        _run_sync(FakeMonarch(txns))
+
+        txns[3]["tags"] = []
+        txns[5]["category"] = {"name": "Software"}
+        self._set_reconciled(business, hours_ago=1)
+        client = FakeMonarch(txns)
+        result = _run_sync(client)
+        assert client.requests["get_transaction_details"] == 0
+        assert result["recategorized_count"] == 0
+        assert result["category_changed_count"] == 0
+
+        self._set_reconciled(business, hours_ago=25)
+        client = FakeMonarch(txns)
+        result = _run_sync(client)
+        # One window request; every synced transaction older than the
+        # window is re-fetched by ID, a bounded number at a time
+        assert client.requests == {"get_transactions": 1, "get_transaction_details": 20}
+        assert 1 < client.max_in_flight["get_transaction_details"] <= 8
+        assert result["recategorized_count"] == 1
+        assert result["category_changed_count"] == 1
+
+        # The reconcile is recorded; the next sync is incremental again
+        client = FakeMonarch(txns)
+        _run_sync(client)
+        assert client.requests["get_transaction_details"] == 0
+
+    def test_missing_transactions_skipped(self, business):
+        txns = [_monarch_txn(i, days_ago=10 + i, tags=["business"]) for i in range(3)]
+        _run_sync(FakeMonarch(txns))
+        self._set_reconciled(business, hours_ago=25)
+
+        result = _run_sync(FakeMonarch(txns[1:]))
+        assert result["recategorized_count"] == 0
+
+
 class TestMonarchCategoryUpdateTracking:
+    def test_batch_updates(self, tmp_path):
+        from istota.db import (
+            get_active_monarch_synced_transactions,
+            get_db,
+            init_db,
+            mark_monarch_transactions_recategorized_batch,
+            track_monarch_transactions_batch,
+            update_monarch_transactions_posted_account_batch,
+        )
+
+        db_path = tmp_path / "test.db"
+        init_db(db_path)
+
+        with get_db(db_path) as conn:
+            track_monarch_transactions_batch(conn, "user1", [
+                {"id": f"txn-{i}", "posted_account": "Expenses:Old"} for i in range(4)
+            ])
+            assert mark_monarch_transactions_recategorized_batch(
+                conn, "user1", ["txn-0", "txn-1", "txn-missing"],
+            ) == 2
+            assert update_monarch_transactions_posted_account_batch(conn, "user1", [
+                {"monarch_transaction_id": "txn-0", "posted_account": "Expenses:New"},
+                {"monarch_transaction_id": "txn-2", "posted_account": "Expenses:New"},
+            ]) == 1  # txn-0 is already recategorized
+
+            active = get_active_monarch_synced_transactions(conn, "user1")
+            assert {t.monarch_transaction_id: t.posted_account for t in active} == {
+                "txn-2": "Expenses:New",
+                "txn-3": "Expenses:Old",
+            }
+            # Restricted to a fetch window
+            window = get_active_monarch_synced_transactions(conn, "user1", ["txn-1", "txn-3"])
+            assert [t.monarch_transaction_id for t in window] == ["txn-3"]
+
     def test_update_monarch_transaction_posted_account(self, tmp_path):
         from istota.db import (
             get_db,
@@ -0,0 +1,296 @@
+"""Tests for the in-process accounting ledger engine and its cache."""
+
+import csv
+import io
+import os
+import shutil
+import subprocess
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from istota.skills.accounting import ledger as ledger_engine
+from istota.skills.accounting import _parse_transactions_for_wash_sales
+
+_MAIN = """\
+option "operating_currency" "USD"
+include "transactions/*.beancount"
+
+2025-01-01 open Assets:Bank:Checking USD
+2025-01-01 open Assets:Brokerage
+2025-01-01 open Expenses:Food USD
+2025-01-01 open Income:Salary USD
+2025-01-01 open Income:CapGains USD
+"""
+
+_TXNS = """\
+2025-01-05 * "Employer" "Pay"
+  Assets:Bank:Checking  5000.00 USD
+  Income:Salary
+
+2025-02-01 * "Broker" "Buy AAPL"
+  Assets:Brokerage  10 AAPL {150.00 USD}
+  Assets:Bank:Checking
+
+2025-06-01 * "Broker" "Sell AAPL at a loss"
+  Assets:Brokerage  -5 AAPL {150.00 USD} @ 120.00 USD
+  Assets:Bank:Checking  600.00 USD
+  Income:CapGains
+
+2025-06-20 * "Broker" "Buy AAPL again"
+  Assets:Brokerage  3 AAPL {118.00 USD}
+  Assets:Bank:Checking
+"""
+
+_FOOD = """
+2025-03-03 * "Store" "Food"
+  Expenses:Food  12.34 USD
+  Assets:Bank:Checking
+"""
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_CACHE_DIR", str(tmp_path / "cache"))
+    ledger_engine.clear_cache()
+    (tmp_path / "transactions").mkdir()
+    (tmp_path / "transactions" / "2025.beancount").write_text(_TXNS)
+    main = tmp_path / "main.beancount"
+    main.write_text(_MAIN)
+    yield main
+    ledger_engine.clear_cache()
+
+
+def _count_full_loads():
+    return patch.object(
+        ledger_engine.loader, "_parse_recursive",
+        side_effect=ledger_engine.loader._parse_recursive,
+    )
+
+
+def _balances(path):
+    rows = ledger_engine.query_rows(
+        path, "SELECT account, sum(position) GROUP BY account ORDER BY account",
+    )
+    return {r["account"]: r["sum(position)"] for r in rows}
+
+
+class TestLoadCache:
+    def test_unchanged_ledger_loaded_once(self, ledger):
+        with _count_full_loads() as full:
+            first = ledger_engine.load_ledger(ledger)
+            second = ledger_engine.load_ledger(ledger)
+        assert first is second
+        assert full.call_count == 1
+
+    def test_includes_tracked(self, ledger):
+        loaded = ledger_engine.load_ledger(ledger)
+        assert str(ledger.parent / "transactions" / "2025.beancount") in loaded.files
+
+    def test_touched_file_not_reparsed(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        st = ledger.stat()
+        os.utime(ledger, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with _count_full_loads() as full:
+            ledger_engine.load_ledger(ledger)
+        assert full.call_count == 0
+
+    def test_append_is_incremental(self, ledger):
+        txns = ledger.parent / "transactions" / "2025.beancount"
+        ledger_engine.load_ledger(ledger)
+        with open(txns, "a") as f:
+            f.write(_FOOD)
+        with _count_full_loads() as full:
+            loaded = ledger_engine.load_ledger(ledger)
+        assert full.call_count == 0
+        assert _balances(ledger)["Expenses:Food"].get_currency_units("USD").number == Decimal("12.34")
+        food = [e for e in loaded.entries if getattr(e, "narration", "") == "Food"][0]
+        # Line numbers point into the whole file, not the appended tail
+        assert food.meta["filename"] == str(txns)
+        assert txns.read_text().splitlines()[food.meta["lineno"] - 1].startswith("2025-03-03")
+
+    def test_append_books_only_new_entries_without_lots(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        with open(ledger, "a") as f:
+            f.write(_FOOD)
+        with patch.object(ledger_engine.booking, "book", side_effect=ledger_engine.booking.book) as book:
+            ledger_engine.load_ledger(ledger)
+        assert len(book.call_args[0][0]) == 1
+
+    def test_append_touching_lots_rebooks_everything(self, ledger):
+        loaded = ledger_engine.load_ledger(ledger)
+        with open(ledger, "a") as f:
+            f.write('\n2025-07-01 * "Broker" "Sell rest"\n  Assets:Brokerage  -5 AAPL {150.00 USD}\n  Assets:Bank:Checking\n')
+        with patch.object(ledger_engine.booking, "book", side_effect=ledger_engine.booking.book) as book:
+            updated = ledger_engine.load_ledger(ledger)
+        assert len(book.call_args[0][0]) == len(loaded.parsed_entries) + 1
+        assert updated.errors == []
+
+    def test_append_with_error_reported(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        with open(ledger, "a") as f:
+            f.write('\n2025-04-01 * "Shop" "Bad"\n  Expenses:Nope  1.00 USD\n  Assets:Bank:Checking\n')
+        errors = ledger_engine.check_ledger(ledger)
+        assert len(errors) == 1
+        assert "Expenses:Nope" in errors[0]
+
+    def test_edit_triggers_full_reload(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        txns = ledger.parent / "transactions" / "2025.beancount"
+        txns.write_text(_TXNS.replace("5000.00", "4000.00"))
+        with _count_full_loads() as full:
+            ledger_engine.load_ledger(ledger)
+        assert full.call_count == 1
+        assert _balances(ledger)["Income:Salary"].get_currency_units("USD").number == Decimal("-4000.00")
+
+    def test_appended_include_triggers_full_reload(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        (ledger.parent / "food.beancount").write_text(_FOOD)
+        with open(ledger, "a") as f:
+            f.write('include "food.beancount"\n')
+        with _count_full_loads() as full:
+            ledger_engine.load_ledger(ledger)
+        assert full.call_count == 1
+        assert "Expenses:Food" in _balances(ledger)
+
+    def test_new_glob_match_picked_up(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        (ledger.parent / "transactions" / "2026.beancount").write_text(_FOOD)
+        assert "Expenses:Food" in _balances(ledger)
+
+    def test_missing_ledger_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="not found"):
+            ledger_engine.load_ledger(tmp_path / "nope.beancount")
+
+
+class TestDiskCache:
+    def test_reused_across_processes(self, ledger, tmp_path):
+        ledger_engine.load_ledger(ledger)
+        ledger_engine.clear_cache()  # as in a fresh CLI process
+        with _count_full_loads() as full:
+            ledger_engine.load_ledger(ledger)
+        assert full.call_count == 0
+        (cache_file,) = (tmp_path / "cache").iterdir()
+        assert cache_file.stat().st_mode & 0o777 == 0o600
+
+    def test_append_after_restart_is_incremental(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        ledger_engine.clear_cache()
+        with open(ledger.parent / "transactions" / "2025.beancount", "a") as f:
+            f.write(_FOOD)
+        with _count_full_loads() as full:
+            assert "Expenses:Food" in _balances(ledger)
+        assert full.call_count == 0
+
+    def test_other_beancount_version_ignored(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        ledger_engine.clear_cache()
+        with patch.object(ledger_engine, "_beancount_version", "0.0.0"), _count_full_loads() as full:
+            ledger_engine.load_ledger(ledger)
+        assert full.call_count == 1
+
+    def test_unwritable_cache_dir_ignored(self, ledger, monkeypatch):
+        monkeypatch.setenv("LEDGER_CACHE_DIR", "/proc/no-such-dir")
+        assert ledger_engine.load_ledger(ledger).entries
+
+
+class TestCheckStaged:
+    def test_valid_text_has_no_errors(self, ledger):
+        staged = {ledger.parent / "transactions" / "2025.beancount": _FOOD}
+        assert ledger_engine.check_staged(ledger, staged) == []
+
+    def test_reports_only_new_errors(self, ledger):
+        with open(ledger, "a") as f:
+            f.write('\n2025-04-01 * "Old" "Bad"\n  Expenses:Old  1.00 USD\n  Assets:Bank:Checking\n')
+        bad = '\n2025-04-02 * "New" "Bad"\n  Expenses:Unknown  1.00 USD\n  Assets:Bank:Checking\n'
+        errors = ledger_engine.check_staged(ledger, {ledger: bad})
+        assert len(errors) == 1
+        assert "Expenses:Unknown" in errors[0]
+        # Line numbers point where the text will land once appended
+        assert f"{ledger}:{len(ledger.read_text().splitlines()) + 2}:" in errors[0]
+
+    def test_nothing_written_or_cached(self, ledger):
+        before = ledger.read_text()
+        entries = len(ledger_engine.load_ledger(ledger).entries)
+        ledger_engine.check_staged(ledger, {ledger: _FOOD})
+        assert ledger.read_text() == before
+        assert len(ledger_engine.load_ledger(ledger).entries) == entries
+        assert "Expenses:Food" not in _balances(ledger)
+
+    def test_new_file_matching_include_glob(self, ledger):
+        staged = {ledger.parent / "transactions" / "2026.beancount": _FOOD.replace("Expenses:Food", "Expenses:Nope")}
+        assert len(ledger_engine.check_staged(ledger, staged)) == 1
+
+    def test_file_outside_ledger_ignored(self, ledger):
+        staged = {ledger.parent / "imports" / "x.beancount": "2025-01-01 * garbage\n"}
+        assert ledger_engine.check_staged(ledger, staged) == []
+
+    def test_batch_checked_in_one_pass(self, ledger):
+        ledger_engine.load_ledger(ledger)
+        text = "".join(_FOOD.replace("03-03", f"03-{day:02d}") for day in range(1, 21))
+        with _count_full_loads() as full, patch.object(
+            ledger_engine.validation, "validate", side_effect=ledger_engine.validation.validate,
+        ) as validate:
+            assert ledger_engine.check_staged(ledger, {ledger: text}) == []
+        full.assert_not_called()
+        assert validate.call_count == 1
+
+    def test_structural_text_rejected(self, ledger):
+        with pytest.raises(ValueError):
+            ledger_engine.check_staged(ledger, {ledger: 'include "other.beancount"\n'})
+
+
+class TestQueries:
+    def test_rows_are_typed(self, ledger):
+        rows = ledger_engine.query_rows(
+            ledger, "SELECT date, units(position), cost(position) WHERE currency = 'AAPL' ORDER BY date",
+        )
+        assert rows[0]["date"] == date(2025, 2, 1)
+        assert rows[0]["units(position)"].number == Decimal("10")
+        assert rows[0]["cost(position)"].number == Decimal("1500.00")
+
+    def test_invalid_query_raises_value_error(self, ledger):
+        with pytest.raises(ValueError):
+            ledger_engine.query_rows(ledger, "SELECT nonsense_column")
+
+    @pytest.mark.skipif(shutil.which("bean-query") is None, reason="bean-query CLI not installed")
+    def test_text_rows_match_bean_query_csv(self, ledger):
+        query = "SELECT account, units(position), cost(position), cost_date WHERE currency = 'AAPL' ORDER BY account, cost_date"
+        out = subprocess.run(
+            ["bean-query", str(ledger), query, "-f", "csv"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        expected = [dict(r) for r in csv.DictReader(io.StringIO(out))]
+        assert ledger_engine.query_text_rows(ledger, query) == expected
+
+
+class TestWashSaleRows:
+    def test_sales_and_purchases_from_typed_rows(self, ledger):
+        sales, purchases = _parse_transactions_for_wash_sales(ledger, 2025)
+        assert len(sales) == 1
+        sale = sales[0]
+        assert sale.date == date(2025, 6, 1)
+        assert sale.symbol == "AAPL"
+        assert sale.units == 5.0
+        assert sale.proceeds == 600.0
+        assert sale.cost_basis == 750.0
+        assert sale.gain_loss == -150.0
+        assert sale.lot_date == date(2025, 2, 1)
+        assert [(p.date, p.units) for p in purchases] == [
+            (date(2025, 2, 1), 10.0), (date(2025, 6, 20), 3.0),
+        ]
+
+    def test_cmd_reports_partial_replacement(self, ledger, monkeypatch):
+        from argparse import Namespace
+        from istota.skills.accounting import cmd_wash_sales
+
+        monkeypatch.setenv("LEDGER_PATH", str(ledger))
+        result = cmd_wash_sales(Namespace(ledger=None, year=2024, end_year=2025))
+        assert result["end_year"] == 2025
+        (violation,) = result["violations"]
+        # 3 of the 5 shares sold were bought back 19 days later
+        assert violation["replacement_units"] == 3.0
+        assert violation["disallowed_loss"] == 90.0
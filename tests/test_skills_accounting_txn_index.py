@@ -0,0 +1,139 @@
+"""Tests for the persisted ledger transaction-hash index."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from istota.db import compute_transaction_hash
+from istota.skills.accounting import txn_index
+
+
+def _txn(day: int, amount: str, payee: str) -> str:
+    return (
+        f'2026-01-{day:02d} * "{payee}" "Memo"\n'
+        f"  Expenses:Misc  {amount} USD\n"
+        "  Assets:Bank\n"
+    )
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "main.beancount"
+    path.write_text(_txn(1, "10.00", "A") + "\n" + _txn(2, "20.00", "B"))
+    return path
+
+
+def _scanned():
+    """Patch scan_hashes to record the text it is handed."""
+    return patch.object(txn_index, "scan_hashes", side_effect=txn_index.scan_hashes)
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestScanHashes:
+    def test_amount_taken_from_own_block(self):
+        text = (
+            '2026-01-01 * "No Amount" "Memo"\n'
+            "  Assets:Bank\n"
+            "\n"
+            + _txn(2, "5.00", "Next")
+        )
+        assert txn_index.scan_hashes(text) == {
+            compute_transaction_hash("2026-01-02", 5.00, "Next"),
+        }
+
+    def test_first_posting_amount_used(self):
+        text = (
+            '2026-01-01 * "Split" "Memo"\n'
+            "  Expenses:Food  30.00 USD\n"
+            "  Expenses:Misc  70.00 USD\n"
+            "  Assets:Bank  -100.00 USD\n"
+        )
+        assert txn_index.scan_hashes(text) == {
+            compute_transaction_hash("2026-01-01", 30.00, "Split"),
+        }
+
+    def test_linear_in_ledger_size(self):
+        def timed(n):
+            text = "\n".join(_txn(1 + i % 28, f"{i}.00", f"P{i}") for i in range(n))
+            start = time.perf_counter()
+            assert len(txn_index.scan_hashes(text)) == n
+            return time.perf_counter() - start
+
+        timed(500)  # warm up
+        small, large = timed(2000), timed(16000)
+        # Quadratic scanning would be ~64x slower; allow generous noise
+        assert large < small * 24
+
+
+class TestFileIndex:
+    def test_hashes_file(self, ledger):
+        assert txn_index.file_hashes(ledger) == {
+            compute_transaction_hash("2026-01-01", 10.00, "A"),
+            compute_transaction_hash("2026-01-02", 20.00, "B"),
+        }
+
+    def test_unchanged_file_not_read(self, ledger):
+        first = txn_index.file_hashes(ledger)
+        with _scanned() as scan, patch.object(type(ledger), "read_bytes") as read:
+            assert txn_index.file_hashes(ledger) == first
+        read.assert_not_called()
+        scan.assert_not_called()
+
+    def test_append_scanned_from_offset(self, ledger):
+        txn_index.file_hashes(ledger)
+        with open(ledger, "a") as f:
+            f.write("\n" + _txn(3, "30.00", "C"))
+        with _scanned() as scan:
+            hashes = txn_index.file_hashes(ledger)
+        assert len(hashes) == 3
+        assert compute_transaction_hash("2026-01-03", 30.00, "C") in hashes
+        scanned = "".join(call.args[0] for call in scan.call_args_list)
+        assert '"A"' not in scanned
+
+    def test_posting_appended_to_last_block(self, ledger):
+        ledger.write_text('2026-01-01 * "A" "Memo"\n')
+        assert txn_index.file_hashes(ledger) == set()
+        with open(ledger, "a") as f:
+            f.write("  Expenses:Misc  10.00 USD\n  Assets:Bank\n")
+        assert txn_index.file_hashes(ledger) == {
+            compute_transaction_hash("2026-01-01", 10.00, "A"),
+        }
+
+    def test_edit_rescans_whole_file(self, ledger):
+        txn_index.file_hashes(ledger)
+        ledger.write_text(ledger.read_text().replace("10.00", "11.00"))
+        _bump_mtime(ledger)
+        hashes = txn_index.file_hashes(ledger)
+        assert compute_transaction_hash("2026-01-01", 11.00, "A") in hashes
+        assert compute_transaction_hash("2026-01-01", 10.00, "A") not in hashes
+
+    def test_truncated_file_rescanned(self, ledger):
+        txn_index.file_hashes(ledger)
+        ledger.write_text(_txn(1, "10.00", "A"))
+        assert txn_index.file_hashes(ledger) == {
+            compute_transaction_hash("2026-01-01", 10.00, "A"),
+        }
+
+    def test_corrupt_index_ignored(self, ledger):
+        txn_index.file_hashes(ledger)
+        txn_index._index_path(ledger).write_text("{not json")
+        _bump_mtime(ledger)
+        assert len(txn_index.file_hashes(ledger)) == 2
+
+    def test_index_file_private(self, ledger):
+        txn_index.file_hashes(ledger)
+        assert txn_index._index_path(ledger).stat().st_mode & 0o777 == 0o600
+
+    def test_unwritable_cache_dir_ignored(self, ledger, monkeypatch):
+        monkeypatch.setenv("LEDGER_CACHE_DIR", "/proc/no-such-dir")
+        assert len(txn_index.file_hashes(ledger)) == 2
+
+    def test_missing_file(self, tmp_path):
+        assert txn_index.file_hashes(tmp_path / "nope.beancount") == set()
@@ -0,0 +1,123 @@
+"""Tests for batched ledger write sessions."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from istota.skills.accounting.write_session import LedgerWriteSession, backup_file
+
+
+def _txn(day: int, payee: str) -> str:
+    return f'2026-01-{day:02d} * "{payee}" "Memo"\n  Expenses:Misc  1.00 USD\n  Assets:Bank\n'
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "main.beancount"
+    path.write_text("2026-01-01 open Assets:Bank USD\n")
+    return path
+
+
+class TestLedgerWriteSession:
+    def test_commit_appends_to_each_file(self, ledger):
+        other = ledger.parent / "transactions" / "2026.beancount"
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        session.stage(_txn(3, "B"), other)
+        session.stage(_txn(4, "C"))
+        session.commit()
+
+        content = ledger.read_text()
+        assert content.startswith("2026-01-01 open Assets:Bank USD\n")
+        assert content.index('"A"') < content.index('"C"')
+        assert '"B"' in other.read_text()
+
+    def test_pending_is_text_to_append(self, ledger):
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        session.stage(_txn(3, "B"))
+        assert session.pending() == {ledger: f"\n{_txn(2, 'A')}\n{_txn(3, 'B')}"}
+
+    def test_one_backup_per_file(self, ledger):
+        original = ledger.read_text()
+        session = LedgerWriteSession(ledger)
+        for day in range(2, 14):
+            session.stage(_txn(day, f"P{day}"))
+        backups = session.commit()
+
+        assert len(backups) == 1
+        assert list((ledger.parent / "backups").iterdir()) == backups
+        assert backups[0].read_text() == original
+
+    def test_backup_is_link_to_replaced_file(self, ledger):
+        inode = ledger.stat().st_ino
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        (backup,) = session.commit()
+        assert backup.stat().st_ino == inode
+        assert ledger.stat().st_ino != inode
+
+    def test_backup_copied_without_links(self, ledger):
+        original = ledger.read_text()
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        with patch("os.link", side_effect=OSError("not supported")):
+            (backup,) = session.commit()
+        assert backup.read_text() == original
+
+    def test_mode_preserved(self, ledger):
+        os.chmod(ledger, 0o640)
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        session.commit()
+        assert ledger.stat().st_mode & 0o777 == 0o640
+
+    def test_failed_write_leaves_files_untouched(self, ledger):
+        original = ledger.read_text()
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        session.stage(_txn(3, "B"), ledger.parent / "transactions" / "2026.beancount")
+        real_open = open
+        calls = []
+
+        def failing_open(path, *args, **kwargs):
+            calls.append(path)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            return real_open(path, *args, **kwargs)
+
+        with patch("builtins.open", failing_open), pytest.raises(OSError):
+            session.commit()
+
+        assert ledger.read_text() == original
+        assert not (ledger.parent / "backups").exists()
+        assert not list(ledger.parent.rglob("*.tmp"))
+
+    def test_empty_commit_is_noop(self, ledger):
+        assert LedgerWriteSession(ledger).commit() == []
+        assert not (ledger.parent / "backups").exists()
+
+    def test_staged_cleared_after_commit(self, ledger):
+        session = LedgerWriteSession(ledger)
+        session.stage(_txn(2, "A"))
+        session.commit()
+        assert session.pending() == {}
+
+
+class TestBackupFile:
+    def test_missing_file(self, tmp_path):
+        assert backup_file(tmp_path / "nope.beancount") is None
+
+    def test_rotates(self, ledger):
+        backups_dir = ledger.parent / "backups"
+        backups_dir.mkdir()
+        for i in range(5):
+            (backups_dir / f"main.beancount.20260101_00000{i}").write_text("old")
+        backup_file(ledger, max_backups=3, timestamp="20260102_000000")
+        remaining = sorted(p.name for p in backups_dir.iterdir())
+        assert remaining == [
+            "main.beancount.20260101_000003",
+            "main.beancount.20260101_000004",
+            "main.beancount.20260102_000000",
+        ]
@@ -9,7 +9,7 @@ import pytest
 from istota.skills.calendar import (
     get_events, get_tomorrow_events, get_today_events,
     cmd_update, cmd_list, build_parser, main, _parse_datetime, _get_date_range,
-    update_event,
+    update_event, CalendarEvent, EventCache,
 )
 
 
@@ -329,3 +329,73 @@ class TestCmdListWeek:
         result = cmd_list(args)
         assert result["date"] == "week"
         assert result["status"] == "ok"
+
+
+class TestEventCache:
+    def _event(self, start, hours=1):
+        return CalendarEvent(uid="e1", summary="Standup", start=start, end=start + timedelta(hours=hours))
+
+    def _cache(self, tokens, events):
+        """EventCache with sync tokens and fetched events served from lists."""
+        token_patch = patch(
+            "istota.skills.calendar.get_calendar_sync_token", side_effect=tokens,
+        )
+        events_patch = patch("istota.skills.calendar.get_events", return_value=events)
+        return EventCache(), token_patch, events_patch
+
+    def test_unchanged_token_reuses_events(self):
+        now = datetime(2026, 3, 15, 9, 0)
+        cache, tokens, fetch = self._cache(["t1", "t1"], [self._event(now)])
+        with tokens, fetch as mock_get:
+            first = cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=24))
+            second = cache.get_events(
+                MagicMock(), "https://cal/1", now + timedelta(minutes=5), now + timedelta(hours=24),
+            )
+        assert mock_get.call_count == 1
+        assert first == second == [self._event(now)]
+        # Fetched range is whole days
+        assert mock_get.call_args.args[2:] == (datetime(2026, 3, 15), datetime(2026, 3, 17))
+
+    def test_changed_token_refetches(self):
+        now = datetime(2026, 3, 15, 9, 0)
+        cache, tokens, fetch = self._cache(["t1", "t2"], [])
+        with tokens, fetch as mock_get:
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+        assert mock_get.call_count == 2
+
+    def test_range_outside_cached_days_refetches(self):
+        now = datetime(2026, 3, 15, 9, 0)
+        cache, tokens, fetch = self._cache(["t1", "t1"], [])
+        with tokens, fetch as mock_get:
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(days=3))
+        assert mock_get.call_count == 2
+
+    def test_without_token_uses_max_age(self):
+        now = datetime(2026, 3, 15, 9, 0)
+        cache, tokens, fetch = self._cache([None, None, None], [])
+        with tokens, fetch as mock_get:
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+            assert mock_get.call_count == 1
+            cache.max_age = 0
+            cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=2))
+        assert mock_get.call_count == 2
+
+    def test_filters_to_requested_range(self):
+        now = datetime(2026, 3, 15, 9, 0)
+        early = self._event(datetime(2026, 3, 15, 7, 0))
+        later = self._event(datetime(2026, 3, 15, 13, 0))
+        cache, tokens, fetch = self._cache(["t1"], [early, later])
+        with tokens, fetch:
+            result = cache.get_events(MagicMock(), "https://cal/1", now, now + timedelta(hours=6))
+        assert result == [later]
+
+    @patch("istota.skills.calendar.get_calendars_for_user")
+    def test_calendar_list_cached(self, mock_cals):
+        mock_cals.return_value = [("Work", "https://cal/1", True)]
+        cache = EventCache()
+        assert cache.calendars_for_user(MagicMock(), "alice") == [("Work", "https://cal/1", True)]
+        cache.calendars_for_user(MagicMock(), "alice")
+        assert mock_cals.call_count == 1
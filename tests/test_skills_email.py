@@ -17,7 +17,11 @@ from istota.skills.email import (
     _sanitize_header,
     cmd_output,
     cmd_send,
+    fetch_emails,
+    fetch_newsletters,
+    folder_uid_status,
     list_emails,
+    list_new_envelopes,
     main,
     read_email,
     reply_to_email,
@@ -214,6 +218,132 @@ class TestEmailOperations:
             list_emails(config=None)
 
 
+# --- fetch_newsletters tests ---
+
+
+class TestFetchNewsletters:
+    def _recent(self, hours_ago=1):
+        from email.utils import format_datetime
+        from datetime import timedelta
+
+        return format_datetime(datetime.now(timezone.utc) - timedelta(hours=hours_ago))
+
+    def _headers(self):
+        return [
+            _make_mock_message(uid="3", from_="daily@semafor.com", date_str=self._recent(),
+                               headers={"message-id": ("<c@semafor.com>",)}),
+            _make_mock_message(uid="2", from_="bob@example.com", date_str=self._recent(),
+                               headers={"message-id": ("<b@example.com>",)}),
+            _make_mock_message(uid="1", from_="news@semafor.com", date_str=self._recent(48),
+                               headers={"message-id": ("<a@semafor.com>",)}),
+        ]
+
+    def _mailbox(self, mock_get_mb, bodies):
+        mock_mb = _make_mock_mailbox()
+        mock_mb.fetch.side_effect = lambda *a, **kw: (
+            iter(bodies) if kw.get("uid_list") else iter(self._headers())
+        )
+        mock_get_mb.return_value = mock_mb
+        return mock_mb
+
+    @patch("istota.skills.email._get_mailbox")
+    def test_headers_then_one_body_fetch(self, mock_get_mb, email_config):
+        mock_mb = self._mailbox(mock_get_mb, [_make_mock_message(uid="3", text="Story")])
+        sources = [{"type": "domain", "value": "semafor.com"}]
+
+        result = fetch_newsletters(sources, 12, config=email_config)
+
+        assert [e.id for e in result] == ["3"]
+        assert result[0].body == "Story"
+        assert result[0].message_id == "<c@semafor.com>"
+        mock_mb.login.assert_called_once()
+        headers_call, body_call = mock_mb.fetch.call_args_list
+        assert headers_call.kwargs["headers_only"] is True
+        assert headers_call.kwargs["bulk"] is True
+        assert body_call.kwargs == {"uid_list": ["3"], "mark_seen": False, "bulk": True}
+
+    @patch("istota.skills.email._get_mailbox")
+    def test_skip_body_avoids_download(self, mock_get_mb, email_config):
+        mock_mb = self._mailbox(mock_get_mb, [])
+        sources = [{"type": "email", "value": "daily@semafor.com"}]
+
+        result = fetch_newsletters(
+            sources, 12, config=email_config,
+            skip_body=lambda message_id: message_id == "<c@semafor.com>",
+        )
+
+        assert [e.id for e in result] == ["3"]
+        assert result[0].body == ""
+        assert mock_mb.fetch.call_count == 1
+
+    def test_no_sources(self, email_config):
+        assert fetch_newsletters([], config=email_config) == []
+
+
+class TestPollingSession:
+    def test_folder_uid_status(self):
+        mock_mb = _make_mock_mailbox()
+        mock_mb.folder.status.return_value = {"UIDVALIDITY": 7, "UIDNEXT": 42}
+        assert folder_uid_status(mock_mb, "INBOX") == (7, 42)
+        mock_mb.folder.status.assert_called_once_with("INBOX", ["UIDVALIDITY", "UIDNEXT"])
+
+    def test_list_new_envelopes_headers_only(self):
+        mock_mb = _make_mock_mailbox([
+            _make_mock_message(uid="12", headers={
+                "message-id": ("<b@x.com>",), "references": ("<a@bot.com>",),
+            }),
+            _make_mock_message(uid="11"),
+        ])
+
+        envelopes = list_new_envelopes(mock_mb, min_uid=11, limit=50)
+
+        assert [e.id for e in envelopes] == ["11", "12"]
+        assert envelopes[1].message_id == "<b@x.com>"
+        assert envelopes[1].references == "<a@bot.com>"
+        kwargs = mock_mb.fetch.call_args.kwargs
+        assert kwargs["headers_only"] is True
+        assert kwargs["mark_seen"] is False
+        assert kwargs["limit"] == 50
+
+    def test_list_new_envelopes_drops_highest_uid_below_watermark(self):
+        # "20:*" matches the highest UID even when no message is that new
+        mock_mb = _make_mock_mailbox([_make_mock_message(uid="19")])
+        assert list_new_envelopes(mock_mb, min_uid=20) == []
+
+    def test_list_new_envelopes_without_watermark_lists_newest(self):
+        mock_mb = _make_mock_mailbox([_make_mock_message(uid="9"), _make_mock_message(uid="8")])
+        envelopes = list_new_envelopes(mock_mb, limit=2)
+        assert [e.id for e in envelopes] == ["8", "9"]
+        assert mock_mb.fetch.call_args.kwargs["reverse"] is True
+
+    def test_fetch_emails_saves_attachments_from_same_fetch(self, tmp_path):
+        att = MagicMock(filename="report.pdf", payload=b"%PDF")
+        mock_mb = _make_mock_mailbox([
+            _make_mock_message(uid="5", text="See attached", attachments=[att]),
+        ])
+
+        results = list(fetch_emails(mock_mb, ["5"], attachment_dir=lambda uid: tmp_path / uid))
+
+        ((email, paths),) = results
+        assert email.body == "See attached"
+        assert email.attachments == ["report.pdf"]
+        assert paths == [tmp_path / "5" / "report.pdf"]
+        assert paths[0].read_bytes() == b"%PDF"
+        mock_mb.fetch.assert_called_once_with(uid_list=["5"], mark_seen=False)
+
+    def test_fetch_emails_strips_attachment_path_components(self, tmp_path):
+        mock_mb = _make_mock_mailbox([
+            _make_mock_message(uid="5", attachments=[
+                MagicMock(filename="../../etc/report.pdf", payload=b"%PDF"),
+                MagicMock(filename="..", payload=b"x"),
+            ]),
+        ])
+
+        ((_, paths),) = fetch_emails(mock_mb, ["5"], attachment_dir=lambda uid: tmp_path / uid)
+
+        assert paths == [tmp_path / "5" / "report.pdf"]
+
+
 # --- _parse_email_date tests ---
 
 
@@ -9,11 +9,13 @@ import pytest
 from istota.config import Config, NextcloudConfig
 from istota.skills.files import (
     get_local_path,
+    list_dirs,
     list_files,
     mkdir,
     move_file,
     path_exists,
     rclone_list,
+    rclone_list_dirs,
     rclone_mkdir,
     rclone_move,
     rclone_path_exists,
@@ -124,7 +126,75 @@ class TestMountFileOps:
 # --- Rclone file operations ---
 
 
+    def test_list_dirs(self, mount_config):
+        mount = mount_config.nextcloud_mount_path
+        (mount / "a").mkdir()
+        (mount / "a" / "x.md").write_text("hello")
+        (mount / "a" / "nested").mkdir()
+
+        listed = list_dirs(mount_config, ["/a", "/missing"])
+
+        assert list(listed) == ["/a"]
+        assert [item["name"] for item in listed["/a"]] == ["x.md"]
+        assert listed["/a"][0]["size"] == 5
+        assert listed["/a"][0]["mod_time"]
+
+
 class TestRcloneFileOps:
+    @patch("istota.skills.files.subprocess.run")
+    def test_rclone_list_dirs(self, mock_run):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps([
+                {"Path": "alice/cfg/TASKS.md", "Size": 10, "ModTime": "2025-01-01T00:00:00Z"},
+                {"Path": "bob/cfg/TASKS.md", "Size": 20, "ModTime": "2025-01-02T00:00:00Z"},
+                {"Path": "bob/cfg/old/TASKS.md", "Size": 1, "ModTime": ""},
+            ]),
+        )
+
+        listed = rclone_list_dirs("nextcloud", ["/Users/alice/cfg", "/Users/bob/cfg"])
+
+        assert listed["/Users/alice/cfg"] == [
+            {"name": "TASKS.md", "size": 10, "mod_time": "2025-01-01T00:00:00Z", "is_dir": False},
+        ]
+        assert [item["size"] for item in listed["/Users/bob/cfg"]] == [20]
+        mock_run.assert_called_once_with(
+            [
+                "rclone", "lsjson", "-R", "--files-only", "nextcloud:/Users",
+                "--max-depth", "3",
+                "--include", "/alice/cfg/*", "--include", "/bob/cfg/*",
+            ],
+            capture_output=True, text=True,
+        )
+
+    @patch("istota.skills.files.subprocess.run")
+    def test_rclone_list_dirs_missing_root(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=3, stderr="directory not found")
+
+        assert rclone_list_dirs("nextcloud", ["/Users/alice/cfg"]) == {}
+        mock_run.assert_called_once()
+
+    @patch("istota.skills.files.subprocess.run")
+    def test_rclone_list_dirs_error_falls_back_per_directory(self, mock_run):
+        mock_run.side_effect = [
+            MagicMock(returncode=1, stderr="permission denied"),
+            MagicMock(returncode=0, stdout=json.dumps([
+                {"Name": "TASKS.md", "Size": 10, "ModTime": "2025-01-01T00:00:00Z"},
+                {"Name": "old", "IsDir": True},
+            ])),
+            MagicMock(returncode=1, stderr="permission denied"),
+            MagicMock(returncode=3, stderr="directory not found"),
+        ]
+
+        listed = rclone_list_dirs(
+            "nextcloud", ["/Users/alice/cfg", "/Users/bob/cfg", "/Users/carol/cfg"],
+        )
+
+        assert listed == {"/Users/alice/cfg": [
+            {"name": "TASKS.md", "size": 10, "mod_time": "2025-01-01T00:00:00Z", "is_dir": False},
+        ]}
+        assert mock_run.call_args_list[1][0][0] == ["rclone", "lsjson", "nextcloud:/Users/alice/cfg"]
+
     @patch("istota.skills.files.subprocess.run")
     def test_rclone_list(self, mock_run):
         mock_run.return_value = MagicMock(
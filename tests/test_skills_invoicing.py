@@ -1,6 +1,9 @@
 """Tests for skills/invoicing.py module."""
 
+import importlib.util
 import json
+import os
+import time
 from datetime import date
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -17,7 +20,9 @@ from istota.skills.accounting.invoicing import (
     WorkEntry,
     _embed_logo,
     _extract_toml_from_markdown,
+    _render_workers,
     _resolve_nc_path,
+    _stamp_work_log_field,
     build_line_items,
     compute_income_lines,
     create_income_posting,
@@ -27,8 +32,10 @@ from istota.skills.accounting.invoicing import (
     generate_invoice_html,
     generate_invoices_for_period,
     group_entries_by_bundle,
+    load_work_log,
     parse_invoicing_config,
     parse_work_log,
+    render_invoice_pdfs,
     resolve_bank_account,
     resolve_currency,
     resolve_entity,
@@ -137,6 +144,12 @@ description = "January work"
 """
 
 
+@pytest.fixture(autouse=True)
+def inline_rendering(monkeypatch):
+    """Render PDFs in-process so patches of generate_invoice_pdf apply."""
+    monkeypatch.setenv("INVOICE_RENDER_WORKERS", "1")
+
+
 class TestExtractToml:
     def test_extract_single_block(self):
         md = "# Config\n\n```toml\nkey = \"value\"\n```\n"
@@ -798,6 +811,20 @@ class TestGenerateInvoiceHtml:
 
         assert result.startswith("data:image/svg+xml;base64,")
 
+    def test_html_uses_preembedded_logo_uri(self):
+        invoice = self._make_invoice()
+        html = generate_invoice_html(invoice, logo_uri="data:image/png;base64,AAAA")
+
+        assert 'src="data:image/png;base64,AAAA"' in html
+
+    def test_html_without_inline_css(self):
+        invoice = self._make_invoice()
+
+        assert "<style>" in generate_invoice_html(invoice)
+        html = generate_invoice_html(invoice, inline_css=False)
+        assert "<style>" not in html
+        assert "TestCo" in html
+
 
 class TestCreateIncomePosting:
     def test_basic_posting(self):
@@ -907,6 +934,55 @@ class TestComputeIncomeLines:
         assert lines == {"Income:Consulting": 1500.00}
 
 
+class TestRenderInvoicePdfs:
+    def test_render_workers_bounded(self, monkeypatch):
+        monkeypatch.delenv("INVOICE_RENDER_WORKERS")
+        with patch("os.cpu_count", return_value=16):
+            assert _render_workers(10) == 4
+            assert _render_workers(2) == 2
+        monkeypatch.setenv("INVOICE_RENDER_WORKERS", "8")
+        assert _render_workers(20) == 8
+        monkeypatch.setenv("INVOICE_RENDER_WORKERS", "bogus")
+        assert _render_workers(20) == 1
+
+    @patch("istota.skills.accounting.invoicing.generate_invoice_pdf")
+    def test_returns_times_in_order(self, mock_pdf, tmp_path):
+        jobs = [(f"<p>{i}</p>", tmp_path / f"{i}.pdf") for i in range(3)]
+        times = render_invoice_pdfs(jobs)
+        assert len(times) == 3
+        assert [c.args for c in mock_pdf.call_args_list] == jobs
+
+    def test_failure_removes_rendered_pdfs(self, tmp_path):
+        def fake_render(html, path):
+            if html == "bad":
+                raise RuntimeError("render failed")
+            path.write_bytes(b"%PDF")
+
+        jobs = [("ok", tmp_path / "a.pdf"), ("bad", tmp_path / "b.pdf")]
+        with patch("istota.skills.accounting.invoicing.generate_invoice_pdf", side_effect=fake_render):
+            with pytest.raises(RuntimeError):
+                render_invoice_pdfs(jobs)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_process_pool_error_propagates(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("INVOICE_RENDER_WORKERS", "2")
+        unwritable = Path("/proc/no-such-dir")
+        jobs = [("<p>1</p>", unwritable / "1.pdf"), ("<p>2</p>", unwritable / "2.pdf")]
+        # ImportError without weasyprint, OSError from the output dir with it
+        with pytest.raises((ImportError, OSError)):
+            render_invoice_pdfs(jobs)
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("weasyprint") is None, reason="weasyprint not installed",
+    )
+    def test_process_pool_renders_pdfs(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("INVOICE_RENDER_WORKERS", "2")
+        jobs = [(f"<p>Invoice {i}</p>", tmp_path / f"{i}.pdf") for i in range(3)]
+        times = render_invoice_pdfs(jobs)
+        assert all(t > 0 for t in times)
+        assert all(path.read_bytes().startswith(b"%PDF") for _html, path in jobs)
+
+
 class TestUpdateInvoiceNumber:
     def test_update_number(self, tmp_path):
         config_file = tmp_path / "INVOICING.md"
@@ -1356,6 +1432,59 @@ invoice = "INV-000042"
         entries = parse_work_log(log_file)
         assert entries[0].paid_date == date(2026, 2, 15)
 
+    @patch("istota.skills.accounting._run_bean_check")
+    @patch("istota.skills.accounting._get_ledger_path")
+    def test_cmd_invoice_paid_validation_failure(self, mock_ledger_path, mock_check, tmp_path, monkeypatch):
+        monkeypatch.delenv("NEXTCLOUD_MOUNT_PATH", raising=False)
+        from istota.skills.accounting import cmd_invoice_paid
+
+        config_file = tmp_path / "INVOICING.md"
+        config_text = SAMPLE_CONFIG_TOML.replace(
+            'accounting_path = "/accounting"',
+            f'accounting_path = "{tmp_path / "accounting"}"',
+        ).replace(
+            'work_log = "/notes/_INVOICES.md"',
+            f'work_log = "{tmp_path / "_INVOICES.md"}"',
+        )
+        config_file.write_text(config_text)
+        monkeypatch.setenv("INVOICING_CONFIG", str(config_file))
+
+        log_file = tmp_path / "_INVOICES.md"
+        log_text = """\
+# Work Log
+
+```toml
+[[entries]]
+date = 2026-02-01
+client = "acme"
+service = "consulting"
+qty = 10
+invoice = "INV-000042"
+```
+"""
+        log_file.write_text(log_text)
+
+        ledger_file = tmp_path / "main.beancount"
+        ledger_file.write_text("")
+        mock_ledger_path.return_value = ledger_file
+        mock_check.return_value = (False, ["Invalid account"])
+
+        args = MagicMock()
+        args.invoice_number = "INV-000042"
+        args.date = "2026-02-15"
+        args.bank = None
+        args.no_post = False
+
+        result = cmd_invoice_paid(args)
+
+        assert result["status"] == "error"
+        assert "not recorded" in result["error"]
+        # The posting was validated as pending, not written first
+        pending = mock_check.call_args[0][1]
+        assert "Payment for INV-000042" in pending[ledger_file]
+        assert ledger_file.read_text() == ""
+        assert log_file.read_text() == log_text
+
     def test_cmd_invoice_paid_not_found(self, tmp_path, monkeypatch):
         from istota.skills.accounting import cmd_invoice_paid
 
@@ -1887,6 +2016,24 @@ class TestMultiEntityInvoiceGeneration:
             html = call[0][0]
             assert "data:image/png;base64," in html
 
+    @patch("istota.skills.accounting.invoicing.generate_invoice_pdf")
+    def test_logo_embedded_once_per_run(self, mock_pdf, tmp_path, monkeypatch):
+        monkeypatch.delenv("NEXTCLOUD_MOUNT_PATH", raising=False)
+        config_file = self._setup(tmp_path)
+        config = parse_invoicing_config(config_file)
+        logo = tmp_path / "accounting" / "invoices" / "assets" / "logo-personal.png"
+        logo.parent.mkdir(parents=True, exist_ok=True)
+        logo.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+        with patch(
+            "istota.skills.accounting.invoicing._embed_logo", side_effect=_embed_logo,
+        ) as embed:
+            generate_invoices_for_period(config=config, config_path=config_file, period="2026-02")
+
+        # Two invoices for the personal entity share one embedded logo
+        assert embed.call_count == 1
+        assert sum("data:image/png;base64," in c.args[0] for c in mock_pdf.call_args_list) == 2
+
     @patch("istota.skills.accounting.invoicing.generate_invoice_pdf")
     def test_no_ledger_entries_multi_entity(self, mock_pdf, tmp_path, monkeypatch):
         monkeypatch.delenv("NEXTCLOUD_MOUNT_PATH", raising=False)
@@ -2284,6 +2431,89 @@ class TestSelectUninvoicedEntries:
         assert result == []
 
 
+def _large_work_log(n: int) -> str:
+    blocks = [
+        f'[[entries]]\ndate = {2016 + i // 600}-{1 + i % 12:02d}-{1 + i % 28:02d}\n'
+        f'client = "{"acme" if i % 3 else "beta"}"\nservice = "consulting"\nqty = 1\n'
+        + (f'invoice = "INV-{i // 10:06d}"\n' if i % 2 else "")
+        for i in range(n)
+    ]
+    return "# Work Log\n\n```toml\n" + "\n".join(blocks) + "```\n"
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+class TestWorkLogIndex:
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        path = tmp_path / "_INVOICES.md"
+        path.write_text(_large_work_log(300))
+        return path
+
+    @pytest.mark.parametrize("period", [None, "2016-06", "2016-12"])
+    @pytest.mark.parametrize("client", [None, "acme", "nobody"])
+    def test_uninvoiced_matches_linear_selection(self, log_file, period, client):
+        entries = parse_work_log(log_file)
+        expected = select_uninvoiced_entries(entries, period, client)
+        assert load_work_log(log_file).uninvoiced(period, client) == expected
+
+    def test_lookups(self, log_file):
+        index = load_work_log(log_file)
+        pairs = index.invoice_entries("INV-000001")
+        assert [idx for idx, _ in pairs] == [11, 13, 15, 17, 19]
+        assert all(e.invoice == "INV-000001" for _, e in pairs)
+        assert all(index.entries[i].client == "beta" for i in index.by_client["beta"])
+        assert index.invoice_entries("INV-999999") == []
+
+    def test_unchanged_log_parsed_once(self, log_file):
+        load_work_log(log_file)
+        _age(log_file)
+        with patch(
+            "istota.skills.accounting.invoicing._parse_work_log_text",
+        ) as parse:
+            load_work_log(log_file)
+            load_work_log(log_file)
+        parse.assert_not_called()
+
+    def test_touched_log_not_reparsed(self, log_file):
+        load_work_log(log_file)
+        os.utime(log_file)
+        with patch(
+            "istota.skills.accounting.invoicing._parse_work_log_text",
+        ) as parse:
+            load_work_log(log_file)
+        parse.assert_not_called()
+
+    def test_edit_invalidates(self, log_file):
+        first = load_work_log(log_file)
+        # Same size, same mtime tick: caught by the content hash
+        log_file.write_text(log_file.read_text().replace('"beta"', '"gama"'))
+        second = load_work_log(log_file)
+        assert second is not first
+        assert "gama" in second.by_client
+
+    def test_stamping_is_single_pass_and_single_write(self, tmp_path):
+        path = tmp_path / "_INVOICES.md"
+        path.write_text(_large_work_log(6000))
+        stamps = {idx: ("paid_date", "2026-03-01") for idx in range(0, 6000, 2)}
+
+        real_write = Path.write_text
+        with patch.object(Path, "write_text", autospec=True, side_effect=real_write) as write:
+            began = time.perf_counter()
+            _stamp_work_log_field(path, stamps)
+            elapsed = time.perf_counter() - began
+        assert write.call_count == 1
+        assert elapsed < 1.0
+
+        entries = parse_work_log(path)
+        assert all(
+            (e.paid_date is not None) == (idx % 2 == 0) for idx, e in enumerate(entries)
+        )
+
+
 class TestStampWorkLogEntries:
     def test_stamp_single_entry(self, tmp_path):
         work_log = tmp_path / "_INVOICES.md"
@@ -2566,6 +2796,48 @@ class TestGenerateInvoicesStamping:
         assert len(results) > 0
 
 
+    def test_render_failure_commits_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("NEXTCLOUD_MOUNT_PATH", raising=False)
+        config_file = self._setup(tmp_path)
+        config = parse_invoicing_config(config_file)
+        log_file = tmp_path / "_INVOICES.md"
+        log_before = log_file.read_text()
+
+        calls = []
+
+        def fake_render(html, path):
+            calls.append(path)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"%PDF")
+
+        with patch("istota.skills.accounting.invoicing.generate_invoice_pdf", side_effect=fake_render):
+            with pytest.raises(OSError):
+                generate_invoices_for_period(config=config, config_path=config_file, period="2026-02")
+
+        assert log_file.read_text() == log_before
+        assert parse_invoicing_config(config_file).next_invoice_number == 42
+        assert not calls[0].exists()
+
+    @patch("istota.skills.accounting.invoicing.generate_invoice_pdf")
+    def test_render_times_reported(self, mock_pdf, tmp_path, monkeypatch):
+        monkeypatch.delenv("NEXTCLOUD_MOUNT_PATH", raising=False)
+        config_file = self._setup(tmp_path)
+        config = parse_invoicing_config(config_file)
+
+        results = generate_invoices_for_period(config=config, config_path=config_file, period="2026-02")
+
+        assert all(r["render_seconds"] >= 0 for r in results)
+        # Numbers follow group order regardless of how rendering was scheduled
+        assert [r["invoice_number"] for r in results] == [
+            f"INV-{42 + i:06d}" for i in range(len(results))
+        ]
+        assert [c.args[1].name.split("-")[1] for c in mock_pdf.call_args_list] == [
+            f"{42 + i:06d}" for i in range(len(results))
+        ]
+
+
 class TestCLIPeriodOptional:
     def test_period_not_required(self):
         from istota.skills.accounting import build_parser
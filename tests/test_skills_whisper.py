@@ -8,12 +8,14 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from istota.skills.whisper import models as whisper_models
 from istota.skills.whisper.cli import (
     build_parser,
     cmd_download,
     cmd_models,
     cmd_transcribe,
     main,
+    serve,
 )
 from istota.skills.whisper.models import (
     MODEL_REQUIREMENTS,
@@ -23,7 +25,10 @@ from istota.skills.whisper.models import (
     _get_max_model,
     _is_model_downloaded,
     download_model,
+    evict_models,
+    get_model,
     list_models,
+    resident_models,
     select_model,
 )
 from istota.skills.whisper.transcribe import (
@@ -33,6 +38,13 @@ from istota.skills.whisper.transcribe import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _empty_model_pool():
+    whisper_models._pool.clear()
+    yield
+    whisper_models._pool.clear()
+
+
 # --- Model selection tests ---
 
 
@@ -331,6 +343,101 @@ class TestTranscribeAudio:
         assert call_kwargs[1]["language"] == "de"
 
 
+# --- Model pool tests ---
+
+
+def _fake_faster_whisper():
+    mock_fw = MagicMock()
+    mock_fw.WhisperModel.side_effect = lambda *a, **kw: MagicMock(name=f"model-{a[0]}")
+    return mock_fw
+
+
+@patch("istota.skills.whisper.models.get_available_memory_gb", return_value=20.0)
+class TestModelPool:
+    def test_model_loaded_once_and_reused(self, mock_mem):
+        mock_fw = _fake_faster_whisper()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            with get_model("tiny") as first:
+                pass
+            with get_model("tiny") as second:
+                pass
+        assert first is second
+        mock_fw.WhisperModel.assert_called_once_with("tiny", device="cpu", compute_type="int8")
+        assert resident_models() == {"tiny"}
+
+    def test_keyed_by_compute_type(self, mock_mem):
+        mock_fw = _fake_faster_whisper()
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            with get_model("tiny", "int8") as a, get_model("tiny", "float32") as b:
+                assert a is not b
+        assert mock_fw.WhisperModel.call_count == 2
+
+    def test_idle_eviction_skips_recent_and_in_use(self, mock_mem):
+        with patch.dict("sys.modules", {"faster_whisper": _fake_faster_whisper()}):
+            with get_model("tiny"):
+                pass
+            whisper_models._pool[("tiny", "int8")].last_used -= 1000
+            with get_model("base"):
+                with get_model("small"):
+                    whisper_models._pool[("small", "int8")].last_used -= 1000
+                    assert evict_models(idle_seconds=600) == ["tiny"]
+        assert resident_models() == {"base", "small"}
+        assert sorted(evict_models()) == ["base", "small"]
+
+    def test_idle_seconds_zero_disables_pool(self, mock_mem):
+        mock_fw = _fake_faster_whisper()
+        with patch.dict("os.environ", {"WHISPER_MODEL_IDLE_SECONDS": "0"}), \
+                patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            with get_model("tiny"):
+                pass
+            with get_model("tiny"):
+                pass
+        assert mock_fw.WhisperModel.call_count == 2
+        assert resident_models() == set()
+
+    def test_loading_evicts_lru_when_ram_short(self, mock_mem):
+        with patch.dict("sys.modules", {"faster_whisper": _fake_faster_whisper()}):
+            with get_model("tiny"):
+                pass
+            with get_model("base"):
+                pass
+            whisper_models._pool[("tiny", "int8")].last_used -= 10
+            # Each eviction frees ~1 GB in this fake
+            mock_mem.side_effect = [2.0, 3.0]
+            with get_model("small"):
+                pass
+        assert resident_models() == {"base", "small"}
+
+    def test_resident_model_always_fits(self, mock_mem):
+        with patch.dict("sys.modules", {"faster_whisper": _fake_faster_whisper()}):
+            with get_model("small"):
+                pass
+        mock_mem.return_value = 0.5
+        assert select_model("small") == "small"
+        assert select_model() == "small"
+
+    def test_resident_memory_counts_as_available(self, mock_mem):
+        with patch.dict("sys.modules", {"faster_whisper": _fake_faster_whisper()}):
+            with get_model("base"):
+                pass
+        # 1.5 free + 1.5 held by base covers small (2.5 + 0.3)
+        mock_mem.return_value = 1.5
+        assert select_model("small") == "small"
+
+    def test_transcribe_audio_reuses_pooled_model(self, mock_mem, tmp_path):
+        audio = tmp_path / "voice.ogg"
+        audio.write_bytes(b"fake audio")
+        mock_model = MagicMock()
+        mock_model.transcribe.side_effect = lambda *a, **kw: (iter([_make_mock_segment(0.0, 1.0, "hi")]), _make_mock_info())
+        mock_fw = MagicMock()
+        mock_fw.WhisperModel.return_value = mock_model
+        with patch.dict("sys.modules", {"faster_whisper": mock_fw}):
+            results = [transcribe_audio(str(audio), model="tiny") for _ in range(3)]
+        assert [r["text"] for r in results] == ["hi"] * 3
+        mock_fw.WhisperModel.assert_called_once()
+        assert mock_model.transcribe.call_count == 3
+
+
 # --- Format tests ---
 
 
@@ -542,3 +649,24 @@ class TestMain:
         captured = capsys.readouterr()
         output = json.loads(captured.out)
         assert output["status"] == "ok"
+
+
+class TestServe:
+    @patch("istota.skills.whisper.cli.cmd_transcribe")
+    def test_returns_proxy_response(self, mock_cmd):
+        mock_cmd.return_value = {"status": "ok", "text": "hello"}
+        resp = serve(["transcribe", "/tmp/a.wav", "--output", "text"])
+        assert resp["returncode"] == 0
+        assert json.loads(resp["stdout"])["text"] == "hello"
+        assert mock_cmd.call_args[0][0].output == "text"
+
+    @patch("istota.skills.whisper.cli.cmd_transcribe")
+    def test_error_result_exit_1(self, mock_cmd):
+        mock_cmd.side_effect = RuntimeError("decoder crashed")
+        resp = serve(["transcribe", "/tmp/a.wav"])
+        assert resp["returncode"] == 1
+        assert "decoder crashed" in resp["stdout"]
+
+    def test_bad_args_returns_none(self, capsys):
+        assert serve(["transcribe"]) is None
+        assert capsys.readouterr().err == ""
@@ -5,6 +5,10 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 from zoneinfo import ZoneInfo
 
+import os
+import threading
+import time
+
 import pytest
 
 from istota import db
@@ -16,6 +20,7 @@ from istota.sleep_cycle import (
     process_user_sleep_cycle,
     cleanup_old_memory_files,
     check_sleep_cycles,
+    SleepCycleRunner,
     build_curation_prompt,
     curate_user_memory,
     NO_NEW_MEMORIES,
@@ -196,6 +201,89 @@ class TestGatherDayData:
         assert "Conversation" not in result
 
 
+    def test_salient_tasks_survive_budget(self, mount_config, db_path):
+        """When tasks overflow the budget, briefings are dropped before conversation."""
+        with db.get_db(db_path) as conn:
+            for i in range(120):
+                t = db.create_task(
+                    conn, prompt=f"briefing {i}", user_id="alice", source_type="briefing",
+                )
+                db.update_task_status(conn, t, "running")
+                db.update_task_status(conn, t, "completed", result="z" * 2000)
+            t = db.create_task(
+                conn, prompt="Remember I moved to Lisbon", user_id="alice", source_type="talk",
+            )
+            db.update_task_status(conn, t, "running")
+            db.update_task_status(conn, t, "completed", result="Noted, Lisbon it is.")
+
+            result = gather_day_data(mount_config, conn, "alice", 24, None)
+
+        assert "Remember I moved to Lisbon" in result
+        assert "Noted, Lisbon it is." in result
+        assert len(result) <= MAX_DAY_DATA_CHARS
+
+    def test_short_tasks_leave_room_for_long_one(self, mount_config, db_path):
+        """Budget unused by short tasks goes to the ones that need it."""
+        with db.get_db(db_path) as conn:
+            t = db.create_task(conn, prompt="Draft the plan", user_id="alice")
+            db.update_task_status(conn, t, "running")
+            db.update_task_status(conn, t, "completed", result="p" * 30000)
+            for i in range(30):
+                t2 = db.create_task(conn, prompt=f"task {i}", user_id="alice")
+                db.update_task_status(conn, t2, "running")
+                db.update_task_status(conn, t2, "completed", result=f"result {i}")
+
+            result = gather_day_data(mount_config, conn, "alice", 24, None)
+
+        # An even split would have cut the long result to ~1.6k chars
+        assert "p" * 30000 in result
+        assert "truncated" not in result
+        assert "result 29" in result
+
+
+class TestStreamExcerpts:
+    def test_sql_slices_match_excerpt(self, db_path):
+        from istota.sleep_cycle import _excerpt, _excerpt_bounds
+
+        texts = ["", "short", "a" * 39 + "b" * 40, "head " + "x" * 3000 + " tail", "é" * 700]
+        with db.get_db(db_path) as conn:
+            ids = []
+            for text in texts:
+                t = db.create_task(conn, prompt=text or "p", user_id="alice")
+                db.update_task_status(conn, t, "running")
+                db.update_task_status(conn, t, "completed", result=text)
+                ids.append(t)
+
+            for budget in (10, 50, 100, 600):
+                slices = {
+                    t: (*_excerpt_bounds(1, 1), *_excerpt_bounds(len(text), budget))
+                    for t, text in zip(ids, texts)
+                }
+                rows = list(db.iter_task_text_slices(conn, slices))
+                assert [row[0] for row in rows] == ids
+                for (_, _, _, head, tail), text in zip(rows, texts):
+                    streamed = head + ("\n...[truncated]...\n" + tail if tail else "")
+                    assert streamed == _excerpt(text, budget)
+
+
+    def test_task_info_and_latest_id(self, db_path):
+        with db.get_db(db_path) as conn:
+            ids = []
+            for user, token in (("alice", "room1"), ("bob", "room1"), ("alice", None)):
+                t = db.create_task(conn, prompt="hello", user_id=user, conversation_token=token)
+                db.update_task_status(conn, t, "running")
+                db.update_task_status(conn, t, "completed", result="done!")
+                ids.append(t)
+            since = (datetime.now(ZoneInfo("UTC")) - timedelta(hours=1)).replace(tzinfo=None).isoformat()
+
+            infos = db.get_completed_task_info(conn, since, user_id="alice")
+            assert [(i.id, i.prompt_chars, i.result_chars) for i in infos] == [
+                (ids[0], 5, 5), (ids[2], 5, 5),
+            ]
+            assert db.get_latest_completed_task_id(conn, since, conversation_token="room1") == ids[1]
+            assert db.get_latest_completed_task_id(conn, since, ids[2], user_id="alice") is None
+
+
 class TestBuildMemoryExtractionPrompt:
     def test_includes_user_id(self):
         prompt = build_memory_extraction_prompt("alice", "some data", None, "2026-01-28")
@@ -462,6 +550,176 @@ class TestCheckSleepCycles:
         assert result == []
 
 
+    def test_records_finished_run(self, mount_config, db_path):
+        mount_config.sleep_cycle = SleepCycleConfig(enabled=True, cron="* * * * *")
+        mount_config.users = {"alice": UserConfig(display_name="Alice", timezone="UTC")}
+
+        with db.get_db(db_path) as conn:
+            with patch("istota.sleep_cycle.process_user_sleep_cycle", return_value=True):
+                check_sleep_cycles(conn, mount_config)
+            run = db.get_sleep_cycle_run(conn, "alice")
+
+        assert run["status"] == "done"
+        assert run["pid"] == os.getpid()
+
+    def test_skips_cycle_running_in_live_process(self, mount_config, db_path):
+        mount_config.sleep_cycle = SleepCycleConfig(enabled=True, cron="* * * * *")
+        mount_config.users = {"alice": UserConfig(display_name="Alice", timezone="UTC")}
+        started = datetime.now(ZoneInfo("UTC")).replace(tzinfo=None).isoformat()
+
+        with db.get_db(db_path) as conn:
+            # Parent process stands in for another live scheduler
+            db.set_sleep_cycle_run(conn, "alice", {
+                "status": "running", "pid": os.getppid(), "started_at": started,
+            })
+            with patch("istota.sleep_cycle.process_user_sleep_cycle") as mock_process:
+                result = check_sleep_cycles(conn, mount_config)
+
+        assert result == []
+        mock_process.assert_not_called()
+
+    def test_reruns_cycle_interrupted_by_restart(self, mount_config, db_path):
+        mount_config.sleep_cycle = SleepCycleConfig(enabled=True, cron="* * * * *")
+        mount_config.users = {"alice": UserConfig(display_name="Alice", timezone="UTC")}
+        started = datetime.now(ZoneInfo("UTC")).replace(tzinfo=None).isoformat()
+
+        with db.get_db(db_path) as conn:
+            with patch("os.kill", side_effect=ProcessLookupError):
+                db.set_sleep_cycle_run(conn, "alice", {
+                    "status": "running", "pid": 999999, "started_at": started,
+                })
+                with patch("istota.sleep_cycle.process_user_sleep_cycle", return_value=True):
+                    result = check_sleep_cycles(conn, mount_config)
+
+        assert result == ["alice"]
+
+    def test_failed_run_recorded(self, mount_config, db_path):
+        mount_config.sleep_cycle = SleepCycleConfig(enabled=True, cron="* * * * *")
+        mount_config.users = {"alice": UserConfig(display_name="Alice", timezone="UTC")}
+
+        with db.get_db(db_path) as conn:
+            with patch("istota.sleep_cycle.process_user_sleep_cycle", side_effect=RuntimeError("boom")):
+                check_sleep_cycles(conn, mount_config)
+            assert db.get_sleep_cycle_run(conn, "alice")["status"] == "failed"
+
+
+class TestSleepCycleRunner:
+    @pytest.fixture
+    def config(self, mount_config, db_path):
+        mount_config.db_path = db_path
+        mount_config.sleep_cycle = SleepCycleConfig(
+            enabled=True, cron="* * * * *", max_concurrent=2,
+        )
+        mount_config.channel_sleep_cycle.enabled = False
+        mount_config.users = {
+            name: UserConfig(display_name=name, timezone="UTC")
+            for name in ("alice", "bob", "carol")
+        }
+        return mount_config
+
+    def test_schedule_does_not_wait_for_cycles(self, config, db_path):
+        release = threading.Event()
+        runner = SleepCycleRunner(config)
+        try:
+            with patch(
+                "istota.sleep_cycle.process_user_sleep_cycle",
+                side_effect=lambda *a: release.wait(5),
+            ):
+                with db.get_db(db_path) as conn:
+                    submitted = runner.schedule(conn)
+                assert sorted(submitted) == ["alice", "bob", "carol"]
+                assert runner.running() == ["alice", "bob", "carol"]
+                release.set()
+        finally:
+            runner._executor.shutdown(wait=True)
+        assert runner.running() == []
+
+    def test_concurrency_limited(self, config, db_path):
+        lock = threading.Lock()
+        active = []
+        peak = []
+        release = threading.Event()
+
+        def process(cfg, conn, user_id):
+            with lock:
+                active.append(user_id)
+                peak.append(len(active))
+            release.wait(5)
+            with lock:
+                active.remove(user_id)
+            return True
+
+        runner = SleepCycleRunner(config)
+        try:
+            with patch("istota.sleep_cycle.process_user_sleep_cycle", side_effect=process):
+                with db.get_db(db_path) as conn:
+                    runner.schedule(conn)
+                deadline = time.monotonic() + 5
+                while len(active) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                time.sleep(0.05)
+                assert len(active) == 2
+                release.set()
+                runner._executor.shutdown(wait=True)
+        finally:
+            runner.shutdown()
+        assert max(peak) == 2
+        assert len(peak) == 3
+
+    def test_in_flight_cycle_not_resubmitted(self, config, db_path):
+        release = threading.Event()
+        runner = SleepCycleRunner(config)
+        try:
+            with patch(
+                "istota.sleep_cycle.process_user_sleep_cycle",
+                side_effect=lambda *a: release.wait(5),
+            ) as mock_process:
+                with db.get_db(db_path) as conn:
+                    runner.schedule(conn)
+                    assert runner.schedule(conn) == []
+                release.set()
+                runner._executor.shutdown(wait=True)
+        finally:
+            runner.shutdown()
+        assert mock_process.call_count == 3
+
+    def test_runs_on_own_connection(self, config, db_path):
+        runner = SleepCycleRunner(config, max_workers=1)
+        config.users = {"alice": config.users["alice"]}
+        seen = []
+        try:
+            with patch(
+                "istota.sleep_cycle.process_user_sleep_cycle",
+                side_effect=lambda cfg, conn, user_id: seen.append(conn) or True,
+            ):
+                with db.get_db(db_path) as conn:
+                    runner.schedule(conn)
+                    runner._executor.shutdown(wait=True)
+        finally:
+            runner.shutdown()
+        assert seen and seen[0] is not conn
+        with db.get_db(db_path) as conn:
+            assert db.get_sleep_cycle_run(conn, "alice")["status"] == "done"
+
+    def test_cycles_not_due_are_not_reevaluated(self, config, db_path):
+        config.sleep_cycle.cron = "0 2 * * *"
+        runner = SleepCycleRunner(config)
+        try:
+            with db.get_db(db_path) as conn:
+                for user_id in config.users:
+                    db.set_sleep_cycle_last_run(conn, user_id, None)
+                with patch(
+                    "istota.sleep_cycle.db.get_sleep_cycle_last_run",
+                    wraps=db.get_sleep_cycle_last_run,
+                ) as mock_last_run:
+                    assert runner.schedule(conn) == []
+                    assert runner.schedule(conn) == []
+        finally:
+            runner.shutdown()
+        # Fire times computed once per user, then held in the runner's index
+        assert mock_last_run.call_count == 3
+
+
 # ---------------------------------------------------------------------------
 # TestMemoryProvenance
 # ---------------------------------------------------------------------------
@@ -1,15 +1,22 @@
 """Tests for stream_parser module."""
 
 import json
+import time
+from pathlib import Path
+from unittest.mock import patch
 
+from istota import stream_parser
 from istota.stream_parser import (
     ResultEvent,
     TextEvent,
     ToolUseEvent,
     _describe_tool_use,
     parse_stream_line,
+    peek_event_type,
 )
 
+FIXTURE = Path(__file__).parent / "fixtures" / "stream_json_session.jsonl"
+
 
 # --- _describe_tool_use tests ---
 
@@ -279,3 +286,94 @@ class TestFullStream:
         assert isinstance(events[3], ResultEvent)
         assert events[3].success is True
         assert events[3].text == "Here is the summary of your files."
+
+
+# --- Fast-path pre-classifier ---
+
+
+def _huge_tool_result_line(size: int) -> str:
+    return json.dumps({
+        "type": "user",
+        "message": {
+            "role": "user",
+            "content": [{"tool_use_id": "t1", "type": "tool_result", "content": "x" * size}],
+        },
+    })
+
+
+class TestPeekEventType:
+    def test_reads_leading_type(self):
+        assert peek_event_type('{"type":"user","message":{}}') == "user"
+        assert peek_event_type('  { "type" : "result", "subtype": "success"}\n') == "result"
+
+    def test_type_not_first_key(self):
+        assert peek_event_type('{"subtype":"init","type":"system"}') is None
+
+    def test_nested_type_not_matched(self):
+        assert peek_event_type('{"message":{"type":"assistant"}}') is None
+
+    def test_non_json(self):
+        assert peek_event_type("not json") is None
+        assert peek_event_type("") is None
+
+
+class TestFastPath:
+    def test_user_lines_skip_decode(self):
+        line = _huge_tool_result_line(1000)
+        with patch.object(stream_parser, "_loads") as mock_loads:
+            assert parse_stream_line(line) is None
+        mock_loads.assert_not_called()
+
+    def test_system_lines_skip_decode(self):
+        line = json.dumps({"type": "system", "subtype": "init"})
+        with patch.object(stream_parser, "_loads") as mock_loads:
+            assert parse_stream_line(line) is None
+        mock_loads.assert_not_called()
+
+    def test_type_not_first_still_parsed(self):
+        line = json.dumps({"subtype": "success", "result": "done", "type": "result"})
+        event = parse_stream_line(line)
+        assert isinstance(event, ResultEvent)
+        assert event.text == "done"
+
+    def test_non_object_json_ignored(self):
+        assert parse_stream_line("[1, 2, 3]") is None
+
+    def test_recorded_fixture(self):
+        events = [parse_stream_line(line) for line in FIXTURE.read_text().splitlines()]
+        events = [e for e in events if e is not None]
+        assert [type(e) for e in events] == [ToolUseEvent, ToolUseEvent, TextEvent, ResultEvent]
+        assert events[0].description == "📄 Reading TODO.md"
+        assert events[1].description == "⚙️ List this week's events"
+        assert events[3].success is True
+
+    def test_fixture_matches_full_decode(self):
+        """Fast path yields the same events as decoding every line."""
+        lines = FIXTURE.read_text().splitlines()
+        fast = [parse_stream_line(line) for line in lines]
+        with patch.object(stream_parser, "peek_event_type", return_value=None):
+            slow = [parse_stream_line(line) for line in lines]
+        assert fast == slow
+
+
+class TestParseBenchmark:
+    """Micro-benchmark: recorded stream with multi-megabyte tool results."""
+
+    def test_large_tool_results_cheaper_than_decode(self):
+        lines = FIXTURE.read_text().splitlines()
+        big = _huge_tool_result_line(4 * 1024 * 1024)
+        stream = lines[:3] + [big] + lines[3:5] + [big] + lines[5:]
+
+        start = time.perf_counter()
+        for _ in range(5):
+            events = [parse_stream_line(line) for line in stream]
+        fast_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(5):
+            for line in stream:
+                json.loads(line)
+        decode_elapsed = time.perf_counter() - start
+
+        assert len([e for e in events if e is not None]) == 4
+        assert fast_elapsed < decode_elapsed / 5
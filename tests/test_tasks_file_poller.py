@@ -12,11 +12,13 @@ from istota.db import Task, IstotaFileTask, init_db
 from istota.tasks_file_poller import (
     TASKS_FILE_PATTERN,
     ParsedTask,
+    clear_file_states,
     compute_content_hash,
     discover_tasks_files,
     handle_tasks_file_completion,
     normalize_task_content,
     parse_tasks_file,
+    poll_all_tasks_files,
     poll_user_tasks_file,
     update_task_in_file,
 )
@@ -25,6 +27,14 @@ from istota.tasks_file_poller import (
 # --- Fixtures ---
 
 
+@pytest.fixture(autouse=True)
+def _fresh_file_states():
+    """Change detection state is per process; start each test without it."""
+    clear_file_states()
+    yield
+    clear_file_states()
+
+
 @pytest.fixture
 def db_path(tmp_path):
     """Create and initialize a temporary SQLite database."""
@@ -423,36 +433,135 @@ class TestHandleTasksFileCompletion:
 
 
 class TestDiscoverTasksFiles:
-    @patch("istota.tasks_file_poller.list_files")
-    def test_discovers_tasks_md(self, mock_list_files, make_config):
+    @patch("istota.tasks_file_poller.list_dirs")
+    def test_discovers_tasks_md(self, mock_list_dirs, make_config):
         config = make_config()
-        mock_list_files.return_value = [
-            {"name": "TASKS.md", "is_dir": False},
-            {"name": "notes.txt", "is_dir": False},
-        ]
+        mock_list_dirs.return_value = {"/Users/alice/istota/config": [
+            {"name": "TASKS.md", "is_dir": False, "size": 12, "mod_time": "2026-01-01T00:00:00Z"},
+            {"name": "notes.txt", "is_dir": False, "size": 3, "mod_time": ""},
+        ]}
         discovered = discover_tasks_files(config)
         assert len(discovered) == 1
         assert discovered[0].owner_id == "alice"
         assert discovered[0].file_path == "/Users/alice/istota/config/TASKS.md"
-        # Verify it scans istota/config/ not user root
-        mock_list_files.assert_called_once_with(config, "/Users/alice/istota/config")
+        assert (discovered[0].mod_time, discovered[0].size) == ("2026-01-01T00:00:00Z", 12)
+        # Verify it scans istota/config/ not user root, all users in one sweep
+        mock_list_dirs.assert_called_once_with(config, ["/Users/alice/istota/config"])
 
-    @patch("istota.tasks_file_poller.list_files")
-    def test_skips_directories(self, mock_list_files, make_config):
+    @patch("istota.tasks_file_poller.list_dirs")
+    def test_skips_directories(self, mock_list_dirs, make_config):
         config = make_config()
-        mock_list_files.return_value = [
+        mock_list_dirs.return_value = {"/Users/alice/istota/config": [
             {"name": "TASKS.md", "is_dir": True},
-        ]
+        ]}
         discovered = discover_tasks_files(config)
         assert len(discovered) == 0
 
-    @patch("istota.tasks_file_poller.list_files")
-    def test_handles_missing_user_dir(self, mock_list_files, make_config):
+    @patch("istota.tasks_file_poller.list_dirs")
+    def test_handles_missing_user_dir(self, mock_list_dirs, make_config):
         config = make_config()
-        mock_list_files.side_effect = FileNotFoundError("No user directory")
+        mock_list_dirs.return_value = {}
         discovered = discover_tasks_files(config)
         assert len(discovered) == 0
 
+    @patch("istota.tasks_file_poller.list_dirs")
+    def test_handles_listing_error(self, mock_list_dirs, make_config):
+        config = make_config()
+        mock_list_dirs.side_effect = RuntimeError("rclone list failed")
+        assert discover_tasks_files(config) == []
+
+    def test_mount_sweep(self, make_config, tmp_path):
+        config = make_config(
+            users={
+                "alice": UserConfig(display_name="Alice"),
+                "bob": UserConfig(display_name="Bob"),
+            },
+        )
+        config_dir = tmp_path / "mount" / "Users" / "alice" / "istota" / "config"
+        config_dir.mkdir(parents=True)
+        (config_dir / "tasks.md").write_text("- [ ] Hello")
+        (config_dir / "archive").mkdir()
+
+        discovered = discover_tasks_files(config)
+
+        assert [d.file_path for d in discovered] == ["/Users/alice/istota/config/tasks.md"]
+        assert discovered[0].size == len("- [ ] Hello")
+        assert discovered[0].mod_time
+
+
+class TestChangeDetection:
+    PATH = "/Users/alice/istota/config/TASKS.md"
+
+    def _discovered(self, mod_time="t1", size=10):
+        from istota.tasks_file_poller import DiscoveredTasksFile
+        return [DiscoveredTasksFile(self.PATH, "alice", mod_time, size)]
+
+    @patch("istota.tasks_file_poller.write_text")
+    @patch("istota.tasks_file_poller.read_text")
+    @patch("istota.tasks_file_poller.discover_tasks_files")
+    def test_unchanged_file_not_read(self, mock_discover, mock_read, mock_write, make_config):
+        config = make_config()
+        mock_discover.return_value = self._discovered()
+        mock_read.return_value = "- [x] Done"
+
+        poll_all_tasks_files(config)
+        poll_all_tasks_files(config)
+
+        assert mock_read.call_count == 1
+
+    @patch("istota.tasks_file_poller.write_text")
+    @patch("istota.tasks_file_poller.read_text")
+    @patch("istota.tasks_file_poller.discover_tasks_files")
+    def test_changed_file_polled(self, mock_discover, mock_read, mock_write, make_config):
+        config = make_config()
+        mock_discover.return_value = self._discovered()
+        mock_read.return_value = "- [x] Done"
+        poll_all_tasks_files(config)
+
+        mock_discover.return_value = self._discovered(mod_time="t2", size=30)
+        mock_read.return_value = "- [x] Done\n- [ ] New task"
+        task_ids = poll_all_tasks_files(config)
+
+        assert len(task_ids) == 1
+        assert mock_read.call_count == 2
+
+    @patch("istota.tasks_file_poller.parse_tasks_file", wraps=parse_tasks_file)
+    @patch("istota.tasks_file_poller.write_text")
+    @patch("istota.tasks_file_poller.read_text")
+    @patch("istota.tasks_file_poller.discover_tasks_files")
+    def test_touched_file_with_same_content_not_parsed(
+        self, mock_discover, mock_read, mock_write, mock_parse, make_config,
+    ):
+        config = make_config()
+        mock_discover.return_value = self._discovered()
+        mock_read.return_value = "- [x] Done"
+        poll_all_tasks_files(config)
+
+        mock_discover.return_value = self._discovered(mod_time="t2")
+        poll_all_tasks_files(config)
+
+        assert mock_read.call_count == 2
+        assert mock_parse.call_count == 1
+
+    @patch("istota.tasks_file_poller.write_text")
+    @patch("istota.tasks_file_poller.read_text")
+    @patch("istota.tasks_file_poller.discover_tasks_files")
+    def test_read_error_retried(self, mock_discover, mock_read, mock_write, make_config):
+        config = make_config()
+        mock_discover.return_value = self._discovered()
+        mock_read.side_effect = [OSError("transient"), "- [ ] Task"]
+
+        assert poll_all_tasks_files(config) == []
+        assert len(poll_all_tasks_files(config)) == 1
+
+    @patch("istota.tasks_file_poller.write_text")
+    @patch("istota.tasks_file_poller.read_text")
+    def test_duplicate_pending_lines_create_one_task(self, mock_read, mock_write, make_config):
+        config = make_config()
+        mock_read.return_value = "- [ ] Send email\n- [ ] send email"
+
+        assert len(poll_user_tasks_file(config, "alice", self.PATH)) == 1
+
 
 # --- TestTasksFilePattern ---
 